@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark for batch opportunity scoring.
+
+Scores a refresh cycle of tracked keywords (1,000 per marketplace by
+default, with history) one keyword at a time and as one vectorized batch per
+marketplace, reporting time per cycle and the largest score difference.
+
+Usage:
+    python benchmarks/bench_opportunity_scoring.py [--keywords N] [--iterations N]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+from src.marketplaces.bob_shop.extractors.search_ranking_extractor import BobShopSearchRankingExtractor
+from src.marketplaces.amazon.extractors.search_ranking_extractor import AmazonSearchRankingExtractor
+
+
+EXTRACTORS = [
+    TakealotSearchRankingExtractor,
+    LootSearchRankingExtractor,
+    MakroSearchRankingExtractor,
+    BobShopSearchRankingExtractor,
+    AmazonSearchRankingExtractor,
+]
+
+# Ranked products kept per keyword (one page of results)
+PRODUCTS_PER_KEYWORD = 24
+
+
+def _ranking_data(rng: random.Random, marketplace: str, index: int) -> dict:
+    """Synthetic ranking data of one tracked keyword."""
+    products = []
+    for position in range(1, PRODUCTS_PER_KEYWORD + 1):
+        price = round(rng.uniform(50, 5000), 2)
+        products.append({
+            "position": position,
+            "price": price,
+            "rating": round(rng.uniform(2.5, 5), 1),
+            "review_count": rng.randint(0, 2000),
+            "sponsored": rng.random() < 0.1,
+            "on_sale": rng.random() < 0.25,
+            "original_price": price * 1.2,
+            "in_stock": rng.random() > 0.1,
+            "badge": rng.choice(["", "Daily Deal", "Best Seller"]),
+            "seller_count": rng.randint(1, 6),
+        })
+
+    return {
+        "keyword": f"keyword {index}",
+        "marketplace": marketplace,
+        "current_results": rng.randint(0, 8000),
+        "top_ranked_products": products,
+        "seller_density": rng.uniform(0, 5),
+        "competitive_index": rng.uniform(0, 10),
+    }
+
+
+def _history(rng: random.Random) -> list:
+    """Synthetic history of one tracked keyword."""
+    return [
+        {"date": f"2026-10-{day:02d}", "total_results": rng.randint(0, 8000), "competitive_density": rng.uniform(0, 5)}
+        for day in range(1, 8)
+    ]
+
+
+def run(keyword_count: int, iterations: int) -> None:
+    """Run the benchmark and print results."""
+    # Scoring logs every keyword at INFO level
+    logging.disable(logging.INFO)
+    rng = random.Random(33)
+
+    header = f"{'marketplace':<14}{'keywords':>9}{'per-keyword ms':>16}{'batch ms':>10}{'speedup':>9}{'max diff':>10}"
+    print(header)
+    print("-" * len(header))
+
+    total_single = total_batch = 0.0
+    for extractor_class in EXTRACTORS:
+        extractor = extractor_class()
+        batch = [_ranking_data(rng, extractor.marketplace_name, i) for i in range(keyword_count)]
+        histories = [_history(rng) for _ in batch]
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            single = [extractor.calculate_opportunity_score(data, history) for data, history in zip(batch, histories)]
+        single_ms = (time.perf_counter() - start) * 1000 / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            batched = extractor.calculate_opportunity_scores(batch, histories)
+        batch_ms = (time.perf_counter() - start) * 1000 / iterations
+
+        max_diff = max(abs(a["opportunity_score"] - b["opportunity_score"]) for a, b in zip(single, batched))
+        total_single += single_ms
+        total_batch += batch_ms
+
+        print(f"{extractor.marketplace_name:<14}{keyword_count:>9}{single_ms:>16.1f}{batch_ms:>10.1f}"
+              f"{single_ms / batch_ms:>8.1f}x{max_diff:>10.1e}")
+
+    print(f"{'total':<14}{keyword_count * len(EXTRACTORS):>9}{total_single:>16.1f}{total_batch:>10.1f}"
+          f"{total_single / total_batch:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch opportunity scoring")
+    parser.add_argument("--keywords", type=int, default=1000, help="Tracked keywords per marketplace")
+    parser.add_argument("--iterations", type=int, default=3, help="Iterations per measurement")
+    args = parser.parse_args()
+    run(args.keywords, args.iterations)
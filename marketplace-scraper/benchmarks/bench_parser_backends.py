@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pluggable HTML parser backends.
+
+Runs the extractors over the saved HTML fixtures with each available parser
+backend, reporting extraction time per page and whether the extracted
+fields are identical to the `html.parser` reference.
+
+Usage:
+    python benchmarks/bench_parser_backends.py [--iterations N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.common.extractors.html_parser import set_parser_backend, available_parser_backends
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.takealot.extractors import search_extractor as takealot_search
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import product_extractor as loot_product
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _load_fixture(page: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, f'{page}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _pages():
+    """Fixture pages with the extraction call to benchmark for each."""
+    takealot_ranking = TakealotSearchRankingExtractor()
+    loot_ranking = LootSearchRankingExtractor()
+
+    return [
+        ("takealot/product", "takealot/product", lambda html: takealot_product.extract_product_details(
+            html, "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234")),
+        ("loot/product", "loot/product", lambda html: loot_product.extract_product_details(
+            html, "https://www.loot.co.za/product/the-long-road/lt-5001")),
+        ("takealot/search", "takealot/search", lambda html: takealot_search.extract_search_results(
+            html, "bluetooth speaker")),
+        ("loot/search", "loot/search", lambda html: loot_search.extract_search_results(
+            html, "history books")),
+        ("takealot/ranking", "takealot/search", lambda html: takealot_ranking.extract_search_ranking_data(
+            html, "bluetooth speaker", 1)),
+        ("loot/ranking", "loot/search", lambda html: loot_ranking.extract_search_ranking_data(
+            html, "history books", 1)),
+    ]
+
+
+def _fields(data: dict) -> str:
+    """Serialize extracted fields without run-dependent timestamps."""
+    data = dict(data)
+    data.pop("timestamp", None)
+    data.pop("extracted_at", None)
+    return json.dumps(data, sort_keys=True, default=str)
+
+
+def run(iterations: int) -> None:
+    """Run the benchmark and print a table of results."""
+    # Ranking extractors log every page at INFO level
+    logging.disable(logging.INFO)
+
+    backends = available_parser_backends()
+    header = f"{'page':<20}" + "".join(f"{backend + ' ms':>16}" for backend in backends) + f"{'identical':>11}"
+    print(header)
+    print("-" * len(header))
+
+    for name, fixture, extract in _pages():
+        html_content = _load_fixture(fixture)
+        timings = []
+        outputs = []
+
+        for backend in backends:
+            set_parser_backend(backend)
+            outputs.append(_fields(extract(html_content)))
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                extract(html_content)
+            timings.append((time.perf_counter() - start) * 1000 / iterations)
+
+        identical = all(output == outputs[0] for output in outputs)
+        print(f"{name:<20}" + "".join(f"{ms:>16.2f}" for ms in timings) + f"{'yes' if identical else 'NO':>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument("--iterations", type=int, default=10, help="Iterations per measurement")
+    args = parser.parse_args()
+    run(args.iterations)
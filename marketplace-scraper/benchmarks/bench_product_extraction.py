@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark for single-pass product page extraction.
+
+Compares locating product fields with the compiled single-pass selector plan
+against the previous one-`select`-per-field approach over the saved HTML
+fixtures, reporting parse time, locate time and peak allocations per page.
+
+Usage:
+    python benchmarks/bench_product_extraction.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.loot.extractors import product_extractor as loot_product
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+PRODUCT_PAGES = [
+    ("takealot", takealot_product.PRODUCT_PLAN),
+    ("loot", loot_product.PRODUCT_PLAN),
+]
+
+
+def _time_per_call(func, iterations: int) -> float:
+    """Average wall time of a call in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def _peak_allocation(func) -> int:
+    """Peak traced memory of a single call in bytes."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(iterations: int) -> None:
+    """Run the benchmark and print a table of results."""
+    header = f"{'page':<20}{'parse ms':>10}{'multi ms':>10}{'single ms':>11}{'speedup':>9}{'multi KiB':>11}{'single KiB':>12}"
+    print(header)
+    print("-" * len(header))
+
+    for marketplace, plan in PRODUCT_PAGES:
+        with open(os.path.join(FIXTURES_DIR, marketplace, 'product.html'), encoding='utf-8') as f:
+            html_content = f.read()
+
+        parse_ms = _time_per_call(lambda: BeautifulSoup(html_content, 'html.parser'), iterations)
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        multi_ms = _time_per_call(lambda: plan.match_each(soup), iterations)
+        single_ms = _time_per_call(lambda: plan.match(soup), iterations)
+        multi_peak = _peak_allocation(lambda: plan.match_each(soup))
+        single_peak = _peak_allocation(lambda: plan.match(soup))
+
+        print(
+            f"{marketplace + '/product':<20}{parse_ms:>10.2f}{multi_ms:>10.2f}{single_ms:>11.2f}"
+            f"{multi_ms / single_ms:>8.1f}x{multi_peak / 1024:>11.1f}{single_peak / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single-pass product extraction")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations per measurement")
+    args = parser.parse_args()
+    run(args.iterations)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark for concurrent ranking analysis.
+
+Runs the cross-marketplace opportunity search, a marketplace opportunity
+report and a product comparison against a local in-memory repository that
+answers every call after a fixed latency, standing in for Firestore round
+trips. Each is run with the analyzer limited to one read at a time and
+with its default concurrency, reporting latency and storage calls.
+
+Usage:
+    python benchmarks/bench_ranking_analyzer.py [--keywords N] [--latency MS] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer
+
+
+MARKETPLACES = ["takealot", "loot", "makro", "bob_shop"]
+
+# Days of history kept per keyword
+HISTORY_DAYS = 45
+
+
+def _matches(entry: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Whether an entry matches repository-style filters."""
+    for field, condition in filters.items():
+        value = entry.get(field)
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                if value is None or not {
+                    ">=": value >= operand, "<=": value <= operand,
+                    ">": value > operand, "<": value < operand
+                }[operator]:
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class LocalRepository:
+    """In-memory stand-in for the repository, with a latency per call."""
+
+    def __init__(self, keyword_count: int, latency: float, seed: int = 7):
+        """Generate tracked keywords with history for every marketplace.
+
+        Args:
+            keyword_count: Tracked keywords per marketplace
+            latency: Seconds every call takes
+            seed: Random seed
+        """
+        self.latency = latency
+        self.calls = 0
+        rng = random.Random(seed)
+        now = datetime.now()
+
+        self.keywords: Dict[str, Dict[str, Any]] = {}
+        self.histories: Dict[str, List[Dict[str, Any]]] = {}
+        self.products: Dict[str, List[Dict[str, Any]]] = {}
+        for marketplace in MARKETPLACES:
+            self.products[marketplace] = [
+                {"product_id": f"{marketplace}{i}", "title": f"Kettle model {i}", "price": rng.uniform(200, 900)}
+                for i in range(10)
+            ]
+            for i in range(keyword_count):
+                keyword = f"keyword {i}"
+                keyword_id = f"{marketplace}_{keyword}"
+                self.keywords[keyword_id] = {
+                    "keyword_id": keyword_id,
+                    "marketplace": marketplace,
+                    "keyword": keyword,
+                    "tracking_enabled": True,
+                    "category": f"category {i % 12}",
+                    "opportunity_score": rng.uniform(10, 90),
+                    "competitive_density": rng.uniform(0, 1),
+                    "seller_density": rng.uniform(0, 1),
+                    "average_price": rng.uniform(100, 2000),
+                    "total_results": rng.randint(10, 5000),
+                    "last_updated": (now - timedelta(days=rng.randint(0, 40))).isoformat(),
+                    "update_count": HISTORY_DAYS,
+                }
+                self.histories[keyword_id] = [
+                    {
+                        "date": (now - timedelta(days=day)).isoformat(),
+                        "opportunity_score": rng.uniform(10, 90),
+                        "total_results": rng.randint(10, 5000),
+                        "average_price": rng.uniform(100, 2000),
+                    }
+                    for day in range(HISTORY_DAYS, 0, -1)
+                ]
+
+    async def _call(self) -> None:
+        """Count a call and wait for its latency."""
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+
+    async def get_keyword_rankings(self,
+                                   filters: Optional[Dict[str, Any]] = None,
+                                   limit: int = 100,
+                                   order_by: Optional[str] = None,
+                                   order_direction: str = "desc") -> List[Dict[str, Any]]:
+        await self._call()
+        entries = [entry for entry in self.keywords.values() if _matches(entry, filters or {})]
+        if order_by:
+            entries.sort(key=lambda entry: entry.get(order_by, 0), reverse=order_direction == "desc")
+        return [dict(entry) for entry in entries[:limit]]
+
+    async def get_keyword_rankings_many(self, keyword_ids: List[str], **kwargs) -> Dict[str, Dict[str, Any]]:
+        await self._call()
+        return {keyword_id: dict(self.keywords[keyword_id]) for keyword_id in keyword_ids if keyword_id in self.keywords}
+
+    async def get_keyword_histories(self,
+                                    keyword_entries: List[Dict[str, Any]],
+                                    start: Any = None,
+                                    end: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+        await self._call()
+        start = start.isoformat() if isinstance(start, datetime) else start
+        return {
+            entry["keyword_id"]: [
+                history_entry for history_entry in self.histories.get(entry["keyword_id"], [])
+                if not start or history_entry["date"] >= start
+            ]
+            for entry in keyword_entries
+        }
+
+    async def get_opportunity_scores(self, filters: Optional[Dict[str, Any]] = None, limit: int = 100,
+                                     **kwargs) -> List[Dict[str, Any]]:
+        await self._call()
+        entries = [entry for entry in self.keywords.values() if _matches(entry, {"marketplace": filters.get("marketplace")})]
+        return sorted(entries, key=lambda entry: entry["opportunity_score"], reverse=True)[:limit]
+
+    async def search_products(self, marketplace: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        await self._call()
+        return [dict(product) for product in self.products.get(marketplace, [])[:limit]]
+
+    async def get_opportunity_score(self, opportunity_id: str) -> Optional[Dict[str, Any]]:
+        await self._call()
+        return {"opportunity_id": opportunity_id, "opportunity_score": 50}
+
+
+def _measure(repository: LocalRepository, analyzer: RankingAnalyzer, scenario) -> tuple:
+    """Run a scenario, returning milliseconds taken and storage calls made."""
+    repository.calls = 0
+    start = time.perf_counter()
+    asyncio.run(scenario(analyzer))
+    return (time.perf_counter() - start) * 1000, repository.calls
+
+
+SCENARIOS = [
+    ("cross-marketplace", lambda analyzer: analyzer.find_cross_marketplace_opportunities(MARKETPLACES)),
+    ("marketplace report", lambda analyzer: analyzer.generate_marketplace_opportunity_report("takealot")),
+    ("product comparison", lambda analyzer: analyzer.analyze_product_across_marketplaces("kettle", MARKETPLACES)),
+]
+
+
+def run(keyword_count: int, latency_ms: float, concurrency: int) -> None:
+    """Run the benchmark and print results."""
+    logging.disable(logging.CRITICAL)
+    repository = LocalRepository(keyword_count, latency_ms / 1000)
+
+    header = f"{'scenario':<20}{'sequential ms':>15}{'calls':>7}{'concurrent ms':>15}{'calls':>7}{'speedup':>9}"
+    print(f"{keyword_count} keywords per marketplace, {latency_ms:g} ms per storage call")
+    print(header)
+    print("-" * len(header))
+
+    for name, scenario in SCENARIOS:
+        sequential = RankingAnalyzer(repository)
+        sequential.max_concurrency = 1
+        sequential_ms, sequential_calls = _measure(repository, sequential, scenario)
+
+        concurrent = RankingAnalyzer(repository)
+        concurrent.max_concurrency = concurrency
+        concurrent_ms, concurrent_calls = _measure(repository, concurrent, scenario)
+
+        print(f"{name:<20}{sequential_ms:>15.1f}{sequential_calls:>7}{concurrent_ms:>15.1f}{concurrent_calls:>7}"
+              f"{sequential_ms / concurrent_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent ranking analysis")
+    parser.add_argument("--keywords", type=int, default=200, help="Tracked keywords per marketplace")
+    parser.add_argument("--latency", type=float, default=20, help="Milliseconds per storage call")
+    parser.add_argument("--concurrency", type=int, default=8, help="Reads the concurrent analyzer runs at a time")
+    args = parser.parse_args()
+    run(args.keywords, args.latency, args.concurrency)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark for delta-encoded search ranking snapshots.
+
+Refreshes the rankings of tracked keywords (100 ranked products each) with
+typical churn: a few products swap places, a few enter and leave and a few
+change price. Compares storing every refresh in full with storing deltas
+between keyframes, reporting rows and bytes written per refresh and the
+time to encode a refresh and to rebuild the last snapshots of a keyword.
+
+Usage:
+    python benchmarks/bench_search_snapshots.py [--keywords N] [--refreshes N] [--history N]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.storage.search_snapshots import (
+    MAX_RESULTS,
+    ranking_rows,
+    diff_rows,
+    apply_delta,
+    delta_size,
+    needs_keyframe
+)
+
+
+def _refreshes(rng: random.Random, refresh_count: int) -> list:
+    """Search results of successive refreshes of one keyword."""
+    product_ids = [f"PLID{rng.randrange(10 ** 8)}" for _ in range(MAX_RESULTS)]
+    prices = {product_id: round(rng.uniform(50, 5000), 2) for product_id in product_ids}
+    refreshes = []
+    for _ in range(refresh_count):
+        for _ in range(rng.randint(0, 4)):
+            first, second = rng.sample(range(len(product_ids)), 2)
+            product_ids[first], product_ids[second] = product_ids[second], product_ids[first]
+        for _ in range(rng.randint(0, 3)):
+            product_id = f"PLID{rng.randrange(10 ** 8)}"
+            product_ids[rng.randrange(len(product_ids))] = product_id
+            prices[product_id] = round(rng.uniform(50, 5000), 2)
+        for product_id in rng.sample(product_ids, rng.randint(0, 3)):
+            prices[product_id] = round(prices[product_id] * rng.uniform(0.8, 1.1), 2)
+
+        refreshes.append([
+            {
+                "product_id": product_id,
+                "title": f"Product {product_id} with a typical marketplace title",
+                "price": prices[product_id],
+                "url": f"https://www.example.com/product/{product_id}",
+                "image_url": f"https://media.example.com/images/{product_id}-full.jpg"
+            }
+            for product_id in product_ids
+        ])
+    return refreshes
+
+
+def _encode(refreshes: list) -> list:
+    """Encode refreshes as keyframes and deltas, as the repository stores them."""
+    snapshots = []
+    previous = None
+    keyframe_sequence = None
+    for sequence, results in enumerate(refreshes, start=1):
+        rows = ranking_rows(results)
+        delta = diff_rows(previous, rows) if previous is not None else None
+        if needs_keyframe(sequence, keyframe_sequence, delta, len(rows)):
+            keyframe_sequence = sequence
+            snapshots.append({"sequence": sequence, "results": rows})
+        else:
+            snapshots.append({"sequence": sequence, "delta": delta})
+        previous = rows
+    return snapshots
+
+
+def _rebuild(snapshots: list, history: int) -> list:
+    """Rebuild the last snapshots, replaying from the keyframe before them."""
+    first = len(snapshots) - history
+    start = max(index for index in range(first + 1) if "results" in snapshots[index])
+    rows = []
+    rebuilt = []
+    for index in range(start, len(snapshots)):
+        snapshot = snapshots[index]
+        rows = snapshot["results"] if "results" in snapshot else apply_delta(rows, snapshot["delta"])
+        if index >= first:
+            rebuilt.append(rows)
+    return rebuilt
+
+
+def run(keyword_count: int, refresh_count: int, history: int) -> None:
+    """Run the benchmark and print results."""
+    rng = random.Random(41)
+    keywords = [_refreshes(rng, refresh_count) for _ in range(keyword_count)]
+    refresh_total = keyword_count * refresh_count
+
+    full_rows = full_bytes = 0
+    for refreshes in keywords:
+        for results in refreshes:
+            rows = ranking_rows(results)
+            full_rows += len(rows)
+            full_bytes += len(json.dumps(rows))
+
+    start = time.perf_counter()
+    encoded = [_encode(refreshes) for refreshes in keywords]
+    encode_ms = (time.perf_counter() - start) * 1000 / refresh_total
+
+    delta_rows = delta_bytes = keyframes = 0
+    for snapshots in encoded:
+        for snapshot in snapshots:
+            if "results" in snapshot:
+                keyframes += 1
+                delta_rows += len(snapshot["results"])
+                delta_bytes += len(json.dumps(snapshot["results"]))
+            else:
+                delta_rows += delta_size(snapshot["delta"])
+                delta_bytes += len(json.dumps(snapshot["delta"]))
+
+    start = time.perf_counter()
+    for refreshes, snapshots in zip(keywords, encoded):
+        rebuilt = _rebuild(snapshots, history)
+        assert rebuilt == [ranking_rows(results) for results in refreshes[-history:]]
+    rebuild_ms = (time.perf_counter() - start) * 1000 / keyword_count
+
+    header = f"{'layout':<10}{'rows/refresh':>14}{'bytes/refresh':>15}"
+    print(f"{keyword_count} keywords x {refresh_count} refreshes, {keyframes} keyframes")
+    print(header)
+    print("-" * len(header))
+    print(f"{'full':<10}{full_rows / refresh_total:>14.1f}{full_bytes / refresh_total:>15.0f}")
+    print(f"{'delta':<10}{delta_rows / refresh_total:>14.1f}{delta_bytes / refresh_total:>15.0f}")
+    print(f"storage saved {1 - delta_bytes / full_bytes:.1%}, rows written saved {1 - delta_rows / full_rows:.1%}")
+    print(f"encode {encode_ms:.3f} ms/refresh, rebuild last {history} snapshots {rebuild_ms:.3f} ms/keyword")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark delta-encoded search snapshots")
+    parser.add_argument("--keywords", type=int, default=200, help="Tracked keywords")
+    parser.add_argument("--refreshes", type=int, default=30, help="Refreshes per keyword")
+    parser.add_argument("--history", type=int, default=7, help="Snapshots rebuilt per keyword")
+    args = parser.parse_args()
+    run(args.keywords, args.refreshes, args.history)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming search page extraction.
+
+Builds long search pages (60 to 120 results) from the recorded fixtures and
+compares full-page parsing with streaming extraction bounded by max_depth
+(ranking) and by a result limit (search), reporting time per page and peak
+memory allocated during extraction.
+
+Usage:
+    python benchmarks/bench_streaming_extraction.py [--iterations N] [--backend NAME]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.common.extractors.html_parser import set_parser_backend, available_parser_backends
+from src.common.extractors.streaming import ElementStream
+from src.marketplaces.takealot.extractors import search_extractor as takealot_search
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+PAGE_SIZES = (60, 120)
+
+# Ranking depth of one page and the result limit used by keyword tracking
+MAX_DEPTH = 1
+SEARCH_LIMIT = 20
+
+
+def long_search_page(marketplace: str, class_name: str, count: int) -> str:
+    """Build a search page with `count` results by repeating the fixture cards."""
+    with open(os.path.join(FIXTURES_DIR, marketplace, 'search.html'), encoding='utf-8') as f:
+        html_content = f.read()
+
+    spans = ElementStream(html_content, class_name).spans
+    cards = [html_content[start:end] for start, end in spans]
+    repeated = [cards[i % len(cards)] for i in range(count)]
+
+    return html_content[:spans[0][0]] + "\n".join(repeated) + html_content[spans[-1][1]:]
+
+
+def _measure(func, iterations: int):
+    """Average wall time in milliseconds and peak traced memory in KiB."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    func()
+    peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    return elapsed_ms, peak_kib
+
+
+def _cases():
+    """Extraction cases as (name, card class, full extract, streaming extract)."""
+    takealot_ranking = TakealotSearchRankingExtractor()
+    loot_ranking = LootSearchRankingExtractor()
+
+    return [
+        ("takealot/ranking", "product-card",
+         lambda html: takealot_ranking.extract_search_ranking_data(html, "kettle", max_depth=MAX_DEPTH),
+         lambda html: takealot_ranking.extract_search_ranking_data(html, "kettle", max_depth=MAX_DEPTH,
+                                                                   streaming=True)),
+        ("loot/ranking", "product",
+         lambda html: loot_ranking.extract_search_ranking_data(html, "kettle", max_depth=MAX_DEPTH),
+         lambda html: loot_ranking.extract_search_ranking_data(html, "kettle", max_depth=MAX_DEPTH,
+                                                               streaming=True)),
+        ("takealot/search", "product-card",
+         lambda html: takealot_search.extract_search_results(html, "kettle")["results"][:SEARCH_LIMIT],
+         lambda html: takealot_search.extract_search_results(html, "kettle", limit=SEARCH_LIMIT)["results"]),
+        ("loot/search", "product-list-item",
+         lambda html: loot_search.extract_search_results(html, "kettle")["results"][:SEARCH_LIMIT],
+         lambda html: loot_search.extract_search_results(html, "kettle", limit=SEARCH_LIMIT)["results"]),
+    ]
+
+
+def run(iterations: int) -> None:
+    """Run the benchmark and print results."""
+    # Ranking extractors log every page at INFO level
+    logging.disable(logging.INFO)
+
+    header = (f"{'case':<18}{'results':>8}{'full ms':>10}{'stream ms':>11}{'speedup':>9}"
+              f"{'full KiB':>10}{'stream KiB':>12}{'same':>6}")
+    print(header)
+    print("-" * len(header))
+
+    for name, class_name, full, streaming in _cases():
+        marketplace = name.split("/")[0]
+        for count in PAGE_SIZES:
+            html_content = long_search_page(marketplace, class_name, count)
+            same = full(html_content) == streaming(html_content)
+
+            full_ms, full_kib = _measure(lambda: full(html_content), iterations)
+            stream_ms, stream_kib = _measure(lambda: streaming(html_content), iterations)
+
+            print(f"{name:<18}{count:>8}{full_ms:>10.2f}{stream_ms:>11.2f}{full_ms / stream_ms:>8.1f}x"
+                  f"{full_kib:>10.0f}{stream_kib:>12.0f}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming search page extraction")
+    parser.add_argument("--iterations", type=int, default=5, help="Iterations per measurement")
+    parser.add_argument("--backend", choices=available_parser_backends(), default="html.parser",
+                        help="HTML parser backend")
+    args = parser.parse_args()
+    set_parser_backend(args.backend)
+    run(args.iterations)
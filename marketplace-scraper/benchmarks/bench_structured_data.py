@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the embedded structured data fast path.
+
+Extracts each fixture page with its embedded structured data and again with
+the structured data disabled (forcing DOM extraction), then prints the time
+per page and the fast path statistics recorded per marketplace.
+
+Usage:
+    python benchmarks/bench_structured_data.py [--iterations N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.common.extractors.structured_data import get_structured_data_stats, reset_structured_data_stats
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.makro.extractors import search_extractor as makro_search
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+TAKEALOT_URL = "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234"
+
+
+def _load_fixture(page: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, f'{page}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _takealot_with_json_ld(html_content: str) -> str:
+    """Embed the product JSON-LD that Takealot serves alongside the markup."""
+    json_ld = {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": "Acme Audio Portable Bluetooth Speaker - Black",
+        "image": "https://media.example.net/covers_images/abc0/s-pdpxl.jpg",
+        "brand": {"@type": "Brand", "name": "Acme Audio"},
+        "offers": {"@type": "Offer", "price": "1299", "priceCurrency": "ZAR",
+                   "availability": "https://schema.org/InStock"},
+        "aggregateRating": {"@type": "AggregateRating", "ratingValue": "4.6", "reviewCount": "213"}
+    }
+    script = f'<script type="application/ld+json">{json.dumps(json_ld)}</script>'
+    return html_content.replace('</head>', script + '\n</head>', 1)
+
+
+def _pages():
+    """Pages as (name, structured html, html without structured data, extract)."""
+    makro_ranking = MakroSearchRankingExtractor()
+    makro_html = _load_fixture("makro/search")
+    takealot_html = _load_fixture("takealot/product")
+
+    return [
+        ("makro/ranking", makro_html, makro_html.replace("__INITIAL_STATE__", "__DISABLED__"),
+         lambda html: makro_ranking.extract_search_ranking_data(html, "kettle")),
+        ("makro/search", makro_html, makro_html.replace("__INITIAL_STATE__", "__DISABLED__"),
+         lambda html: makro_search.extract_search_results(html, "kettle")),
+        ("takealot/product", _takealot_with_json_ld(takealot_html), takealot_html,
+         lambda html: takealot_product.extract_product_details(html, TAKEALOT_URL)),
+    ]
+
+
+def _time_per_call(func, iterations: int) -> float:
+    """Average wall time of a call in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def run(iterations: int) -> None:
+    """Run the benchmark and print results."""
+    # Ranking extractors log every page at INFO level
+    logging.disable(logging.INFO)
+
+    header = f"{'page':<20}{'structured ms':>15}{'dom ms':>10}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    pages = _pages()
+    reset_structured_data_stats()
+
+    for name, structured_html, dom_html, extract in pages:
+        structured_ms = _time_per_call(lambda: extract(structured_html), iterations)
+        dom_ms = _time_per_call(lambda: extract(dom_html), iterations)
+        print(f"{name:<20}{structured_ms:>15.2f}{dom_ms:>10.2f}{dom_ms / structured_ms:>8.1f}x")
+
+    print()
+    print(json.dumps(get_structured_data_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the structured data fast path")
+    parser.add_argument("--iterations", type=int, default=10, help="Iterations per measurement")
+    args = parser.parse_args()
+    run(args.iterations)
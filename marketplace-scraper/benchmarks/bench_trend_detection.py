@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for vectorized trend detection.
+
+Identifies the trending keywords among all tracked keyword-marketplace
+pairs (1,500 per marketplace by default, with 45 days of daily history of
+which the last 30 are analyzed) with every trend method, reporting the
+time to lay out the history as arrays, to score it and to select the top
+keywords, and the time of a whole identify_trending_keywords call against
+a local repository without latency.
+
+Usage:
+    python benchmarks/bench_trend_detection.py [--keywords N] [--days N] [--iterations N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer
+from src.processing.analyzers.trend_detection import TREND_METHODS, HistoryArrays, metric_changes, trend_scores, top_k
+
+from bench_ranking_analyzer import MARKETPLACES, LocalRepository
+
+# Trending keywords selected
+TOP_KEYWORDS = 20
+
+
+def _time_ms(func, iterations: int):
+    """Average milliseconds per call of a function, and its last result."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / iterations, result
+
+
+def run(keyword_count: int, days: int, iterations: int) -> None:
+    """Run the benchmark and print results."""
+    logging.disable(logging.CRITICAL)
+    repository = LocalRepository(keyword_count, 0)
+    analyzer = RankingAnalyzer(repository)
+    total = keyword_count * len(MARKETPLACES)
+    start = datetime.now() - timedelta(days=days)
+    histories = list(repository.histories.values())
+
+    load_ms, arrays = _time_ms(lambda: HistoryArrays(histories, start, days), iterations)
+    print(f"{total} keywords, {days} days of history: arrays laid out in {load_ms:.1f} ms")
+
+    header = f"{'method':<16}{'score ms':>10}{'top-k ms':>10}{'sort ms':>9}{'call ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for method in TREND_METHODS:
+        score_ms, scores = _time_ms(lambda: trend_scores(*metric_changes(arrays, method)), iterations)
+        top_ms, _ = _time_ms(lambda: top_k(scores, TOP_KEYWORDS), iterations)
+        sort_ms, _ = _time_ms(lambda: scores.argsort(kind="stable")[::-1][:TOP_KEYWORDS], iterations)
+        call_ms, _ = _time_ms(lambda: asyncio.run(analyzer.identify_trending_keywords(
+            days=days, limit=TOP_KEYWORDS, method=method, max_keywords=total
+        )), iterations)
+
+        print(f"{method:<16}{score_ms:>10.1f}{top_ms:>10.2f}{sort_ms:>9.2f}{call_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized trend detection")
+    parser.add_argument("--keywords", type=int, default=1500, help="Tracked keywords per marketplace")
+    parser.add_argument("--days", type=int, default=30, help="Days of history analyzed")
+    parser.add_argument("--iterations", type=int, default=3, help="Iterations per measurement")
+    args = parser.parse_args()
+    run(args.keywords, args.days, args.iterations)
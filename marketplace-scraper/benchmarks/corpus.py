@@ -0,0 +1,294 @@
+"""
+Extractor benchmark corpus.
+
+The corpus is the set of recorded marketplace pages in `fixtures/`, listed
+with their source URL, search keyword and content hash in
+`fixtures/manifest.json`. Each case runs one extractor over one page; its
+expected output is stored in `fixtures/expected/<marketplace>/<case>.json`
+so that optimisations can be checked for unchanged results field by field.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.marketplaces.takealot.extractors import (
+    product_extractor as takealot_product,
+    search_extractor as takealot_search,
+    category_extractor as takealot_category,
+    deals_extractor as takealot_deals,
+)
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import (
+    product_extractor as loot_product,
+    search_extractor as loot_search,
+    category_extractor as loot_category,
+    deals_extractor as loot_deals,
+)
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+from src.marketplaces.makro.extractors import (
+    product_extractor as makro_product,
+    search_extractor as makro_search,
+    category_extractor as makro_category,
+    deals_extractor as makro_deals,
+    reviews_extractor as makro_reviews,
+)
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+from src.marketplaces.bob_shop.extractors import (
+    product_extractor as bob_shop_product,
+    search_extractor as bob_shop_search,
+    category_extractor as bob_shop_category,
+    deals_extractor as bob_shop_deals,
+)
+from src.marketplaces.bob_shop.extractors.search_ranking_extractor import BobShopSearchRankingExtractor
+from src.marketplaces.buck_cheap.extractors import (
+    product_extractor as buck_cheap_product,
+    price_history_extractor as buck_cheap_price_history,
+)
+from src.marketplaces.amazon.extractors import reviews_extractor as amazon_reviews
+from src.marketplaces.amazon.extractors.search_ranking_extractor import AmazonSearchRankingExtractor
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARKS_DIR, 'fixtures')
+EXPECTED_DIR = os.path.join(FIXTURES_DIR, 'expected')
+MANIFEST_PATH = os.path.join(FIXTURES_DIR, 'manifest.json')
+
+# Output fields that change on every run and are left out of comparisons
+VOLATILE_FIELDS = frozenset({"timestamp", "extracted_at"})
+
+Extract = Callable[[str, Dict[str, Any]], Any]
+
+
+def _ranking(extractor_class) -> Extract:
+    """Case function running a search ranking extractor on a search page."""
+    extractor = extractor_class()
+    return lambda html, entry: extractor.extract_search_ranking_data(html, entry["keyword"])
+
+
+def _search(module) -> Extract:
+    """Case function running a search results extractor on a search page."""
+    return lambda html, entry: module.extract_search_results(html, entry["keyword"])
+
+
+def _with_url(func) -> Extract:
+    """Case function for extractors taking the page HTML and URL."""
+    return lambda html, entry: func(html, entry["url"])
+
+
+def _html_only(func) -> Extract:
+    """Case function for extractors taking only the page HTML."""
+    return lambda html, entry: func(html)
+
+
+# Case name -> (fixture id, extractor). Case names are "<marketplace>/<case>"
+# and fixture ids are "<marketplace>/<page type>".
+CASES: Dict[str, Tuple[str, Extract]] = {
+    "takealot/product": ("takealot/product", _with_url(takealot_product.extract_product_details)),
+    "takealot/search": ("takealot/search", _search(takealot_search)),
+    "takealot/search_ranking": ("takealot/search", _ranking(TakealotSearchRankingExtractor)),
+    "takealot/category": ("takealot/category", _with_url(takealot_category.extract_category_details)),
+    "takealot/deals": ("takealot/deals", _html_only(takealot_deals.extract_deal_product_paths)),
+
+    "loot/product": ("loot/product", _with_url(loot_product.extract_product_details)),
+    "loot/search": ("loot/search", _search(loot_search)),
+    "loot/search_ranking": ("loot/search", _ranking(LootSearchRankingExtractor)),
+    "loot/category": ("loot/category", _with_url(loot_category.extract_category_details)),
+    "loot/deals": ("loot/deals", _html_only(loot_deals.extract_deal_product_paths)),
+
+    "makro/product": ("makro/product", _with_url(makro_product.extract_product_details)),
+    "makro/search": ("makro/search", _search(makro_search)),
+    "makro/search_ranking": ("makro/search", _ranking(MakroSearchRankingExtractor)),
+    "makro/category": ("makro/category", _with_url(makro_category.extract_category_details)),
+    "makro/deals": ("makro/deals", _html_only(makro_deals.extract_deal_product_paths)),
+    "makro/reviews": ("makro/reviews", _html_only(makro_reviews.extract_reviews)),
+
+    "bob_shop/product": ("bob_shop/product", _with_url(bob_shop_product.extract_product_details)),
+    "bob_shop/search": ("bob_shop/search", _search(bob_shop_search)),
+    "bob_shop/search_ranking": ("bob_shop/search", _ranking(BobShopSearchRankingExtractor)),
+    "bob_shop/category": ("bob_shop/category", _with_url(bob_shop_category.extract_category_details)),
+    "bob_shop/deals": ("bob_shop/deals", _html_only(bob_shop_deals.extract_deal_product_paths)),
+
+    "buck_cheap/product": ("buck_cheap/product", _with_url(buck_cheap_product.extract_product_details)),
+    "buck_cheap/price_history": ("buck_cheap/product",
+                                 _html_only(buck_cheap_price_history.extract_price_history)),
+
+    "amazon/search_ranking": ("amazon/search", _ranking(AmazonSearchRankingExtractor)),
+    "amazon/reviews": ("amazon/reviews", _html_only(amazon_reviews.extract_reviews)),
+}
+
+
+def load_manifest() -> Dict[str, Any]:
+    """Load the corpus manifest.
+
+    Returns:
+        Manifest with the corpus version and fixture entries keyed by fixture id
+    """
+    with open(MANIFEST_PATH, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    manifest["fixtures"] = {entry["id"]: entry for entry in manifest["fixtures"]}
+    return manifest
+
+
+def fixture_hash(path: str) -> str:
+    """SHA-256 of a fixture file's bytes."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def verify_manifest(manifest: Dict[str, Any]) -> List[str]:
+    """Check that every fixture exists and matches its recorded hash.
+
+    Args:
+        manifest: Loaded manifest
+
+    Returns:
+        Problems found, empty if the corpus is intact
+    """
+    problems = []
+
+    for fixture_id, entry in manifest["fixtures"].items():
+        path = os.path.join(FIXTURES_DIR, entry["file"])
+        if not os.path.exists(path):
+            problems.append(f"{fixture_id}: missing fixture {entry['file']}")
+        elif fixture_hash(path) != entry["sha256"]:
+            problems.append(f"{fixture_id}: {entry['file']} does not match its manifest hash")
+
+    for name, (fixture_id, _) in CASES.items():
+        if fixture_id not in manifest["fixtures"]:
+            problems.append(f"{name}: fixture {fixture_id} is not in the manifest")
+
+    return problems
+
+
+def update_hashes(manifest: Dict[str, Any]) -> None:
+    """Record the current hash of every fixture in the manifest file.
+
+    Args:
+        manifest: Loaded manifest
+    """
+    for entry in manifest["fixtures"].values():
+        entry["sha256"] = fixture_hash(os.path.join(FIXTURES_DIR, entry["file"]))
+
+    data = dict(manifest, fixtures=list(manifest["fixtures"].values()))
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_fixture(entry: Dict[str, Any]) -> str:
+    """Read a fixture page."""
+    with open(os.path.join(FIXTURES_DIR, entry["file"]), encoding='utf-8') as f:
+        return f.read()
+
+
+def run_case(name: str, html_content: str, manifest: Dict[str, Any]) -> Any:
+    """Run a case's extractor over its fixture page.
+
+    Args:
+        name: Case name
+        html_content: Fixture page content
+        manifest: Loaded manifest
+
+    Returns:
+        Extractor output
+    """
+    fixture_id, extract = CASES[name]
+    return extract(html_content, manifest["fixtures"][fixture_id])
+
+
+def normalize(value: Any) -> Any:
+    """Convert extractor output to its JSON form without volatile fields."""
+    value = json.loads(json.dumps(value, default=str))
+    return _drop_volatile(value)
+
+
+def _drop_volatile(value: Any) -> Any:
+    """Remove volatile fields from JSON-form output at any depth."""
+    if isinstance(value, dict):
+        return {key: _drop_volatile(item) for key, item in value.items() if key not in VOLATILE_FIELDS}
+    if isinstance(value, list):
+        return [_drop_volatile(item) for item in value]
+    return value
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested output to dotted field paths.
+
+    Lists are indexed by position, e.g. "results.3.price". Empty containers
+    are kept as leaves so that a missing list and an empty one differ.
+
+    Args:
+        value: Normalized output
+        prefix: Path of `value` itself
+
+    Returns:
+        Mapping of field path to leaf value
+    """
+    if isinstance(value, dict) and value:
+        items = value.items()
+    elif isinstance(value, list) and value:
+        items = enumerate(value)
+    else:
+        return {prefix: value}
+
+    fields = {}
+    for key, item in items:
+        fields.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+    return fields
+
+
+def diff_fields(expected: Any, actual: Any) -> List[Tuple[str, Any, Any]]:
+    """Compare normalized outputs field by field.
+
+    Args:
+        expected: Expected normalized output
+        actual: Actual normalized output
+
+    Returns:
+        (field path, expected value, actual value) for each differing field,
+        with None standing in for a field missing on one side
+    """
+    expected_fields = flatten(expected)
+    actual_fields = flatten(actual)
+    missing = object()
+
+    differences = []
+    for path in sorted(set(expected_fields) | set(actual_fields)):
+        want = expected_fields.get(path, missing)
+        got = actual_fields.get(path, missing)
+        if want is missing or got is missing or want != got:
+            differences.append((path,
+                                None if want is missing else want,
+                                None if got is missing else got))
+    return differences
+
+
+def expected_path(name: str) -> str:
+    """Path of a case's expected output file."""
+    marketplace, case = name.split("/")
+    return os.path.join(EXPECTED_DIR, marketplace, f"{case}.json")
+
+
+def load_expected(name: str) -> Optional[Any]:
+    """Load a case's expected output, or None if it has not been recorded."""
+    path = expected_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_expected(name: str, output: Any) -> None:
+    """Record a case's normalized output as its expected output."""
+    path = expected_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Extractor benchmark and regression harness.
+
+Runs every case of the benchmark corpus (see corpus.py), checks each output
+field by field against its recorded expected output, and measures time and
+allocations per page:
+
+- median and fastest wall time over the timed iterations, after a warmup
+- peak traced memory during one extraction
+- traced memory blocks still allocated after it returns (CPython keeps no
+  cumulative allocation count, so retained blocks stand in for leaks and
+  caches that grow per call)
+
+Results can be written as JSON and compared with an earlier run, failing
+when a case got slower than the threshold allows. The exit status is
+nonzero on a corpus problem, output mismatch or regression.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--iterations N] [--backend NAME] [--case PATTERN]
+                                        [--output FILE] [--compare BASELINE] [--threshold RATIO]
+                                        [--update-expected]
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+# Add marketplace-scraper directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.common.extractors.html_parser import set_parser_backend, get_parser_backend, available_parser_backends
+
+import corpus
+
+
+RESULTS_SCHEMA = 1
+
+# Differences shown per mismatching case
+MAX_DIFFERENCES_SHOWN = 10
+
+
+def _measure(func, iterations: int, warmup: int) -> Dict[str, Any]:
+    """Time and allocation measurements of a call.
+
+    Args:
+        func: Function to measure
+        iterations: Timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Measurements in milliseconds, KiB and memory blocks
+    """
+    for _ in range(warmup):
+        func()
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before_blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.reset_peak()
+        func()
+        gc.collect()
+        _, peak = tracemalloc.get_traced_memory()
+        retained_blocks = len(tracemalloc.take_snapshot().traces) - before_blocks
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_blocks": max(retained_blocks, 0),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=corpus.BENCHMARKS_DIR, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(iterations: int, warmup: int, case_pattern: str, update_expected: bool) -> Dict[str, Any]:
+    """Run the corpus and print a table of results.
+
+    Args:
+        iterations: Timed calls per case
+        warmup: Untimed calls per case before timing
+        case_pattern: Shell-style pattern selecting case names
+        update_expected: Record outputs as the expected outputs instead of checking them
+
+    Returns:
+        Results document
+    """
+    # Several extractors log every page at INFO level
+    logging.disable(logging.INFO)
+
+    manifest = corpus.load_manifest()
+    if update_expected:
+        corpus.update_hashes(manifest)
+
+    results = {
+        "schema": RESULTS_SCHEMA,
+        "corpus_version": manifest["version"],
+        "created": datetime.now().isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "parser_backend": get_parser_backend(),
+        "iterations": iterations,
+        "problems": corpus.verify_manifest(manifest),
+        "cases": {},
+    }
+
+    for problem in results["problems"]:
+        print(f"corpus: {problem}")
+
+    header = f"{'case':<28}{'median ms':>11}{'min ms':>9}{'peak KiB':>10}{'retained':>10}  output"
+    print(header)
+    print("-" * len(header))
+
+    for name in corpus.CASES:
+        if not fnmatch.fnmatch(name, case_pattern):
+            continue
+
+        fixture_id, _ = corpus.CASES[name]
+        entry = manifest["fixtures"].get(fixture_id)
+        if entry is None or not os.path.exists(os.path.join(corpus.FIXTURES_DIR, entry["file"])):
+            continue
+
+        html_content = corpus.load_fixture(entry)
+        output = corpus.normalize(corpus.run_case(name, html_content, manifest))
+
+        if update_expected:
+            corpus.save_expected(name, output)
+            differences = []
+            status = "recorded"
+        else:
+            expected = corpus.load_expected(name)
+            differences = [] if expected is None else corpus.diff_fields(expected, output)
+            status = "no expected output" if expected is None else (
+                f"{len(differences)} fields differ" if differences else "ok")
+
+        measurements = _measure(lambda: corpus.run_case(name, html_content, manifest), iterations, warmup)
+        results["cases"][name] = dict(
+            measurements,
+            output=status,
+            differences=[{"field": path, "expected": want, "actual": got} for path, want, got in differences]
+        )
+
+        print(f"{name:<28}{measurements['median_ms']:>11.2f}{measurements['min_ms']:>9.2f}"
+              f"{measurements['peak_kib']:>10.0f}{measurements['retained_blocks']:>10}  {status}")
+        for path, want, got in differences[:MAX_DIFFERENCES_SHOWN]:
+            print(f"    {path}: expected {want!r}, got {got!r}")
+
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Find cases that got slower than a baseline run allows.
+
+    Args:
+        results: Results of this run
+        baseline: Results document of an earlier run
+        threshold: Largest accepted ratio of median times
+
+    Returns:
+        Descriptions of the regressed cases
+    """
+    regressions = []
+
+    if baseline.get("parser_backend") != results["parser_backend"]:
+        print(f"warning: baseline used parser backend {baseline.get('parser_backend')}, "
+              f"this run uses {results['parser_backend']}")
+
+    print()
+    print(f"{'case':<28}{'baseline ms':>13}{'now ms':>9}{'ratio':>8}")
+    for name, case in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or not base.get("median_ms"):
+            continue
+
+        ratio = case["median_ms"] / base["median_ms"]
+        marker = "  REGRESSION" if ratio > threshold else ""
+        print(f"{name:<28}{base['median_ms']:>13.2f}{case['median_ms']:>9.2f}{ratio:>7.2f}x{marker}")
+        if marker:
+            regressions.append(f"{name}: {base['median_ms']:.2f} ms -> {case['median_ms']:.2f} ms ({ratio:.2f}x)")
+
+    return regressions
+
+
+def main() -> int:
+    """Run the harness from the command line and return the exit status."""
+    parser = argparse.ArgumentParser(description="Run the extractor benchmark corpus")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations per case")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed iterations per case before timing")
+    parser.add_argument("--backend", choices=available_parser_backends(), default="html.parser",
+                        help="HTML parser backend")
+    parser.add_argument("--case", default="*", help="Shell-style pattern selecting cases, e.g. 'makro/*'")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON of a baseline run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Largest accepted ratio of median time to the baseline's")
+    parser.add_argument("--update-expected", action="store_true",
+                        help="Record fixture hashes and outputs as expected instead of checking them")
+    args = parser.parse_args()
+
+    set_parser_backend(args.backend)
+    results = run(args.iterations, args.warmup, args.case, args.update_expected)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    results["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    mismatches = [name for name, case in results["cases"].items() if case["output"] not in ("ok", "recorded")]
+
+    print()
+    for name in mismatches:
+        print(f"FAIL output {name}: {results['cases'][name]['output']}")
+    for regression in regressions:
+        print(f"FAIL regression {regression}")
+
+    return 1 if results["problems"] or mismatches or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,6 +38,28 @@ from .user_agent_randomizer import (
     UserAgentRandomizer
 )
 
+from .extraction_executor import (
+    ExtractionExecutor,
+    get_extraction_executor,
+    set_extraction_executor
+)
+
+from .keyword_classifier import (
+    KeywordClassifier,
+    get_keyword_classifier,
+    set_keyword_classifier
+)
+
+from .keyword_canonicalizer import (
+    canonical_keyword
+)
+
+from .suggestion_index import (
+    SuggestionIndex,
+    get_suggestion_index,
+    set_suggestion_index
+)
+
 from .load_shedding_detector import (
     LoadSheddingDetector,
     LoadSheddingAdapter,
@@ -76,6 +98,24 @@ __all__ = [
     # User agent randomization
     'UserAgentRandomizer',
     
+    # Extraction executor
+    'ExtractionExecutor',
+    'get_extraction_executor',
+    'set_extraction_executor',
+    
+    # Keyword classification
+    'KeywordClassifier',
+    'get_keyword_classifier',
+    'set_keyword_classifier',
+    
+    # Keyword canonicalisation
+    'canonical_keyword',
+    
+    # Search suggestion index
+    'SuggestionIndex',
+    'get_suggestion_index',
+    'set_suggestion_index',
+    
     # Load shedding detection
     'LoadSheddingDetector',
     'LoadSheddingAdapter',
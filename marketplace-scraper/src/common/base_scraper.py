@@ -12,12 +12,16 @@ import re
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Set, Tuple
+from typing import Dict, List, Any, Optional, Union, Set, Tuple, Callable
 from urllib.parse import urlparse, urljoin
 
 # Import local modules
 from ..common.proxy_client import SmartProxyClient
 from ..storage.repository import MarketplaceDataRepository
+from ..common.extractors.structured_data import get_structured_data_stats
+from ..common.extraction_executor import get_extraction_executor
+from ..common.keyword_classifier import get_keyword_classifier
+from ..common.suggestion_index import get_suggestion_index
 
 
 class NetworkError(Exception):
@@ -98,6 +102,7 @@ class MarketplaceScraper(ABC):
         self.requests_made = 0
         self.successful_requests = 0
         self.failed_requests = 0
+        self.failed_saves = 0
         self.start_time = datetime.now()
         
         # Template performance tracking
@@ -109,6 +114,12 @@ class MarketplaceScraper(ABC):
             "template_success_by_type": {}
         }
         
+        # Shared keyword classifier, compiled once per process
+        self.keyword_classifier = get_keyword_classifier()
+        
+        # Shared index of fetched search suggestions
+        self.suggestion_index = get_suggestion_index()
+        
     def _setup_logging(self):
         """Set up structured logging."""
         handler = logging.StreamHandler()
@@ -411,6 +422,61 @@ class MarketplaceScraper(ABC):
             self.logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
             await asyncio.sleep(wait_time)
             
+    async def run_extractor(self, extractor: Callable[..., Any], html_content: Union[str, bytes], *args, **kwargs) -> Any:
+        """Run an HTML extractor without blocking the event loop.
+        
+        Extraction is handed to the shared extraction executor, which runs it
+        in a warm worker process when a pool has been started and inline
+        otherwise.
+        
+        Args:
+            extractor: Module-level extractor taking the page content first
+            html_content: Page content
+            *args: Extra positional arguments for the extractor
+            **kwargs: Keyword arguments for the extractor
+            
+        Returns:
+            Extractor result
+        """
+        return await get_extraction_executor().run(extractor, html_content, *args, **kwargs)
+        
+    def _cached_search_suggestions(self, keyword_prefix: str) -> Optional[Dict[str, Any]]:
+        """Answer a search suggestion request from the suggestion index.
+        
+        Args:
+            keyword_prefix: Partial search term
+            
+        Returns:
+            Suggestions dictionary marked as cached, or None if the
+            suggestions need to be fetched. Answers derived from a shorter
+            prefix have no extractor-specific fields such as
+            "product_suggestions".
+        """
+        response = self.suggestion_index.lookup_response(self.marketplace_name, keyword_prefix)
+        if response is None:
+            return None
+            
+        return {
+            **response,
+            "prefix": keyword_prefix,
+            "marketplace": self.marketplace_name,
+            "count": len(response["suggestions"]),
+            "timestamp": datetime.now().isoformat(),
+            "cached": True
+        }
+        
+    def _remember_search_suggestions(self, suggestion_data: Dict[str, Any]) -> None:
+        """Record fetched search suggestions in the suggestion index.
+        
+        Args:
+            suggestion_data: Suggestions dictionary with "prefix" and "suggestions"
+        """
+        self.suggestion_index.record(
+            self.marketplace_name, suggestion_data["prefix"], suggestion_data.get("suggestions", []),
+            fields=suggestion_data
+        )
+        self.suggestion_index.save_if_due()
+        
     async def extract_data(self, content: Dict[str, Any], extractor_type: str) -> Dict[str, Any]:
         """Extract structured data from page content.
         
@@ -477,6 +543,31 @@ class MarketplaceScraper(ABC):
             self.logger.error(f"Failed to save {entity_type} data: {str(e)}")
             raise
             
+    async def save_products_bulk(self, products: List[Dict[str, Any]]) -> List[str]:
+        """Save products in batched writes, logging the products not saved.
+        
+        Args:
+            products: Product data to save
+            
+        Returns:
+            Document IDs of the saved products
+        """
+        results = await self.storage_client.save_products_bulk(products)
+        
+        saved = []
+        for product_data, result in zip(products, results):
+            if result["error"]:
+                self.failed_saves += 1
+                self.logger.error(f"Failed to save product {product_data.get('product_id')}: {result['error']}")
+            else:
+                saved.append(result["doc_id"])
+                
+        if len(saved) < len(products):
+            self.logger.warning(f"Saved {len(saved)} of {len(products)} products")
+            
+        return saved
+        
+
     async def test_template_compatibility(self, url: str, templates_to_test: List[str] = None) -> Dict[str, Any]:
         """Test compatibility of various templates with this marketplace.
         
@@ -559,6 +650,7 @@ class MarketplaceScraper(ABC):
             "requests_made": self.requests_made,
             "successful_requests": self.successful_requests,
             "failed_requests": self.failed_requests,
+            "failed_saves": self.failed_saves,
             "success_rate": (self.successful_requests / self.requests_made * 100) if self.requests_made > 0 else 0,
             "network_status": self.network_status,
             "consecutive_failures": self.consecutive_failures
@@ -567,6 +659,14 @@ class MarketplaceScraper(ABC):
         # Add template stats if template support is enabled
         if self.template_support:
             stats["template_performance"] = self.get_template_performance()
+        
+        # Add embedded structured data fast path stats
+        structured_data_stats = get_structured_data_stats(self.marketplace_name)
+        if structured_data_stats:
+            stats["structured_data"] = structured_data_stats
+        
+        # Add extraction executor stats
+        stats["extraction_executor"] = get_extraction_executor().get_stats()
             
         return stats
         
@@ -42,7 +42,7 @@ class BrowserAction:
     # Optional parameters for each action type
     OPTIONAL_PARAMS = {
         "click": ["optional", "timeout"],
-        "scroll": ["behavior"],
+        "scroll": ["selector", "value", "behavior"],
         "input": ["optional", "delay"],
         "wait": [],
         "wait_for_selector": ["visible", "timeout"],
@@ -0,0 +1,269 @@
+"""
+Process-pool extraction executor for marketplace scrapers.
+
+HTML extraction (parsing and field location) is CPU-bound and would otherwise
+run on the asyncio event loop, stalling every concurrent fetch while a large
+page is parsed. This module runs extractor functions in a pool of warm worker
+processes so parsing scales across cores while the loop keeps servicing I/O.
+
+Page content crosses the process boundary once, as UTF-8 bytes, and is
+decoded in the worker. Extractors must be module-level functions (or methods
+of picklable objects such as the search ranking extractors).
+"""
+
+import asyncio
+import functools
+import importlib
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Dict, Any, Optional, Callable, Sequence, Union
+
+from .extractors.html_parser import set_parser_backend, get_parser_backend
+from .extractors.structured_data import drain_structured_data_stats, merge_structured_data_stats
+
+
+# Package prefix ("src." when imported as a package, empty when run from src/)
+_PACKAGE_PREFIX = __name__[:-len("common.extraction_executor")]
+
+# Modules imported by each worker at start-up so the first task is not slowed
+# down by imports
+DEFAULT_WARM_MODULES = ("bs4",) + tuple(
+    f"{_PACKAGE_PREFIX}marketplaces.{marketplace}.extractors"
+    for marketplace in ("takealot", "loot", "makro", "bob_shop", "buck_cheap", "amazon")
+)
+
+logger = logging.getLogger("marketplace-scraper.extraction-executor")
+
+_default_executor: Optional["ExtractionExecutor"] = None
+
+
+def _init_worker(parser_backend: str, warm_modules: Sequence[str]) -> None:
+    """Prepare a worker process.
+
+    Args:
+        parser_backend: HTML parser backend to use in the worker
+        warm_modules: Modules to import ahead of the first task
+    """
+    set_parser_backend(parser_backend)
+
+    for module_name in warm_modules:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            logger.warning(f"Could not preload {module_name} in extraction worker: {str(e)}")
+
+
+def _warm_up() -> int:
+    """No-op task used to start worker processes ahead of time."""
+    return os.getpid()
+
+
+def _run_extraction(func: Callable[..., Any], html_bytes: bytes, args: tuple, kwargs: Dict[str, Any]) -> tuple:
+    """Run an extractor in a worker process.
+
+    Args:
+        func: Extractor function
+        html_bytes: Page content as UTF-8 bytes
+        args: Extra positional arguments for the extractor
+        kwargs: Keyword arguments for the extractor
+
+    Returns:
+        Tuple of extractor result and fast path counters recorded in the worker
+    """
+    result = func(html_bytes.decode("utf-8", errors="replace"), *args, **kwargs)
+    return result, drain_structured_data_stats()
+
+
+class ExtractionExecutor:
+    """Runs CPU-bound extraction off the event loop in warm worker processes.
+
+    With `max_workers=0` (or before `start()`), extraction runs inline on the
+    calling thread, which keeps tests and single-page tools simple.
+    """
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 parser_backend: Optional[str] = None,
+                 warm_modules: Sequence[str] = DEFAULT_WARM_MODULES):
+        """Initialize the extraction executor.
+
+        Args:
+            max_workers: Number of worker processes (defaults to CPU count, 0 runs inline)
+            parser_backend: HTML parser backend for workers (defaults to the current backend)
+            warm_modules: Modules each worker imports at start-up
+        """
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.parser_backend = parser_backend
+        self.warm_modules = tuple(warm_modules)
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._replacement: Optional[asyncio.Future] = None
+
+        # Statistics
+        self.tasks_completed = 0
+        self.tasks_inline = 0
+        self.tasks_failed = 0
+        self.pool_restarts = 0
+        self.worker_time_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool is running."""
+        return self._pool is not None
+
+    def start(self) -> None:
+        """Start the worker pool and warm up every worker."""
+        if self._pool is not None or self.max_workers <= 0:
+            return
+
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Create a worker pool and wait until every worker has warmed up."""
+        backend = self.parser_backend or get_parser_backend()
+
+        # Spawned workers do not inherit the event loop, threads or sockets
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend, self.warm_modules)
+        )
+
+        warm_start = time.perf_counter()
+        wait([pool.submit(_warm_up) for _ in range(self.max_workers)])
+        logger.info(
+            f"Started {self.max_workers} extraction workers ({backend} parser) "
+            f"in {time.perf_counter() - warm_start:.2f}s"
+        )
+        return pool
+
+    async def _replace_broken_pool(self, broken_pool: ProcessPoolExecutor) -> None:
+        """Replace a broken worker pool, once however many tasks saw it break.
+
+        The first task to notice starts the replacement; later ones wait for
+        it. The new workers are spawned and warmed up on a thread so the event
+        loop keeps running meanwhile.
+
+        Args:
+            broken_pool: Pool whose worker died
+        """
+        if self._pool is not broken_pool:
+            # Already replaced, or the executor was shut down
+            return
+
+        if self._replacement is None:
+            self._replacement = asyncio.ensure_future(self._start_replacement(broken_pool))
+        await asyncio.shield(self._replacement)
+
+    async def _start_replacement(self, broken_pool: ProcessPoolExecutor) -> None:
+        """Start a new worker pool and shut down the broken one."""
+        logger.error("Extraction worker pool broke, restarting")
+        self.pool_restarts += 1
+
+        try:
+            pool = await asyncio.to_thread(self._create_pool)
+        finally:
+            self._replacement = None
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+
+        if self._pool is broken_pool:
+            self._pool = pool
+        else:
+            # Shut down while the new workers started
+            pool.shutdown(wait=False)
+
+    def shutdown(self, wait_for_tasks: bool = True) -> None:
+        """Stop the worker pool.
+
+        Args:
+            wait_for_tasks: Whether to wait for running extractions to finish
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait_for_tasks, cancel_futures=not wait_for_tasks)
+            self._pool = None
+
+    async def run(self, func: Callable[..., Any], html_content: Union[str, bytes], *args, **kwargs) -> Any:
+        """Run an extractor on page content without blocking the event loop.
+
+        Args:
+            func: Extractor taking the page content as its first argument
+            html_content: Page content as text or bytes
+            *args: Extra positional arguments for the extractor
+            **kwargs: Keyword arguments for the extractor
+
+        Returns:
+            Extractor result
+        """
+        if self._pool is None:
+            self.tasks_inline += 1
+            if isinstance(html_content, bytes):
+                html_content = html_content.decode("utf-8", errors="replace")
+            return func(html_content, *args, **kwargs)
+
+        html_bytes = html_content.encode("utf-8") if isinstance(html_content, str) else html_content
+        call = functools.partial(_run_extraction, func, html_bytes, args, kwargs)
+        loop = asyncio.get_running_loop()
+
+        start_time = time.perf_counter()
+        pool = self._pool
+        try:
+            result, worker_stats = await loop.run_in_executor(pool, call)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); replace the pool and retry once
+            self.tasks_failed += 1
+            await self._replace_broken_pool(pool)
+            if self._pool is None:
+                raise
+            result, worker_stats = await loop.run_in_executor(self._pool, call)
+
+        self.worker_time_ms += (time.perf_counter() - start_time) * 1000
+        self.tasks_completed += 1
+        merge_structured_data_stats(worker_stats)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics.
+
+        Returns:
+            Dictionary of executor statistics
+        """
+        return {
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "tasks_completed": self.tasks_completed,
+            "tasks_inline": self.tasks_inline,
+            "tasks_failed": self.tasks_failed,
+            "pool_restarts": self.pool_restarts,
+            "avg_task_ms": self.worker_time_ms / self.tasks_completed if self.tasks_completed else 0.0
+        }
+
+
+def get_extraction_executor() -> ExtractionExecutor:
+    """Get the shared extraction executor.
+
+    Returns an inline executor until one is configured with
+    `set_extraction_executor`.
+
+    Returns:
+        Shared ExtractionExecutor
+    """
+    global _default_executor
+
+    if _default_executor is None:
+        _default_executor = ExtractionExecutor(max_workers=0)
+    return _default_executor
+
+
+def set_extraction_executor(executor: ExtractionExecutor) -> None:
+    """Set the shared extraction executor used by all scrapers.
+
+    Args:
+        executor: Extraction executor
+    """
+    global _default_executor
+    _default_executor = executor
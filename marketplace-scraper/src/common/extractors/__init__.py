@@ -5,6 +5,51 @@ This package provides base extractor classes and utilities that can be extended
 by marketplace-specific implementations.
 """
 
-from .search_ranking_extractor import SearchRankingExtractor
+from .search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
+from .selector_plan import SelectorPlan, PlanMatches
+from .html_parser import (
+    parse_html,
+    set_parser_backend,
+    get_parser_backend,
+    available_parser_backends,
+    is_html_node,
+    FastNode,
+    PARSER_BACKENDS
+)
+from .structured_data import (
+    iter_json_ld,
+    find_json_ld,
+    find_hydration_state,
+    record_structured_extraction,
+    get_structured_data_stats,
+    drain_structured_data_stats,
+    merge_structured_data_stats,
+    reset_structured_data_stats
+)
+from .streaming import ElementStream, iter_element_spans
+from .opportunity_scoring import RankingArrays
 
-__all__ = ["SearchRankingExtractor"]
\ No newline at end of file
+__all__ = [
+    "SearchRankingExtractor",
+    "PRODUCT_ELEMENT_KEY",
+    "SelectorPlan",
+    "PlanMatches",
+    "parse_html",
+    "set_parser_backend",
+    "get_parser_backend",
+    "available_parser_backends",
+    "is_html_node",
+    "FastNode",
+    "PARSER_BACKENDS",
+    "iter_json_ld",
+    "find_json_ld",
+    "find_hydration_state",
+    "record_structured_extraction",
+    "get_structured_data_stats",
+    "drain_structured_data_stats",
+    "merge_structured_data_stats",
+    "reset_structured_data_stats",
+    "ElementStream",
+    "iter_element_spans",
+    "RankingArrays"
+]
@@ -0,0 +1,271 @@
+"""
+Pluggable HTML parser backends for marketplace extractors.
+
+This module provides a single `parse_html` entry point used by all extractors,
+so the parser can be selected by configuration. BeautifulSoup trees are built
+with `html.parser` or `lxml`; the `selectolax` backend parses with lexbor and
+exposes the subset of the BeautifulSoup API the extractors rely on (`select`,
+`select_one`, `text`, `string`, `get`, `attrs`, `find_all`) over native CSS
+selectors.
+"""
+
+import logging
+from typing import Dict, List, Any, Optional, Union
+
+from bs4 import BeautifulSoup, Tag
+from bs4.builder import builder_registry
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, SelectolaxError
+except ImportError:
+    LexborHTMLParser = None
+    SelectolaxError = ValueError
+
+
+logger = logging.getLogger("marketplace-scraper.html-parser")
+
+PARSER_BACKENDS = ("html.parser", "lxml", "selectolax")
+DEFAULT_PARSER_BACKEND = "html.parser"
+
+_parser_backend = DEFAULT_PARSER_BACKEND
+
+
+class FastNode:
+    """BeautifulSoup-compatible view over a selectolax (lexbor) node.
+
+    Only the element API used by the extractors is provided. Selector
+    matching runs in lexbor's native CSS engine; selectors it cannot parse,
+    such as soupsieve's `:contains`, are matched by BeautifulSoup over the
+    element's HTML and return BeautifulSoup tags.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any):
+        """Wrap a lexbor node.
+
+        Args:
+            node: selectolax LexborNode
+        """
+        self._node = node
+
+    @property
+    def name(self) -> str:
+        """Tag name of the element."""
+        return self._node.tag
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        """Element attributes, with `class` split into a list like BeautifulSoup."""
+        attrs = {}
+        for key, value in self._node.attributes.items():
+            if value is None:
+                value = ""
+            if key == "class":
+                value = value.split()
+            attrs[key] = value
+        return attrs
+
+    @property
+    def text(self) -> str:
+        """Concatenated text of the element and its descendants."""
+        return self._node.text(deep=True)
+
+    @property
+    def string(self) -> Optional[str]:
+        """Single text child of the element (BeautifulSoup `.string` semantics)."""
+        children = list(self._node.iter(include_text=True))
+        if len(children) != 1:
+            return None
+        child = children[0]
+        if child.tag == "-text":
+            return child.text_content
+        return FastNode(child).string
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        """Get the text of the element and its descendants.
+
+        Args:
+            separator: String inserted between text nodes
+            strip: Whether to strip whitespace from each text node
+
+        Returns:
+            Element text
+        """
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get an attribute value.
+
+        Args:
+            key: Attribute name
+            default: Value returned when the attribute is missing
+
+        Returns:
+            Attribute value or default
+        """
+        return self.attrs.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.attrs[key]
+
+    def _css(self, selector: str) -> List[Any]:
+        """Match a CSS selector against the descendants of the element.
+
+        lexbor also matches the element itself, which BeautifulSoup does
+        not, so it is dropped from the matches.
+        """
+        mem_id = self._node.mem_id
+        return [node for node in self._node.css(selector) if node.mem_id != mem_id]
+
+    def _soup_select(self, selector: str) -> List[Tag]:
+        """Match a selector lexbor cannot parse with BeautifulSoup."""
+        soup = BeautifulSoup(self._node.html, "html.parser")
+        parent = self._node.parent
+        root = soup if parent is None or parent.tag == "-document" else soup.find()
+        return root.select(selector) if root is not None else []
+
+    def select(self, selector: str) -> List[Union["FastNode", Tag]]:
+        """Find all descendants matching a CSS selector.
+
+        Args:
+            selector: CSS selector
+
+        Returns:
+            List of matching nodes in document order
+        """
+        try:
+            return [FastNode(node) for node in self._css(selector)]
+        except SelectolaxError:
+            return self._soup_select(selector)
+
+    def select_one(self, selector: str) -> Optional[Union["FastNode", Tag]]:
+        """Find the first descendant matching a CSS selector.
+
+        Args:
+            selector: CSS selector
+
+        Returns:
+            First matching node or None
+        """
+        try:
+            node = self._node.css_first(selector)
+            if node is not None and node.mem_id == self._node.mem_id:
+                # The element itself matched; look for the first descendant
+                matches = self._css(selector)
+                node = matches[0] if matches else None
+        except SelectolaxError:
+            matches = self._soup_select(selector)
+            return matches[0] if matches else None
+        return FastNode(node) if node is not None else None
+
+    def find_all(self, name: Optional[str] = None, attrs: Optional[Dict[str, str]] = None,
+                 **kwargs) -> List["FastNode"]:
+        """Find all descendants by tag name and exact attribute values.
+
+        Args:
+            name: Tag name
+            attrs: Attribute values to match
+            **kwargs: Attribute values to match (`class_` for class)
+
+        Returns:
+            List of matching nodes in document order
+        """
+        filters = dict(attrs or {})
+        for key, value in kwargs.items():
+            filters["class" if key == "class_" else key] = value
+
+        selector = name or "*"
+        for key, value in filters.items():
+            escaped = str(value).replace('"', '\\"')
+            selector += f'[{key}="{escaped}"]'
+        return self.select(selector)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FastNode) and self._node.mem_id == other._node.mem_id
+
+    def __hash__(self) -> int:
+        return self._node.mem_id
+
+    def __repr__(self) -> str:
+        return f"<FastNode {self._node.tag}>"
+
+
+def is_html_node(obj: Any) -> bool:
+    """Check whether an object is a parsed HTML element from any backend.
+
+    Args:
+        obj: Object to check
+
+    Returns:
+        True if the object is a BeautifulSoup Tag or FastNode
+    """
+    return isinstance(obj, (Tag, FastNode))
+
+
+def available_parser_backends() -> List[str]:
+    """Get the parser backends usable in this environment.
+
+    Returns:
+        List of backend names
+    """
+    backends = ["html.parser"]
+    if builder_registry.lookup("lxml") is not None:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+def set_parser_backend(backend: str) -> str:
+    """Select the HTML parser backend used by `parse_html`.
+
+    Falls back to `html.parser` if the requested backend is not installed.
+
+    Args:
+        backend: Backend name (html.parser, lxml or selectolax)
+
+    Returns:
+        Name of the backend in use
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _parser_backend
+
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    if backend not in available_parser_backends():
+        logger.warning(f"HTML parser backend '{backend}' not available, using {DEFAULT_PARSER_BACKEND}")
+        backend = DEFAULT_PARSER_BACKEND
+
+    _parser_backend = backend
+    return backend
+
+
+def get_parser_backend() -> str:
+    """Get the HTML parser backend used by `parse_html`.
+
+    Returns:
+        Backend name
+    """
+    return _parser_backend
+
+
+def parse_html(html_content: Union[str, bytes], backend: Optional[str] = None) -> Any:
+    """Parse HTML with the configured parser backend.
+
+    Args:
+        html_content: HTML content as text or bytes
+        backend: Backend override (defaults to the configured backend)
+
+    Returns:
+        Document root supporting the BeautifulSoup element API
+    """
+    backend = backend or _parser_backend
+
+    if backend == "selectolax":
+        return FastNode(LexborHTMLParser(html_content).root)
+
+    return BeautifulSoup(html_content, backend)
@@ -0,0 +1,213 @@
+"""
+Vectorized opportunity score components.
+
+Lays the ranking data of many keywords out as NumPy arrays (one row per
+keyword, one column per ranked product, NaN where a product has no value)
+and computes the base opportunity factor scores for all rows at once. The
+formulas mirror the per-keyword `SearchRankingExtractor._calculate_*_score`
+methods before marketplace-specific adjustments.
+"""
+
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+
+class RankingArrays:
+    """Ranking data of a batch of keywords as aligned arrays."""
+
+    def __init__(self, ranking_batch: List[Dict[str, Any]]):
+        """Lay out ranking data as arrays.
+
+        Args:
+            ranking_batch: Ranking data of each keyword
+        """
+        product_lists = [data.get("top_ranked_products", []) for data in ranking_batch]
+        self.width = max((len(products) for products in product_lists), default=0)
+
+        self.prices = self._positive_values(product_lists, "price")
+        self.ratings = self._positive_values(product_lists, "rating")
+        self.review_counts = self._positive_values(product_lists, "review_count")
+        self.product_counts = np.array([len(products) for products in product_lists], dtype=float)
+        self.has_rating = np.array([any("rating" in product for product in products) for products in product_lists],
+                                   dtype=bool)
+
+        self.current_results = np.array([data.get("current_results", 0) for data in ranking_batch], dtype=float)
+        self.competitive_index = np.array([data.get("competitive_index", 5.0) for data in ranking_batch], dtype=float)
+        self.seller_density = np.array([data.get("seller_density", 0) for data in ranking_batch], dtype=float)
+
+    def _positive_values(self, product_lists: List[List[Dict[str, Any]]], key: str) -> np.ndarray:
+        """Matrix of a product value, NaN where it is missing or not positive."""
+        padding = [None] * self.width
+        values = np.array(
+            [[product.get(key) for product in products] + padding[len(products):] for products in product_lists],
+            dtype=float
+        ).reshape(len(product_lists), self.width)
+
+        with np.errstate(invalid="ignore"):
+            values[~(values > 0)] = np.nan
+        return values
+
+    def __len__(self) -> int:
+        """Number of keywords in the batch."""
+        return len(self.current_results)
+
+
+def _row_means(values: np.ndarray) -> np.ndarray:
+    """Mean of the non-NaN values of each row, 0 for rows without values."""
+    counts = np.count_nonzero(~np.isnan(values), axis=1)
+    totals = np.nansum(values, axis=1)
+    return np.divide(totals, counts, out=np.zeros(len(values)), where=counts > 0)
+
+
+def average_prices(arrays: RankingArrays) -> np.ndarray:
+    """Average positive price per keyword, 0 without prices."""
+    return _row_means(arrays.prices)
+
+
+def average_ratings(arrays: RankingArrays) -> np.ndarray:
+    """Average positive rating per keyword, 0 without ratings."""
+    return _row_means(arrays.ratings)
+
+
+def competition_scores(arrays: RankingArrays) -> np.ndarray:
+    """Base competition scores from the competitive index."""
+    return np.maximum(0, 100 - arrays.competitive_index * 10)
+
+
+def demand_scores(arrays: RankingArrays) -> np.ndarray:
+    """Base demand scores from the result counts."""
+    results = arrays.current_results
+
+    return np.select(
+        [results < 5, results < 50, results < 200, results < 1000],
+        [
+            np.maximum(0, results * 10),
+            60 + np.minimum(30, (results - 5) / 45 * 30),
+            90 - np.minimum(20, (results - 50) / 150 * 20),
+            70 - np.minimum(20, (results - 200) / 800 * 20),
+        ],
+        np.maximum(30, 50 - (results / 5000) * 20)
+    )
+
+
+def price_gap_counts(arrays: RankingArrays) -> np.ndarray:
+    """Number of significant gaps in each keyword's sorted prices.
+
+    A gap is significant when it is more than twice the average gap between
+    neighbouring prices. Keywords with fewer than three prices have none.
+    """
+    if arrays.prices.shape[1] < 3:
+        return np.zeros(len(arrays), dtype=int)
+
+    # NaN sorts last, so the valid prices of each row come first
+    sorted_prices = np.sort(arrays.prices, axis=1)
+    counts = np.count_nonzero(~np.isnan(sorted_prices), axis=1)
+    rows = np.arange(len(arrays))
+
+    last = sorted_prices[rows, np.maximum(counts - 1, 0)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average_gap = (last - sorted_prices[:, 0]) / (counts - 1)
+        gaps = np.diff(sorted_prices, axis=1) > (average_gap * 2)[:, None]
+
+    return np.where(counts >= 3, np.count_nonzero(gaps, axis=1), 0)
+
+
+def price_scores(arrays: RankingArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Base price scores from price dispersion and gaps.
+
+    Returns:
+        Scores, and a mask of the keywords whose score was computed rather
+        than defaulted to neutral (only those get marketplace adjustments)
+    """
+    counts = np.count_nonzero(~np.isnan(arrays.prices), axis=1)
+    average = average_prices(arrays)
+
+    missing = np.isnan(arrays.prices)
+    highest = np.max(np.where(missing, -np.inf, arrays.prices), axis=1, initial=-np.inf)
+    lowest = np.min(np.where(missing, np.inf, arrays.prices), axis=1, initial=np.inf)
+    price_range = np.where(counts > 0, highest - lowest, 0.0)
+
+    gap_score = np.minimum(25, price_gap_counts(arrays) * 5)
+    dispersion_score = np.select(
+        [price_range < average * 0.1, price_range < average * 0.3],
+        [30, 50],
+        70
+    )
+    score = np.minimum(100, dispersion_score + gap_score).astype(float)
+
+    # Neutral without prices or when every product has the same price
+    computed = (counts > 0) & (price_range != 0)
+    return np.where(computed, score, 50.0), computed
+
+
+def rating_scores(arrays: RankingArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Base rating scores from average ratings and review volume.
+
+    Returns:
+        Scores, and a mask of the keywords whose score was computed rather
+        than defaulted to neutral (only those get marketplace adjustments)
+    """
+    rating_counts = np.count_nonzero(~np.isnan(arrays.ratings), axis=1)
+    review_counts = np.count_nonzero(~np.isnan(arrays.review_counts), axis=1)
+
+    normalized_rating = (average_ratings(arrays) / 5) * 100
+    average_reviews = _row_means(arrays.review_counts)
+
+    review_modifier = np.select(
+        [review_counts == 0, average_reviews < 10, average_reviews < 50],
+        [1.0, 0.9, 1.0],
+        1.1
+    )
+    score = np.minimum(100, normalized_rating * review_modifier)
+
+    # Neutral without rating data
+    computed = rating_counts > 0
+    return np.where(computed, score, 50.0), computed
+
+
+def _trend_steps(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """Trend step (-2 to 2) of current values against previous ones."""
+    return np.select(
+        [current > previous * 1.2, current > previous * 1.05, current < previous * 0.8, current < previous * 0.95],
+        [2, 1, -2, -1],
+        0
+    )
+
+
+def trend_scores(current_results: np.ndarray,
+                 previous_results: np.ndarray,
+                 current_density: np.ndarray,
+                 previous_density: np.ndarray) -> np.ndarray:
+    """Base trend scores against the most recent historical data point.
+
+    Args:
+        current_results: Current result counts
+        previous_results: Result counts of the previous data point
+        current_density: Current seller densities
+        previous_density: Seller densities of the previous data point
+
+    Returns:
+        Trend scores (0-100, 50 is stable)
+    """
+    result_trend = _trend_steps(current_results, previous_results)
+
+    # Rising competition is a negative trend; no density data is neutral
+    competition_trend = np.where(
+        (current_density == 0) | (previous_density == 0),
+        0,
+        -_trend_steps(current_density, previous_density)
+    )
+
+    return np.clip(50 + (result_trend + competition_trend) * 10, 0, 100).astype(float)
+
+
+def confidence_scores(arrays: RankingArrays) -> np.ndarray:
+    """Share of the data completeness factors present for each keyword."""
+    factors = np.stack([
+        arrays.product_counts > 0,
+        arrays.current_results > 0,
+        arrays.seller_density > 0,
+        arrays.has_rating,
+    ])
+    return factors.sum(axis=0) / len(factors)
@@ -6,11 +6,66 @@ from marketplace search results, including seller counting and keyword ranking.
 """
 
 import re
+import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union, Tuple
+from itertools import islice
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterable, Iterator
 from datetime import datetime
 from bs4 import BeautifulSoup
+import numpy as np
+
+from .html_parser import parse_html
+from .streaming import ElementStream
+from .structured_data import record_structured_extraction
+from ..keyword_classifier import get_keyword_classifier
+from .opportunity_scoring import (
+    RankingArrays,
+    average_prices,
+    average_ratings,
+    competition_scores,
+    confidence_scores,
+    demand_scores,
+    price_scores,
+    rating_scores,
+    trend_scores,
+)
+
+
+# Key under which `_extract_ranked_products` may attach a product's card element
+PRODUCT_ELEMENT_KEY = "_element"
+
+# Opportunity score factors in scoring order, with their explanations
+OPPORTUNITY_FACTORS = [
+    ("competition", "Based on seller density and competitive index"),
+    ("demand", "Based on search result count and result quality"),
+    ("price_point", "Based on price distribution and positioning"),
+    ("rating", "Based on product ratings and review counts"),
+    ("trend", "Based on changes in search metrics over time"),
+    ("seasonality", "Based on current season relevance"),
+    ("marketplace_specific", "Based on marketplace-specific factors"),
+]
+
+
+# Methods that decide a keyword's seasonality score
+_SEASONALITY_METHODS = (
+    "_calculate_seasonality_score",
+    "_is_spring_keyword",
+    "_is_summer_keyword",
+    "_is_fall_keyword",
+    "_is_winter_keyword",
+)
+
+
+def _season_of_month(month: int) -> str:
+    """Get the season of a month, as used for seasonality scoring."""
+    if 3 <= month <= 5:
+        return "spring"
+    elif 6 <= month <= 8:
+        return "summer"
+    elif 9 <= month <= 11:
+        return "fall"
+    return "winter"
 
 
 class SearchRankingExtractor(ABC):
@@ -20,6 +75,9 @@ class SearchRankingExtractor(ABC):
     analyzing seller density, and calculating opportunity scores.
     """
     
+    # Class names of a search result card, used for streaming extraction
+    product_card_class: Optional[str] = None
+    
     def __init__(self, marketplace_name: str):
         """Initialize the search ranking extractor.
         
@@ -53,55 +111,171 @@ class SearchRankingExtractor(ABC):
                                   html_content: str, 
                                   keyword: str,
                                   page: int = 1,
-                                  max_depth: int = 3) -> Dict[str, Any]:
+                                  max_depth: int = 3,
+                                  streaming: bool = False) -> Dict[str, Any]:
         """Extract search ranking data from search results page.
         
+        In streaming mode product cards are parsed one at a time and parsing
+        stops once `max_depth` is reached, instead of parsing the whole page.
+        Marketplaces without a `product_card_class` always parse the page.
+        
         Args:
             html_content: HTML content of the search page
             keyword: Search keyword
             page: Page number
             max_depth: Maximum number of pages to consider for ranking
+            streaming: Whether to stream product cards instead of parsing the page
             
         Returns:
             Search ranking data
         """
         self.logger.info(f"Extracting search ranking data for '{keyword}' (page {page})")
+        start_time = time.perf_counter()
+        
+        # Fast path: results embedded as structured data, no DOM needed
+        structured = self._extract_structured_results(html_content, keyword, page)
+        
+        if structured is not None:
+            current_results, products = structured
+        elif streaming and self.product_card_class:
+            stream = ElementStream(html_content, self.product_card_class)
+            # Streamed cards are left empty on the page, so marketplace
+            # fallbacks counting product cards see every card
+            current_results = self._extract_total_results(stream.page)
+            products = self._stream_ranked_products(stream, keyword, page)
+        else:
+            soup = parse_html(html_content)
+            current_results = self._extract_total_results(soup)
+            products = self._extract_ranked_products(soup, keyword, page)
+        
+        ranking_data = self._build_ranking_data(current_results, products, keyword, page, max_depth)
+        
+        record_structured_extraction(
+            self.marketplace_name, "ranking", structured is not None, structured is None,
+            (time.perf_counter() - start_time) * 1000
+        )
+        
+        self.logger.info(f"Extracted {len(ranking_data['top_ranked_products'])} ranked products for '{keyword}'")
+        
+        return ranking_data
+    
+    def analyze_search_page(self, 
+                            html_content: str, 
+                            keyword: str,
+                            page: int = 1,
+                            max_depth: int = 3) -> Dict[str, Any]:
+        """Extract search results and ranking data from one parse of a search page.
+        
+        Keyword tracking needs both the marketplace search results and the
+        ranking and competitive data for the same page. This parses the page
+        once and runs both extractions on the shared tree.
+        
+        Args:
+            html_content: HTML content of the search page
+            keyword: Search keyword
+            page: Page number
+            max_depth: Maximum number of pages to consider for ranking
+            
+        Returns:
+            Dictionary with "search_results" (None if the marketplace has no
+            search extractor) and "ranking"
+        """
+        self.logger.info(f"Analyzing search page for '{keyword}' (page {page})")
+        start_time = time.perf_counter()
+        
+        # Fast path: results embedded as structured data, no DOM needed
+        structured = self._extract_structured_results(html_content, keyword, page)
+        
+        if structured is not None:
+            soup = None
+            current_results, products = structured
+        else:
+            soup = parse_html(html_content)
+            current_results = self._extract_total_results(soup)
+            products = self._extract_ranked_products(soup, keyword, page)
+        
+        search_results = self._extract_search_results(html_content, soup, keyword, page)
+        ranking_data = self._build_ranking_data(current_results, products, keyword, page, max_depth)
+        
+        record_structured_extraction(
+            self.marketplace_name, "ranking", structured is not None, structured is None,
+            (time.perf_counter() - start_time) * 1000
+        )
+        
+        return {
+            "search_results": search_results,
+            "ranking": ranking_data
+        }
+    
+    def _stream_ranked_products(self, 
+                                stream: ElementStream, 
+                                keyword: str, 
+                                page: int) -> Iterator[Dict[str, Any]]:
+        """Lazily extract ranked products from streamed product cards.
+        
+        Args:
+            stream: Product card stream of the search page
+            keyword: Search keyword
+            page: Page number
+            
+        Yields:
+            Product data dictionaries
+        """
+        for card in stream:
+            product = self._extract_ranked_product(card, keyword, page)
+            if product is not None:
+                yield product
+    
+    def _build_ranking_data(self, 
+                            current_results: int, 
+                            products: Iterable[Dict[str, Any]], 
+                            keyword: str, 
+                            page: int, 
+                            max_depth: int) -> Dict[str, Any]:
+        """Build ranking data from extracted products.
         
-        # Parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
+        Products may be a lazy iterator; it is not consumed past `max_depth`.
         
+        Args:
+            current_results: Total result count for the search
+            products: Products in page order
+            keyword: Search keyword
+            page: Page number
+            max_depth: Maximum number of pages to consider for ranking
+            
+        Returns:
+            Search ranking data
+        """
         # Create ranking data dictionary
         ranking_data = {
             "keyword": keyword,
             "marketplace": self.marketplace_name,
             "page": page,
-            "current_results": self._extract_total_results(soup),
+            "current_results": current_results,
             "top_ranked_products": []
         }
         
-        # Extract ranking data - implementation varies by marketplace
-        products = self._extract_ranked_products(soup, keyword, page)
-        
         # Calculate starting position for this page
         start_position = (page - 1) * self._get_products_per_page() + 1
         
+        # Only products within the maximum depth are pulled from the iterator
+        depth_limit = max(0, max_depth * self._get_products_per_page() - (start_position - 1))
+        
         # Process each product
-        for idx, product in enumerate(products):
+        for idx, product in enumerate(islice(products, depth_limit)):
             position = start_position + idx
             
-            # Skip processing if we exceed the maximum depth
-            if (position - 1) // self._get_products_per_page() >= max_depth:
-                break
+            # Seller and sponsored hints are read from the product's own card
+            element = product.pop(PRODUCT_ELEMENT_KEY, None)
                 
             # Add position to product data
             product["position"] = position
             
             # Get seller count for the product
-            product["seller_count"] = self._extract_seller_count(product, soup)
+            product["seller_count"] = self._extract_seller_count(product, element)
             
             # Determine if this is a sponsored result
-            is_sponsored = self._detect_sponsored_result(product, soup)
-            if is_sponsored:
+            if product.get("sponsored") or self._detect_sponsored_result(product, element):
                 product["sponsored"] = True
             
             # Add to top ranked products
@@ -118,8 +292,6 @@ class SearchRankingExtractor(ABC):
         # Calculate competitive index (0-10)
         ranking_data["competitive_index"] = self._calculate_competitive_index(ranking_data)
         
-        self.logger.info(f"Extracted {len(ranking_data['top_ranked_products'])} ranked products for '{keyword}'")
-        
         return ranking_data
     
     def calculate_opportunity_score(self, 
@@ -136,81 +308,221 @@ class SearchRankingExtractor(ABC):
         """
         self.logger.info(f"Calculating opportunity score for '{ranking_data['keyword']}'")
         
-        # Initialize score components
-        factor_scores = []
-        
-        # 1. Competition Factor
-        competition_score = self._calculate_competition_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "competition",
-            "score": competition_score,
-            "weight": self.scoring_weights["competition"],
-            "explanation": "Based on seller density and competitive index",
-            "raw_value": ranking_data.get("seller_density", 0)
-        })
-        
-        # 2. Demand Factor
-        demand_score = self._calculate_demand_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "demand",
-            "score": demand_score,
-            "weight": self.scoring_weights["demand"],
-            "explanation": "Based on search result count and result quality",
-            "raw_value": ranking_data.get("current_results", 0)
-        })
-        
-        # 3. Price Point Factor
-        price_score = self._calculate_price_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "price_point",
-            "score": price_score,
-            "weight": self.scoring_weights["price_point"],
-            "explanation": "Based on price distribution and positioning",
-            "raw_value": self._get_average_price(ranking_data)
-        })
-        
-        # 4. Rating Factor
-        rating_score = self._calculate_rating_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "rating",
-            "score": rating_score,
-            "weight": self.scoring_weights["rating"],
-            "explanation": "Based on product ratings and review counts",
-            "raw_value": self._get_average_rating(ranking_data)
-        })
-        
-        # 5. Trend Factor (if historical data is available)
-        trend_score = self._calculate_trend_score(ranking_data, historical_data) if historical_data else 50.0
-        factor_scores.append({
-            "factor_name": "trend",
-            "score": trend_score,
-            "weight": self.scoring_weights["trend"],
-            "explanation": "Based on changes in search metrics over time",
-            "raw_value": "stable" if trend_score == 50 else ("improving" if trend_score > 50 else "declining")
-        })
-        
-        # 6. Seasonality Factor
-        seasonality_score = self._calculate_seasonality_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "seasonality",
-            "score": seasonality_score,
-            "weight": self.scoring_weights["seasonality"],
-            "explanation": "Based on current season relevance",
-            "raw_value": "in_season" if seasonality_score > 50 else "off_season"
-        })
-        
-        # 7. Marketplace-specific Factor
-        marketplace_score = self._calculate_marketplace_specific_score(ranking_data)
-        factor_scores.append({
-            "factor_name": "marketplace_specific",
-            "score": marketplace_score,
-            "weight": self.scoring_weights["marketplace_specific"],
-            "explanation": "Based on marketplace-specific factors",
-            "raw_value": self.marketplace_name
-        })
+        scores = {
+            "competition": self._calculate_competition_score(ranking_data),
+            "demand": self._calculate_demand_score(ranking_data),
+            "price_point": self._calculate_price_score(ranking_data),
+            "rating": self._calculate_rating_score(ranking_data),
+            # Trend factor only if historical data is available
+            "trend": self._calculate_trend_score(ranking_data, historical_data) if historical_data else 50.0,
+            "seasonality": self._calculate_seasonality_score(ranking_data),
+            "marketplace_specific": self._calculate_marketplace_specific_score(ranking_data)
+        }
+        
+        opportunity_data = self._build_opportunity_data(
+            ranking_data,
+            scores,
+            average_price=self._get_average_price(ranking_data),
+            average_rating=self._get_average_rating(ranking_data),
+            confidence=self._calculate_confidence_score(ranking_data)
+        )
+        
+        self.logger.info(f"Calculated opportunity score of {opportunity_data['opportunity_score']:.1f} "
+                         f"for '{ranking_data['keyword']}'")
+        
+        return opportunity_data
+    
+    def calculate_opportunity_scores(self, 
+                                    ranking_batch: List[Dict[str, Any]], 
+                                    historical_batch: Optional[List[Optional[List[Dict[str, Any]]]]] = None) -> List[Dict[str, Any]]:
+        """Calculate opportunity scores for many keywords at once.
+        
+        The ranking data is laid out as arrays and the factor scores of all
+        keywords are computed with vectorized operations. Marketplace-specific
+        adjustments still run per keyword, and only when the marketplace
+        overrides them. Each result matches `calculate_opportunity_score` for
+        the same keyword.
+        
+        Args:
+            ranking_batch: Ranking data of each keyword
+            historical_batch: Optional historical ranking data of each keyword,
+                aligned with `ranking_batch`
+            
+        Returns:
+            Opportunity score data of each keyword, in batch order
+        """
+        if not ranking_batch:
+            return []
+        
+        self.logger.info(f"Calculating opportunity scores for {len(ranking_batch)} keywords")
+        
+        arrays = RankingArrays(ranking_batch)
+        
+        scores = {
+            "competition": self._adjust_batch("_adjust_competition_score", competition_scores(arrays), None,
+                                              ranking_batch),
+            "demand": self._adjust_batch("_adjust_demand_score", demand_scores(arrays), None, ranking_batch),
+            "price_point": self._adjust_batch("_adjust_price_score", *price_scores(arrays), ranking_batch),
+            "rating": self._adjust_batch("_adjust_rating_score", *rating_scores(arrays), ranking_batch),
+            "trend": self._calculate_trend_scores(arrays, ranking_batch, historical_batch),
+            "seasonality": self._calculate_seasonality_scores(ranking_batch),
+            "marketplace_specific": np.array([self._calculate_marketplace_specific_score(data)
+                                              for data in ranking_batch], dtype=float)
+        }
+        
+        weights = np.array([self.scoring_weights[name] for name, _ in OPPORTUNITY_FACTORS])
+        composite_scores = np.column_stack([scores[name] for name, _ in OPPORTUNITY_FACTORS]) @ weights
+        
+        price_averages = average_prices(arrays)
+        rating_averages = average_ratings(arrays)
+        confidences = confidence_scores(arrays)
+        
+        return [
+            self._build_opportunity_data(
+                ranking_data,
+                {name: float(values[row]) for name, values in scores.items()},
+                average_price=float(price_averages[row]),
+                average_rating=float(rating_averages[row]),
+                confidence=float(confidences[row]),
+                composite_score=float(composite_scores[row])
+            )
+            for row, ranking_data in enumerate(ranking_batch)
+        ]
+    
+    def _adjust_batch(self, 
+                     hook_name: str, 
+                     scores: np.ndarray, 
+                     adjustable: Optional[np.ndarray],
+                     ranking_batch: List[Dict[str, Any]]) -> np.ndarray:
+        """Apply a marketplace score adjustment to a batch of base scores.
+        
+        Args:
+            hook_name: Name of the `_adjust_*_score` method
+            scores: Base scores of each keyword
+            adjustable: Mask of the keywords to adjust, or None for all; neutral
+                default scores are not adjusted, as in the per-keyword path
+            ranking_batch: Ranking data of each keyword
+            
+        Returns:
+            Adjusted scores, or the base scores if the marketplace keeps the default
+        """
+        if getattr(type(self), hook_name) is getattr(SearchRankingExtractor, hook_name):
+            return scores
+        
+        adjust = getattr(self, hook_name)
+        adjusted = scores.copy()
+        rows = range(len(scores)) if adjustable is None else np.flatnonzero(adjustable)
+        for row in rows:
+            adjusted[row] = adjust(float(scores[row]), ranking_batch[row])
+        return adjusted
+    
+    def _calculate_trend_scores(self, 
+                               arrays: RankingArrays, 
+                               ranking_batch: List[Dict[str, Any]],
+                               historical_batch: Optional[List[Optional[List[Dict[str, Any]]]]]) -> np.ndarray:
+        """Calculate trend factor scores for a batch of keywords.
+        
+        Args:
+            arrays: Ranking data of the batch as arrays
+            ranking_batch: Ranking data of each keyword
+            historical_batch: Optional historical ranking data of each keyword
+            
+        Returns:
+            Trend scores (0-100), neutral for keywords with insufficient history
+        """
+        trend = np.full(len(arrays), 50.0)
+        if not historical_batch:
+            return trend
+        
+        rows = [row for row, history in enumerate(historical_batch) if history and len(history) >= 2]
+        if not rows:
+            return trend
+        
+        # Most recent previous data point; the last one wins on equal dates
+        previous = [max(reversed(historical_batch[row]), key=lambda x: x.get("date", "")) for row in rows]
+        
+        base_scores = trend_scores(
+            arrays.current_results[rows],
+            np.array([data.get("total_results", 0) for data in previous], dtype=float),
+            arrays.seller_density[rows],
+            np.array([data.get("competitive_density", 0) for data in previous], dtype=float)
+        )
+        
+        if getattr(type(self), "_adjust_trend_score") is SearchRankingExtractor._adjust_trend_score:
+            trend[rows] = base_scores
+        else:
+            trend[rows] = [self._adjust_trend_score(float(score), ranking_batch[row], historical_batch[row])
+                           for score, row in zip(base_scores, rows)]
+        
+        return trend
+    
+    def _calculate_seasonality_scores(self, ranking_batch: List[Dict[str, Any]]) -> np.ndarray:
+        """Calculate seasonality factor scores for a batch of keywords.
+        
+        Keywords are classified in one batch by the shared keyword classifier.
+        Marketplaces that override the per-keyword seasonality methods are
+        scored keyword by keyword instead.
+        
+        Args:
+            ranking_batch: Ranking data of each keyword
+            
+        Returns:
+            Seasonality scores (0-100)
+        """
+        if any(getattr(type(self), name) is not getattr(SearchRankingExtractor, name) for name in _SEASONALITY_METHODS):
+            return np.array([self._calculate_seasonality_score(data) for data in ranking_batch], dtype=float)
+        
+        season = _season_of_month(datetime.now().month)
+        classes = get_keyword_classifier().classify_batch(data["keyword"] for data in ranking_batch)
+        scores = np.array([60.0 if season in keyword_classes.get("season", ()) else 50.0
+                           for keyword_classes in classes])
+        
+        return self._adjust_batch("_adjust_seasonality_score", scores, None, ranking_batch)
+    
+    def _build_opportunity_data(self, 
+                               ranking_data: Dict[str, Any], 
+                               scores: Dict[str, float],
+                               average_price: float,
+                               average_rating: float,
+                               confidence: float,
+                               composite_score: Optional[float] = None) -> Dict[str, Any]:
+        """Assemble opportunity score data from factor scores.
+        
+        Args:
+            ranking_data: Current ranking data
+            scores: Score of each opportunity factor
+            average_price: Average product price, the price factor's raw value
+            average_rating: Average product rating, the rating factor's raw value
+            confidence: Confidence in the score (0.0-1.0)
+            composite_score: Weighted factor score sum, computed if not given
+            
+        Returns:
+            Opportunity score data
+        """
+        raw_values = {
+            "competition": ranking_data.get("seller_density", 0),
+            "demand": ranking_data.get("current_results", 0),
+            "price_point": average_price,
+            "rating": average_rating,
+            "trend": "stable" if scores["trend"] == 50 else ("improving" if scores["trend"] > 50 else "declining"),
+            "seasonality": "in_season" if scores["seasonality"] > 50 else "off_season",
+            "marketplace_specific": self.marketplace_name
+        }
+        
+        factor_scores = [
+            {
+                "factor_name": name,
+                "score": scores[name],
+                "weight": self.scoring_weights[name],
+                "explanation": explanation,
+                "raw_value": raw_values[name]
+            }
+            for name, explanation in OPPORTUNITY_FACTORS
+        ]
         
         # Calculate weighted average for composite score
-        composite_score = sum(factor["score"] * factor["weight"] for factor in factor_scores)
+        if composite_score is None:
+            composite_score = sum(factor["score"] * factor["weight"] for factor in factor_scores)
         
         # Ensure score is within 0-100 range
         composite_score = max(0, min(100, composite_score))
@@ -225,7 +537,7 @@ class SearchRankingExtractor(ABC):
             "entity_id": ranking_data["keyword"],
             "entity_name": ranking_data["keyword"],
             "opportunity_score": composite_score,
-            "confidence": self._calculate_confidence_score(ranking_data),
+            "confidence": confidence,
             "factor_scores": factor_scores,
             "score_breakdown": score_breakdown,
             "search_volume": None,  # Would need external API for this
@@ -236,8 +548,6 @@ class SearchRankingExtractor(ABC):
         # Generate recommendations based on score components
         opportunity_data["recommendations"] = self._generate_recommendations(opportunity_data)
         
-        self.logger.info(f"Calculated opportunity score of {composite_score:.1f} for '{ranking_data['keyword']}'")
-        
         return opportunity_data
     
     def _calculate_competitive_index(self, ranking_data: Dict[str, Any]) -> float:
@@ -600,8 +910,7 @@ class SearchRankingExtractor(ABC):
         Returns:
             True if spring-related
         """
-        spring_terms = ["spring", "easter", "garden", "planting", "allergy", "rain"]
-        return any(term in keyword.lower() for term in spring_terms)
+        return get_keyword_classifier().has_label(keyword, "season", "spring")
     
     def _is_summer_keyword(self, keyword: str) -> bool:
         """Check if keyword is summer-related.
@@ -612,8 +921,7 @@ class SearchRankingExtractor(ABC):
         Returns:
             True if summer-related
         """
-        summer_terms = ["summer", "beach", "pool", "bbq", "barbecue", "vacation", "holiday"]
-        return any(term in keyword.lower() for term in summer_terms)
+        return get_keyword_classifier().has_label(keyword, "season", "summer")
     
     def _is_fall_keyword(self, keyword: str) -> bool:
         """Check if keyword is fall-related.
@@ -624,8 +932,7 @@ class SearchRankingExtractor(ABC):
         Returns:
             True if fall-related
         """
-        fall_terms = ["fall", "autumn", "halloween", "harvest", "school", "thanksgiving"]
-        return any(term in keyword.lower() for term in fall_terms)
+        return get_keyword_classifier().has_label(keyword, "season", "fall")
     
     def _is_winter_keyword(self, keyword: str) -> bool:
         """Check if keyword is winter-related.
@@ -636,8 +943,7 @@ class SearchRankingExtractor(ABC):
         Returns:
             True if winter-related
         """
-        winter_terms = ["winter", "christmas", "snow", "cold", "holiday", "new year"]
-        return any(term in keyword.lower() for term in winter_terms)
+        return get_keyword_classifier().has_label(keyword, "season", "winter")
     
     def _calculate_marketplace_specific_score(self, ranking_data: Dict[str, Any]) -> float:
         """Calculate marketplace-specific factor score (0-100).
@@ -808,6 +1114,48 @@ class SearchRankingExtractor(ABC):
     
     # Methods that can be overridden by marketplace-specific implementations
     
+    def _extract_structured_results(self, 
+                                  html_content: str, 
+                                  keyword: str, 
+                                  page: int) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """Extract total results and ranked products from embedded structured data.
+    
+        Marketplaces whose search pages embed complete result data override
+        this to skip DOM parsing. Seller counts and sponsored detection are
+        then called without a card element.
+    
+        Args:
+            html_content: HTML content of the search page
+            keyword: Search keyword
+            page: Page number
+    
+        Returns:
+            Tuple of total result count and products, or None to use the DOM
+        """
+        # Default implementation always uses the DOM
+        return None
+    
+    def _extract_search_results(self, 
+                                html_content: str, 
+                                soup: Optional[BeautifulSoup], 
+                                keyword: str, 
+                                page: int) -> Optional[Dict[str, Any]]:
+        """Extract marketplace search results for `analyze_search_page`.
+        
+        Marketplaces with a search extractor override this to run it on the
+        already parsed page.
+        
+        Args:
+            html_content: HTML content of the search page
+            soup: Parsed page, or None when ranking came from structured data
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Search results data, or None if the marketplace has no search extractor
+        """
+        return None
+    
     def _extract_total_results(self, soup: BeautifulSoup) -> int:
         """Extract total number of search results.
         
@@ -827,6 +1175,9 @@ class SearchRankingExtractor(ABC):
                                page: int) -> List[Dict[str, Any]]:
         """Extract ranked products from search results.
         
+        Each product may carry its card element under `PRODUCT_ELEMENT_KEY`;
+        it is removed and handed to the seller count and sponsored hooks.
+        
         Args:
             soup: BeautifulSoup object
             keyword: Search keyword
@@ -837,6 +1188,24 @@ class SearchRankingExtractor(ABC):
         """
         pass
     
+    def _extract_ranked_product(self, 
+                               card: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from one search result card.
+        
+        Required for streaming extraction, together with `product_card_class`.
+        
+        Args:
+            card: Product card element
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        raise NotImplementedError(f"{self.marketplace_name} does not support streaming extraction")
+    
     @abstractmethod
     def _extract_seller_count(self, 
                             product: Dict[str, Any], 
@@ -845,7 +1214,7 @@ class SearchRankingExtractor(ABC):
         
         Args:
             product: Product data
-            soup: BeautifulSoup object
+            soup: Product card element, or None for structured results
             
         Returns:
             Seller count
@@ -860,7 +1229,7 @@ class SearchRankingExtractor(ABC):
         
         Args:
             product: Product data
-            soup: BeautifulSoup object
+            soup: Product card element, or None for structured results
             
         Returns:
             True if sponsored
@@ -0,0 +1,300 @@
+"""
+Single-pass selector plans for marketplace extractors.
+
+This module provides a declarative selector plan that is compiled once at
+import time and locates the elements for every field of a page in a single
+walk of the parsed DOM, instead of one full-document `select` per field.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Tuple
+
+from bs4 import Tag
+
+
+# Simple selector parts supported inside a compound selector
+_TAG_RE = re.compile(r'[a-zA-Z][\w-]*|\*')
+_PART_RE = re.compile(
+    r'\.(?P<cls>[\w-]+)'
+    r'|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$]?=)\s*(?P<quote>["\']?)(?P<value>.*?)(?P=quote)\s*)?\]'
+    r'|:not\((?P<not>[^()]*)\)'
+)
+
+
+class _Compound:
+    """A compound selector (tag, classes, attribute tests and negations)."""
+
+    __slots__ = ("tag", "classes", "attributes", "negations", "key")
+
+    def __init__(self, selector: str):
+        """Compile a compound selector.
+
+        Args:
+            selector: Compound selector such as `a.crumb[href*="/brand/"]`
+
+        Raises:
+            ValueError: If the selector uses unsupported syntax
+        """
+        self.tag = None
+        self.classes = []
+        self.attributes = []
+        self.negations = []
+
+        pos = 0
+        tag_match = _TAG_RE.match(selector)
+        if tag_match:
+            if tag_match.group(0) != '*':
+                self.tag = tag_match.group(0).lower()
+            pos = tag_match.end()
+
+        while pos < len(selector):
+            part = _PART_RE.match(selector, pos)
+            if not part:
+                raise ValueError(f"Unsupported selector syntax: {selector!r}")
+
+            if part.group("cls"):
+                self.classes.append(part.group("cls"))
+            elif part.group("attr"):
+                self.attributes.append((part.group("attr"), part.group("op"), part.group("value")))
+            else:
+                self.negations.append(_Compound(part.group("not").strip()))
+
+            pos = part.end()
+
+        # Index key used to find candidate rules for an element
+        if self.classes:
+            self.key = "." + self.classes[0]
+        elif self.tag:
+            self.key = self.tag
+        else:
+            self.key = "*"
+
+    def matches(self, element: Any) -> bool:
+        """Check whether an element matches this compound selector.
+
+        Args:
+            element: BeautifulSoup Tag
+
+        Returns:
+            True if the element matches
+        """
+        if self.tag and element.name != self.tag:
+            return False
+
+        attrs = element.attrs
+        if self.classes:
+            element_classes = attrs.get("class") or ()
+            for cls in self.classes:
+                if cls not in element_classes:
+                    return False
+
+        for name, op, expected in self.attributes:
+            value = attrs.get(name)
+            if value is None:
+                return False
+            if op is None:
+                continue
+            if isinstance(value, list):
+                value = " ".join(value)
+            if op == "=" and value != expected:
+                return False
+            if op == "*=" and (not expected or expected not in value):
+                return False
+            if op == "^=" and (not expected or not value.startswith(expected)):
+                return False
+            if op == "$=" and (not expected or not value.endswith(expected)):
+                return False
+
+        for negation in self.negations:
+            if negation.matches(element):
+                return False
+
+        return True
+
+
+class PlanMatches:
+    """Elements located by a selector plan, keyed by field name."""
+
+    __slots__ = ("_found",)
+
+    def __init__(self, found: Dict[str, List[Any]]):
+        """Initialize plan matches.
+
+        Args:
+            found: Matched elements per field in document order
+        """
+        self._found = found
+
+    def first(self, field: str) -> Optional[Any]:
+        """Get the first element matched for a field (`select_one` semantics).
+
+        Args:
+            field: Field name
+
+        Returns:
+            First matching element or None
+        """
+        elements = self._found.get(field)
+        return elements[0] if elements else None
+
+    def all(self, field: str) -> List[Any]:
+        """Get all elements matched for a field (`select` semantics).
+
+        Args:
+            field: Field name
+
+        Returns:
+            List of matching elements in document order
+        """
+        return self._found.get(field, [])
+
+    def as_dict(self) -> Dict[str, List[Any]]:
+        """Get the raw field to elements mapping.
+
+        Returns:
+            Dictionary of matched elements per field
+        """
+        return self._found
+
+
+class SelectorPlan:
+    """Declarative per-page selector plan compiled once at import.
+
+    Each field maps to a CSS selector (descendant combinators, classes, tags,
+    attribute tests, `:not()` and selector lists). `match` walks the DOM once
+    and collects the elements for every field, returning the same elements in
+    the same order as calling `select` for each field separately.
+    """
+
+    def __init__(self, fields: Dict[str, str]):
+        """Compile a selector plan.
+
+        Args:
+            fields: Mapping of field name to CSS selector
+
+        Raises:
+            ValueError: If a selector uses unsupported syntax
+        """
+        self.fields = dict(fields)
+
+        # Each chain is (field, [compound, ...]) for one selector in a list
+        self._chains: List[Tuple[str, List[_Compound]]] = []
+        # Class names each chain requires, used for raw HTML pre-checks
+        self._markers: Dict[str, List[Tuple[str, ...]]] = {}
+        for field, selector in self.fields.items():
+            for alternative in selector.split(","):
+                compounds = [_Compound(part) for part in alternative.split()]
+                if not compounds:
+                    raise ValueError(f"Empty selector for field '{field}'")
+                self._chains.append((field, compounds))
+                self._markers.setdefault(field, []).append(
+                    tuple(cls for compound in compounds for cls in compound.classes)
+                )
+
+        # Index compounds by key so each element only checks candidate rules
+        self._index: Dict[str, List[Tuple[int, int, bool, _Compound]]] = {}
+        for chain_id, (field, compounds) in enumerate(self._chains):
+            last = len(compounds) - 1
+            for position, compound in enumerate(compounds):
+                self._index.setdefault(compound.key, []).append(
+                    (chain_id, position, position == last, compound)
+                )
+
+        self._initial_progress = (0,) * len(self._chains)
+
+    def may_match(self, field: str, html_content: str) -> bool:
+        """Check whether a field can match without parsing the page.
+
+        A field can only match if every class name of one of its selector
+        alternatives occurs in the raw HTML, so a False result is exact.
+
+        Args:
+            field: Field name
+            html_content: Raw HTML content
+
+        Returns:
+            False if the field cannot match the page
+        """
+        return any(
+            all(marker in html_content for marker in markers)
+            for markers in self._markers[field]
+        )
+
+    def match(self, root: Any) -> PlanMatches:
+        """Locate the elements for every field in a single DOM walk.
+
+        Args:
+            root: Parsed document or element to search within
+
+        Returns:
+            PlanMatches with elements per field in document order
+        """
+        # Non-BeautifulSoup backends select natively, one call per field
+        if not isinstance(root, Tag):
+            return self.match_each(root)
+
+        found = {field: [] for field in self.fields}
+        index = self._index
+        chains = self._chains
+        star_rules = index.get("*", ())
+
+        # Progress per chain: number of leading compounds matched by ancestors.
+        # Greedy matching is exact for descendant-only combinators.
+        stack = [(child, self._initial_progress) for child in reversed(root.contents) if child.name is not None]
+
+        while stack:
+            element, progress = stack.pop()
+
+            candidates = []
+            rules = index.get(element.name)
+            if rules:
+                candidates.extend(rules)
+            for cls in element.attrs.get("class") or ():
+                rules = index.get("." + cls)
+                if rules:
+                    candidates.extend(rules)
+            if star_rules:
+                candidates.extend(star_rules)
+
+            child_progress = progress
+            if candidates:
+                matched_fields = None
+                advanced = None
+                for chain_id, position, is_last, compound in candidates:
+                    if progress[chain_id] != position or not compound.matches(element):
+                        continue
+                    if is_last:
+                        field = chains[chain_id][0]
+                        if matched_fields is None:
+                            matched_fields = set()
+                        if field not in matched_fields:
+                            matched_fields.add(field)
+                            found[field].append(element)
+                    else:
+                        if advanced is None:
+                            advanced = list(progress)
+                        advanced[chain_id] = position + 1
+                if advanced is not None:
+                    child_progress = tuple(advanced)
+
+            children = element.contents
+            for i in range(len(children) - 1, -1, -1):
+                child = children[i]
+                if child.name is not None:
+                    stack.append((child, child_progress))
+
+        return PlanMatches(found)
+
+    def match_each(self, root: Any) -> PlanMatches:
+        """Locate the elements for every field with one `select` per field.
+
+        This is the multi-pass reference behaviour, used for equivalence
+        checks and benchmarks.
+
+        Args:
+            root: Parsed document or element to search within
+
+        Returns:
+            PlanMatches with elements per field in document order
+        """
+        return PlanMatches({field: root.select(selector) for field, selector in self.fields.items()})
@@ -0,0 +1,203 @@
+"""
+Streaming extraction of repeated elements from raw HTML.
+
+Search pages are mostly a long run of product cards. Instead of building a
+parse tree for the whole page, `ElementStream` locates the top-level cards
+with a forward scan of the raw HTML and parses each card only when it is
+consumed, so extraction that stops after a depth or result limit never
+parses the rest of the page. Page-level data (result counts, pagination,
+filters) is read from a tree of the page with the cards emptied.
+"""
+
+import re
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Union
+
+from .html_parser import parse_html
+
+
+_RAW_TEXT_PATTERN = re.compile(r'<(script|style)\b', re.IGNORECASE)
+
+_RAW_CLOSE_PATTERNS = {
+    tag: re.compile(r'</' + tag + r'\s*>', re.IGNORECASE) for tag in ("script", "style")
+}
+
+_START_TAG_PATTERN = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)\b([^>]*)>')
+_CLASS_ATTR_PATTERN = re.compile(r'\sclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+_tag_patterns: Dict[str, Any] = {}
+
+
+def _tag_pattern(tag: str):
+    """Get the compiled pattern matching open and close tags of an element, or a raw text element."""
+    pattern = _tag_patterns.get(tag)
+    if pattern is None:
+        pattern = _tag_patterns[tag] = re.compile(
+            r'<(?:(?P<raw>script|style)\b|(?P<close>/?)' + re.escape(tag) + r'\b[^>]*?(?P<void>/?)>)',
+            re.IGNORECASE
+        )
+    return pattern
+
+
+def _skip_raw_text(html_content: str, tag: str, start: int) -> int:
+    """Get the offset just after a script or style element's close tag."""
+    close = _RAW_CLOSE_PATTERNS[tag.lower()].search(html_content, start)
+    return close.end() if close else len(html_content)
+
+
+def iter_element_spans(html_content: str, class_name: str) -> Iterator[Tuple[int, int]]:
+    """Iterate over the raw HTML spans of top-level elements with given classes.
+
+    Occurrences of the first class name are located with a plain text search
+    and then checked against the class attribute of the enclosing start tag.
+    Elements nested inside a matching element are part of its span and are
+    not reported separately. Script and style contents are skipped.
+
+    Args:
+        html_content: HTML content
+        class_name: Space-separated class names the element must all have
+
+    Yields:
+        (start, end) offsets of each element's outer HTML
+    """
+    tokens = class_name.split()
+    required = set(tokens)
+    first = tokens[0]
+
+    raw_match = _RAW_TEXT_PATTERN.search(html_content)
+    pos = 0
+
+    while True:
+        found = html_content.find(first, pos)
+        if found == -1:
+            return
+
+        # Skip occurrences inside script or style elements
+        if raw_match is not None and raw_match.start() < found:
+            pos = max(pos, _skip_raw_text(html_content, raw_match.group(1), raw_match.end()))
+            raw_match = _RAW_TEXT_PATTERN.search(html_content, pos)
+            continue
+
+        # The occurrence must be a class of the enclosing start tag
+        pos = found + len(first)
+        start = html_content.rfind("<", 0, found)
+        if start == -1 or html_content.find(">", start, found) != -1:
+            continue
+        tag_match = _START_TAG_PATTERN.match(html_content, start)
+        if tag_match is None:
+            continue
+        class_match = _CLASS_ATTR_PATTERN.search(tag_match.group(2))
+        if class_match is None or not required.issubset((class_match.group(1) or class_match.group(2)
+                                                         or class_match.group(3) or "").split()):
+            pos = max(pos, tag_match.end())
+            continue
+
+        end = _find_element_end(html_content, tag_match.group(1), tag_match.end())
+        yield start, end
+        pos = end
+        if raw_match is not None and raw_match.start() < pos:
+            raw_match = _RAW_TEXT_PATTERN.search(html_content, pos)
+
+
+def _find_element_end(html_content: str, tag: str, start: int) -> int:
+    """Find the end of an element by balancing open and close tags of its name.
+
+    Args:
+        html_content: HTML content
+        tag: Element name
+        start: Offset just after the element's opening tag
+
+    Returns:
+        Offset just after the matching close tag, or the end of the content
+        if the element is never closed
+    """
+    pattern = _tag_pattern(tag)
+    depth = 1
+    pos = start
+
+    while True:
+        match = pattern.search(html_content, pos)
+        if match is None:
+            return len(html_content)
+        pos = match.end()
+
+        if match.group("raw"):
+            pos = _skip_raw_text(html_content, match.group("raw"), pos)
+        elif match.group("close"):
+            depth -= 1
+            if depth == 0:
+                return pos
+        elif not match.group("void"):
+            depth += 1
+
+
+class ElementStream:
+    """Lazily parsed sequence of repeated elements on a page.
+
+    The raw HTML is scanned once to find the elements; each element is then
+    parsed on its own when iterated, and the rest of the page is parsed only
+    if `page` is used.
+    """
+
+    def __init__(self, html_content: Union[str, bytes], class_name: str, backend: Optional[str] = None):
+        """Initialize the element stream.
+
+        Args:
+            html_content: HTML content of the page
+            class_name: Space-separated class names identifying the elements
+            backend: Parser backend for the elements and page (defaults to the active backend)
+        """
+        if isinstance(html_content, bytes):
+            html_content = html_content.decode("utf-8", errors="replace")
+
+        self.html_content = html_content
+        self.class_name = class_name
+        self.backend = backend
+        self.spans: List[Tuple[int, int]] = list(iter_element_spans(html_content, class_name))
+        self.parsed_count = 0
+
+        self._selector = "." + ".".join(class_name.split())
+        self._page = None
+
+    def __len__(self) -> int:
+        """Number of elements on the page."""
+        return len(self.spans)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the parsed elements in document order."""
+        return self.iter_elements()
+
+    def iter_elements(self, limit: Optional[int] = None) -> Iterator[Any]:
+        """Parse and yield elements one at a time.
+
+        Args:
+            limit: Maximum number of elements to yield
+
+        Yields:
+            Parsed elements supporting `select`, `select_one` and `get`
+        """
+        spans = self.spans if limit is None else self.spans[:limit]
+        for start, end in spans:
+            fragment = parse_html(self.html_content[start:end], self.backend)
+            element = fragment.select_one(self._selector)
+            self.parsed_count += 1
+            if element is not None:
+                yield element
+
+    @property
+    def page(self):
+        """Parsed page with the streamed elements emptied.
+
+        Each element keeps its start tag, so page-level fallbacks that count
+        the elements by their classes still find them all.
+        """
+        if self._page is None:
+            parts = []
+            pos = 0
+            for start, end in self.spans:
+                tag_match = _START_TAG_PATTERN.match(self.html_content, start)
+                parts.append(self.html_content[pos:tag_match.end()])
+                parts.append(f"</{tag_match.group(1)}>")
+                pos = end
+            parts.append(self.html_content[pos:])
+            self._page = parse_html("".join(parts), self.backend)
+        return self._page
@@ -0,0 +1,242 @@
+"""
+Embedded structured data fast path for marketplace extractors.
+
+Product and search pages often embed their data as JSON-LD blocks or as
+framework hydration state (`window.__INITIAL_STATE__ = {...}`, Next.js
+`__NEXT_DATA__`). This module locates and decodes those blocks by scanning
+the raw HTML, without building a parse tree, so extractors can map them to
+their schemas and only fall back to DOM extraction for missing fields.
+
+Hit rate and time saved are tracked per marketplace and page type.
+"""
+
+import json
+from typing import Dict, Any, Optional, Iterator, Union
+
+
+HYDRATION_STATE_NAMES = ("__INITIAL_STATE__", "__PRELOADED_STATE__", "__NEXT_DATA__", "__NUXT__")
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+# Fast path counters per marketplace and page type
+_stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+
+def _as_text(html_content: Union[str, bytes]) -> str:
+    """Decode raw page bytes to text."""
+    if isinstance(html_content, bytes):
+        return html_content.decode("utf-8", errors="replace")
+    return html_content
+
+
+def iter_json_ld(html_content: Union[str, bytes]) -> Iterator[Dict[str, Any]]:
+    """Iterate over the JSON-LD objects embedded in a page.
+
+    Script tags are located with a forward scan of the raw HTML. Arrays and
+    `@graph` containers are flattened, and malformed blocks are skipped.
+
+    Args:
+        html_content: HTML content as text or bytes
+
+    Yields:
+        JSON-LD objects in document order
+    """
+    html_content = _as_text(html_content)
+    pos = html_content.find("<script")
+
+    while pos != -1:
+        tag_end = html_content.find(">", pos)
+        if tag_end == -1:
+            return
+        body_end = html_content.find("</script", tag_end)
+        if body_end == -1:
+            return
+
+        if "ld+json" in html_content[pos:tag_end]:
+            try:
+                data = json.loads(html_content[tag_end + 1:body_end])
+            except ValueError:
+                data = None
+
+            items = data if isinstance(data, list) else [data]
+            for item in items:
+                if isinstance(item, dict) and isinstance(item.get("@graph"), list):
+                    for node in item["@graph"]:
+                        if isinstance(node, dict):
+                            yield node
+                elif isinstance(item, dict):
+                    yield item
+
+        pos = html_content.find("<script", body_end)
+
+
+def find_json_ld(html_content: Union[str, bytes], schema_type: str) -> Optional[Dict[str, Any]]:
+    """Find the first embedded JSON-LD object of a schema.org type.
+
+    Args:
+        html_content: HTML content as text or bytes
+        schema_type: schema.org type such as "Product" or "ItemList"
+
+    Returns:
+        JSON-LD object or None if not found
+    """
+    for item in iter_json_ld(html_content):
+        item_type = item.get("@type")
+        if item_type == schema_type or (isinstance(item_type, list) and schema_type in item_type):
+            return item
+    return None
+
+
+def find_hydration_state(html_content: Union[str, bytes],
+                         names: Union[str, tuple] = HYDRATION_STATE_NAMES) -> Optional[Any]:
+    """Find and decode framework hydration state embedded in a page.
+
+    Handles script assignments (`window.__INITIAL_STATE__ = {...};`) and JSON
+    script tags identified by name (`<script id="__NEXT_DATA__">{...}</script>`).
+    Only the JSON value itself is decoded, starting in place in the page text.
+
+    Args:
+        html_content: HTML content as text or bytes
+        names: Hydration variable name or names to look for
+
+    Returns:
+        Decoded state or None if not found
+    """
+    html_content = _as_text(html_content)
+    if isinstance(names, str):
+        names = (names,)
+
+    for name in names:
+        pos = html_content.find(name)
+        while pos != -1:
+            start = pos + len(name)
+            while start < len(html_content) and html_content[start] in _WHITESPACE:
+                start += 1
+
+            if html_content.startswith("=", start):
+                # Script assignment
+                start += 1
+            elif html_content.startswith(("\"", "'"), start):
+                # Attribute of a JSON script tag
+                start = html_content.find(">", start) + 1
+            else:
+                start = 0
+
+            if start > 0:
+                while start < len(html_content) and html_content[start] in _WHITESPACE:
+                    start += 1
+                if html_content.startswith(("{", "["), start):
+                    try:
+                        return _JSON_DECODER.raw_decode(html_content, start)[0]
+                    except ValueError:
+                        pass
+
+            pos = html_content.find(name, pos + len(name))
+
+    return None
+
+
+def record_structured_extraction(marketplace: str,
+                                 page_type: str,
+                                 structured_hit: bool,
+                                 dom_used: bool,
+                                 elapsed_ms: float) -> None:
+    """Record the outcome of an extraction for fast path statistics.
+
+    Args:
+        marketplace: Marketplace name
+        page_type: Page type (product, search, ranking, ...)
+        structured_hit: Whether embedded structured data supplied fields
+        dom_used: Whether DOM extraction was still needed
+        elapsed_ms: Total extraction time in milliseconds
+    """
+    stats = _stats.setdefault(marketplace, {}).setdefault(page_type, {
+        "pages": 0,
+        "structured_hits": 0,
+        "dom_skipped": 0,
+        "fast_path_ms": 0.0,
+        "dom_ms": 0.0
+    })
+
+    stats["pages"] += 1
+    if structured_hit:
+        stats["structured_hits"] += 1
+    if dom_used:
+        stats["dom_ms"] += elapsed_ms
+    else:
+        stats["dom_skipped"] += 1
+        stats["fast_path_ms"] += elapsed_ms
+
+
+def get_structured_data_stats(marketplace: Optional[str] = None) -> Dict[str, Any]:
+    """Get structured data fast path statistics.
+
+    Time saved is estimated from the average time of pages that needed DOM
+    extraction, compared with pages served from structured data alone.
+
+    Args:
+        marketplace: Marketplace to report (all marketplaces if None)
+
+    Returns:
+        Statistics per page type, or per marketplace and page type
+    """
+    def _summarize(page_stats: Dict[str, float]) -> Dict[str, Any]:
+        pages = page_stats["pages"]
+        dom_pages = pages - page_stats["dom_skipped"]
+        avg_dom_ms = page_stats["dom_ms"] / dom_pages if dom_pages else 0.0
+        avg_fast_ms = page_stats["fast_path_ms"] / page_stats["dom_skipped"] if page_stats["dom_skipped"] else 0.0
+
+        time_saved_ms = 0.0
+        if dom_pages and page_stats["dom_skipped"]:
+            time_saved_ms = max(avg_dom_ms - avg_fast_ms, 0.0) * page_stats["dom_skipped"]
+
+        return {
+            "pages": pages,
+            "structured_hits": page_stats["structured_hits"],
+            "dom_skipped": page_stats["dom_skipped"],
+            "hit_rate": page_stats["structured_hits"] / pages if pages else 0.0,
+            "dom_skip_rate": page_stats["dom_skipped"] / pages if pages else 0.0,
+            "avg_dom_ms": avg_dom_ms,
+            "avg_fast_path_ms": avg_fast_ms,
+            "time_saved_ms": time_saved_ms
+        }
+
+    if marketplace is not None:
+        return {page_type: _summarize(page_stats)
+                for page_type, page_stats in _stats.get(marketplace, {}).items()}
+
+    return {name: {page_type: _summarize(page_stats) for page_type, page_stats in pages.items()}
+            for name, pages in _stats.items()}
+
+
+def drain_structured_data_stats() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Take the raw fast path counters recorded so far and reset them.
+
+    Used by extraction worker processes to hand their counters back.
+
+    Returns:
+        Raw counters per marketplace and page type
+    """
+    drained = {marketplace: {page_type: dict(counters) for page_type, counters in pages.items()}
+               for marketplace, pages in _stats.items()}
+    _stats.clear()
+    return drained
+
+
+def merge_structured_data_stats(raw_stats: Dict[str, Dict[str, Dict[str, float]]]) -> None:
+    """Merge raw fast path counters from another process.
+
+    Args:
+        raw_stats: Raw counters from `drain_structured_data_stats`
+    """
+    for marketplace, pages in raw_stats.items():
+        for page_type, counters in pages.items():
+            stats = _stats.setdefault(marketplace, {}).setdefault(page_type, dict.fromkeys(counters, 0))
+            for key, value in counters.items():
+                stats[key] = stats.get(key, 0) + value
+
+
+def reset_structured_data_stats() -> None:
+    """Clear all structured data fast path statistics."""
+    _stats.clear()
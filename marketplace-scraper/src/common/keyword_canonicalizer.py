@@ -0,0 +1,191 @@
+"""
+Keyword canonicalisation and near-duplicate detection.
+
+Variants of one search ("iphone 13 case", "iPhone13 case", "iphone 13
+cases") return the same results but were tracked, and refreshed, as
+separate keywords. Two checks map such variants to one tracked keyword:
+
+- Canonical forms fold case, accents, whitespace and punctuation, split
+  digits from letters, normalise numbers and units ("0.5 L" and "500ml")
+  and strip plural endings, so spelling variants share a form. Words
+  that are not plurals ("series", "lens") or that name something other
+  than their singular ("glasses", "shorts") keep their ending; such
+  variants are left to the result check.
+- MinHash signatures of the product IDs a keyword's search returned
+  estimate the Jaccard similarity of result sets, so variants the form
+  misses are found once both have been refreshed. Signatures are split
+  into bands for locality-sensitive hashing, so only keywords sharing a
+  band are compared.
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+from typing import Dict, List, Iterable, Optional, Tuple
+
+
+# Unit spellings -> (canonical unit, multiplier to the canonical unit)
+UNIT_ALIASES: Dict[str, Tuple[str, float]] = {
+    "ml": ("ml", 1), "millilitre": ("ml", 1), "milliliter": ("ml", 1),
+    "l": ("ml", 1000), "lt": ("ml", 1000), "ltr": ("ml", 1000), "litre": ("ml", 1000), "liter": ("ml", 1000),
+    "g": ("g", 1), "gr": ("g", 1), "gram": ("g", 1),
+    "kg": ("g", 1000), "kilo": ("g", 1000), "kilogram": ("g", 1000),
+    "mm": ("mm", 1), "cm": ("mm", 10),
+    "gb": ("gb", 1), "gig": ("gb", 1), "tb": ("gb", 1000),
+    "w": ("w", 1), "watt": ("w", 1), "kw": ("w", 1000),
+    "v": ("v", 1), "volt": ("v", 1),
+    "mah": ("mah", 1),
+    "inch": ("inch", 1),
+}
+
+# Words ending like plurals whose ending is kept: words that are not plurals,
+# and plurals naming something other than their singular
+UNSTEMMED_WORDS = frozenset({
+    "atlas", "canvas", "chaos", "lens", "news", "series", "species",
+    "boxers", "chips", "glasses", "shorts", "specs", "tights",
+})
+
+# Number of hash functions in a MinHash signature
+SIGNATURE_SIZE = 64
+
+# Bands a signature is split into for locality-sensitive hashing. With 16
+# bands of 4 rows, keywords with result sets 80% alike share a band with
+# a probability above 99.9%, and 30% alike with a probability below 13%.
+SIGNATURE_BANDS = 16
+
+# Smallest result set whose signature is compared, as tiny result sets
+# are alike by chance
+MIN_SIGNATURE_ITEMS = 5
+
+_TOKEN_PATTERN = re.compile(r"\d+(?:\.\d+)?|[a-z]+")
+_THOUSANDS_PATTERN = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_INCH_PATTERN = re.compile(r"(\d)\s*(?:\"|''|”|″)")
+
+# Modulus and seeded coefficients of the MinHash hash functions (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+_COEFFICIENTS = [
+    (random.Random(seed).randrange(1, _PRIME), random.Random(-seed).randrange(0, _PRIME))
+    for seed in range(1, SIGNATURE_SIZE + 1)
+]
+
+
+def _stem(token: str) -> str:
+    """Strip the plural ending of a word."""
+    if len(token) <= 3 or token in UNIT_ALIASES or token in UNSTEMMED_WORDS:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def _format_number(value: float) -> str:
+    """Format a number without trailing zeros, e.g. 500.0 as "500"."""
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+def canonical_keyword(keyword: str) -> str:
+    """Get the canonical form of a keyword, shared by its spelling variants.
+
+    Args:
+        keyword: Keyword as entered or suggested
+
+    Returns:
+        Canonical form, e.g. "iphone 13 case" for "iPhone13 Cases" and
+        "kettle 1700ml" for "Kettle 1.7 Litres"
+    """
+    text = _INCH_PATTERN.sub(r"\1 inch", keyword)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = _THOUSANDS_PATTERN.sub("", text.lower())
+
+    tokens: List[str] = []
+    for token in _TOKEN_PATTERN.findall(text):
+        token = _stem(token)
+        unit = UNIT_ALIASES.get(token)
+        if unit is not None and tokens and tokens[-1][0].isdigit() and tokens[-1].replace(".", "").isdigit():
+            # Join a number and its unit, converted to the canonical unit
+            tokens[-1] = _format_number(float(tokens[-1]) * unit[1]) + unit[0]
+        elif token[0].isdigit():
+            tokens.append(_format_number(float(token)))
+        else:
+            tokens.append(token)
+
+    # Keywords without latin letters or digits are only case and whitespace folded
+    return " ".join(tokens) or " ".join(keyword.lower().split())
+
+
+def minhash_signature(items: Iterable[str]) -> List[int]:
+    """Compute the MinHash signature of a set of items.
+
+    Args:
+        items: Items of the set, e.g. the product IDs a search returned
+
+    Returns:
+        Signature of SIGNATURE_SIZE hash minimums, or an empty list for an
+        empty set
+    """
+    hashes = {
+        int.from_bytes(hashlib.blake2b(str(item).encode("utf-8"), digest_size=8).digest(), "big")
+        for item in items
+    }
+    if not hashes:
+        return []
+    return [min((a * value + b) % _PRIME for value in hashes) for a, b in _COEFFICIENTS]
+
+
+def signature_similarity(first: List[int], second: List[int]) -> float:
+    """Estimate the Jaccard similarity of two sets from their signatures.
+
+    Args:
+        first: MinHash signature of one set
+        second: MinHash signature of the other set
+
+    Returns:
+        Estimated similarity between 0 and 1
+    """
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+def signature_bands(signature: List[int], bands: int = SIGNATURE_BANDS) -> List[Tuple[int, Tuple[int, ...]]]:
+    """Split a signature into bands for locality-sensitive hashing.
+
+    Args:
+        signature: MinHash signature
+        bands: Number of bands
+
+    Returns:
+        (band number, band rows) pairs, equal for two signatures exactly
+        when they agree in all rows of the band
+    """
+    rows = len(signature) // bands
+    if not rows:
+        return []
+    return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(bands)]
+
+
+def closest_signature(signature: List[int],
+                      candidates: Dict[str, List[int]],
+                      threshold: float) -> Optional[Tuple[str, float]]:
+    """Find the candidate whose signature is most similar to a signature.
+
+    Args:
+        signature: MinHash signature
+        candidates: Candidate name -> signature
+        threshold: Lowest similarity to report
+
+    Returns:
+        (candidate name, similarity) of the most similar candidate at or
+        above the threshold, or None
+    """
+    best = None
+    for name, candidate in candidates.items():
+        similarity = signature_similarity(signature, candidate)
+        if similarity >= threshold and (best is None or similarity > best[1]):
+            best = (name, similarity)
+    return best
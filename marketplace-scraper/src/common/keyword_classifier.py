@@ -0,0 +1,252 @@
+"""
+Keyword classification against term dictionaries.
+
+All term dictionaries (seasonal terms, product categories, brands and stop
+words) are compiled into a single Aho-Corasick automaton, so a keyword or
+product title is classified against every term in one linear pass over its
+characters instead of one substring scan per term.
+
+Terms match anywhere in the lower-cased text, as the original `term in
+keyword.lower()` checks did, except in dictionaries registered as whole-word
+(stop words and brands), where a match must not be part of a longer word.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Iterable, Iterator, Mapping, Tuple
+
+
+# Seasonal terms by season
+SEASON_TERMS: Dict[str, List[str]] = {
+    "spring": ["spring", "easter", "garden", "planting", "allergy", "rain"],
+    "summer": ["summer", "beach", "pool", "bbq", "barbecue", "vacation", "holiday"],
+    "fall": ["fall", "autumn", "halloween", "harvest", "school", "thanksgiving"],
+    "winter": ["winter", "christmas", "snow", "cold", "holiday", "new year"],
+}
+
+# Product category indicator terms by category
+CATEGORY_TERMS: Dict[str, List[str]] = {
+    "electronics": ["phone", "laptop", "tablet", "tv", "camera", "headphone"],
+    "books": ["book", "paperback", "hardcover"],
+}
+
+# Filler words dropped when building search keywords from product titles
+STOP_WORDS: List[str] = ["with", "plus", "and", "for", "the"]
+
+# Groups whose terms only match whole words
+WHOLE_WORD_GROUPS = frozenset({"brand", "stop_word"})
+
+# A match as (start, end, group, label, term), with offsets into the text
+KeywordMatch = Tuple[int, int, str, str, str]
+
+_default_classifier: Optional["KeywordClassifier"] = None
+_default_lock = threading.Lock()
+
+
+class KeywordClassifier:
+    """Classifier matching text against many term dictionaries at once.
+
+    Dictionaries are organised as groups of labelled term lists, for example
+    group "season" with labels "spring" and "winter". Classifying a text
+    returns, per group, the labels of every term found in it.
+    """
+
+    def __init__(self,
+                 dictionaries: Optional[Mapping[str, Mapping[str, Iterable[str]]]] = None,
+                 whole_word_groups: Iterable[str] = WHOLE_WORD_GROUPS):
+        """Compile the term dictionaries into an automaton.
+
+        Args:
+            dictionaries: Group name -> label -> terms. Defaults to the
+                seasonal, category and stop word dictionaries.
+            whole_word_groups: Groups whose terms only match whole words
+        """
+        if dictionaries is None:
+            dictionaries = default_dictionaries()
+
+        self.whole_word_groups = frozenset(whole_word_groups)
+        self.term_count = 0
+
+        # Automaton states: transitions, failure links and terms ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str, str, bool]]] = [[]]
+
+        for group, labels in dictionaries.items():
+            whole_word = group in self.whole_word_groups
+            for label, terms in labels.items():
+                for term in terms:
+                    self._add_term(term.lower(), group, label, whole_word)
+
+        self._build_failure_links()
+
+    def _add_term(self, term: str, group: str, label: str, whole_word: bool) -> None:
+        """Add a term to the trie of the automaton."""
+        if not term:
+            return
+
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+
+        self._output[state].append((len(term), group, label, whole_word))
+        self.term_count += 1
+
+    def _build_failure_links(self) -> None:
+        """Link each state to its longest proper suffix state, breadth first."""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # Terms ending at the suffix state also end here
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """Find every term occurring in a text.
+
+        Args:
+            text: Keyword or other text to scan
+
+        Yields:
+            (start, end, group, label, term) of each match, by end offset
+        """
+        lowered = text.lower()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for index, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for length, group, label, whole_word in output[state]:
+                start = index + 1 - length
+                end = index + 1
+                if whole_word and not _is_whole_word(lowered, start, end):
+                    continue
+                yield start, end, group, label, lowered[start:end]
+
+    def classify(self, text: str) -> Dict[str, List[str]]:
+        """Classify a text against all dictionaries.
+
+        Args:
+            text: Keyword or other text to classify
+
+        Returns:
+            Group name -> labels found, in order of first occurrence. Groups
+            without matches are left out.
+        """
+        classes: Dict[str, List[str]] = {}
+
+        for _, _, group, label, _ in self.iter_matches(text):
+            labels = classes.setdefault(group, [])
+            if label not in labels:
+                labels.append(label)
+
+        return classes
+
+    def classify_batch(self, texts: Iterable[str]) -> List[Dict[str, List[str]]]:
+        """Classify many texts, scanning each distinct text once.
+
+        Args:
+            texts: Keywords or other texts to classify
+
+        Returns:
+            Classification of each text, in order
+        """
+        seen: Dict[str, Dict[str, List[str]]] = {}
+        results = []
+
+        for text in texts:
+            key = text.lower()
+            classes = seen.get(key)
+            if classes is None:
+                classes = seen[key] = self.classify(key)
+            results.append(classes)
+
+        return results
+
+    def has_label(self, text: str, group: str, label: str) -> bool:
+        """Check whether a text contains a term with a given label.
+
+        Stops at the first matching term.
+
+        Args:
+            text: Keyword or other text
+            group: Dictionary group, e.g. "season"
+            label: Label within the group, e.g. "winter"
+
+        Returns:
+            True if a term of the label occurs in the text
+        """
+        return any(match[2] == group and match[3] == label for match in self.iter_matches(text))
+
+    def is_stop_word(self, word: str) -> bool:
+        """Check whether a single word is a stop word."""
+        return any(
+            match[2] == "stop_word" and match[0] == 0 and match[1] == len(word)
+            for match in self.iter_matches(word)
+        )
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that a match is not part of a longer word."""
+    return ((start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum()))
+
+
+def default_dictionaries(brands: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+    """Build the default term dictionaries.
+
+    Args:
+        brands: Brand names to tag, each under its own name as the label
+
+    Returns:
+        Group name -> label -> terms
+    """
+    dictionaries = {
+        "season": {season: list(terms) for season, terms in SEASON_TERMS.items()},
+        "category": {category: list(terms) for category, terms in CATEGORY_TERMS.items()},
+        "stop_word": {"stop_word": list(STOP_WORDS)},
+    }
+    if brands:
+        dictionaries["brand"] = {brand.lower(): [brand] for brand in brands}
+    return dictionaries
+
+
+def get_keyword_classifier() -> KeywordClassifier:
+    """Get the shared classifier, compiling the default dictionaries on first use."""
+    global _default_classifier
+
+    if _default_classifier is None:
+        with _default_lock:
+            if _default_classifier is None:
+                _default_classifier = KeywordClassifier()
+    return _default_classifier
+
+
+def set_keyword_classifier(classifier: Optional[KeywordClassifier]) -> None:
+    """Replace the shared classifier, e.g. to add brand dictionaries.
+
+    Args:
+        classifier: Classifier to share, or None to rebuild the default one on next use
+    """
+    global _default_classifier
+    _default_classifier = classifier
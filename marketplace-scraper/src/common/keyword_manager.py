@@ -7,13 +7,24 @@ rotation and scheduling.
 """
 
 import asyncio
+import heapq
+import json
 import logging
+import os
 import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
 
 # Local imports
 from ..storage.repository import Repository
+from .suggestion_index import SuggestionIndex, get_suggestion_index, suggestion_text
+from .keyword_canonicalizer import (
+    MIN_SIGNATURE_ITEMS,
+    canonical_keyword,
+    closest_signature,
+    minhash_signature,
+    signature_bands
+)
 
 
 class KeywordManager:
@@ -27,17 +38,30 @@ class KeywordManager:
     def __init__(self, 
                  storage_client: Repository, 
                  max_active_keywords: int = 1000,
-                 history_retention_days: int = 90):
+                 history_retention_days: int = 90,
+                 checkpoint_path: Optional[str] = None,
+                 suggestion_index: Optional[SuggestionIndex] = None,
+                 duplicate_similarity: float = 0.8):
         """Initialize the keyword manager.
         
         Args:
             storage_client: Repository client for data storage
             max_active_keywords: Maximum number of keywords to actively track
             history_retention_days: Number of days to retain historical data
+            checkpoint_path: Path to persist the progress of history cleaning to (optional)
+            suggestion_index: Index of fetched search suggestions (defaults to the shared index)
+            duplicate_similarity: Estimated similarity of search results above which
+                two keywords are collapsed into one
         """
         self.storage_client = storage_client
+        self.suggestion_index = suggestion_index or get_suggestion_index()
         self.max_active_keywords = max_active_keywords
         self.history_retention_days = history_retention_days
+        self.checkpoint_path = checkpoint_path
+        self.duplicate_similarity = duplicate_similarity
+        
+        # Last keyword ID whose history was cleaned by an unfinished run
+        self._history_checkpoint = self._load_history_checkpoint()
         self.logger = logging.getLogger("keyword-manager")
         
         # Tracking sets
@@ -46,6 +70,18 @@ class KeywordManager:
         self._category_keywords = {}  # category -> set of keywords
         self._priority_keywords = {}  # priority -> set of keywords
         
+        # Due-time index of tracked keywords, answering due and batch queries without storage reads
+        self._keyword_entries = {}  # marketplace_keyword -> keyword entry
+        self._due_times = {}  # marketplace_keyword -> (marketplace, priority, due timestamp)
+        self._due_heaps = {}  # (marketplace, priority) -> heap of (due timestamp, marketplace_keyword)
+        self._initialized = False
+        
+        # Canonical forms and result signatures of tracked keywords, collapsing near-duplicates
+        self._canonical_keys = {}  # (marketplace, canonical form) -> marketplace_keyword
+        self._result_signatures = {}  # marketplace_keyword -> (marketplace, MinHash signature of its results)
+        self._signature_buckets = {}  # (marketplace, signature band) -> set of marketplace_keyword
+        self._duplicate_keys = []  # (marketplace_keyword, marketplace_keyword) pairs sharing a form when loaded
+        
         # Scheduling parameters
         self.refresh_intervals = {
             10: 12,    # Priority 10: refresh every 12 hours
@@ -97,8 +133,242 @@ class KeywordManager:
                 self._priority_keywords[priority] = set()
             self._priority_keywords[priority].add(key)
             
+            self._index_keyword(keyword_entry)
+            self._index_canonical(keyword_entry)
+            
+        self._initialized = True
         self.logger.info(f"Loaded {len(self._tracked_keywords)} active keywords")
         
+    def _due_time(self, keyword_entry: Dict[str, Any]) -> float:
+        """Get the timestamp a keyword is due for refresh at.
+        
+        Keywords never refreshed are due immediately.
+        """
+        last_updated = keyword_entry.get("last_updated")
+        if not last_updated:
+            return 0.0
+        if isinstance(last_updated, str):
+            last_updated = datetime.fromisoformat(last_updated)
+        priority = max(1, min(10, keyword_entry.get("priority", 1)))
+        return (last_updated + timedelta(hours=self.refresh_intervals[priority])).timestamp()
+        
+    def _index_keyword(self, keyword_entry: Dict[str, Any]) -> None:
+        """Add a keyword to the due-time index or move it to its new due time.
+        
+        Entries superseded in the heaps are left in place and skipped when
+        they reach the top.
+        """
+        key = f"{keyword_entry['marketplace']}_{keyword_entry['keyword']}"
+        if not keyword_entry.get("tracking_enabled", True):
+            self._unindex_keyword(key)
+            return
+            
+        marketplace = keyword_entry["marketplace"]
+        priority = keyword_entry.get("priority", 1)
+        due_time = self._due_time(keyword_entry)
+        
+        self._keyword_entries[key] = keyword_entry
+        if self._due_times.get(key) == (marketplace, priority, due_time):
+            return
+        self._due_times[key] = (marketplace, priority, due_time)
+        heapq.heappush(self._due_heaps.setdefault((marketplace, priority), []), (due_time, key))
+        
+    def _unindex_keyword(self, key: str) -> None:
+        """Remove a keyword from the due-time index and the result signature index."""
+        self._keyword_entries.pop(key, None)
+        self._due_times.pop(key, None)
+        self._unindex_signature(key)
+        
+    def _discard_superseded(self, heap_key: Tuple[str, int]) -> List[Tuple[float, str]]:
+        """Pop superseded entries off the top of a due-time heap."""
+        heap = self._due_heaps[heap_key]
+        while heap and self._due_times.get(heap[0][1]) != (*heap_key, heap[0][0]):
+            heapq.heappop(heap)
+        return heap
+        
+    def _earliest_due(self,
+                      priority: int,
+                      marketplace: Optional[str] = None,
+                      limit: int = 100,
+                      due_before: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Get the tracked keywords of a priority that are due first.
+        
+        Pops at most limit entries off the heaps of the marketplaces, merged
+        by due time, and pushes them back, so a query takes O(k log n).
+        
+        Args:
+            priority: Priority level
+            marketplace: Optional marketplace to filter by
+            limit: Maximum number of keywords to return
+            due_before: Only return keywords due before this timestamp (optional)
+            
+        Returns:
+            Keyword entries, earliest due first
+        """
+        marketplaces = [marketplace] if marketplace else list(self._marketplace_keywords)
+        heap_keys = [(name, priority) for name in marketplaces if (name, priority) in self._due_heaps]
+        
+        # Heads of the marketplace heaps
+        heads = []
+        for index, heap_key in enumerate(heap_keys):
+            heap = self._discard_superseded(heap_key)
+            if heap:
+                heads.append((heap[0], index))
+        heapq.heapify(heads)
+        
+        popped = []
+        keywords = []
+        seen = set()
+        while heads and len(keywords) < limit:
+            (due_time, key), index = heads[0]
+            if due_before is not None and due_time >= due_before:
+                break
+                
+            heap = self._due_heaps[heap_keys[index]]
+            item = heapq.heappop(heap)
+            
+            # A keyword moved back to an earlier due time has a second entry
+            if key not in seen:
+                seen.add(key)
+                popped.append((heap, item))
+                keywords.append(dict(self._keyword_entries[key]))
+            
+            heap = self._discard_superseded(heap_keys[index])
+            if heap:
+                heapq.heapreplace(heads, (heap[0], index))
+            else:
+                heapq.heappop(heads)
+                
+        for heap, item in popped:
+            heapq.heappush(heap, item)
+            
+        return keywords
+        
+    def _claim_form(self, marketplace: str, keyword: str, key: str) -> Optional[str]:
+        """Map the canonical form of a keyword to a tracked keyword, unless another tracked keyword has it.
+        
+        Returns:
+            The other tracked keyword with the form, or None if the form was claimed
+        """
+        form_key = (marketplace, canonical_keyword(keyword))
+        owner = self._canonical_keys.get(form_key)
+        if owner is None or owner == key or owner not in self._keyword_entries:
+            self._canonical_keys[form_key] = key
+            return None
+        return owner
+        
+    def _index_canonical(self, keyword_entry: Dict[str, Any]) -> None:
+        """Add a tracked keyword, its aliases and its result signature to the duplicate indexes."""
+        marketplace = keyword_entry["marketplace"]
+        key = f"{marketplace}_{keyword_entry['keyword']}"
+        if key not in self._keyword_entries:
+            return
+            
+        owner = self._claim_form(marketplace, keyword_entry["keyword"], key)
+        if owner is not None:
+            self._duplicate_keys.append((owner, key))
+            
+        for alias in keyword_entry.get("aliases", []):
+            self._claim_form(marketplace, alias["keyword"], key)
+            
+        if keyword_entry.get("result_signature"):
+            self._index_signature(key, marketplace, keyword_entry["result_signature"])
+            
+    def _index_signature(self, key: str, marketplace: str, signature: List[int]) -> None:
+        """Add the result signature of a keyword to the signature buckets."""
+        self._unindex_signature(key)
+        self._result_signatures[key] = (marketplace, signature)
+        for band in signature_bands(signature):
+            self._signature_buckets.setdefault((marketplace, band), set()).add(key)
+            
+    def _unindex_signature(self, key: str) -> None:
+        """Remove the result signature of a keyword from the signature buckets."""
+        indexed = self._result_signatures.pop(key, None)
+        if indexed is None:
+            return
+            
+        marketplace, signature = indexed
+        for band in signature_bands(signature):
+            bucket = self._signature_buckets.get((marketplace, band))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._signature_buckets[(marketplace, band)]
+                    
+    def _similar_keyword(self, key: str, marketplace: str, signature: List[int]) -> Optional[str]:
+        """Find a tracked keyword whose search returned nearly the same results.
+        
+        Only keywords sharing a signature band are compared.
+        """
+        candidates = set()
+        for band in signature_bands(signature):
+            candidates |= self._signature_buckets.get((marketplace, band), set())
+        candidates.discard(key)
+        
+        match = closest_signature(
+            signature,
+            {candidate: self._result_signatures[candidate][1] for candidate in candidates if candidate in self._keyword_entries},
+            self.duplicate_similarity
+        )
+        return match[0] if match else None
+        
+    async def _add_aliases(self,
+                           canonical_key: str,
+                           marketplace: str,
+                           aliases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record keywords as aliases of a tracked keyword, which is refreshed in their place.
+        
+        The tracked keyword takes the highest priority of its aliases.
+        
+        Args:
+            canonical_key: marketplace_keyword of the tracked keyword
+            marketplace: Marketplace name
+            aliases: Aliases with "keyword", "priority", "reason" and "added_at"
+            
+        Returns:
+            The updated entry of the tracked keyword
+        """
+        keyword_entry = self._keyword_entries[canonical_key]
+        priority = max(alias["priority"] for alias in aliases)
+        if priority > keyword_entry.get("priority", 1):
+            keyword_entry = await self.update_keyword_priority(marketplace, keyword_entry["keyword"], priority)
+            
+        added = {alias["keyword"] for alias in aliases}
+        all_aliases = [alias for alias in keyword_entry.get("aliases", []) if alias["keyword"] not in added] + aliases
+        await self.storage_client.update_keyword_ranking(canonical_key, {"aliases": all_aliases})
+        
+        keyword_entry = dict(keyword_entry, aliases=all_aliases)
+        self._keyword_entries[canonical_key] = keyword_entry
+        for alias in aliases:
+            self._claim_form(marketplace, alias["keyword"], canonical_key)
+            
+        self.logger.info(f"Tracking {', '.join(sorted(added))} as aliases of {canonical_key}")
+        return keyword_entry
+        
+    async def _merge_duplicate(self, canonical_key: str, duplicate_key: str, reason: str) -> Dict[str, Any]:
+        """Stop tracking a duplicate keyword and record it and its aliases as aliases of another.
+        
+        Args:
+            canonical_key: marketplace_keyword of the keyword kept
+            duplicate_key: marketplace_keyword of the duplicate
+            reason: Why the keywords are duplicates, "form" or "results"
+            
+        Returns:
+            The updated entry of the kept keyword
+        """
+        duplicate_entry = self._keyword_entries[duplicate_key]
+        marketplace = duplicate_entry["marketplace"]
+        await self.disable_keyword_tracking(marketplace, duplicate_entry["keyword"])
+        self._claim_form(marketplace, duplicate_entry["keyword"], canonical_key)
+        
+        aliases = [{
+            "keyword": duplicate_entry["keyword"],
+            "priority": duplicate_entry.get("priority", 1),
+            "reason": reason,
+            "added_at": datetime.now().isoformat()
+        }] + duplicate_entry.get("aliases", [])
+        return await self._add_aliases(canonical_key, marketplace, aliases)
+        
     async def get_high_value_keywords(self, 
                                      marketplace: Optional[str] = None, 
                                      limit: int = 100,
@@ -135,39 +405,28 @@ class KeywordManager:
     async def get_due_keywords(self, marketplace: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get keywords due for refresh based on priority and refresh frequency.
         
+        Answered from the due-time index, loaded on first use.
+        
         Args:
             marketplace: Optional marketplace to filter by
             
         Returns:
             List of keyword objects due for refresh
         """
-        now = datetime.now()
+        if not self._initialized:
+            await self.initialize()
+            
+        now = datetime.now().timestamp()
         due_keywords = []
         
-        # For each priority level, get keywords due for refresh
+        # For each priority level, take the keywords due for refresh from the index
         for priority in range(10, 0, -1):
-            refresh_hours = self.refresh_intervals[priority]
-            refresh_timestamp = (now - timedelta(hours=refresh_hours)).isoformat()
-            
-            # Build filters
-            filters = {
-                "tracking_enabled": True,
-                "priority": priority,
-                "last_updated": {"<": refresh_timestamp}
-            }
-            
-            if marketplace:
-                filters["marketplace"] = marketplace
-                
-            # Get keywords from storage
-            keywords = await self.storage_client.get_keyword_rankings(
-                filters=filters,
-                limit=100,  # Limit per priority level
-                order_by="last_updated",
-                order_direction="asc"
-            )
-            
-            due_keywords.extend(keywords)
+            due_keywords.extend(self._earliest_due(
+                priority,
+                marketplace=marketplace,
+                limit=100 - len(due_keywords),  # Limit per priority level
+                due_before=now
+            ))
             
             # If we have enough keywords, stop
             if len(due_keywords) >= 100:
@@ -183,6 +442,10 @@ class KeywordManager:
                          tags: List[str] = None) -> Dict[str, Any]:
         """Add a new keyword to tracking or update an existing one.
         
+        A spelling variant of a tracked keyword, with the same canonical
+        form, or a known duplicate is recorded as an alias of the tracked
+        keyword instead of being tracked and refreshed on its own.
+        
         Args:
             marketplace: Marketplace name
             keyword: Keyword to track
@@ -191,17 +454,32 @@ class KeywordManager:
             tags: Optional list of tags
             
         Returns:
-            The created or updated keyword entry
+            The created or updated keyword entry, or the entry of the
+            tracked keyword the keyword is an alias of
         """
         # Normalize priority
         priority = max(1, min(10, priority))
         categories = categories or []
         tags = tags or []
         
+        if not self._initialized:
+            await self.initialize()
+            
         # Check if already exists
         key = f"{marketplace}_{keyword}"
         keyword_id = key
         
+        # Collapse variants of tracked keywords into aliases
+        if key not in self._keyword_entries:
+            canonical_key = self._claim_form(marketplace, keyword, key)
+            if canonical_key is not None:
+                return await self._add_aliases(canonical_key, marketplace, [{
+                    "keyword": keyword,
+                    "priority": priority,
+                    "reason": "form",
+                    "added_at": datetime.now().isoformat()
+                }])
+                
         existing = await self.storage_client.get_keyword_ranking(keyword_id)
         if existing:
             # Update existing keyword
@@ -234,6 +512,9 @@ class KeywordManager:
             }
             
             await self.storage_client.create_keyword_ranking(keyword_entry)
+            
+        self._index_keyword(keyword_entry)
+        self._index_canonical(keyword_entry)
         
         # Add to tracking sets if not already tracked
         if key not in self._tracked_keywords:
@@ -308,7 +589,10 @@ class KeywordManager:
         self._priority_keywords[new_priority].add(key)
         
         # Get updated entry
-        return await self.storage_client.get_keyword_ranking(keyword_id)
+        keyword_entry = await self.storage_client.get_keyword_ranking(keyword_id)
+        self._index_keyword(keyword_entry)
+        
+        return keyword_entry
     
     async def disable_keyword_tracking(self, 
                                       marketplace: str, 
@@ -357,9 +641,133 @@ class KeywordManager:
         for priority, keywords in self._priority_keywords.items():
             keywords.discard(key)
             
+        self._unindex_keyword(key)
+        
         # Get updated entry
         return await self.storage_client.get_keyword_ranking(keyword_id)
     
+    async def record_refresh(self,
+                             marketplace: str,
+                             keyword: str,
+                             refreshed_at: Optional[datetime] = None,
+                             history_entry: Optional[Dict[str, Any]] = None,
+                             result_ids: Optional[Iterable[str]] = None) -> Optional[str]:
+        """Record that a keyword's rankings were refreshed, moving it to its next due time.
+        
+        When the search results are given, a keyword whose results nearly
+        match those of another tracked keyword is collapsed with it: the
+        keyword with the lower priority becomes an alias of the other.
+        
+        Args:
+            marketplace: Marketplace name
+            keyword: Refreshed keyword
+            refreshed_at: Time of the refresh (defaults to now)
+            history_entry: Metrics of the refresh to append to the keyword's history (optional)
+            result_ids: Product IDs the keyword's search returned (optional)
+            
+        Returns:
+            marketplace_keyword of the keyword kept if the keyword was
+            collapsed with another, otherwise None
+        """
+        key = f"{marketplace}_{keyword}"
+        last_updated = (refreshed_at or datetime.now()).isoformat()
+        
+        keyword_entry = self._keyword_entries.get(key)
+        update_data = {"last_updated": last_updated}
+        if keyword_entry is not None:
+            update_data["update_count"] = keyword_entry.get("update_count", 0) + 1
+            
+        # Summarise the results, unless too few to compare
+        signature = None
+        result_ids = set(result_ids or [])
+        if len(result_ids) >= MIN_SIGNATURE_ITEMS:
+            signature = minhash_signature(result_ids)
+            update_data["result_signature"] = signature
+            
+        if history_entry is not None:
+            segments = await self.storage_client.append_keyword_history(
+                key, [dict({"date": last_updated}, **history_entry)], update_data
+            )
+            if keyword_entry is not None:
+                update_data["history_segments"] = sorted(set(keyword_entry.get("history_segments", [])) | set(segments))
+        else:
+            await self.storage_client.update_keyword_ranking(key, update_data)
+            
+        if keyword_entry is None:
+            return None
+            
+        self._index_keyword(dict(keyword_entry, **update_data))
+        if signature is None:
+            return None
+            
+        similar_key = self._similar_keyword(key, marketplace, signature)
+        if similar_key is None:
+            self._index_signature(key, marketplace, signature)
+            return None
+            
+        # Keep the keyword with the higher priority, or the one tracked before
+        canonical_key, duplicate_key = similar_key, key
+        if keyword_entry.get("priority", 1) > self._keyword_entries[similar_key].get("priority", 1):
+            canonical_key, duplicate_key = key, similar_key
+            self._index_signature(key, marketplace, signature)
+            
+        await self._merge_duplicate(canonical_key, duplicate_key, "results")
+        return canonical_key
+        
+    async def collapse_duplicate_keywords(self) -> int:
+        """Collapse tracked keywords that share a canonical form.
+        
+        Keywords tracked before canonicalisation are found by initialize();
+        of each pair, the keyword with the lower priority becomes an alias
+        of the other.
+        
+        Returns:
+            Number of keywords turned into aliases
+        """
+        if not self._initialized:
+            await self.initialize()
+            
+        collapsed = 0
+        duplicate_keys, self._duplicate_keys = self._duplicate_keys, []
+        for first_key, second_key in duplicate_keys:
+            if first_key not in self._keyword_entries or second_key not in self._keyword_entries:
+                continue
+                
+            canonical_key, duplicate_key = first_key, second_key
+            if self._keyword_entries[second_key].get("priority", 1) > self._keyword_entries[first_key].get("priority", 1):
+                canonical_key, duplicate_key = second_key, first_key
+                
+            await self._merge_duplicate(canonical_key, duplicate_key, "form")
+            collapsed += 1
+            
+        return collapsed
+        
+    def get_duplicate_stats(self) -> Dict[str, Any]:
+        """Get statistics of keywords collapsed into aliases.
+        
+        Returns:
+            Number of tracked keywords with aliases, aliases by reason, and
+            the refresh requests per day the aliases would have cost if
+            tracked on their own, at their priorities
+        """
+        aliases = [alias for entry in self._keyword_entries.values() for alias in entry.get("aliases", [])]
+        
+        by_reason = {}
+        for alias in aliases:
+            by_reason[alias.get("reason", "form")] = by_reason.get(alias.get("reason", "form"), 0) + 1
+            
+        saved = sum(
+            24 / self.refresh_intervals[max(1, min(10, alias.get("priority", 1)))]
+            for alias in aliases
+        )
+        
+        return {
+            "canonical_keywords": sum(1 for entry in self._keyword_entries.values() if entry.get("aliases")),
+            "aliases": len(aliases),
+            "aliases_by_reason": by_reason,
+            "refresh_requests_saved_per_day": round(saved, 2)
+        }
+            
     async def get_related_keywords(self, 
                                   marketplace: str, 
                                   keyword: str,
@@ -389,15 +797,11 @@ class KeywordManager:
         if not related_keywords:
             return []
             
-        # Get entries for related keywords
-        related_entries = []
-        for related_keyword in related_keywords[:max_results]:
-            related_key = f"{marketplace}_{related_keyword}"
-            related_entry = await self.storage_client.get_keyword_ranking(related_key)
-            if related_entry:
-                related_entries.append(related_entry)
-                
-        return related_entries
+        # Get entries for related keywords in one batched read
+        related_keys = [f"{marketplace}_{related_keyword}" for related_keyword in related_keywords[:max_results]]
+        related_entries = await self.storage_client.get_keyword_rankings_many(related_keys)
+        
+        return [related_entries[related_key] for related_key in related_keys if related_key in related_entries]
         
     async def get_keywords_by_category(self, 
                                       category: str,
@@ -541,9 +945,59 @@ class KeywordManager:
                 
         return to_activate, to_deactivate
     
-    async def clean_old_history(self) -> int:
+    def _load_history_checkpoint(self) -> Optional[str]:
+        """Load the progress of an unfinished history cleaning run."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+            
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                return json.load(f).get("start_after")
+                
+        except Exception as e:
+            self.logger.error(f"Error loading history cleaning checkpoint: {str(e)}")
+            return None
+            
+    def _save_history_checkpoint(self, start_after: Optional[str]) -> None:
+        """Record the last keyword ID whose history was cleaned, None when a run finished."""
+        self._history_checkpoint = start_after
+        if not self.checkpoint_path:
+            return
+            
+        try:
+            if start_after is None:
+                if os.path.exists(self.checkpoint_path):
+                    os.remove(self.checkpoint_path)
+                return
+                
+            directory = os.path.dirname(self.checkpoint_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                
+            # Write to a temporary file first so a crash never leaves a partial checkpoint
+            temp_path = f"{self.checkpoint_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"start_after": start_after}, f)
+            os.replace(temp_path, self.checkpoint_path)
+            
+        except Exception as e:
+            self.logger.error(f"Error saving history cleaning checkpoint: {str(e)}")
+            
+    async def clean_old_history(self, page_size: int = 100, max_concurrency: int = 4) -> int:
         """Clean old history entries beyond retention period.
         
+        Keywords are scanned page by page in keyword ID order. The history
+        segments of each page that ended before the retention period are
+        dropped in one batched write while the next pages are read, and
+        history still embedded in entries is moved to segments. After the
+        writes of a page complete, and those of the pages before it, the
+        page's last keyword ID is recorded as a checkpoint, so a run that
+        fails or is interrupted resumes after it.
+        
+        Args:
+            page_size: Keywords read per page
+            max_concurrency: Maximum number of page writes in flight
+            
         Returns:
             Number of keywords with cleaned history
         """
@@ -551,48 +1005,47 @@ class KeywordManager:
         
         retention_date = (datetime.now() - timedelta(days=self.history_retention_days)).isoformat()
         cleaned_count = 0
+        failed_count = 0
         
-        # Process in batches to avoid memory issues
-        batch_size = 100
-        offset = 0
-        
-        while True:
-            # Get batch of keywords
-            keywords = await self.storage_client.get_keyword_rankings(
-                limit=batch_size,
-                offset=offset
-            )
+        if self._history_checkpoint is not None:
+            self.logger.info(f"Resuming history cleaning after {self._history_checkpoint}")
             
-            if not keywords:
-                break
-                
-            # Update counter
-            offset += len(keywords)
+        # Writes of scanned pages in scan order, with the last keyword ID of each page
+        in_flight: List[Tuple[str, asyncio.Task]] = []
+        
+        async def complete_oldest() -> None:
+            nonlocal cleaned_count, failed_count
+            last_keyword_id, task = in_flight.pop(0)
+            cleaned_ids, errors = await task
+            cleaned_count += len(cleaned_ids)
+            failed_count += len(errors)
+            self._save_history_checkpoint(last_keyword_id)
             
-            # Process each keyword
-            for keyword_entry in keywords:
-                keyword_id = keyword_entry["keyword_id"]
-                history = keyword_entry.get("history", [])
-                
-                # Filter out old entries
-                new_history = [
-                    entry for entry in history
-                    if entry.get("date", "9999-12-31") >= retention_date
-                ]
-                
-                # Skip if no change
-                if len(new_history) == len(history):
-                    continue
+        try:
+            async for keywords in self.storage_client.scan_keyword_rankings(
+                page_size=page_size,
+                start_after=self._history_checkpoint
+            ):
+                in_flight.append((
+                    keywords[-1]["keyword_id"],
+                    asyncio.create_task(self.storage_client.drop_keyword_history_bulk(keywords, retention_date))
+                ))
+                if len(in_flight) >= max_concurrency:
+                    await complete_oldest()
                     
-                # Update with new history
-                update_data = {
-                    "history": new_history,
-                    "last_updated": datetime.now().isoformat()
-                }
-                await self.storage_client.update_keyword_ranking(keyword_id, update_data)
-                
-                cleaned_count += 1
+            while in_flight:
+                await complete_oldest()
                 
+        except BaseException:
+            for _, task in in_flight:
+                task.cancel()
+            raise
+            
+        # The run finished, the next one starts from the beginning
+        self._save_history_checkpoint(None)
+        
+        if failed_count:
+            self.logger.error(f"Failed to clean history for {failed_count} keywords")
         self.logger.info(f"Cleaned history for {cleaned_count} keywords")
         return cleaned_count
     
@@ -603,7 +1056,8 @@ class KeywordManager:
         """Generate a batch of keywords for processing.
         
         This creates a balanced batch with a mix of high and low priority keywords,
-        optimized for efficient quota usage.
+        optimized for efficient quota usage. Keywords are taken from the
+        due-time index without storage reads.
         
         Args:
             marketplace: Marketplace to generate batch for
@@ -628,6 +1082,9 @@ class KeywordManager:
             1: int(batch_size * 0.025)
         }
         
+        if not self._initialized:
+            await self.initialize()
+            
         # Get due keywords for each priority level
         batch = []
         remaining_slots = batch_size
@@ -637,20 +1094,8 @@ class KeywordManager:
             if allocation <= 0:
                 continue
                 
-            # Get keywords due for refresh with this priority
-            filters = {
-                "tracking_enabled": True,
-                "priority": priority,
-                "marketplace": marketplace
-            }
-            
             # Get oldest updated first
-            keywords = await self.storage_client.get_keyword_rankings(
-                filters=filters,
-                limit=allocation,
-                order_by="last_updated",
-                order_direction="asc"
-            )
+            keywords = self._earliest_due(priority, marketplace=marketplace, limit=allocation)
             
             # Add to batch
             batch.extend(keywords)
@@ -727,25 +1172,30 @@ class KeywordManager:
             # Extract search suggestions for each keyword
             for keyword in sampled_market_keywords:
                 try:
-                    suggestions = await scraper.extract_search_suggestions(keyword)
+                    suggestion_data = await scraper.extract_search_suggestions(keyword)
+                    suggestions = [suggestion_text(item) for item in suggestion_data.get("suggestions", [])]
+                    
+                    # Add known completions fetched for other prefixes
+                    suggestions.extend(self.suggestion_index.completions(marketplace, keyword))
                     
                     # Process suggestions
-                    for suggestion in suggestions:
+                    for suggestion in dict.fromkeys(suggestion for suggestion in suggestions if suggestion):
                         # Check if already tracked
                         suggestion_key = f"{marketplace}_{suggestion}"
                         if suggestion_key not in self._tracked_keywords:
                             # Add with lower priority
-                            await self.add_keyword(
+                            keyword_entry = await self.add_keyword(
                                 marketplace,
                                 suggestion,
                                 priority=3,  # Medium-low priority for discovered keywords
                                 categories=[]  # No categories initially
                             )
                             
-                            discovered_keywords.append(suggestion)
+                            # Variants of tracked keywords become aliases
+                            if keyword_entry.get("keyword") == suggestion:
+                                discovered_keywords.append(suggestion)
                             
                 except Exception as e:
                     self.logger.error(f"Error discovering related keywords for {keyword} in {marketplace}: {str(e)}")
                     
         return discovered_keywords
-"""
\ No newline at end of file
@@ -0,0 +1,389 @@
+"""
+Prefix-trie index of marketplace search suggestions.
+
+Every autocomplete lookup costs a proxy request, and prefixes overlap
+heavily: "kett", "kettl" and "kettle" mostly return the same suggestions.
+The index keeps the suggestions fetched for each prefix in a trie per
+marketplace and answers lookups locally while they are fresh.
+
+A longer prefix is answered from a shorter cached one when that is valid:
+the shorter prefix's response held fewer suggestions than the marketplace
+returns at most, so it was not truncated, and every suggestion in it
+started with the prefix, so the marketplace completes prefixes rather than
+matching words anywhere. The suggestions for the longer prefix are then
+exactly those of the shorter one starting with it. Only prefixes that
+cannot be answered this way need a network request. As a response of
+unknown size cannot be told from a truncated one, nothing is derived for
+marketplaces whose most suggestions per prefix are not configured.
+
+A prefix answered from its own fetch carries the other fields of the
+fetched response too, e.g. "product_suggestions"; a derived answer has the
+suggestions only, as those fields cannot be narrowed to the longer prefix.
+
+The index is kept in memory and can be persisted to disk, so that it is
+warm when the scraper restarts.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+
+# Seconds fetched suggestions are used for
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# Fields of a suggestions response that are not kept with its suggestions,
+# as they are set again when answering from the index
+RESPONSE_METADATA = ("prefix", "marketplace", "suggestions", "count", "timestamp", "cached")
+
+
+_default_index: Optional["SuggestionIndex"] = None
+_default_lock = threading.Lock()
+
+
+def normalize_prefix(prefix: str) -> str:
+    """Normalize a prefix or suggestion for matching, lower-casing it and collapsing whitespace."""
+    return " ".join(prefix.lower().split())
+
+
+def suggestion_text(suggestion: Any) -> str:
+    """Get the text of a suggestion, a string or a dictionary with "suggestion" or "text"."""
+    if isinstance(suggestion, dict):
+        return suggestion.get("suggestion") or suggestion.get("text") or ""
+    return str(suggestion)
+
+
+class _Node:
+    """Trie node, holding the suggestions fetched for its prefix, if any."""
+
+    __slots__ = ("children", "suggestions", "fields", "fetched_at", "derivable", "terminal")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.suggestions: Optional[List[Any]] = None
+        self.fields: Dict[str, Any] = {}
+        self.fetched_at = 0.0
+        self.derivable = False
+        self.terminal: Optional[str] = None
+
+
+class SuggestionTrie:
+    """Trie of the suggestions fetched for the prefixes of one marketplace.
+
+    Nodes on the path of a fetched prefix hold its suggestions, and every
+    suggestion seen is marked at its own node, so known completions of any
+    prefix can be listed without a request.
+    """
+
+    def __init__(self, max_suggestions: Optional[int] = None):
+        """Initialize an empty trie.
+
+        Args:
+            max_suggestions: Most suggestions the marketplace returns for one
+                prefix, None if not known, which leaves nothing derivable
+        """
+        self.max_suggestions = max_suggestions
+        self.root = _Node()
+        self.prefix_count = 0
+
+    def _node(self, key: str, create: bool = False) -> Optional[_Node]:
+        """Find the node of a normalized key, optionally creating the path to it."""
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _Node()
+            node = child
+        return node
+
+    def record(self,
+               prefix: str,
+               suggestions: List[Any],
+               fetched_at: float,
+               fields: Optional[Dict[str, Any]] = None) -> None:
+        """Record the suggestions fetched for a prefix.
+
+        Args:
+            prefix: Prefix the suggestions were fetched for
+            suggestions: Suggestions in the marketplace's order
+            fetched_at: Unix timestamp of the fetch
+            fields: Other fields of the response, returned with exact lookups
+        """
+        key = normalize_prefix(prefix)
+        node = self._node(key, create=True)
+        if node.suggestions is None:
+            self.prefix_count += 1
+        node.suggestions = list(suggestions)
+        node.fields = dict(fields or {})
+        node.fetched_at = fetched_at
+        node.derivable = self.max_suggestions is not None and len(suggestions) < self.max_suggestions and all(
+            normalize_prefix(suggestion_text(suggestion)).startswith(key) for suggestion in suggestions
+        )
+
+        for suggestion in suggestions:
+            text = suggestion_text(suggestion)
+            suggestion_key = normalize_prefix(text)
+            if suggestion_key:
+                self._node(suggestion_key, create=True).terminal = text
+
+    def lookup(self, prefix: str, fetched_after: float) -> Tuple[Optional[List[Any]], Optional[Dict[str, Any]]]:
+        """Answer a prefix from fetched suggestions.
+
+        Args:
+            prefix: Prefix to look up
+            fetched_after: Unix timestamp before which fetches are stale
+
+        Returns:
+            Suggestions, or None if a request is needed, and the other
+            fields of the response for the prefix, or None if the
+            suggestions were derived from a shorter prefix
+        """
+        key = normalize_prefix(prefix)
+        node = self.root
+        ancestor = None
+        for depth in range(len(key) + 1):
+            if node.suggestions is not None and node.fetched_at >= fetched_after:
+                if depth == len(key):
+                    return list(node.suggestions), dict(node.fields)
+                if node.derivable:
+                    ancestor = node
+            if depth == len(key):
+                break
+            node = node.children.get(key[depth])
+            if node is None:
+                break
+
+        if ancestor is None:
+            return None, None
+        return [
+            suggestion for suggestion in ancestor.suggestions
+            if normalize_prefix(suggestion_text(suggestion)).startswith(key)
+        ], None
+
+    def completions(self, prefix: str, limit: int = 10) -> List[str]:
+        """List known suggestions starting with a prefix, shortest first.
+
+        Args:
+            prefix: Prefix to complete
+            limit: Maximum number of suggestions
+
+        Returns:
+            Known suggestions starting with the prefix
+        """
+        node = self._node(normalize_prefix(prefix))
+        if node is None:
+            return []
+
+        # Breadth-first, so shorter completions come first
+        completions = []
+        level = [node]
+        while level and len(completions) < limit:
+            next_level = []
+            for current in level:
+                if current.terminal is not None:
+                    completions.append(current.terminal)
+                    if len(completions) >= limit:
+                        break
+                next_level.extend(current.children[char] for char in sorted(current.children))
+            level = next_level
+        return completions
+
+    def fetched(self) -> Iterator[Tuple[str, List[Any], Dict[str, Any], float]]:
+        """Iterate over the fetched prefixes as (prefix, suggestions, fields, fetched at)."""
+        stack = [("", self.root)]
+        while stack:
+            key, node = stack.pop()
+            if node.suggestions is not None:
+                yield key, node.suggestions, node.fields, node.fetched_at
+            stack.extend((key + char, child) for char, child in node.children.items())
+
+
+class SuggestionIndex:
+    """Per-marketplace suggestion tries, with freshness and persistence."""
+
+    def __init__(self,
+                 persist_path: Optional[str] = None,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 max_suggestions: Optional[Dict[str, int]] = None,
+                 save_interval: int = 300):
+        """Initialize the suggestion index.
+
+        Args:
+            persist_path: Path to persist the index to (optional)
+            max_age: Seconds fetched suggestions are used for
+            max_suggestions: Most suggestions returned for one prefix, by
+                marketplace; only marketplaces with a verified cap here
+                answer longer prefixes from shorter ones
+            save_interval: Minimum seconds between saves by save_if_due
+        """
+        self.persist_path = persist_path
+        self.max_age = max_age
+        self.max_suggestions = max_suggestions or {}
+        self.save_interval = save_interval
+        self.tries: Dict[str, SuggestionTrie] = {}
+        self.dirty = False
+        self.last_saved = time.time()
+        self.stats = {"hits": 0, "derived": 0, "misses": 0}
+
+        self.logger = logging.getLogger("marketplace-suggestions")
+
+        # Warm-load persisted suggestions if available
+        if self.persist_path and os.path.exists(self.persist_path):
+            self.load()
+
+    def _trie(self, marketplace: str) -> SuggestionTrie:
+        """Get the trie of a marketplace, creating it on first use."""
+        trie = self.tries.get(marketplace)
+        if trie is None:
+            trie = self.tries[marketplace] = SuggestionTrie(self.max_suggestions.get(marketplace))
+        return trie
+
+    def lookup(self, marketplace: str, prefix: str) -> Optional[List[Any]]:
+        """Answer a prefix without a request if fresh suggestions allow it.
+
+        Args:
+            marketplace: Marketplace name
+            prefix: Prefix to look up
+
+        Returns:
+            Suggestions, or None if they need to be fetched
+        """
+        response = self.lookup_response(marketplace, prefix)
+        return response["suggestions"] if response is not None else None
+
+    def lookup_response(self, marketplace: str, prefix: str) -> Optional[Dict[str, Any]]:
+        """Answer a prefix with the fields of a suggestions response if fresh suggestions allow it.
+
+        Args:
+            marketplace: Marketplace name
+            prefix: Prefix to look up
+
+        Returns:
+            The other fields fetched for the prefix with its "suggestions",
+            or only "suggestions" if derived from a shorter prefix, or None
+            if they need to be fetched
+        """
+        suggestions, fields = self._trie(marketplace).lookup(prefix, time.time() - self.max_age)
+        if suggestions is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits" if fields is not None else "derived"] += 1
+        return {**(fields or {}), "suggestions": suggestions}
+
+    def record(self,
+               marketplace: str,
+               prefix: str,
+               suggestions: List[Any],
+               fetched_at: Optional[float] = None,
+               fields: Optional[Dict[str, Any]] = None) -> None:
+        """Record the suggestions fetched for a prefix.
+
+        Args:
+            marketplace: Marketplace name
+            prefix: Prefix the suggestions were fetched for
+            suggestions: Suggestions in the marketplace's order, strings or
+                dictionaries with "suggestion" or "text"
+            fetched_at: Unix timestamp of the fetch (defaults to now)
+            fields: Other fields of the response, e.g. "product_suggestions";
+                RESPONSE_METADATA fields are left out
+        """
+        fields = {key: value for key, value in (fields or {}).items() if key not in RESPONSE_METADATA}
+        self._trie(marketplace).record(prefix, suggestions, fetched_at or time.time(), fields)
+        self.dirty = True
+
+    def completions(self, marketplace: str, prefix: str, limit: int = 10) -> List[str]:
+        """List known suggestions of a marketplace starting with a prefix.
+
+        Args:
+            marketplace: Marketplace name
+            prefix: Prefix to complete
+            limit: Maximum number of suggestions
+
+        Returns:
+            Texts of known suggestions, shortest first
+        """
+        trie = self.tries.get(marketplace)
+        return trie.completions(prefix, limit) if trie else []
+
+    def load(self) -> None:
+        """Load the index from persistent storage, skipping expired suggestions."""
+        try:
+            with open(self.persist_path, 'r') as f:
+                data = json.load(f)
+
+            fetched_after = time.time() - self.max_age
+            for marketplace, prefixes in data.get("marketplaces", {}).items():
+                for prefix, entry in prefixes.items():
+                    if entry["fetched_at"] >= fetched_after:
+                        self._trie(marketplace).record(prefix, entry["suggestions"], entry["fetched_at"],
+                                                       entry.get("fields"))
+
+            self.dirty = False
+            self.logger.info(f"Loaded suggestions for {sum(trie.prefix_count for trie in self.tries.values())} prefixes")
+
+        except Exception as e:
+            self.logger.error(f"Error loading search suggestions: {str(e)}")
+
+    def save(self) -> None:
+        """Save the fresh suggestions to persistent storage."""
+        if not self.persist_path:
+            return
+
+        try:
+            # Ensure directory exists
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            fetched_after = time.time() - self.max_age
+            data = {
+                marketplace: {
+                    prefix: {"suggestions": suggestions, "fields": fields, "fetched_at": fetched_at}
+                    for prefix, suggestions, fields, fetched_at in trie.fetched() if fetched_at >= fetched_after
+                }
+                for marketplace, trie in self.tries.items()
+            }
+
+            # Write to a temporary file first so a crash never leaves a partial index
+            temp_path = f"{self.persist_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"version": 1, "marketplaces": data}, f, separators=(",", ":"))
+            os.replace(temp_path, self.persist_path)
+
+            self.dirty = False
+            self.last_saved = time.time()
+
+        except Exception as e:
+            self.logger.error(f"Error saving search suggestions: {str(e)}")
+
+    def save_if_due(self) -> None:
+        """Save the index if it changed and the save interval has passed."""
+        if self.dirty and time.time() - self.last_saved >= self.save_interval:
+            self.save()
+
+
+def get_suggestion_index() -> SuggestionIndex:
+    """Get the shared suggestion index, creating an in-memory one on first use."""
+    global _default_index
+
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                _default_index = SuggestionIndex()
+    return _default_index
+
+
+def set_suggestion_index(index: Optional[SuggestionIndex]) -> None:
+    """Replace the shared suggestion index, e.g. with a persisted one.
+
+    Args:
+        index: Index to share, or None to create an in-memory one on next use
+    """
+    global _default_index
+    _default_index = index
@@ -15,7 +15,7 @@ import json
 import signal
 import time
 import traceback
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from functools import partial
 
@@ -39,7 +39,10 @@ except ImportError:
 
 # Import components
 from common import SmartProxyClient, LoadSheddingDetector, QuotaManager, QuotaPriority, QuotaDistributor
-from storage import MarketplaceDataRepository
+from common.extractors import set_parser_backend
+from common.extraction_executor import ExtractionExecutor, set_extraction_executor
+from common.suggestion_index import SuggestionIndex, set_suggestion_index
+from storage import MarketplaceDataRepository, SQLiteRepository, WriteBehindRepository, get_cache_stats
 from marketplaces import TakealotScraper, BobShopScraper, MakroScraper, BuckCheapScraper
 from orchestration import TaskScheduler, TaskDistributor, ScraperMonitoring
 
@@ -72,6 +75,15 @@ class MarketplaceScraperController:
         self.project_id = self.config.get('project_id', os.environ.get('GCP_PROJECT_ID', 'fluxori-marketplace-data'))
         self.region = self.config.get('region', os.environ.get('GCP_REGION', 'africa-south1'))
         
+        # Select HTML parser backend used by all extractors
+        set_parser_backend(self.config.get('html_parser_backend', 'html.parser'))
+        
+        # Start warm extraction workers so HTML parsing runs off the event loop
+        self.extraction_executor = self._init_extraction_executor()
+        
+        # Share one search suggestion index between scrapers, warm from disk
+        self.suggestion_index = self._init_suggestion_index()
+        
         # Initialize components
         self.quota_manager = self._init_quota_manager()
         self.proxy_client = self._init_proxy_client()
@@ -110,7 +122,20 @@ class MarketplaceScraperController:
             'max_concurrent_tasks': 5,
             'load_shedding_detection': True,
             'persistence_enabled': True,
+            'write_behind_enabled': False,
+            'write_behind_max_pending': 5000,
+            'write_behind_flush_interval': 5.0,
+            'storage_backend': 'firestore',
+            'storage_sqlite_path': '/tmp/marketplace.db',
+            'storage_price_layout': 'documents',
+            'storage_price_bucket': 'monthly',
             'task_topic': 'marketplace-scraper-tasks',
+            'html_parser_backend': 'html.parser',
+            'extraction_workers': os.cpu_count() or 1,
+            'suggestion_max_age_days': 7,
+            # Most autocomplete suggestions per prefix, by marketplace, where
+            # verified; other marketplaces never answer a prefix from a shorter one
+            'suggestion_max_results': {},
             'schedule_jobs': [
                 {
                     'name': 'takealot-product-refresh',
@@ -262,6 +287,38 @@ class MarketplaceScraperController:
         
         return config
         
+    def _init_extraction_executor(self) -> ExtractionExecutor:
+        """Initialize the shared extraction worker pool.
+        
+        Returns:
+            Started ExtractionExecutor
+        """
+        executor = ExtractionExecutor(
+            max_workers=self.config.get('extraction_workers', os.cpu_count() or 1),
+            parser_backend=self.config.get('html_parser_backend', 'html.parser')
+        )
+        executor.start()
+        set_extraction_executor(executor)
+        return executor
+        
+    def _init_suggestion_index(self) -> SuggestionIndex:
+        """Initialize the shared search suggestion index.
+        
+        Returns:
+            Initialized SuggestionIndex
+        """
+        persist_path = None
+        if self.config.get('persistence_enabled', True):
+            persist_path = '/tmp/search_suggestions.json'
+            
+        index = SuggestionIndex(
+            persist_path=persist_path,
+            max_age=self.config.get('suggestion_max_age_days', 7) * 24 * 3600,
+            max_suggestions=self.config.get('suggestion_max_results', {})
+        )
+        set_suggestion_index(index)
+        return index
+        
     def _init_quota_manager(self) -> QuotaManager:
         """Initialize the quota manager.
         
@@ -310,17 +367,41 @@ class MarketplaceScraperController:
             quota_manager=self.quota_manager
         )
         
-    def _init_storage_client(self) -> MarketplaceDataRepository:
+    def _init_storage_client(self) -> Union[MarketplaceDataRepository, SQLiteRepository, WriteBehindRepository]:
         """Initialize the storage client.
         
         Returns:
-            Initialized MarketplaceDataRepository
+            Initialized MarketplaceDataRepository, or SQLiteRepository with
+            the sqlite backend, wrapped in a write-behind buffer if enabled
         """
-        return MarketplaceDataRepository(
-            project_id=self.project_id,
-            cache_enabled=self.config.get('storage_cache_enabled', True),
-            cache_ttl=self.config.get('storage_cache_ttl', 3600)
-        )
+        fingerprint_path = None
+        if self.config.get('persistence_enabled', True):
+            fingerprint_path = '/tmp/product_fingerprints.json'
+            
+        if self.config.get('storage_backend', 'firestore') == 'sqlite':
+            # Local tier for single-node deployments
+            repository = SQLiteRepository(self.config.get('storage_sqlite_path', '/tmp/marketplace.db'))
+        else:
+            repository = MarketplaceDataRepository(
+                project_id=self.project_id,
+                cache_enabled=self.config.get('storage_cache_enabled', True),
+                cache_ttl=self.config.get('storage_cache_ttl', 3600),
+                fingerprint_path=fingerprint_path,
+                cache_max_entries=self.config.get('storage_cache_max_entries', 10000),
+                cache_max_bytes=self.config.get('storage_cache_max_bytes', 32 * 1024 * 1024),
+                price_layout=self.config.get('storage_price_layout', 'documents'),
+                price_bucket=self.config.get('storage_price_bucket', 'monthly')
+            )
+        
+        # Optionally take storage latency off the scraping path
+        if self.config.get('write_behind_enabled', False):
+            return WriteBehindRepository(
+                repository,
+                max_pending=self.config.get('write_behind_max_pending', 5000),
+                flush_interval=self.config.get('write_behind_flush_interval', 5.0)
+            )
+            
+        return repository
         
     def _init_scrapers(self) -> Dict[str, Any]:
         """Initialize marketplace scrapers.
@@ -461,6 +542,19 @@ class MarketplaceScraperController:
         logger.info("Closing SmartProxy client")
         await self.proxy_client.__aexit__(None, None, None)
         
+        logger.info("Stopping extraction workers")
+        self.extraction_executor.shutdown()
+        
+        if isinstance(self.storage_client, WriteBehindRepository):
+            logger.info("Flushing buffered storage writes")
+            await self.storage_client.close()
+            
+        logger.info("Saving product fingerprints")
+        self.storage_client.save_fingerprints()
+        
+        logger.info("Saving search suggestions")
+        self.suggestion_index.save()
+        
         logger.info("Graceful shutdown complete")
         self.shutdown_complete.set()
         
@@ -881,105 +975,105 @@ class MarketplaceScraperController:
                 "results": results
             }
         elif task_type == 'match_products':
-                # Special task for Buck.cheap to match products with marketplace products
-                # Get marketplace products to match
-                marketplace_to_match = params.get('marketplace', 'takealot')
-                max_count = params.get('max_count', 50)
+            # Special task for Buck.cheap to match products with marketplace products
+            # Get marketplace products to match
+            marketplace_to_match = params.get('marketplace', 'takealot')
+            max_count = params.get('max_count', 50)
+            
+            # Get marketplace scraper
+            if marketplace_to_match not in self.scrapers:
+                raise ValueError(f"Unsupported marketplace for matching: {marketplace_to_match}")
                 
-                # Get marketplace scraper
-                if marketplace_to_match not in self.scrapers:
-                    raise ValueError(f"Unsupported marketplace for matching: {marketplace_to_match}")
+            marketplace_scraper = self.scrapers[marketplace_to_match]
+            
+            # Get recently updated products
+            # In a real implementation, we would query the repository
+            # Here we'll simulate by discovering some products
+            product_urls = await marketplace_scraper.discover_products(
+                category=params.get('category'),
+                page=1,
+                limit=max_count
+            )
+            
+            results = []
+            for url in product_urls[:max_count]:
+                try:
+                    # Get the product details
+                    product_data = await marketplace_scraper.extract_product_details(url)
                     
-                marketplace_scraper = self.scrapers[marketplace_to_match]
-                
-                # Get recently updated products
-                # In a real implementation, we would query the repository
-                # Here we'll simulate by discovering some products
-                product_urls = await marketplace_scraper.discover_products(
-                    category=params.get('category'),
-                    page=1,
-                    limit=max_count
-                )
-                
-                results = []
-                for url in product_urls[:max_count]:
-                    try:
-                        # Get the product details
-                        product_data = await marketplace_scraper.extract_product_details(url)
-                        
-                        # Match with Buck.cheap data
-                        match_result = await scraper.match_with_marketplace_product(
-                            marketplace_to_match,
-                            product_data
-                        )
-                        
-                        # Add to results
-                        results.append({
-                            "product_id": product_data.get("product_id", ""),
-                            "title": product_data.get("title", ""),
-                            "matched": match_result.get("matched", False),
-                            "confidence": match_result.get("confidence", 0),
-                            "price_history_points": len(match_result.get("price_history", []))
-                        })
-                    except Exception as e:
-                        results.append({
-                            "product_id": url,
-                            "error": str(e),
-                            "matched": False
-                        })
-                
-                return {
-                    "marketplace": marketplace_to_match,
-                    "total_products": len(results),
-                    "matched_products": sum(1 for r in results if r.get("matched", False)),
-                    "match_rate": (sum(1 for r in results if r.get("matched", False)) / len(results)) * 100 if results else 0,
-                    "results": results
-                }
-            elif task_type == 'extract_price_history':
-                # Special task for Buck.cheap to extract detailed price history
-                product_urls = params.get('product_urls', [])
-                max_count = params.get('max_count', 20)
-                
-                if not product_urls:
-                    # Search for products to analyze
-                    search_results = await scraper.search_products(
-                        keyword=params.get('keyword', 'laptop'),
-                        page=1
+                    # Match with Buck.cheap data
+                    match_result = await scraper.match_with_marketplace_product(
+                        marketplace_to_match,
+                        product_data
                     )
                     
-                    product_urls = [result["url"] for result in search_results.get("results", [])]
-                
-                results = []
-                for url in product_urls[:max_count]:
-                    try:
-                        # Get product details with price history
-                        product_data = await scraper.extract_product_details(url)
-                        
-                        # Also get price trend analysis
-                        trend_analysis = await scraper.analyze_price_trends(url)
-                        
-                        # Add to results
-                        results.append({
-                            "product_id": product_data.get("product_id", ""),
-                            "title": product_data.get("title", ""),
-                            "retailer": product_data.get("retailer", ""),
-                            "price_history_points": len(product_data.get("price_history", [])),
-                            "price_trend": trend_analysis.get("overall_trend", {}).get("direction", "unknown"),
-                            "price_volatility": trend_analysis.get("price_volatility", {}).get("level", "unknown")
-                        })
-                    except Exception as e:
-                        results.append({
-                            "url": url,
-                            "error": str(e)
-                        })
+                    # Add to results
+                    results.append({
+                        "product_id": product_data.get("product_id", ""),
+                        "title": product_data.get("title", ""),
+                        "matched": match_result.get("matched", False),
+                        "confidence": match_result.get("confidence", 0),
+                        "price_history_points": len(match_result.get("price_history", []))
+                    })
+                except Exception as e:
+                    results.append({
+                        "product_id": url,
+                        "error": str(e),
+                        "matched": False
+                    })
+            
+            return {
+                "marketplace": marketplace_to_match,
+                "total_products": len(results),
+                "matched_products": sum(1 for r in results if r.get("matched", False)),
+                "match_rate": (sum(1 for r in results if r.get("matched", False)) / len(results)) * 100 if results else 0,
+                "results": results
+            }
+        elif task_type == 'extract_price_history':
+            # Special task for Buck.cheap to extract detailed price history
+            product_urls = params.get('product_urls', [])
+            max_count = params.get('max_count', 20)
+            
+            if not product_urls:
+                # Search for products to analyze
+                search_results = await scraper.search_products(
+                    keyword=params.get('keyword', 'laptop'),
+                    page=1
+                )
                 
-                return {
-                    "total_products": len(results),
-                    "successful_extractions": sum(1 for r in results if "error" not in r),
-                    "results": results
-                }
-            else:
-                raise ValueError(f"Unsupported task type: {task_type}")
+                product_urls = [result["url"] for result in search_results.get("results", [])]
+            
+            results = []
+            for url in product_urls[:max_count]:
+                try:
+                    # Get product details with price history
+                    product_data = await scraper.extract_product_details(url)
+                    
+                    # Also get price trend analysis
+                    trend_analysis = await scraper.analyze_price_trends(url)
+                    
+                    # Add to results
+                    results.append({
+                        "product_id": product_data.get("product_id", ""),
+                        "title": product_data.get("title", ""),
+                        "retailer": product_data.get("retailer", ""),
+                        "price_history_points": len(product_data.get("price_history", [])),
+                        "price_trend": trend_analysis.get("overall_trend", {}).get("direction", "unknown"),
+                        "price_volatility": trend_analysis.get("price_volatility", {}).get("level", "unknown")
+                    })
+                except Exception as e:
+                    results.append({
+                        "url": url,
+                        "error": str(e)
+                    })
+            
+            return {
+                "total_products": len(results),
+                "successful_extractions": sum(1 for r in results if "error" not in r),
+                "results": results
+            }
+        else:
+            raise ValueError(f"Unsupported task type: {task_type}")
             
     def _get_task_priority(self, task_type: str) -> QuotaPriority:
         """Get the priority for a task type.
@@ -1025,9 +1119,14 @@ class MarketplaceScraperController:
                 "queue_size": self.scheduler.task_queue.qsize(),
                 "load_shedding_detected": self.scheduler.load_shedding_detected,
                 "load_shedding_until": self.scheduler.load_shedding_until.isoformat() if self.scheduler.load_shedding_until else None
-            }
+            },
+            "storage": self.storage_client.get_write_stats(),
+            "caches": get_cache_stats()
         }
         
+        if isinstance(self.storage_client, WriteBehindRepository):
+            status["storage"]["write_behind"] = self.storage_client.get_buffer_stats()
+        
         # Add scraper statistics
         status["scrapers"] = {}
         for marketplace, scraper in self.scrapers.items():
@@ -19,6 +19,10 @@ from urllib.parse import urljoin, urlparse, parse_qs, urlencode, quote
 from ...common.base_scraper import MarketplaceScraper, NetworkError, LoadSheddingDetectedError
 from ...common.proxy_client import SmartProxyClient
 from ...storage.repository import MarketplaceDataRepository
+from ...storage.cache import BoundedCache
+
+# Import extractors
+from .extractors.reviews_extractor import extract_reviews
 
 
 class AmazonSAScraper(MarketplaceScraper):
@@ -63,7 +67,12 @@ class AmazonSAScraper(MarketplaceScraper):
         self.search_base_url = "https://www.amazon.co.za/s"
         self.product_base_url = "https://www.amazon.co.za/dp"
         self.bestsellers_url = "https://www.amazon.co.za/gp/bestsellers/"
-        self.price_history = {}  # In-memory price history cache
+        self.price_history = BoundedCache(  # In-memory price history cache
+            "amazon.price_history",
+            max_entries=20000,
+            max_bytes=32 * 1024 * 1024,
+            ttl=30 * 24 * 60 * 60
+        )
         
         # Template mapping for different data types
         self.template_map = {
@@ -651,27 +660,7 @@ class AmazonSAScraper(MarketplaceScraper):
                 html_content = response.get("content", "")
                 
                 # Extract reviews using regex patterns
-                review_pattern = r'<div data-hook="review".*?<span class="a-profile-name">([^<]+)</span>.*?<i class="a-icon a-icon-star a-star-([0-5]).*?<span data-hook="review-title">.*?>([^<]+)</span>.*?<span data-hook="review-body">.*?<span>([^<]+)</span>'
-                review_matches = re.finditer(review_pattern, html_content, re.DOTALL)
-                
-                for i, match in enumerate(review_matches):
-                    if i >= limit:
-                        break
-                        
-                    reviewer_name = match.group(1).strip()
-                    rating = int(match.group(2))
-                    title = match.group(3).strip()
-                    body = match.group(4).strip()
-                    
-                    review = {
-                        "reviewer_name": reviewer_name,
-                        "rating": rating,
-                        "title": title,
-                        "body": body,
-                        "date": None  # Unable to reliably extract date with simple regex
-                    }
-                    
-                    reviews_data["reviews"].append(review)
+                reviews_data["reviews"].extend(await self.run_extractor(extract_reviews, html_content, limit))
             
             # Update review count
             reviews_data["review_count"] = len(reviews_data["reviews"])
@@ -1189,19 +1178,17 @@ class AmazonSAScraper(MarketplaceScraper):
             currency: Currency code
         """
         now = datetime.now().isoformat()
-        if asin not in self.price_history:
-            self.price_history[asin] = []
-            
-        # Add this price point
-        self.price_history[asin].append({
+        history = self.price_history.get(asin, [])
+        
+        # Add this price point, keeping only the most recent 30 points;
+        # the list is replaced rather than appended to so its size is re-counted
+        history = history[-29:] + [{
             "price": price,
             "currency": currency,
             "timestamp": now
-        })
+        }]
         
-        # Keep only the most recent 30 days of price history
-        if len(self.price_history[asin]) > 30:
-            self.price_history[asin] = self.price_history[asin][-30:]
+        self.price_history.set(asin, history)
     
     def _get_price_history(self, asin: str) -> List[Dict[str, Any]]:
         """Get the price history for a product.
@@ -1,5 +1,6 @@
 """Amazon marketplace extractors."""
 
 from .search_ranking_extractor import AmazonSearchRankingExtractor
+from .reviews_extractor import extract_reviews
 
-__all__ = ["AmazonSearchRankingExtractor"]
\ No newline at end of file
+__all__ = ["AmazonSearchRankingExtractor", "extract_reviews"]
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""
+Reviews extractor for Amazon marketplace.
+
+This module provides functions for extracting product reviews from Amazon's
+review pages when template extraction is unavailable.
+"""
+
+import re
+from typing import Dict, Any, List
+
+
+REVIEW_PATTERN = re.compile(
+    r'<div data-hook="review".*?<span class="a-profile-name">([^<]+)</span>.*?<i class="a-icon a-icon-star a-star-([0-5]).*?<span data-hook="review-title">.*?>([^<]+)</span>.*?<span data-hook="review-body">.*?<span>([^<]+)</span>',
+    re.DOTALL
+)
+
+
+def extract_reviews(html_content: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Extract reviews from Amazon product reviews page HTML.
+    
+    Args:
+        html_content: HTML content of the reviews page
+        limit: Maximum number of reviews to return
+        
+    Returns:
+        List of review dictionaries
+    """
+    reviews = []
+    
+    for i, match in enumerate(REVIEW_PATTERN.finditer(html_content)):
+        if i >= limit:
+            break
+        
+        reviews.append({
+            "reviewer_name": match.group(1).strip(),
+            "rating": int(match.group(2)),
+            "title": match.group(3).strip(),
+            "body": match.group(4).strip(),
+            "date": None  # Unable to reliably extract date with simple regex
+        })
+    
+    return reviews
@@ -10,9 +10,10 @@ import json
 import logging
 from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup
 
-from ....common.extractors.search_ranking_extractor import SearchRankingExtractor
+from ....common.extractors.html_parser import is_html_node
+from ....common.extractors.search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
 
 
 class AmazonSearchRankingExtractor(SearchRankingExtractor):
@@ -22,6 +23,8 @@ class AmazonSearchRankingExtractor(SearchRankingExtractor):
     with specific handling of Amazon's marketplace seller model and search result format.
     """
     
+    product_card_class = "s-result-item"
+    
     def __init__(self):
         """Initialize the Amazon search ranking extractor."""
         super().__init__(marketplace_name="amazon")
@@ -92,89 +95,109 @@ class AmazonSearchRankingExtractor(SearchRankingExtractor):
         result_items = soup.select('.s-result-item[data-asin]')
         results = []
         
-        for idx, item in enumerate(result_items):
-            # Skip empty ASINs or sponsored brand sections
-            asin = item.get('data-asin')
-            if not asin or asin == "":
-                continue
-                
-            # Skip non-product items like editorial recommendations
-            if "AdHolder" in item.get('class', []):
-                continue
-                
-            product = {
-                "product_id": asin,
-                "url": f"https://www.amazon.com/dp/{asin}"
-            }
+        for item in result_items:
+            product = self._extract_ranked_product(item, keyword, page)
+            if product is not None:
+                results.append(product)
+        
+        return results
+    
+    def _extract_ranked_product(self, 
+                               item: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from an Amazon search result card.
+        
+        Args:
+            item: Product card element
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        # Skip empty ASINs or sponsored brand sections
+        asin = item.get('data-asin')
+        if not asin or asin == "":
+            return None
             
-            # Extract title
-            title_element = item.select_one('.a-text-normal[data-a-color="secondary"]') or \
-                            item.select_one('.a-link-normal .a-text-normal') or \
-                            item.select_one('h2 .a-link-normal')
-            if title_element:
-                product["title"] = title_element.text.strip()
+        # Skip non-product items like editorial recommendations
+        if "AdHolder" in item.get('class', []):
+            return None
             
-            # Extract price
-            price_element = item.select_one('.a-price .a-offscreen')
-            if price_element:
-                price_text = price_element.text.strip()
-                # Remove currency symbol and thousands separators
-                price_text = re.sub(r'[^\d.]', '', price_text.replace(',', ''))
+        product = {
+            "product_id": asin,
+            "url": f"https://www.amazon.com/dp/{asin}"
+        }
+        
+        # Extract title
+        title_element = item.select_one('.a-text-normal[data-a-color="secondary"]') or \
+                        item.select_one('.a-link-normal .a-text-normal') or \
+                        item.select_one('h2 .a-link-normal')
+        if title_element:
+            product["title"] = title_element.text.strip()
+        
+        # Extract price
+        price_element = item.select_one('.a-price .a-offscreen')
+        if price_element:
+            price_text = price_element.text.strip()
+            # Remove currency symbol and thousands separators
+            price_text = re.sub(r'[^\d.]', '', price_text.replace(',', ''))
+            try:
+                product["price"] = float(price_text)
+                product["currency"] = "ZAR"  # Amazon.co.za shows prices in ZAR
+            except ValueError:
+                pass
+        
+        # Extract image
+        img_element = item.select_one('.s-image')
+        if img_element and img_element.get('src'):
+            product["image_url"] = img_element['src']
+        
+        # Extract rating
+        rating_element = item.select_one('.a-icon-star-small .a-icon-alt') or \
+                        item.select_one('.a-icon-star .a-icon-alt')
+        if rating_element:
+            rating_text = rating_element.text.strip()
+            rating_match = re.search(r'(\d+(\.\d+)?)', rating_text)
+            if rating_match:
                 try:
-                    product["price"] = float(price_text)
-                    product["currency"] = "ZAR"  # Amazon.co.za shows prices in ZAR
+                    product["rating"] = float(rating_match.group(1))
                 except ValueError:
                     pass
-            
-            # Extract image
-            img_element = item.select_one('.s-image')
-            if img_element and img_element.get('src'):
-                product["image_url"] = img_element['src']
-            
-            # Extract rating
-            rating_element = item.select_one('.a-icon-star-small .a-icon-alt') or \
-                            item.select_one('.a-icon-star .a-icon-alt')
-            if rating_element:
-                rating_text = rating_element.text.strip()
-                rating_match = re.search(r'(\d+(\.\d+)?)', rating_text)
-                if rating_match:
-                    try:
-                        product["rating"] = float(rating_match.group(1))
-                    except ValueError:
-                        pass
-            
-            # Extract review count
-            review_element = item.select_one('.a-size-small .a-link-normal')
-            if review_element:
-                review_text = review_element.text.strip()
-                review_match = re.search(r'(\d+[,]?\d*)', review_text)
-                if review_match:
-                    try:
-                        product["review_count"] = int(review_match.group(1).replace(',', ''))
-                    except ValueError:
-                        pass
-            
-            # Extract badges like "Amazon's Choice" or "Best Seller"
-            badge_element = item.select_one('.a-badge')
-            if badge_element:
-                badge_text_element = badge_element.select_one('.a-badge-text')
-                if badge_text_element:
-                    product["badge"] = badge_text_element.text.strip()
-            
-            # Extract Amazon Prime eligibility
-            prime_element = item.select_one('.s-prime .a-icon-prime')
-            if prime_element:
-                product["prime_eligible"] = True
-            
-            # Check if sponsored
-            sponsored = self._detect_sponsored_result(product, item)
-            if sponsored:
-                product["sponsored"] = True
-            
-            # Add to results
-            results.append(product)
         
-        return results
+        # Extract review count
+        review_element = item.select_one('.a-size-small .a-link-normal')
+        if review_element:
+            review_text = review_element.text.strip()
+            review_match = re.search(r'(\d+[,]?\d*)', review_text)
+            if review_match:
+                try:
+                    product["review_count"] = int(review_match.group(1).replace(',', ''))
+                except ValueError:
+                    pass
+        
+        # Extract badges like "Amazon's Choice" or "Best Seller"
+        badge_element = item.select_one('.a-badge')
+        if badge_element:
+            badge_text_element = badge_element.select_one('.a-badge-text')
+            if badge_text_element:
+                product["badge"] = badge_text_element.text.strip()
+        
+        # Extract Amazon Prime eligibility
+        prime_element = item.select_one('.s-prime .a-icon-prime')
+        if prime_element:
+            product["prime_eligible"] = True
+        
+        # Check if sponsored
+        sponsored = self._detect_sponsored_result(product, item)
+        if sponsored:
+            product["sponsored"] = True
+        
+        # Keep the card for seller and sponsored checks
+        product[PRODUCT_ELEMENT_KEY] = item
+        
+        return product
     
     def _extract_seller_count(self, 
                            product: Dict[str, Any], 
@@ -192,7 +215,7 @@ class AmazonSearchRankingExtractor(SearchRankingExtractor):
         # We'll use some heuristics and look for seller hints
         
         # If we have a full product card, look for seller/vendor info
-        if isinstance(soup, Tag) and soup.name == 'div' and 'data-asin' in soup.attrs:
+        if is_html_node(soup) and soup.name == 'div' and 'data-asin' in soup.attrs:
             # Try to find "ships from and sold by" or "sold by" text
             seller_element = soup.select_one('.s-merchant-info')
             if seller_element:
@@ -244,7 +267,7 @@ class AmazonSearchRankingExtractor(SearchRankingExtractor):
             True if sponsored
         """
         # Look for sponsored badge on product card
-        if isinstance(soup, Tag):
+        if is_html_node(soup):
             # Amazon shows 'Sponsored' label in search results
             sponsored_elements = soup.select('.s-sponsored-label-info-icon, .s-label-popover-hover span')
             for element in sponsored_elements:
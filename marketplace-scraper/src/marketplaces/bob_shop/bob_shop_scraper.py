@@ -23,6 +23,7 @@ from ...storage.repository import MarketplaceDataRepository
 from .extractors.product_extractor import extract_product_details
 from .extractors.search_extractor import extract_search_results, extract_search_suggestions
 from .extractors.category_extractor import extract_category_details
+from .extractors.deals_extractor import extract_deal_product_paths
 
 
 class BobShopScraper(MarketplaceScraper):
@@ -181,11 +182,12 @@ class BobShopScraper(MarketplaceScraper):
         # Assume it's a category name/path slug
         return f"{self.category_base_url}/{category}?page={page}"
             
-    async def extract_product_details(self, product_id_or_url: str) -> Dict[str, Any]:
+    async def extract_product_details(self, product_id_or_url: str, save: bool = True) -> Dict[str, Any]:
         """Extract detailed product information from Bob Shop.
         
         Args:
             product_id_or_url: Product ID, URL, or path
+            save: Whether to save the product to the repository
             
         Returns:
             Product details dictionary
@@ -254,7 +256,7 @@ class BobShopScraper(MarketplaceScraper):
                 # Extract product data
                 if "content" in response:
                     # Use our specialized product extractor
-                    product_data = extract_product_details(response["content"], product_url)
+                    product_data = await self.run_extractor(extract_product_details, response["content"], product_url)
                     self.hybrid_performance["product_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for product {product_url}: {response}")
@@ -262,8 +264,9 @@ class BobShopScraper(MarketplaceScraper):
             
             # Save product data to repository
             if product_data:
-                await self.storage_client.save_product(product_data)
-                self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
+                if save:
+                    await self.storage_client.save_product(product_data)
+                    self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
                 
                 # Update performance metrics
                 total_extractions = self.hybrid_performance["product_extraction"]["template"] + self.hybrid_performance["product_extraction"]["raw"]
@@ -524,7 +527,11 @@ class BobShopScraper(MarketplaceScraper):
                 # Extract search data
                 if "content" in response:
                     # Use our specialized search extractor
-                    search_data = extract_search_results(response["content"], keyword, page)
+                    # Cards past the limit are not parsed; one extra result lets the
+                    # truncation below tell whether the page had more
+                    search_data = await self.run_extractor(
+                        extract_search_results, response["content"], keyword, page, limit + 1
+                    )
                     self.hybrid_performance["search_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for search '{keyword}': {response}")
@@ -642,6 +649,11 @@ class BobShopScraper(MarketplaceScraper):
         Raises:
             NetworkError: If suggestions couldn't be fetched
         """
+        # Answer from fetched suggestions when they cover this prefix
+        cached = self._cached_search_suggestions(keyword_prefix)
+        if cached is not None:
+            return cached
+            
         try:
             # Build suggestions URL
             suggest_url = f"{self.suggest_url}?q={quote(keyword_prefix)}"
@@ -654,11 +666,12 @@ class BobShopScraper(MarketplaceScraper):
             
             # Extract suggestions
             if "content" in response:
-                suggestion_data = extract_search_suggestions(response["content"], keyword_prefix)
+                suggestion_data = await self.run_extractor(extract_search_suggestions, response["content"], keyword_prefix)
                 
                 # Add metadata
                 suggestion_data["marketplace"] = self.marketplace_name
                 suggestion_data["timestamp"] = datetime.now().isoformat()
+                self._remember_search_suggestions(suggestion_data)
                 
                 # Save suggestions to repository
                 await self.storage_client.save_search_suggestions(suggestion_data)
@@ -713,7 +726,7 @@ class BobShopScraper(MarketplaceScraper):
             # Extract category data
             if "content" in response:
                 # Use our specialized category extractor
-                category_data = extract_category_details(response["content"], category_url)
+                category_data = await self.run_extractor(extract_category_details, response["content"], category_url)
                 
                 # Add metadata
                 category_data["marketplace"] = self.marketplace_name
@@ -797,15 +810,12 @@ class BobShopScraper(MarketplaceScraper):
                                     product_url = urljoin(self.base_url, product_url)
                                 
                                 # For each product, fetch complete details
-                                detailed_product = await self.extract_product_details(product_url)
+                                detailed_product = await self.extract_product_details(product_url, save=False)
                                 
                                 if detailed_product:
                                     # Mark as deal
                                     detailed_product["promotion"] = "Deal"
                                     
-                                    # Save the updated product
-                                    await self.storage_client.save_product(detailed_product)
-                                    
                                     deal_products.append(detailed_product)
                             
                             template_success = True
@@ -833,28 +843,28 @@ class BobShopScraper(MarketplaceScraper):
                     self.hybrid_performance["category_extraction"]["raw"] += 1
                     
                     # Extract product cards
-                    product_link_pattern = r'<a\s+[^>]*href="(/products/[^"]+)"[^>]*class="[^"]*product-card[^"]*"'
-                    product_paths = re.findall(product_link_pattern, html_content)
+                    product_paths = await self.run_extractor(extract_deal_product_paths, html_content)
                     
                     # Process each deal product
                     for path in product_paths:
                         product_url = f"{self.base_url}{path}"
                         
-                        # Extract the product details (this will also save it)
-                        product_data = await self.extract_product_details(product_url)
+                        # Extract the product details, saved below with the other deals
+                        product_data = await self.extract_product_details(product_url, save=False)
                         
                         if product_data:
                             # Mark as deal
                             product_data["promotion"] = "Deal"
                             
-                            # Save the updated product
-                            await self.storage_client.save_product(product_data)
-                            
                             deal_products.append(product_data)
                 else:
                     self.logger.error(f"Invalid response for deals: {response}")
                     return []
             
+            # Save all deal products in a handful of batched writes
+            if deal_products:
+                await self.save_products_bulk(deal_products)
+            
             # Update performance metrics
             total_extractions = self.hybrid_performance["category_extraction"]["template"] + self.hybrid_performance["category_extraction"]["raw"]
             if total_extractions > 0:
@@ -8,14 +8,17 @@ Exports:
     product_extractor: Functions for extracting product details
     search_extractor: Functions for extracting search results
     category_extractor: Functions for extracting category information
+    deals_extractor: Functions for extracting deal products
 """
 
 from . import product_extractor
 from . import search_extractor
 from . import category_extractor
+from . import deals_extractor
 
 __all__ = [
     'product_extractor',
     'search_extractor',
-    'category_extractor'
+    'category_extractor',
+    'deals_extractor'
 ]
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Deals extractor for Bob Shop marketplace.
+
+This module provides functions for extracting deal products from Bob Shop's
+deals page.
+"""
+
+import re
+from typing import List
+
+
+PRODUCT_CARD_LINK_PATTERN = re.compile(r'<a\s+[^>]*href="(/products/[^"]+)"[^>]*class="[^"]*product-card[^"]*"')
+
+
+def extract_deal_product_paths(html_content: str) -> List[str]:
+    """Extract product paths from Bob Shop deals page HTML.
+    
+    Args:
+        html_content: Raw HTML content of the deals page
+        
+    Returns:
+        Product page paths in page order
+    """
+    return PRODUCT_CARD_LINK_PATTERN.findall(html_content)
@@ -12,13 +12,14 @@ from urllib.parse import urljoin
 from datetime import datetime
 
 
-def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Dict[str, Any]:
+def extract_search_results(html_content: str, keyword: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """Extract search results from Bob Shop search page HTML.
     
     Args:
         html_content: Raw HTML content of the search page
         keyword: Search keyword used
         page: Page number of search results
+        limit: Maximum number of results to extract (cards beyond it are not scanned)
         
     Returns:
         Dictionary containing search results and metadata
@@ -56,20 +57,21 @@ def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Di
             except ValueError:
                 pass
     
-    # Extract product cards
-    product_cards = []
+    # Extract product cards lazily from the grid layout
+    product_cards = iter(())
     
-    # First look for grid layout
     grid_match = re.search(r'<ul[^>]*class="[^"]*product-grid[^"]*"[^>]*>(.*?)</ul>', html_content, re.DOTALL)
     if grid_match:
         grid_content = grid_match.group(1)
-        card_matches = re.findall(r'<li[^>]*class="[^"]*grid__item[^"]*"[^>]*>(.*?)</li>', grid_content, re.DOTALL)
-        product_cards.extend(card_matches)
+        product_cards = re.finditer(r'<li[^>]*class="[^"]*grid__item[^"]*"[^>]*>(.*?)</li>', grid_content, re.DOTALL)
     
     # Process each product card
     position = 1
-    for card_html in product_cards:
-        product = extract_product_from_card(card_html, position)
+    for card_match in product_cards:
+        if limit is not None and len(search_data["results"]) >= limit:
+            break
+        
+        product = extract_product_from_card(card_match.group(1), position)
         if product:
             search_data["results"].append(product)
             position += 1
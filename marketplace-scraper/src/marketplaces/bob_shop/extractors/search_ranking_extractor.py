@@ -12,7 +12,8 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from ....common.extractors.search_ranking_extractor import SearchRankingExtractor
+from ....common.extractors.search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
+from .search_extractor import extract_search_results
 
 
 class BobShopSearchRankingExtractor(SearchRankingExtractor):
@@ -22,6 +23,8 @@ class BobShopSearchRankingExtractor(SearchRankingExtractor):
     adapting to the Shopify-based platform's unique structure.
     """
     
+    product_card_class = "grid__item grid-product"
+    
     def __init__(self):
         """Initialize the Bob Shop search ranking extractor."""
         super().__init__(marketplace_name="bob_shop")
@@ -96,89 +99,128 @@ class BobShopSearchRankingExtractor(SearchRankingExtractor):
         # Find all product cards (Shopify structure)
         product_items = soup.select('.grid__item.grid-product')
         
-        for idx, item in enumerate(product_items):
-            product = {}
+        for item in product_items:
+            product = self._extract_ranked_product(item, keyword, page)
+            if product is not None:
+                results.append(product)
+        
+        return results
+    
+    def _extract_ranked_product(self, 
+                               item: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from a Bob Shop search result card.
+        
+        Args:
+            item: Product card element
+            keyword: Search keyword
+            page: Page number
             
-            # Extract product URL
-            url_element = item.select_one('a.grid-product__link')
-            if url_element and url_element.get('href'):
-                product_url = url_element['href']
-                # Make sure it's a full URL
-                if product_url.startswith('/'):
-                    product_url = f"https://www.bobshop.co.za{product_url}"
-                product["url"] = product_url
-                
-                # Extract product ID from URL
-                product_id_match = re.search(r'/products/([^/?#]+)', product_url)
-                if product_id_match:
-                    product["product_id"] = product_id_match.group(1)
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        product = {}
+        
+        # Extract product URL
+        url_element = item.select_one('a.grid-product__link')
+        if url_element and url_element.get('href'):
+            product_url = url_element['href']
+            # Make sure it's a full URL
+            if product_url.startswith('/'):
+                product_url = f"https://www.bobshop.co.za{product_url}"
+            product["url"] = product_url
             
-            # Extract product title
-            title_element = item.select_one('.grid-product__title')
-            if title_element:
-                product["title"] = title_element.text.strip()
+            # Extract product ID from URL
+            product_id_match = re.search(r'/products/([^/?#]+)', product_url)
+            if product_id_match:
+                product["product_id"] = product_id_match.group(1)
+        
+        # Extract product title
+        title_element = item.select_one('.grid-product__title')
+        if title_element:
+            product["title"] = title_element.text.strip()
+        
+        # Extract price
+        price_element = item.select_one('.grid-product__price')
+        if price_element:
+            # Look for current price
+            current_element = price_element.select_one('.grid-product__price--current')
+            if current_element:
+                price_text = current_element.text.strip()
+            else:
+                price_text = price_element.text.strip()
             
-            # Extract price
-            price_element = item.select_one('.grid-product__price')
-            if price_element:
-                # Look for current price
-                current_element = price_element.select_one('.grid-product__price--current')
-                if current_element:
-                    price_text = current_element.text.strip()
-                else:
-                    price_text = price_element.text.strip()
-                
-                # Extract numeric price
-                price_match = re.search(r'R\s*(\d+[,.]?\d*)', price_text)
-                if price_match:
-                    price_str = price_match.group(1).replace(',', '.')
+            # Extract numeric price
+            price_match = re.search(r'R\s*(\d+[,.]?\d*)', price_text)
+            if price_match:
+                price_str = price_match.group(1).replace(',', '.')
+                try:
+                    product["price"] = float(price_str)
+                    product["currency"] = "ZAR"
+                except ValueError:
+                    pass
+                    
+            # Check for sale prices
+            compare_element = price_element.select_one('.grid-product__price--original')
+            if compare_element:
+                compare_text = compare_element.text.strip()
+                compare_match = re.search(r'R\s*(\d+[,.]?\d*)', compare_text)
+                if compare_match:
+                    compare_str = compare_match.group(1).replace(',', '.')
                     try:
-                        product["price"] = float(price_str)
-                        product["currency"] = "ZAR"
+                        product["original_price"] = float(compare_str)
+                        product["on_sale"] = True
                     except ValueError:
                         pass
-                        
-                # Check for sale prices
-                compare_element = price_element.select_one('.grid-product__price--original')
-                if compare_element:
-                    compare_text = compare_element.text.strip()
-                    compare_match = re.search(r'R\s*(\d+[,.]?\d*)', compare_text)
-                    if compare_match:
-                        compare_str = compare_match.group(1).replace(',', '.')
-                        try:
-                            product["original_price"] = float(compare_str)
-                            product["on_sale"] = True
-                        except ValueError:
-                            pass
-            
-            # Extract image
-            image_element = item.select_one('.grid-product__image')
-            if image_element and image_element.get('data-src'):
-                image_url = image_element['data-src']
-                # Replace image size parameters for full size
-                image_url = re.sub(r'_{[^}]+}', '', image_url)
-                product["image_url"] = image_url
-            
-            # Check for badges/tags
-            badge_element = item.select_one('.grid-product__tag')
-            if badge_element:
-                product["badge"] = badge_element.text.strip()
-            
-            # Check for out of stock
-            sold_out = item.select_one('.grid-product__sold-out')
-            if sold_out:
-                product["in_stock"] = False
-            else:
-                product["in_stock"] = True
-            
-            # Detect if it's a featured/promoted product
-            if self._detect_sponsored_result(product, item):
-                product["sponsored"] = True
-            
-            # Add to results
-            results.append(product)
         
-        return results
+        # Extract image
+        image_element = item.select_one('.grid-product__image')
+        if image_element and image_element.get('data-src'):
+            image_url = image_element['data-src']
+            # Replace image size parameters for full size
+            image_url = re.sub(r'_{[^}]+}', '', image_url)
+            product["image_url"] = image_url
+        
+        # Check for badges/tags
+        badge_element = item.select_one('.grid-product__tag')
+        if badge_element:
+            product["badge"] = badge_element.text.strip()
+        
+        # Check for out of stock
+        sold_out = item.select_one('.grid-product__sold-out')
+        if sold_out:
+            product["in_stock"] = False
+        else:
+            product["in_stock"] = True
+        
+        # Detect if it's a featured/promoted product
+        if self._detect_sponsored_result(product, item):
+            product["sponsored"] = True
+        
+        # Keep the card for seller and sponsored checks
+        product[PRODUCT_ELEMENT_KEY] = item
+        
+        return product
+    
+    def _extract_search_results(self, 
+                                html_content: str, 
+                                soup: Optional[BeautifulSoup], 
+                                keyword: str, 
+                                page: int) -> Optional[Dict[str, Any]]:
+        """Extract Bob Shop search results for `analyze_search_page`.
+        
+        Args:
+            html_content: HTML content of the search page
+            soup: Parsed page, or None when ranking came from structured data
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Search results data
+        """
+        # The search extractor works on the raw HTML and needs no parse tree
+        return extract_search_results(html_content, keyword, page)
     
     def _extract_seller_count(self, 
                             product: Dict[str, Any], 
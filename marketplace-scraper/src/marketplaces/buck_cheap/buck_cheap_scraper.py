@@ -20,6 +20,7 @@ from urllib.parse import urljoin, urlparse, parse_qs, urlencode, quote
 # Import base scraper
 from ...common.base_scraper import MarketplaceScraper, NetworkError, LoadSheddingDetectedError
 from ...common.proxy_client import SmartProxyClient
+from ...common.extractors.html_parser import parse_html
 from ...storage.repository import MarketplaceDataRepository
 
 # Import extractors
@@ -149,10 +150,8 @@ class BuckCheapScraper(MarketplaceScraper):
         Returns:
             List of product dictionaries
         """
-        from bs4 import BeautifulSoup
-        
         products = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_html(html_content)
         
         # Find all product cards in the search results
         product_cards = soup.select(".product-card")
@@ -284,10 +283,10 @@ class BuckCheapScraper(MarketplaceScraper):
             
             # Extract base product details
             html_content = response["content"]
-            product_data = extract_product_details(html_content, product_url)
+            product_data = await self.run_extractor(extract_product_details, html_content, product_url)
             
             # Extract price history from the page
-            price_history = extract_price_history(html_content)
+            price_history = await self.run_extractor(extract_price_history, html_content)
             if price_history:
                 product_data["price_history"] = price_history
             
@@ -338,10 +337,8 @@ class BuckCheapScraper(MarketplaceScraper):
         Returns:
             List of price history points from CSV or None if unavailable
         """
-        from bs4 import BeautifulSoup
-        
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_html(html_content)
             
             # Look for CSV download link
             csv_link = soup.select_one("a[href$='.csv'], a[href*='download'], a[href*='history']")
@@ -499,10 +496,8 @@ class BuckCheapScraper(MarketplaceScraper):
         Returns:
             Original retailer URL or None if not found
         """
-        from bs4 import BeautifulSoup
-        
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_html(html_content)
             
             # Look for retailer link
             retailer_link = soup.select_one("a.retailer-link, a.original-link, a[href*='takealot.com'], a[href*='makro.co.za'], a[href*='pnp.co.za'], a[href*='checkers.co.za'], a[href*='woolworths.co.za'], a[href*='game.co.za'], a[href*='clicks.co.za'], a[href*='dischem.co.za']")
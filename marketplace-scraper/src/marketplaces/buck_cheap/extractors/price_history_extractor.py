@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
+from ....common.extractors.html_parser import parse_html
+
 
 def extract_price_history(html_content: str) -> List[Dict[str, Any]]:
     """Extract price history from Buck.cheap product page HTML.
@@ -21,7 +23,7 @@ def extract_price_history(html_content: str) -> List[Dict[str, Any]]:
         List of price history points
     """
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content)
     
     # Find price history section
     history_section = soup.select_one('.price-history, .history-section, .timeline')
@@ -10,6 +10,8 @@ from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from ....common.extractors.html_parser import parse_html
+
 
 def extract_product_details(html_content: str, product_url: str) -> Dict[str, Any]:
     """Extract product details from Buck.cheap product page HTML.
@@ -22,7 +24,7 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
         Product data dictionary
     """
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content)
     
     # Create product data dictionary
     product_data = {
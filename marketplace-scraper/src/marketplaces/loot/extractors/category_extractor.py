@@ -11,6 +11,8 @@ from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs
 
+from ....common.extractors.html_parser import parse_html
+
 
 def extract_category_details(html_content: str, category_url: str) -> Dict[str, Any]:
     """Extract category details from Loot category page HTML.
@@ -23,7 +25,7 @@ def extract_category_details(html_content: str, category_url: str) -> Dict[str,
         Category data dictionary
     """
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content)
     
     # Initialize category data
     category_data = {
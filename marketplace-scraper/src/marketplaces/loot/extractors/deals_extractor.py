@@ -0,0 +1,25 @@
+"""
+Deals extractor for Loot marketplace.
+
+This module provides functions for extracting deal products from Loot's
+daily deals page.
+"""
+
+import re
+from typing import List
+
+
+PRODUCT_LINK_PATTERN = re.compile(r'<a\s+[^>]*href="(/product/[^"]+)"[^>]*>')
+
+
+def extract_deal_product_paths(html_content: str) -> List[str]:
+    """Extract product paths from Loot daily deals page HTML.
+    
+    Args:
+        html_content: HTML content of the daily deals page
+        
+    Returns:
+        Unique product page paths in page order
+    """
+    # Deal tiles link to the same product more than once
+    return list(dict.fromkeys(PRODUCT_LINK_PATTERN.findall(html_content)))
@@ -8,9 +8,36 @@ product detail pages.
 import re
 import json
 from typing import Dict, List, Any, Optional
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.selector_plan import SelectorPlan, PlanMatches
+
+
+# Selector plan compiled once at import; located in a single DOM walk
+PRODUCT_PLAN = SelectorPlan({
+    "title": ".product-title h1",
+    "description": ".product-description",
+    "current_price": ".product-price .current-price",
+    "list_price": ".product-price .original-price",
+    "gallery_images": ".product-images .image-carousel img",
+    "main_image": ".product-image img",
+    "spec_groups": ".product-specs .spec-group",
+    "spec_tables": ".product-details table",
+    "brand": ".product-brand",
+    "breadcrumbs": ".breadcrumbs a",
+    "seller": ".seller-info .seller-name",
+    "rating": ".rating-stars",
+    "review_count": ".review-count",
+    "variant_groups": ".product-variants .variant-group",
+    "out_of_stock": ".out-of-stock, .unavailable",
+    "add_to_cart": ".add-to-cart-button:not(.disabled)",
+    "stock_level": ".stock-level",
+    "free_delivery": ".free-delivery",
+    "delivery": ".delivery-info",
+    "promotion": ".promotion-badge, .discount-label",
+})
+
 def extract_product_details(html_content: str, product_url: str) -> Dict[str, Any]:
     """Extract product details from Loot product page HTML.
     
@@ -22,7 +49,7 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
         Product data dictionary
     """
     # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parse_html(html_content)
     
     # Create product data dictionary
     product_data = {
@@ -38,41 +65,44 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
         # No product ID found, cannot proceed
         return {}
     
+    # Locate every field's elements in one walk
+    matches = PRODUCT_PLAN.match(soup)
+    
     # Extract basic product info
-    _extract_basic_info(soup, product_data)
+    _extract_basic_info(matches, product_data)
     
     # Extract pricing information
-    _extract_pricing(soup, product_data)
+    _extract_pricing(matches, product_data)
     
     # Extract images
-    _extract_images(soup, product_data)
+    _extract_images(matches, product_data)
     
     # Extract specifications
-    _extract_specifications(soup, product_data)
+    _extract_specifications(matches, product_data)
     
     # Extract brand
-    _extract_brand(soup, product_data)
+    _extract_brand(matches, product_data)
     
     # Extract categories
-    _extract_categories(soup, product_data)
+    _extract_categories(matches, product_data)
     
     # Extract seller
-    _extract_seller(soup, product_data)
+    _extract_seller(matches, product_data)
     
     # Extract ratings and reviews
-    _extract_ratings(soup, product_data)
+    _extract_ratings(matches, product_data)
     
     # Extract variant info
-    _extract_variants(soup, product_data)
+    _extract_variants(matches, product_data)
     
     # Extract stock status
-    _extract_stock_status(soup, product_data)
+    _extract_stock_status(matches, product_data)
     
     # Extract shipping info
-    _extract_shipping_info(soup, product_data)
+    _extract_shipping_info(matches, product_data)
     
     # Extract promotions
-    _extract_promotions(soup, product_data)
+    _extract_promotions(matches, product_data)
     
     return product_data
 
@@ -94,33 +124,33 @@ def _extract_product_id(product_url: str) -> Optional[str]:
     return None
 
 
-def _extract_basic_info(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_basic_info(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract basic product information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Extract title
-    title_element = soup.select_one(".product-title h1")
+    title_element = matches.first("title")
     if title_element:
         product_data["title"] = title_element.text.strip()
     
     # Extract description
-    description_element = soup.select_one(".product-description")
+    description_element = matches.first("description")
     if description_element:
         product_data["description"] = description_element.text.strip()
 
 
-def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_pricing(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract pricing information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Current price
-    current_price_element = soup.select_one(".product-price .current-price")
+    current_price_element = matches.first("current_price")
     if current_price_element:
         price_text = current_price_element.text.strip().replace('R', '').replace(',', '')
         try:
@@ -130,7 +160,7 @@ def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
     
     # List price
-    list_price_element = soup.select_one(".product-price .original-price")
+    list_price_element = matches.first("list_price")
     if list_price_element:
         list_price_text = list_price_element.text.strip().replace('R', '').replace(',', '')
         try:
@@ -144,17 +174,17 @@ def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
 
 
-def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_images(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product images.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     images = []
     
     # Try to find images in gallery
-    image_elements = soup.select(".product-images .image-carousel img")
+    image_elements = matches.all("gallery_images")
     for img in image_elements:
         if img.get('src'):
             src = img['src']
@@ -164,7 +194,7 @@ def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
     
     # If no images found in gallery, try main product image
     if not images:
-        main_image = soup.select_one(".product-image img")
+        main_image = matches.first("main_image")
         if main_image and main_image.get('src'):
             src = main_image['src']
             # Convert thumbnail URL to full-size URL if needed
@@ -176,17 +206,17 @@ def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
         product_data["main_image"] = images[0]
 
 
-def _extract_specifications(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_specifications(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product specifications.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     specs = {}
     
     # Find specification sections
-    spec_sections = soup.select(".product-specs .spec-group")
+    spec_sections = matches.all("spec_groups")
     for section in spec_sections:
         # Find all specification rows
         rows = section.select(".spec-row")
@@ -204,7 +234,7 @@ def _extract_specifications(soup: BeautifulSoup, product_data: Dict[str, Any]) -
     
     # If no spec groups, try looking for table-based specs
     if not specs:
-        spec_tables = soup.select(".product-details table")
+        spec_tables = matches.all("spec_tables")
         for table in spec_tables:
             rows = table.select("tr")
             for row in rows:
@@ -220,11 +250,11 @@ def _extract_specifications(soup: BeautifulSoup, product_data: Dict[str, Any]) -
         product_data["specifications"] = specs
 
 
-def _extract_brand(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_brand(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product brand.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Try to find brand in specifications
@@ -236,13 +266,13 @@ def _extract_brand(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
                 return
     
     # Try to find brand element
-    brand_element = soup.select_one(".product-brand")
+    brand_element = matches.first("brand")
     if brand_element:
         product_data["brand"] = brand_element.text.strip()
         return
         
     # Try to find brand in breadcrumb
-    breadcrumbs = soup.select(".breadcrumbs a")
+    breadcrumbs = matches.all("breadcrumbs")
     for crumb in breadcrumbs:
         href = crumb.get('href', '')
         if 'brand/' in href or 'publisher/' in href:
@@ -250,18 +280,18 @@ def _extract_brand(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             return
 
 
-def _extract_categories(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_categories(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product categories.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     categories = []
     category_ids = []
     
     # Extract from breadcrumbs
-    breadcrumbs = soup.select(".breadcrumbs a")
+    breadcrumbs = matches.all("breadcrumbs")
     for crumb in breadcrumbs[1:]:  # Skip first (Home)
         category_name = crumb.text.strip()
         href = crumb.get('href', '')
@@ -285,14 +315,14 @@ def _extract_categories(soup: BeautifulSoup, product_data: Dict[str, Any]) -> No
         product_data["category_ids"] = category_ids
 
 
-def _extract_seller(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_seller(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract seller information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
-    seller_element = soup.select_one(".seller-info .seller-name")
+    seller_element = matches.first("seller")
     if seller_element:
         product_data["seller"] = seller_element.text.strip()
         
@@ -303,15 +333,15 @@ def _extract_seller(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             product_data["is_marketplace"] = False
 
 
-def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_ratings(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract ratings and reviews.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Extract rating score
-    rating_container = soup.select_one(".rating-stars")
+    rating_container = matches.first("rating")
     if rating_container:
         # Try to extract from data attribute first
         if 'data-rating' in rating_container.attrs:
@@ -327,7 +357,7 @@ def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
                 product_data["rating"] = len(filled_stars)
     
     # Extract review count
-    review_count_element = soup.select_one(".review-count")
+    review_count_element = matches.first("review_count")
     if review_count_element:
         review_text = review_count_element.text.strip()
         count_match = re.search(r'(\d+)', review_text)
@@ -338,17 +368,17 @@ def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
                 pass
 
 
-def _extract_variants(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_variants(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product variants.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     variants = []
     
     # Find variant selectors (may be dropdowns or buttons)
-    variant_containers = soup.select(".product-variants .variant-group")
+    variant_containers = matches.all("variant_groups")
     if not variant_containers:
         return
         
@@ -382,26 +412,26 @@ def _extract_variants(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None
         product_data["variants"] = variants
 
 
-def _extract_stock_status(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_stock_status(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract stock availability status.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Check for out of stock indicator
-    out_of_stock = soup.select_one(".out-of-stock, .unavailable")
+    out_of_stock = matches.first("out_of_stock")
     if out_of_stock:
         product_data["in_stock"] = False
         return
     
     # Check for "add to cart" button (indicates in stock)
-    add_to_cart = soup.select_one(".add-to-cart-button:not(.disabled)")
+    add_to_cart = matches.first("add_to_cart")
     if add_to_cart:
         product_data["in_stock"] = True
     
     # Try to extract stock level
-    stock_level_element = soup.select_one(".stock-level")
+    stock_level_element = matches.first("stock_level")
     if stock_level_element:
         stock_text = stock_level_element.text.strip()
         
@@ -414,22 +444,22 @@ def _extract_stock_status(soup: BeautifulSoup, product_data: Dict[str, Any]) ->
                 pass
 
 
-def _extract_shipping_info(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_shipping_info(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract shipping information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     shipping_info = {}
     
     # Check for free delivery
-    free_delivery = soup.select_one(".free-delivery")
+    free_delivery = matches.first("free_delivery")
     if free_delivery:
         shipping_info["free_shipping"] = True
     
     # Extract delivery time
-    delivery_element = soup.select_one(".delivery-info")
+    delivery_element = matches.first("delivery")
     if delivery_element:
         delivery_text = delivery_element.text.strip()
         shipping_info["delivery_time"] = delivery_text
@@ -438,15 +468,15 @@ def _extract_shipping_info(soup: BeautifulSoup, product_data: Dict[str, Any]) ->
         product_data["shipping_info"] = shipping_info
 
 
-def _extract_promotions(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_promotions(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract promotion information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Check for promotions
-    promo_element = soup.select_one(".promotion-badge, .discount-label")
+    promo_element = matches.first("promotion")
     if promo_element:
         promo_text = promo_element.text.strip()
         if promo_text:
@@ -7,25 +7,71 @@ suggestions from Loot's search pages.
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs
 
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.streaming import ElementStream
 
-def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Dict[str, Any]:
+
+# Class of a search result card
+PRODUCT_CARD_CLASS = "product-list-item"
+
+
+def extract_search_results(html_content: str, keyword: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """Extract search results from Loot search page HTML.
     
+    With a limit, product cards are streamed and parsing stops once enough
+    results have been extracted.
+    
     Args:
         html_content: HTML content of the search page
         keyword: Search keyword
         page: Page number
+        limit: Maximum number of results to extract
         
     Returns:
         Search results data
     """
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    if limit is None:
+        return extract_search_results_from_soup(parse_html(html_content), keyword, page)
+    
+    stream = ElementStream(html_content, PRODUCT_CARD_CLASS)
+    return _build_search_data(stream.page, stream, keyword, page, limit)
+
+
+def extract_search_results_from_soup(soup: BeautifulSoup, keyword: str, page: int = 1) -> Dict[str, Any]:
+    """Extract search results from an already parsed Loot search page.
     
+    Args:
+        soup: Parsed search page
+        keyword: Search keyword
+        page: Page number
+        
+    Returns:
+        Search results data
+    """
+    return _build_search_data(soup, soup.select(f".{PRODUCT_CARD_CLASS}"), keyword, page)
+
+
+def _build_search_data(soup: BeautifulSoup,
+                       product_items: Iterable[Any],
+                       keyword: str,
+                       page: int,
+                       limit: Optional[int] = None) -> Dict[str, Any]:
+    """Build search results from page-level markup and product cards.
+    
+    Args:
+        soup: Parsed search page (product cards may be removed)
+        product_items: Product card elements in page order
+        keyword: Search keyword
+        page: Page number
+        limit: Maximum number of results to extract
+        
+    Returns:
+        Search results data
+    """
     # Initialize search results
     search_data = {
         "keyword": keyword,
@@ -56,10 +102,12 @@ def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Di
                 pass
     
     # Extract products
-    product_items = soup.select(".product-list-item")
     results = []
     
     for position, item in enumerate(product_items, 1):
+        if limit is not None and len(results) >= limit:
+            break
+        
         product_data = {}
         
         # Extract title
@@ -208,7 +256,7 @@ def extract_search_suggestions(html_content: str, keyword_prefix: str) -> Dict[s
     
     except json.JSONDecodeError:
         # Not JSON, try extracting as HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = parse_html(html_content)
         
         # Look for suggestion elements
         suggestion_elements = soup.select(".autocomplete-suggestion, .search-suggestion")
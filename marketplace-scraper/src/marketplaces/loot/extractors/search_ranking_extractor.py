@@ -12,7 +12,10 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from ....common.extractors.search_ranking_extractor import SearchRankingExtractor
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
+from ....common.keyword_classifier import get_keyword_classifier
+from .search_extractor import extract_search_results_from_soup
 
 
 class LootSearchRankingExtractor(SearchRankingExtractor):
@@ -22,6 +25,8 @@ class LootSearchRankingExtractor(SearchRankingExtractor):
     with specific handling of Loot's marketplace structure and search result format.
     """
     
+    product_card_class = "product"
+    
     def __init__(self):
         """Initialize the Loot search ranking extractor."""
         super().__init__(marketplace_name="loot")
@@ -105,109 +110,149 @@ class LootSearchRankingExtractor(SearchRankingExtractor):
         # Find all product elements
         product_elements = soup.select('.product')
         
-        for idx, product_elem in enumerate(product_elements):
-            product = {}
-            
-            # Extract product URL and ID
-            link_element = product_elem.select_one('.product-link, .product-image a')
-            if link_element and link_element.get('href'):
-                product_url = link_element['href']
-                # Make sure it's a full URL
-                if not product_url.startswith('http'):
-                    product_url = f"https://www.loot.co.za{product_url}"
-                product["url"] = product_url
-                
-                # Extract product ID from URL
-                product_id_match = re.search(r'/product/([^/]+)', product_url)
-                if product_id_match:
-                    product["product_id"] = product_id_match.group(1)
-            
-            # Extract product title
-            title_element = product_elem.select_one('.product-title, .product-name')
-            if title_element:
-                product["title"] = title_element.text.strip()
-            
-            # Extract price
-            price_element = product_elem.select_one('.price, .product-price')
-            if price_element:
-                price_text = price_element.text.strip()
-                # Extract numeric price
-                price_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', price_text)
-                if price_match:
-                    price_str = price_match.group(1).replace(',', '.')
-                    try:
-                        product["price"] = float(price_str)
-                        product["currency"] = "ZAR"
-                    except ValueError:
-                        pass
-            
-            # Check for special price or sale
-            special_price_element = product_elem.select_one('.special-price, .was-price')
-            original_price_element = product_elem.select_one('.original-price, .old-price')
-            
-            if special_price_element and original_price_element:
-                special_text = special_price_element.text.strip()
-                original_text = original_price_element.text.strip()
-                
-                # Extract prices
-                special_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', special_text)
-                original_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', original_text)
-                
-                if special_match and original_match:
-                    try:
-                        special_price = float(special_match.group(1).replace(',', '.'))
-                        original_price = float(original_match.group(1).replace(',', '.'))
-                        
-                        product["price"] = special_price
-                        product["original_price"] = original_price
-                        product["on_sale"] = True
-                    except ValueError:
-                        pass
-            
-            # Extract image
-            img_element = product_elem.select_one('.product-image img')
-            if img_element and img_element.get('src'):
-                product["image_url"] = img_element['src']
-            elif img_element and img_element.get('data-src'):
-                product["image_url"] = img_element['data-src']
-            
-            # Extract availability/stock status
-            stock_element = product_elem.select_one('.availability, .stock-status')
-            if stock_element:
-                stock_text = stock_element.text.strip().lower()
-                product["in_stock"] = "in stock" in stock_text and "out of stock" not in stock_text
-            else:
-                # Default to in stock if not specified
-                product["in_stock"] = True
-            
-            # Extract author for books (Loot specializes in books)
-            author_element = product_elem.select_one('.author, .product-author')
-            if author_element:
-                product["author"] = author_element.text.strip()
-            
-            # Extract format/binding for books
-            format_element = product_elem.select_one('.format, .binding')
-            if format_element:
-                product["format"] = format_element.text.strip()
+        for product_elem in product_elements:
+            product = self._extract_ranked_product(product_elem, keyword, page)
+            if product is not None:
+                products.append(product)
+        
+        return products
+    
+    def _extract_ranked_product(self, 
+                               product_elem: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from a Loot search result card.
+        
+        Args:
+            product_elem: Product card element
+            keyword: Search keyword
+            page: Page number
             
-            # Extract estimated delivery date if available
-            delivery_element = product_elem.select_one('.delivery-estimate, .estimated-delivery')
-            if delivery_element:
-                product["estimated_delivery"] = delivery_element.text.strip()
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        product = {}
+        
+        # Extract product URL and ID
+        link_element = product_elem.select_one('.product-link, .product-image a')
+        if link_element and link_element.get('href'):
+            product_url = link_element['href']
+            # Make sure it's a full URL
+            if not product_url.startswith('http'):
+                product_url = f"https://www.loot.co.za{product_url}"
+            product["url"] = product_url
             
-            # Check for badges/labels
-            badge_element = product_elem.select_one('.badge, .product-badge')
-            if badge_element:
-                product["badge"] = badge_element.text.strip()
+            # Extract product ID from URL
+            product_id_match = re.search(r'/product/([^/]+)', product_url)
+            if product_id_match:
+                product["product_id"] = product_id_match.group(1)
+        
+        # Extract product title
+        title_element = product_elem.select_one('.product-title, .product-name')
+        if title_element:
+            product["title"] = title_element.text.strip()
+        
+        # Extract price
+        price_element = product_elem.select_one('.price, .product-price')
+        if price_element:
+            price_text = price_element.text.strip()
+            # Extract numeric price
+            price_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', price_text)
+            if price_match:
+                price_str = price_match.group(1).replace(',', '.')
+                try:
+                    product["price"] = float(price_str)
+                    product["currency"] = "ZAR"
+                except ValueError:
+                    pass
+        
+        # Check for special price or sale
+        special_price_element = product_elem.select_one('.special-price, .was-price')
+        original_price_element = product_elem.select_one('.original-price, .old-price')
+        
+        if special_price_element and original_price_element:
+            special_text = special_price_element.text.strip()
+            original_text = original_price_element.text.strip()
             
-            # Check if it's a featured/promoted product
-            if self._detect_sponsored_result(product, product_elem):
-                product["sponsored"] = True
+            # Extract prices
+            special_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', special_text)
+            original_match = re.search(r'R\s*(\d+(?:[,\.]\d+)*)', original_text)
             
-            # Add to products list
-            products.append(product)
+            if special_match and original_match:
+                try:
+                    special_price = float(special_match.group(1).replace(',', '.'))
+                    original_price = float(original_match.group(1).replace(',', '.'))
+                    
+                    product["price"] = special_price
+                    product["original_price"] = original_price
+                    product["on_sale"] = True
+                except ValueError:
+                    pass
         
-        return products
+        # Extract image
+        img_element = product_elem.select_one('.product-image img')
+        if img_element and img_element.get('src'):
+            product["image_url"] = img_element['src']
+        elif img_element and img_element.get('data-src'):
+            product["image_url"] = img_element['data-src']
+        
+        # Extract availability/stock status
+        stock_element = product_elem.select_one('.availability, .stock-status')
+        if stock_element:
+            stock_text = stock_element.text.strip().lower()
+            product["in_stock"] = "in stock" in stock_text and "out of stock" not in stock_text
+        else:
+            # Default to in stock if not specified
+            product["in_stock"] = True
+        
+        # Extract author for books (Loot specializes in books)
+        author_element = product_elem.select_one('.author, .product-author')
+        if author_element:
+            product["author"] = author_element.text.strip()
+        
+        # Extract format/binding for books
+        format_element = product_elem.select_one('.format, .binding')
+        if format_element:
+            product["format"] = format_element.text.strip()
+        
+        # Extract estimated delivery date if available
+        delivery_element = product_elem.select_one('.delivery-estimate, .estimated-delivery')
+        if delivery_element:
+            product["estimated_delivery"] = delivery_element.text.strip()
+        
+        # Check for badges/labels
+        badge_element = product_elem.select_one('.badge, .product-badge')
+        if badge_element:
+            product["badge"] = badge_element.text.strip()
+        
+        # Check if it's a featured/promoted product
+        if self._detect_sponsored_result(product, product_elem):
+            product["sponsored"] = True
+        
+        # Keep the card for seller and sponsored checks
+        product[PRODUCT_ELEMENT_KEY] = product_elem
+        
+        return product
+    
+    def _extract_search_results(self, 
+                                html_content: str, 
+                                soup: Optional[BeautifulSoup], 
+                                keyword: str, 
+                                page: int) -> Optional[Dict[str, Any]]:
+        """Extract Loot search results for `analyze_search_page`.
+        
+        Args:
+            html_content: HTML content of the search page
+            soup: Parsed page, or None when ranking came from structured data
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Search results data
+        """
+        if soup is None:
+            soup = parse_html(html_content)
+        return extract_search_results_from_soup(soup, keyword, page)
     
     def _extract_seller_count(self, 
                             product: Dict[str, Any], 
@@ -295,17 +340,15 @@ class LootSearchRankingExtractor(SearchRankingExtractor):
         # Detect product categories by looking at titles and formats
         book_count = 0
         electronics_count = 0
+        classifier = get_keyword_classifier()
         
         for product in ranking_data.get("top_ranked_products", []):
-            title = product.get("title", "").lower()
-            format_info = product.get("format", "").lower()
-            
             # Check for book indicators
-            if "author" in product or "book" in format_info or "paperback" in format_info or "hardcover" in format_info:
+            if "author" in product or classifier.has_label(product.get("format", ""), "category", "books"):
                 book_count += 1
             
             # Check for electronics indicators
-            elif any(term in title for term in ["phone", "laptop", "tablet", "tv", "camera", "headphone"]):
+            elif classifier.has_label(product.get("title", ""), "category", "electronics"):
                 electronics_count += 1
         
         # Adjust competition index based on category prevalence
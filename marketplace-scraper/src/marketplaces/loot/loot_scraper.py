@@ -24,6 +24,7 @@ from ...storage.repository import MarketplaceDataRepository
 from .extractors.product_extractor import extract_product_details
 from .extractors.search_extractor import extract_search_results, extract_search_suggestions
 from .extractors.category_extractor import extract_category_details
+from .extractors.deals_extractor import extract_deal_product_paths
 
 
 class LootScraper(MarketplaceScraper):
@@ -179,11 +180,12 @@ class LootScraper(MarketplaceScraper):
         # Add pagination
         return f"{self.base_url}{base_path}?offset={(page-1)*24}"
             
-    async def extract_product_details(self, product_id_or_url: str) -> Dict[str, Any]:
+    async def extract_product_details(self, product_id_or_url: str, save: bool = True) -> Dict[str, Any]:
         """Extract detailed product information from Loot.
         
         Args:
             product_id_or_url: Product ID, URL, or path
+            save: Whether to save the product to the repository
             
         Returns:
             Product details dictionary
@@ -252,7 +254,7 @@ class LootScraper(MarketplaceScraper):
                 # Extract product data
                 if "content" in response:
                     # Use our specialized product extractor
-                    product_data = extract_product_details(response["content"], product_url)
+                    product_data = await self.run_extractor(extract_product_details, response["content"], product_url)
                     self.hybrid_performance["product_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for product {product_url}: {response}")
@@ -260,8 +262,9 @@ class LootScraper(MarketplaceScraper):
             
             # Save product data to repository
             if product_data:
-                await self.storage_client.save_product(product_data)
-                self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
+                if save:
+                    await self.storage_client.save_product(product_data)
+                    self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
                 
                 # Update performance metrics
                 total_extractions = self.hybrid_performance["product_extraction"]["template"] + self.hybrid_performance["product_extraction"]["raw"]
@@ -507,7 +510,11 @@ class LootScraper(MarketplaceScraper):
                 # Extract search data
                 if "content" in response:
                     # Use our specialized search extractor
-                    search_data = extract_search_results(response["content"], keyword, page)
+                    # Cards past the limit are not parsed; one extra result lets the
+                    # truncation below tell whether the page had more
+                    search_data = await self.run_extractor(
+                        extract_search_results, response["content"], keyword, page, limit + 1
+                    )
                     self.hybrid_performance["search_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for search '{keyword}': {response}")
@@ -625,6 +632,11 @@ class LootScraper(MarketplaceScraper):
         Raises:
             NetworkError: If suggestions couldn't be fetched
         """
+        # Answer from fetched suggestions when they cover this prefix
+        cached = self._cached_search_suggestions(keyword_prefix)
+        if cached is not None:
+            return cached
+            
         try:
             # Build suggestions URL
             suggest_url = f"{self.base_url}/search/autocomplete?q={quote(keyword_prefix)}"
@@ -637,11 +649,12 @@ class LootScraper(MarketplaceScraper):
             
             # Extract suggestions
             if "content" in response:
-                suggestion_data = extract_search_suggestions(response["content"], keyword_prefix)
+                suggestion_data = await self.run_extractor(extract_search_suggestions, response["content"], keyword_prefix)
                 
                 # Add metadata
                 suggestion_data["marketplace"] = self.marketplace_name
                 suggestion_data["timestamp"] = datetime.now().isoformat()
+                self._remember_search_suggestions(suggestion_data)
                 
                 # Save suggestions to repository
                 await self.storage_client.save_search_suggestions(suggestion_data)
@@ -696,7 +709,7 @@ class LootScraper(MarketplaceScraper):
             # Extract category data
             if "content" in response:
                 # Use our specialized category extractor
-                category_data = extract_category_details(response["content"], category_url)
+                category_data = await self.run_extractor(extract_category_details, response["content"], category_url)
                 
                 # Add metadata
                 category_data["marketplace"] = self.marketplace_name
@@ -780,15 +793,12 @@ class LootScraper(MarketplaceScraper):
                                     product_url = urljoin(self.base_url, product_url)
                                 
                                 # For each product, fetch complete details
-                                detailed_product = await self.extract_product_details(product_url)
+                                detailed_product = await self.extract_product_details(product_url, save=False)
                                 
                                 if detailed_product:
                                     # Mark as daily deal
                                     detailed_product["promotion"] = "Daily Deal"
                                     
-                                    # Save the updated product
-                                    await self.storage_client.save_product(detailed_product)
-                                    
                                     deal_products.append(detailed_product)
                             
                             template_success = True
@@ -816,28 +826,28 @@ class LootScraper(MarketplaceScraper):
                     self.hybrid_performance["category_extraction"]["raw"] += 1
                     
                     # Extract product links
-                    product_links = re.findall(r'<a\s+[^>]*href="(/product/[^"]+)"[^>]*>', html_content)
+                    unique_links = await self.run_extractor(extract_deal_product_paths, html_content)
                     
                     # Process each deal product
-                    unique_links = list(set(product_links))
                     for link in unique_links[:20]:  # Limit to first 20 deals to avoid too many requests
                         product_url = f"{self.base_url}{link}"
                         
-                        # Extract the product details (this will also save it)
-                        product_data = await self.extract_product_details(product_url)
+                        # Extract the product details, saved below with the other deals
+                        product_data = await self.extract_product_details(product_url, save=False)
                         
                         if product_data:
                             # Mark as daily deal
                             product_data["promotion"] = "Daily Deal"
                             
-                            # Save the updated product
-                            await self.storage_client.save_product(product_data)
-                            
                             deal_products.append(product_data)
                 else:
                     self.logger.error(f"Invalid response for daily deals: {response}")
                     return []
             
+            # Save all deal products in a handful of batched writes
+            if deal_products:
+                await self.save_products_bulk(deal_products)
+            
             # Update performance metrics
             total_extractions = self.hybrid_performance["category_extraction"]["template"] + self.hybrid_performance["category_extraction"]["raw"]
             if total_extractions > 0:
@@ -1162,9 +1172,9 @@ class LootScraper(MarketplaceScraper):
                 # Remove the brand from the title to avoid redundancy
                 simplified_title = re.sub(rf'{re.escape(product_brand)}\s+', '', product_title, flags=re.IGNORECASE)
                 
-                # Extract key words from title (remove common filler words)
+                # Extract key words from title (remove stop words)
                 key_words = [word for word in simplified_title.split() 
-                            if len(word) > 3 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 3 and not self.keyword_classifier.is_stop_word(word)]
                 
                 # Take first 3-4 key words for more focused search
                 title_keywords = ' '.join(key_words[:min(4, len(key_words))])
@@ -1176,7 +1186,7 @@ class LootScraper(MarketplaceScraper):
             if not search_keywords:
                 # Extract key words from title
                 key_words = [word for word in product_title.split() 
-                            if len(word) > 3 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 3 and not self.keyword_classifier.is_stop_word(word)]
                 
                 # Take first 5-6 key words for more focused search
                 title_keywords = ' '.join(key_words[:min(6, len(key_words))])
@@ -1190,7 +1200,7 @@ class LootScraper(MarketplaceScraper):
                 
                 # Extract 2-3 key attributes from title
                 key_attrs = [word for word in product_title.split() 
-                            if len(word) > 4 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 4 and not self.keyword_classifier.is_stop_word(word)]
                 
                 if key_attrs:
                     attr_keywords = ' '.join(key_attrs[:min(3, len(key_attrs))])
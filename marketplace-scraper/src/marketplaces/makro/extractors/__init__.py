@@ -8,6 +8,9 @@ from the Makro marketplace website.
 from .product_extractor import extract_product_details
 from .search_extractor import extract_search_results, extract_search_suggestions
 from .category_extractor import extract_category_details
+from .deals_extractor import extract_deal_product_paths
+from .reviews_extractor import extract_reviews
 
 __all__ = ['extract_product_details', 'extract_search_results', 
-           'extract_search_suggestions', 'extract_category_details']
\ No newline at end of file
+           'extract_search_suggestions', 'extract_category_details',
+           'extract_deal_product_paths', 'extract_reviews']
\ No newline at end of file
@@ -5,11 +5,12 @@ This module provides functions for extracting category details from Makro's cate
 """
 
 import re
-import json
 from typing import Dict, Any, List
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 
+from ....common.extractors.structured_data import find_hydration_state
+
 
 def extract_category_details(html_content: str, category_url: str) -> Dict[str, Any]:
     """Extract category details from Makro category page HTML.
@@ -38,15 +39,9 @@ def extract_category_details(html_content: str, category_url: str) -> Dict[str,
         category_data["category_id"] = '_'.join(path_parts)
     
     # Try to extract structured category data from window.__INITIAL_STATE__
-    initial_state_match = re.search(r'window\.__INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
-    if initial_state_match:
-        try:
-            initial_state = json.loads(initial_state_match.group(1))
-            if "category" in initial_state and isinstance(initial_state["category"], dict):
-                category_state = initial_state["category"]
-                category_data.update(_extract_from_category_state(category_state))
-        except (json.JSONDecodeError, ValueError) as e:
-            pass  # Continue with regular HTML extraction if JSON parsing fails
+    initial_state = find_hydration_state(html_content, "__INITIAL_STATE__")
+    if isinstance(initial_state, dict) and isinstance(initial_state.get("category"), dict):
+        category_data.update(_extract_from_category_state(initial_state["category"]))
     
     # If name is not already extracted, extract it from HTML
     if "name" not in category_data:
@@ -0,0 +1,31 @@
+"""
+Deals extractor for Makro marketplace.
+
+This module provides functions for extracting deal products from Makro's
+daily deals page.
+"""
+
+import re
+from typing import List
+
+
+PRODUCT_CARD_LINK_PATTERN = re.compile(r'<a\s+[^>]*href="(/p/[^"]+)"[^>]*class="[^"]*product-card__link[^"]*"')
+PRODUCT_LINK_PATTERN = re.compile(r'<a\s+[^>]*href="(/p/[^"]+)"[^>]*>')
+
+
+def extract_deal_product_paths(html_content: str) -> List[str]:
+    """Extract product paths from Makro daily deals page HTML.
+    
+    Args:
+        html_content: HTML content of the daily deals page
+        
+    Returns:
+        Product page paths in page order
+    """
+    product_paths = PRODUCT_CARD_LINK_PATTERN.findall(html_content)
+    
+    # Alternative pattern if the page has no product card links
+    if not product_paths:
+        product_paths = PRODUCT_LINK_PATTERN.findall(html_content)
+    
+    return product_paths
@@ -6,10 +6,22 @@ This module provides functions for extracting product details from Makro's produ
 
 import re
 import json
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from urllib.parse import urljoin
 
+from ....common.extractors.structured_data import (
+    find_json_ld, find_hydration_state, record_structured_extraction
+)
+
+
+# Product fields with a markup fallback when not in structured data
+MARKUP_FALLBACK_FIELDS = (
+    "title", "price", "brand", "sku", "description", "images",
+    "specifications", "availability", "rating", "categories"
+)
+
 
 def extract_product_details(html_content: str, product_url: str) -> Dict[str, Any]:
     """Extract detailed product information from Makro product page HTML.
@@ -21,6 +33,8 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
     Returns:
         Dictionary containing product details
     """
+    start_time = time.perf_counter()
+    
     product_data = {
         "url": product_url,
         "timestamp": datetime.now().isoformat(),
@@ -34,33 +48,19 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
             product_id = parts[1].split("?")[0].split("#")[0]
             product_data["product_id"] = product_id
     
-    # Try to extract structured JSON data (typically in a script tag)
-    json_ld_match = re.search(r'<script type="application/ld\+json">(.*?)</script>', html_content, re.DOTALL)
-    if json_ld_match:
-        try:
-            json_ld_data = json.loads(json_ld_match.group(1))
-            if isinstance(json_ld_data, dict):
-                # Handle single product JSON-LD
-                product_data.update(_extract_from_json_ld(json_ld_data))
-            elif isinstance(json_ld_data, list):
-                # Handle array of JSON-LD (find the product one)
-                for item in json_ld_data:
-                    if isinstance(item, dict) and item.get("@type") == "Product":
-                        product_data.update(_extract_from_json_ld(item))
-                        break
-        except (json.JSONDecodeError, ValueError) as e:
-            pass  # Continue with regular HTML extraction if JSON parsing fails
+    # Try to extract structured JSON-LD product data
+    json_ld_data = find_json_ld(html_content, "Product")
+    if json_ld_data:
+        product_data.update(_extract_from_json_ld(json_ld_data))
     
     # Try to extract product data from structured data in window.__INITIAL_STATE__
-    initial_state_match = re.search(r'window\.__INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
-    if initial_state_match:
-        try:
-            initial_state = json.loads(initial_state_match.group(1))
-            if "product" in initial_state and isinstance(initial_state["product"], dict):
-                product_state = initial_state["product"]
-                product_data.update(_extract_from_initial_state(product_state))
-        except (json.JSONDecodeError, ValueError) as e:
-            pass  # Continue with regular HTML extraction if JSON parsing fails
+    initial_state = find_hydration_state(html_content, "__INITIAL_STATE__")
+    if isinstance(initial_state, dict) and isinstance(initial_state.get("product"), dict):
+        product_data.update(_extract_from_initial_state(initial_state["product"]))
+    
+    # Fields only extracted from markup when structured data is missing them
+    structured_hit = any(key in product_data for key in MARKUP_FALLBACK_FIELDS)
+    markup_fallback = any(key not in product_data for key in MARKUP_FALLBACK_FIELDS)
     
     # Extract data directly from HTML if needed
     # Title (if not already extracted from structured data)
@@ -176,6 +176,11 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
     if delivery_info:
         product_data["delivery"] = delivery_info
     
+    record_structured_extraction(
+        "makro", "product", structured_hit, markup_fallback,
+        (time.perf_counter() - start_time) * 1000
+    )
+    
     return product_data
 
 
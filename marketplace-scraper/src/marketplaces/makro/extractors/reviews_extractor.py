@@ -0,0 +1,65 @@
+"""
+Reviews extractor for Makro marketplace.
+
+This module provides functions for extracting product reviews from Makro's
+review pages when the reviews API returns HTML instead of JSON.
+"""
+
+import re
+from typing import Dict, Any, List
+
+
+def extract_reviews(html_content: str) -> List[Dict[str, Any]]:
+    """Extract reviews from Makro review page HTML.
+    
+    Args:
+        html_content: HTML content with reviews
+        
+    Returns:
+        List of review dictionaries
+    """
+    reviews = []
+    
+    # Pattern to match review blocks
+    review_block_pattern = r'<div[^>]*class="[^"]*review-item[^"]*"[^>]*>(.*?)</div>\s*</div>'
+    review_blocks = re.findall(review_block_pattern, html_content, re.DOTALL)
+    
+    for block in review_blocks:
+        # Extract review components
+        review = {}
+        
+        # Rating
+        rating_match = re.search(r'<div[^>]*class="[^"]*rating[^"]*"[^>]*data-rating="([^"]+)"', block)
+        if rating_match:
+            try:
+                review["rating"] = float(rating_match.group(1))
+            except ValueError:
+                review["rating"] = 0
+        
+        # Title
+        title_match = re.search(r'<h3[^>]*class="[^"]*review-title[^"]*"[^>]*>(.*?)</h3>', block, re.DOTALL)
+        if title_match:
+            review["title"] = title_match.group(1).strip()
+        
+        # Content
+        content_match = re.search(r'<div[^>]*class="[^"]*review-content[^"]*"[^>]*>(.*?)</div>', block, re.DOTALL)
+        if content_match:
+            review["content"] = content_match.group(1).strip()
+        
+        # Author
+        author_match = re.search(r'<span[^>]*class="[^"]*review-author[^"]*"[^>]*>(.*?)</span>', block, re.DOTALL)
+        if author_match:
+            review["author"] = author_match.group(1).strip()
+        else:
+            review["author"] = "Anonymous"
+        
+        # Date
+        date_match = re.search(r'<span[^>]*class="[^"]*review-date[^"]*"[^>]*>(.*?)</span>', block, re.DOTALL)
+        if date_match:
+            review["date"] = date_match.group(1).strip()
+        
+        # Only add reviews with at least content or rating
+        if review.get("content") or review.get("rating"):
+            reviews.append(review)
+    
+    return reviews
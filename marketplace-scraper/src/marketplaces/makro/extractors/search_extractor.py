@@ -6,22 +6,28 @@ This module provides functions for extracting search results and suggestions fro
 
 import re
 import json
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from urllib.parse import urljoin
 
+from ....common.extractors.structured_data import find_hydration_state, record_structured_extraction
 
-def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Dict[str, Any]:
+
+def extract_search_results(html_content: str, keyword: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """Extract search results from Makro search page HTML.
     
     Args:
         html_content: HTML content of the search page
         keyword: Search keyword used
         page: Page number
+        limit: Maximum number of results to extract (cards beyond it are not scanned)
         
     Returns:
         Dictionary containing search results and metadata
     """
+    start_time = time.perf_counter()
+    
     search_data = {
         "keyword": keyword,
         "page": page,
@@ -33,24 +39,25 @@ def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Di
     }
     
     # Try to extract structured search data from window.__INITIAL_STATE__
-    initial_state_match = re.search(r'window\.__INITIAL_STATE__\s*=\s*({.*?});', html_content, re.DOTALL)
-    if initial_state_match:
-        try:
-            initial_state = json.loads(initial_state_match.group(1))
-            if "search" in initial_state and isinstance(initial_state["search"], dict):
-                search_state = initial_state["search"]
-                search_data.update(_extract_from_search_state(search_state))
-        except (json.JSONDecodeError, ValueError) as e:
-            pass  # Continue with regular HTML extraction if JSON parsing fails
+    initial_state = find_hydration_state(html_content, "__INITIAL_STATE__")
+    if isinstance(initial_state, dict) and isinstance(initial_state.get("search"), dict):
+        search_data.update(_extract_from_search_state(initial_state["search"]))
+        if limit is not None:
+            search_data["results"] = search_data["results"][:limit]
+    
+    structured_hit = bool(search_data["results"])
     
     # If no results extracted from structured data, extract from HTML
-    if not search_data["results"]:
+    if not structured_hit:
         # Find all product cards in the search results
-        product_cards = re.findall(r'<div[^>]*class="[^"]*product-card[^"]*"[^>]*>(.*?)</div>\s*</div>\s*</div>', html_content, re.DOTALL)
+        product_cards = re.finditer(r'<div[^>]*class="[^"]*product-card[^"]*"[^>]*>(.*?)</div>\s*</div>\s*</div>', html_content, re.DOTALL)
         
         position = 1
-        for card in product_cards:
-            product = _extract_product_from_card(card, position)
+        for card_match in product_cards:
+            if limit is not None and len(search_data["results"]) >= limit:
+                break
+            
+            product = _extract_product_from_card(card_match.group(1), position)
             if product:
                 search_data["results"].append(product)
                 position += 1
@@ -86,6 +93,11 @@ def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Di
         else:
             search_data["result_count"] = len(search_data["results"])
     
+    record_structured_extraction(
+        "makro", "search", structured_hit, not structured_hit,
+        (time.perf_counter() - start_time) * 1000
+    )
+    
     return search_data
 
 
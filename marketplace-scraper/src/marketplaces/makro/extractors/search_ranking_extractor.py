@@ -12,7 +12,13 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from ....common.extractors.search_ranking_extractor import SearchRankingExtractor
+from ....common.extractors.search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
+from ....common.extractors.structured_data import find_hydration_state
+from .search_extractor import extract_search_results, _extract_from_search_state
+
+
+# Markup that only the DOM path can interpret (sponsored placement, sellers)
+_DOM_ONLY_MARKERS = re.compile(r'sponsored-label|promoted-product|product-seller|sold-by|class="[^"]*\bhighlight\b')
 
 
 class MakroSearchRankingExtractor(SearchRankingExtractor):
@@ -22,6 +28,8 @@ class MakroSearchRankingExtractor(SearchRankingExtractor):
     with specific handling of Makro's marketplace seller model and search result format.
     """
     
+    product_card_class = "product-item"
+    
     def __init__(self):
         """Initialize the Makro search ranking extractor."""
         super().__init__(marketplace_name="makro")
@@ -37,6 +45,49 @@ class MakroSearchRankingExtractor(SearchRankingExtractor):
             "marketplace_specific": 0.05  # Lower weight for marketplace-specific
         }
     
+    def _extract_structured_results(self, 
+                                  html_content: str, 
+                                  keyword: str, 
+                                  page: int) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """Extract ranked products from Makro's window.__INITIAL_STATE__.
+        
+        Args:
+            html_content: HTML content of the search page
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Tuple of total result count and products, or None to use the DOM
+        """
+        # Sponsored and seller markup is not represented in the state
+        if _DOM_ONLY_MARKERS.search(html_content):
+            return None
+        
+        initial_state = find_hydration_state(html_content, "__INITIAL_STATE__")
+        if not isinstance(initial_state, dict) or not isinstance(initial_state.get("search"), dict):
+            return None
+        
+        search_data = _extract_from_search_state(initial_state["search"])
+        if not search_data["results"]:
+            return None
+        
+        products = []
+        for result in search_data["results"]:
+            product = {key: result[key] for key in ("product_id", "url", "title", "brand", "price", "currency",
+                                                    "rating", "review_count") if key in result}
+            
+            if "was_price" in result:
+                product["original_price"] = result["was_price"]
+                product["on_sale"] = True
+            
+            if "image" in result:
+                product["image_url"] = result["image"]
+            
+            product["in_stock"] = result.get("availability", "in_stock") == "in_stock"
+            products.append(product)
+        
+        return search_data.get("result_count", len(products)), products
+    
     def _extract_total_results(self, soup: BeautifulSoup) -> int:
         """Extract total number of search results from Makro search page.
         
@@ -117,119 +168,158 @@ class MakroSearchRankingExtractor(SearchRankingExtractor):
         # Find all product items
         product_items = soup.select('.product-item')
         
-        for idx, item in enumerate(product_items):
-            product = {}
+        for item in product_items:
+            product = self._extract_ranked_product(item, keyword, page)
+            if product is not None:
+                products.append(product)
+        
+        return products
+    
+    def _extract_ranked_product(self, 
+                               item: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from a Makro search result card.
+        
+        Args:
+            item: Product card element
+            keyword: Search keyword
+            page: Page number
             
-            # Extract product URL and ID
-            link_element = item.select_one('.product-item-link')
-            if link_element and link_element.get('href'):
-                product_url = link_element['href']
-                product["url"] = product_url
-                
-                # Try to extract product ID
-                product_id_match = re.search(r'product/(\d+)', product_url)
-                if product_id_match:
-                    product["product_id"] = product_id_match.group(1)
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        product = {}
+        
+        # Extract product URL and ID
+        link_element = item.select_one('.product-item-link')
+        if link_element and link_element.get('href'):
+            product_url = link_element['href']
+            product["url"] = product_url
             
-            # Extract title
-            if link_element:
-                product["title"] = link_element.text.strip()
+            # Try to extract product ID
+            product_id_match = re.search(r'product/(\d+)', product_url)
+            if product_id_match:
+                product["product_id"] = product_id_match.group(1)
+        
+        # Extract title
+        if link_element:
+            product["title"] = link_element.text.strip()
+        
+        # Extract price
+        price_element = item.select_one('.price')
+        if price_element:
+            price_text = price_element.text.strip()
+            # Extract numeric price
+            price_match = re.search(r'R\s*(\d+[,.]?\d*)', price_text)
+            if price_match:
+                price_str = price_match.group(1).replace(',', '.')
+                try:
+                    product["price"] = float(price_str)
+                    product["currency"] = "ZAR"
+                except ValueError:
+                    pass
+        
+        # Check for special price or old price
+        special_price_element = item.select_one('.special-price .price')
+        old_price_element = item.select_one('.old-price .price')
+        
+        if special_price_element and old_price_element:
+            special_price_text = special_price_element.text.strip()
+            old_price_text = old_price_element.text.strip()
             
-            # Extract price
-            price_element = item.select_one('.price')
-            if price_element:
-                price_text = price_element.text.strip()
-                # Extract numeric price
-                price_match = re.search(r'R\s*(\d+[,.]?\d*)', price_text)
-                if price_match:
-                    price_str = price_match.group(1).replace(',', '.')
+            # Extract special price
+            special_match = re.search(r'R\s*(\d+[,.]?\d*)', special_price_text)
+            old_match = re.search(r'R\s*(\d+[,.]?\d*)', old_price_text)
+            
+            if special_match and old_match:
+                try:
+                    special_price = float(special_match.group(1).replace(',', '.'))
+                    old_price = float(old_match.group(1).replace(',', '.'))
+                    
+                    product["price"] = special_price
+                    product["original_price"] = old_price
+                    product["on_sale"] = True
+                except ValueError:
+                    pass
+        
+        # Extract image
+        img_element = item.select_one('.product-image-photo')
+        if img_element and img_element.get('src'):
+            product["image_url"] = img_element['src']
+        
+        # Extract rating if available
+        rating_element = item.select_one('.rating-summary')
+        if rating_element:
+            rating_value_element = rating_element.select_one('.rating-result')
+            if rating_value_element and 'title' in rating_value_element.attrs:
+                rating_title = rating_value_element['title']
+                rating_match = re.search(r'(\d+(\.\d+)?)%', rating_title)
+                if rating_match:
                     try:
-                        product["price"] = float(price_str)
-                        product["currency"] = "ZAR"
+                        # Convert percentage to 5-star scale
+                        percentage = float(rating_match.group(1))
+                        product["rating"] = round((percentage / 100) * 5, 1)
                     except ValueError:
                         pass
             
-            # Check for special price or old price
-            special_price_element = item.select_one('.special-price .price')
-            old_price_element = item.select_one('.old-price .price')
-            
-            if special_price_element and old_price_element:
-                special_price_text = special_price_element.text.strip()
-                old_price_text = old_price_element.text.strip()
-                
-                # Extract special price
-                special_match = re.search(r'R\s*(\d+[,.]?\d*)', special_price_text)
-                old_match = re.search(r'R\s*(\d+[,.]?\d*)', old_price_text)
-                
-                if special_match and old_match:
+            # Try to extract review count
+            review_count_element = item.select_one('.reviews-actions .action.view')
+            if review_count_element:
+                review_text = review_count_element.text.strip()
+                review_match = re.search(r'(\d+)', review_text)
+                if review_match:
                     try:
-                        special_price = float(special_match.group(1).replace(',', '.'))
-                        old_price = float(old_match.group(1).replace(',', '.'))
-                        
-                        product["price"] = special_price
-                        product["original_price"] = old_price
-                        product["on_sale"] = True
+                        product["review_count"] = int(review_match.group(1))
                     except ValueError:
                         pass
+        
+        # Check for stock status
+        stock_element = item.select_one('.stock')
+        if stock_element:
+            stock_text = stock_element.text.strip().lower()
+            product["in_stock"] = "in stock" in stock_text
+        else:
+            # Default to in stock if no indicator
+            product["in_stock"] = True
+        
+        # Check for badges or labels
+        promo_element = item.select_one('.label-promotion')
+        if promo_element:
+            product["badge"] = promo_element.text.strip()
             
-            # Extract image
-            img_element = item.select_one('.product-image-photo')
-            if img_element and img_element.get('src'):
-                product["image_url"] = img_element['src']
-            
-            # Extract rating if available
-            rating_element = item.select_one('.rating-summary')
-            if rating_element:
-                rating_value_element = rating_element.select_one('.rating-result')
-                if rating_value_element and 'title' in rating_value_element.attrs:
-                    rating_title = rating_value_element['title']
-                    rating_match = re.search(r'(\d+(\.\d+)?)%', rating_title)
-                    if rating_match:
-                        try:
-                            # Convert percentage to 5-star scale
-                            percentage = float(rating_match.group(1))
-                            product["rating"] = round((percentage / 100) * 5, 1)
-                        except ValueError:
-                            pass
-                
-                # Try to extract review count
-                review_count_element = item.select_one('.reviews-actions .action.view')
-                if review_count_element:
-                    review_text = review_count_element.text.strip()
-                    review_match = re.search(r'(\d+)', review_text)
-                    if review_match:
-                        try:
-                            product["review_count"] = int(review_match.group(1))
-                        except ValueError:
-                            pass
-            
-            # Check for stock status
-            stock_element = item.select_one('.stock')
-            if stock_element:
-                stock_text = stock_element.text.strip().lower()
-                product["in_stock"] = "in stock" in stock_text
-            else:
-                # Default to in stock if no indicator
-                product["in_stock"] = True
-            
-            # Check for badges or labels
-            promo_element = item.select_one('.label-promotion')
-            if promo_element:
-                product["badge"] = promo_element.text.strip()
-                
-            # Check for flags like "Makro choice" or "special"
-            flag_element = item.select_one('.product-flag')
-            if flag_element:
-                product["flag"] = flag_element.text.strip()
-                
-            # Check if sponsored
-            if self._detect_sponsored_result(product, item):
-                product["sponsored"] = True
+        # Check for flags like "Makro choice" or "special"
+        flag_element = item.select_one('.product-flag')
+        if flag_element:
+            product["flag"] = flag_element.text.strip()
             
-            # Add to products list
-            products.append(product)
+        # Check if sponsored
+        if self._detect_sponsored_result(product, item):
+            product["sponsored"] = True
         
-        return products
+        # Keep the card for seller and sponsored checks
+        product[PRODUCT_ELEMENT_KEY] = item
+        
+        return product
+    
+    def _extract_search_results(self, 
+                                html_content: str, 
+                                soup: Optional[BeautifulSoup], 
+                                keyword: str, 
+                                page: int) -> Optional[Dict[str, Any]]:
+        """Extract Makro search results for `analyze_search_page`.
+        
+        Args:
+            html_content: HTML content of the search page
+            soup: Parsed page, or None when ranking came from structured data
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Search results data
+        """
+        # The search extractor works on the raw HTML and needs no parse tree
+        return extract_search_results(html_content, keyword, page)
     
     def _extract_seller_count(self, 
                             product: Dict[str, Any], 
@@ -293,7 +383,7 @@ class MakroSearchRankingExtractor(SearchRankingExtractor):
                 return True
             
             # Check for Makro's highlighted products
-            if soup.select_one('.product-item.highlight'):
+            if 'highlight' in soup.get('class', []) or soup.select_one('.product-item.highlight'):
                 return True
         
         # Check badge data in product dict
@@ -23,6 +23,8 @@ from ...storage.repository import MarketplaceDataRepository
 from .extractors.product_extractor import extract_product_details
 from .extractors.search_extractor import extract_search_results, extract_search_suggestions
 from .extractors.category_extractor import extract_category_details
+from .extractors.deals_extractor import extract_deal_product_paths
+from .extractors.reviews_extractor import extract_reviews
 
 
 class MakroScraper(MarketplaceScraper):
@@ -192,11 +194,12 @@ class MakroScraper(MarketplaceScraper):
         # Assume it's a category slug
         return f"{self.category_base_url}/{category}?page={page}"
             
-    async def extract_product_details(self, product_id_or_url: str) -> Dict[str, Any]:
+    async def extract_product_details(self, product_id_or_url: str, save: bool = True) -> Dict[str, Any]:
         """Extract detailed product information from Makro.
         
         Args:
             product_id_or_url: Product ID, URL, or path
+            save: Whether to save the product to the repository
             
         Returns:
             Product details dictionary
@@ -265,7 +268,7 @@ class MakroScraper(MarketplaceScraper):
                 # Extract product data
                 if "content" in response:
                     # Use our specialized product extractor
-                    product_data = extract_product_details(response["content"], product_url)
+                    product_data = await self.run_extractor(extract_product_details, response["content"], product_url)
                     self.hybrid_performance["product_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for product {product_url}: {response}")
@@ -273,8 +276,9 @@ class MakroScraper(MarketplaceScraper):
             
             # Save product data to repository
             if product_data:
-                await self.storage_client.save_product(product_data)
-                self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
+                if save:
+                    await self.storage_client.save_product(product_data)
+                    self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
                 
                 # Update performance metrics
                 total_extractions = self.hybrid_performance["product_extraction"]["template"] + self.hybrid_performance["product_extraction"]["raw"]
@@ -572,7 +576,11 @@ class MakroScraper(MarketplaceScraper):
                 # Extract search data
                 if "content" in response:
                     # Use our specialized search extractor
-                    search_data = extract_search_results(response["content"], keyword, page)
+                    # Cards past the limit are not parsed; one extra result lets the
+                    # truncation below tell whether the page had more
+                    search_data = await self.run_extractor(
+                        extract_search_results, response["content"], keyword, page, limit + 1
+                    )
                     self.hybrid_performance["search_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for search '{keyword}': {response}")
@@ -690,6 +698,11 @@ class MakroScraper(MarketplaceScraper):
         Raises:
             NetworkError: If suggestions couldn't be fetched
         """
+        # Answer from fetched suggestions when they cover this prefix
+        cached = self._cached_search_suggestions(keyword_prefix)
+        if cached is not None:
+            return cached
+            
         try:
             # Build suggestions URL with API endpoint
             suggest_url = f"{self.suggest_url}?q={quote(keyword_prefix)}"
@@ -702,11 +715,12 @@ class MakroScraper(MarketplaceScraper):
             
             # Extract suggestions
             if "content" in response:
-                suggestion_data = extract_search_suggestions(response["content"], keyword_prefix)
+                suggestion_data = await self.run_extractor(extract_search_suggestions, response["content"], keyword_prefix)
                 
                 # Add metadata
                 suggestion_data["marketplace"] = self.marketplace_name
                 suggestion_data["timestamp"] = datetime.now().isoformat()
+                self._remember_search_suggestions(suggestion_data)
                 
                 # Save suggestions to repository
                 await self.storage_client.save_search_suggestions(suggestion_data)
@@ -761,7 +775,7 @@ class MakroScraper(MarketplaceScraper):
             # Extract category data
             if "content" in response:
                 # Use our specialized category extractor
-                category_data = extract_category_details(response["content"], category_url)
+                category_data = await self.run_extractor(extract_category_details, response["content"], category_url)
                 
                 # Add metadata
                 category_data["marketplace"] = self.marketplace_name
@@ -845,15 +859,12 @@ class MakroScraper(MarketplaceScraper):
                                     product_url = urljoin(self.base_url, product_url)
                                 
                                 # For each product, fetch complete details
-                                detailed_product = await self.extract_product_details(product_url)
+                                detailed_product = await self.extract_product_details(product_url, save=False)
                                 
                                 if detailed_product:
                                     # Mark as daily deal
                                     detailed_product["promotion"] = "Daily Deal"
                                     
-                                    # Save the updated product
-                                    await self.storage_client.save_product(detailed_product)
-                                    
                                     deal_products.append(detailed_product)
                             
                             template_success = True
@@ -881,33 +892,28 @@ class MakroScraper(MarketplaceScraper):
                     self.hybrid_performance["category_extraction"]["raw"] += 1
                     
                     # Extract product cards
-                    product_link_pattern = r'<a\s+[^>]*href="(/p/[^"]+)"[^>]*class="[^"]*product-card__link[^"]*"'
-                    product_paths = re.findall(product_link_pattern, html_content)
-                    
-                    # Alternative pattern if the first one doesn't work
-                    if not product_paths:
-                        product_link_pattern = r'<a\s+[^>]*href="(/p/[^"]+)"[^>]*>'
-                        product_paths = re.findall(product_link_pattern, html_content)
+                    product_paths = await self.run_extractor(extract_deal_product_paths, html_content)
                     
                     # Process each deal product
                     for path in product_paths:
                         product_url = f"{self.base_url}{path}"
                         
-                        # Extract the product details (this will also save it)
-                        product_data = await self.extract_product_details(product_url)
+                        # Extract the product details, saved below with the other deals
+                        product_data = await self.extract_product_details(product_url, save=False)
                         
                         if product_data:
                             # Mark as daily deal
                             product_data["promotion"] = "Daily Deal"
                             
-                            # Save the updated product
-                            await self.storage_client.save_product(product_data)
-                            
                             deal_products.append(product_data)
                 else:
                     self.logger.error(f"Invalid response for daily deals: {response}")
                     return []
             
+            # Save all deal products in a handful of batched writes
+            if deal_products:
+                await self.save_products_bulk(deal_products)
+            
             # Update performance metrics
             total_extractions = self.hybrid_performance["category_extraction"]["template"] + self.hybrid_performance["category_extraction"]["raw"]
             if total_extractions > 0:
@@ -1340,7 +1346,7 @@ class MakroScraper(MarketplaceScraper):
                     return result
                 except json.JSONDecodeError:
                     # Fallback to extracting from HTML content if the response isn't JSON
-                    reviews = self._extract_reviews_from_html(response["content"], product_id)
+                    reviews = await self.run_extractor(extract_reviews, response["content"])
                     self.logger.info(f"Extracted {len(reviews)} reviews from HTML for product {product_id}")
                     return {
                         "product_id": product_id,
@@ -1359,60 +1365,4 @@ class MakroScraper(MarketplaceScraper):
             raise
         except Exception as e:
             self.logger.error(f"Error extracting product reviews: {str(e)}")
-            raise
-    
-    def _extract_reviews_from_html(self, html_content: str, product_id: str) -> List[Dict[str, Any]]:
-        """Extract reviews from HTML content.
-        
-        Args:
-            html_content: HTML content with reviews
-            product_id: Product ID
-            
-        Returns:
-            List of review dictionaries
-        """
-        reviews = []
-        
-        # Pattern to match review blocks
-        review_block_pattern = r'<div[^>]*class="[^"]*review-item[^"]*"[^>]*>(.*?)</div>\s*</div>'
-        review_blocks = re.findall(review_block_pattern, html_content, re.DOTALL)
-        
-        for block in review_blocks:
-            # Extract review components
-            review = {}
-            
-            # Rating
-            rating_match = re.search(r'<div[^>]*class="[^"]*rating[^"]*"[^>]*data-rating="([^"]+)"', block)
-            if rating_match:
-                try:
-                    review["rating"] = float(rating_match.group(1))
-                except ValueError:
-                    review["rating"] = 0
-            
-            # Title
-            title_match = re.search(r'<h3[^>]*class="[^"]*review-title[^"]*"[^>]*>(.*?)</h3>', block, re.DOTALL)
-            if title_match:
-                review["title"] = title_match.group(1).strip()
-            
-            # Content
-            content_match = re.search(r'<div[^>]*class="[^"]*review-content[^"]*"[^>]*>(.*?)</div>', block, re.DOTALL)
-            if content_match:
-                review["content"] = content_match.group(1).strip()
-            
-            # Author
-            author_match = re.search(r'<span[^>]*class="[^"]*review-author[^"]*"[^>]*>(.*?)</span>', block, re.DOTALL)
-            if author_match:
-                review["author"] = author_match.group(1).strip()
-            else:
-                review["author"] = "Anonymous"
-            
-            # Date
-            date_match = re.search(r'<span[^>]*class="[^"]*review-date[^"]*"[^>]*>(.*?)</span>', block, re.DOTALL)
-            if date_match:
-                review["date"] = date_match.group(1).strip()
-            
-            # Only add reviews with at least content or rating
-            if review.get("content") or review.get("rating"):
-                reviews.append(review)
-        
-        return reviews
\ No newline at end of file
+            raise
\ No newline at end of file
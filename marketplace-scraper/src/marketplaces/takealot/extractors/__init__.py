@@ -5,12 +5,15 @@ This package provides specialized extractors for Takealot's website.
 """
 
 from .product_extractor import extract_product_details
-from .search_extractor import extract_search_results, extract_search_suggestions
+from .search_extractor import extract_search_results, extract_search_results_from_soup, extract_search_suggestions
 from .category_extractor import extract_category_details
+from .deals_extractor import extract_deal_product_paths
 
 __all__ = [
     'extract_product_details',
     'extract_search_results',
+    'extract_search_results_from_soup',
     'extract_search_suggestions',
-    'extract_category_details'
+    'extract_category_details',
+    'extract_deal_product_paths'
 ]
\ No newline at end of file
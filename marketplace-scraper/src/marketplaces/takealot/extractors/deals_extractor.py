@@ -0,0 +1,25 @@
+"""
+Deals extractor for Takealot marketplace.
+
+This module provides functions for extracting deal products from Takealot's
+daily deals page.
+"""
+
+import re
+from typing import List
+
+
+# Deal product cards reference their product page in data-ref
+PRODUCT_CARD_PATTERN = re.compile(r'<div[^>]*class="[^"]*product-card[^"]*"[^>]*data-ref="([^"]+)"')
+
+
+def extract_deal_product_paths(html_content: str) -> List[str]:
+    """Extract product paths from Takealot daily deals page HTML.
+    
+    Args:
+        html_content: HTML content of the daily deals page
+        
+    Returns:
+        Product page paths in page order
+    """
+    return [ref for ref in PRODUCT_CARD_PATTERN.findall(html_content) if "/PLID" in ref]
@@ -7,10 +7,39 @@ product detail pages.
 
 import re
 import json
+import time
 from typing import Dict, List, Any, Optional
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.selector_plan import SelectorPlan, PlanMatches
+from ....common.extractors.structured_data import iter_json_ld, record_structured_extraction
+
+
+# Selector plan compiled once at import; located in a single DOM walk
+PRODUCT_PLAN = SelectorPlan({
+    "title": ".pdp-title",
+    "description": ".pdp-description",
+    "current_price": ".currency-module_currency_29IIm .amount",
+    "list_price": ".pdp-show-desktop del",
+    "gallery_images": ".pdp-images-module_slider-list_R6wFj img",
+    "main_image": ".pdp-images-module_slider-container_1FWu1 img",
+    "spec_sections": ".pdp-specifications-module_section_1TbAF",
+    "brand_crumb": '.pdp-breadcrumb-module_crumb_5qpA6[href*="/brand/"]',
+    "breadcrumbs": ".pdp-breadcrumb-module_crumb_5qpA6",
+    "seller": ".pdp-marketplace-seller-module_name_y9-wg",
+    "rating": ".review-module_star-rating-container_jlVJL .review-rating",
+    "review_count": ".review-module_star-rating-container_jlVJL .review-count",
+    "variant_containers": ".pdp-select-a-variant-module_container_3YtFX",
+    "out_of_stock": ".pdp-out-of-stock-module_container_1B85s",
+    "add_to_cart": ".add-to-cart-button",
+    "stock_level": ".stock-availability-module_stock-level_28kjG",
+    "free_delivery": ".free-delivery",
+    "delivery": ".pdp-fulfillment-information-module_container_1jexO",
+    "daily_deal": ".pdp-deal-badge-module_daily-deal_1kUdX",
+    "promotion": ".pdp-promotion-module_container_1psoO",
+})
+
 
 def extract_product_details(html_content: str, product_url: str) -> Dict[str, Any]:
     """Extract product details from Takealot product page HTML.
@@ -22,8 +51,7 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
     Returns:
         Product data dictionary
     """
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    start_time = time.perf_counter()
     
     # Create product data dictionary
     product_data = {
@@ -44,41 +72,46 @@ def extract_product_details(html_content: str, product_url: str) -> Dict[str, An
             # No product ID found, cannot proceed
             return {}
     
-    # Extract basic product info
-    _extract_basic_info(soup, product_data)
-    
-    # Extract pricing information
-    _extract_pricing(soup, product_data)
-    
-    # Extract images
-    _extract_images(soup, product_data)
-    
-    # Extract specifications
-    _extract_specifications(soup, product_data)
-    
-    # Extract brand
-    _extract_brand(soup, product_data)
-    
-    # Extract categories
-    _extract_categories(soup, product_data)
-    
-    # Extract seller
-    _extract_seller(soup, product_data)
-    
-    # Extract ratings and reviews
-    _extract_ratings(soup, product_data)
-    
-    # Extract variant info
-    _extract_variants(soup, product_data)
-    
-    # Extract stock status
-    _extract_stock_status(soup, product_data)
-    
-    # Extract shipping info
-    _extract_shipping_info(soup, product_data)
+    # Fast path: embedded JSON-LD, decoded without parsing the page
+    structured_hit = _extract_from_json_ld(html_content, product_data)
+    
+    # DOM helpers in dependency order, with the (key, plan field) pairs they
+    # fill; a helper runs if one of its keys is missing and its field exists
+    dom_extractors = [
+        (_extract_basic_info, (("title", "title"), ("description", "description"))),
+        (_extract_pricing, (("price", "current_price"), ("list_price", "list_price"))),
+        (_extract_images, (("images", "gallery_images"), ("images", "main_image"))),
+        (_extract_specifications, (("specifications", "spec_sections"),)),
+        (_extract_brand, (("brand", "spec_sections"), ("brand", "brand_crumb"))),
+        (_extract_categories, (("categories", "breadcrumbs"),)),
+        (_extract_seller, (("seller", "seller"),)),
+        (_extract_ratings, (("rating", "rating"), ("review_count", "review_count"))),
+        (_extract_variants, (("variants", "variant_containers"),)),
+        (_extract_stock_status, (("in_stock", "out_of_stock"), ("in_stock", "add_to_cart"),
+                                 ("stock_level", "stock_level"))),
+        (_extract_shipping_info, (("shipping_info", "free_delivery"), ("shipping_info", "delivery"))),
+        (_extract_promotions, (("promotion", "daily_deal"), ("promotion", "promotion"))),
+    ]
+    
+    # Only fall through to the DOM for missing fields present in the markup
+    pending = [
+        extractor for extractor, fields in dom_extractors
+        if any(key not in product_data and PRODUCT_PLAN.may_match(field, html_content)
+               for key, field in fields)
+    ]
+    
+    if pending:
+        # Parse HTML and locate every field's elements in one walk
+        soup = parse_html(html_content)
+        matches = PRODUCT_PLAN.match(soup)
+        
+        for extractor in pending:
+            extractor(matches, product_data)
     
-    # Extract promotions
-    _extract_promotions(soup, product_data)
+    record_structured_extraction(
+        "takealot", "product", structured_hit, bool(pending),
+        (time.perf_counter() - start_time) * 1000
+    )
     
     return product_data
 
@@ -105,33 +138,128 @@ def _extract_product_id(product_url: str) -> Optional[str]:
     return None
 
 
-def _extract_basic_info(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_from_json_ld(html_content: str, product_data: Dict[str, Any]) -> bool:
+    """Extract product fields from embedded JSON-LD.
+    
+    Args:
+        html_content: HTML content of the product page
+        product_data: Product data dictionary to update
+        
+    Returns:
+        True if any fields were extracted
+    """
+    found = False
+    
+    for item in iter_json_ld(html_content):
+        item_type = item.get("@type")
+        
+        if item_type == "Product":
+            if item.get("name"):
+                product_data["title"] = item["name"].strip()
+            if item.get("description"):
+                product_data["description"] = item["description"].strip()
+            
+            # Offer price and availability
+            offers = item.get("offers")
+            if isinstance(offers, list):
+                offers = offers[0] if offers else None
+            if isinstance(offers, dict):
+                try:
+                    product_data["price"] = float(offers["price"])
+                    product_data["currency"] = offers.get("priceCurrency", "ZAR")
+                except (KeyError, ValueError, TypeError):
+                    pass
+                
+                availability = offers.get("availability", "")
+                if "InStock" in availability:
+                    product_data["in_stock"] = True
+                elif "OutOfStock" in availability:
+                    product_data["in_stock"] = False
+            
+            # Images
+            images = item.get("image")
+            if isinstance(images, str):
+                images = [images]
+            if isinstance(images, list) and images:
+                product_data["images"] = images
+                product_data["main_image"] = images[0]
+            
+            # Brand
+            brand = item.get("brand")
+            if isinstance(brand, dict):
+                brand = brand.get("name")
+            if isinstance(brand, str) and brand.strip():
+                product_data["brand"] = brand.strip()
+            
+            # Ratings
+            rating = item.get("aggregateRating")
+            if isinstance(rating, dict):
+                try:
+                    product_data["rating"] = float(rating["ratingValue"])
+                except (KeyError, ValueError, TypeError):
+                    pass
+                try:
+                    product_data["review_count"] = int(rating.get("reviewCount", rating.get("ratingCount")))
+                except (ValueError, TypeError):
+                    pass
+            
+            found = True
+        
+        elif item_type == "BreadcrumbList":
+            categories = []
+            category_ids = []
+            
+            elements = sorted(item.get("itemListElement", []), key=lambda e: e.get("position", 0))
+            for element in elements[1:]:  # Skip first (Home)
+                crumb = element.get("item")
+                href = crumb.get("@id", "") if isinstance(crumb, dict) else (crumb or "")
+                name = element.get("name") or (crumb.get("name") if isinstance(crumb, dict) else None)
+                
+                # Skip brand crumbs
+                if not name or 'brand/' in href:
+                    continue
+                
+                categories.append(name.strip())
+                cat_id_match = re.search(r'Categories/(\d+)', href)
+                if cat_id_match:
+                    category_ids.append(cat_id_match.group(1))
+            
+            if categories:
+                product_data["categories"] = categories
+                found = True
+            if category_ids:
+                product_data["category_ids"] = category_ids
+    
+    return found
+
+
+def _extract_basic_info(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract basic product information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Extract title
-    title_element = soup.select_one('.pdp-title')
+    title_element = matches.first("title")
     if title_element:
         product_data["title"] = title_element.text.strip()
     
     # Extract description
-    description_element = soup.select_one('.pdp-description')
+    description_element = matches.first("description")
     if description_element:
         product_data["description"] = description_element.text.strip()
     
 
-def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_pricing(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract pricing information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Current price
-    current_price_element = soup.select_one('.currency-module_currency_29IIm .amount')
+    current_price_element = matches.first("current_price")
     if current_price_element:
         price_text = current_price_element.text.strip().replace('R', '').replace(',', '')
         try:
@@ -141,7 +269,7 @@ def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
     
     # List price
-    list_price_element = soup.select_one('.pdp-show-desktop del')
+    list_price_element = matches.first("list_price")
     if list_price_element:
         list_price_text = list_price_element.text.strip().replace('R', '').replace(',', '')
         try:
@@ -155,17 +283,17 @@ def _extract_pricing(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
 
 
-def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_images(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product images.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     images = []
     
     # Try to find images in gallery
-    image_elements = soup.select('.pdp-images-module_slider-list_R6wFj img')
+    image_elements = matches.all("gallery_images")
     for img in image_elements:
         if img.get('src'):
             src = img['src']
@@ -175,7 +303,7 @@ def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
     
     # If no images found in gallery, try main product image
     if not images:
-        main_image = soup.select_one('.pdp-images-module_slider-container_1FWu1 img')
+        main_image = matches.first("main_image")
         if main_image and main_image.get('src'):
             src = main_image['src']
             # Convert thumbnail URL to full-size URL
@@ -187,17 +315,17 @@ def _extract_images(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
         product_data["main_image"] = images[0]
 
 
-def _extract_specifications(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_specifications(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product specifications.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     specs = {}
     
     # Find specification sections
-    spec_sections = soup.select('.pdp-specifications-module_section_1TbAF')
+    spec_sections = matches.all("spec_sections")
     for section in spec_sections:
         # Find all specification rows
         rows = section.select('.detail-row')
@@ -217,11 +345,11 @@ def _extract_specifications(soup: BeautifulSoup, product_data: Dict[str, Any]) -
         product_data["specifications"] = specs
 
 
-def _extract_brand(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_brand(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product brand.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Try to find brand in specifications
@@ -230,23 +358,23 @@ def _extract_brand(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
         return
     
     # Try to find brand in breadcrumb
-    brand_element = soup.select_one('.pdp-breadcrumb-module_crumb_5qpA6[href*="/brand/"]')
+    brand_element = matches.first("brand_crumb")
     if brand_element:
         product_data["brand"] = brand_element.text.strip()
 
 
-def _extract_categories(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_categories(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product categories.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     categories = []
     category_ids = []
     
     # Extract from breadcrumbs
-    breadcrumbs = soup.select('.pdp-breadcrumb-module_crumb_5qpA6')
+    breadcrumbs = matches.all("breadcrumbs")
     for crumb in breadcrumbs[1:]:  # Skip first (Home)
         category_name = crumb.text.strip()
         href = crumb.get('href', '')
@@ -270,14 +398,14 @@ def _extract_categories(soup: BeautifulSoup, product_data: Dict[str, Any]) -> No
         product_data["category_ids"] = category_ids
 
 
-def _extract_seller(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_seller(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract seller information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
-    seller_element = soup.select_one('.pdp-marketplace-seller-module_name_y9-wg')
+    seller_element = matches.first("seller")
     if seller_element:
         product_data["seller"] = seller_element.text.strip()
         
@@ -288,15 +416,15 @@ def _extract_seller(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             product_data["is_marketplace"] = False
 
 
-def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_ratings(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract ratings and reviews.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Extract rating score
-    rating_element = soup.select_one('.review-module_star-rating-container_jlVJL .review-rating')
+    rating_element = matches.first("rating")
     if rating_element:
         rating_text = rating_element.text.strip().split('/')[0]
         try:
@@ -305,7 +433,7 @@ def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
     
     # Extract review count
-    review_count_element = soup.select_one('.review-module_star-rating-container_jlVJL .review-count')
+    review_count_element = matches.first("review_count")
     if review_count_element:
         review_text = review_count_element.text.strip().replace('(', '').replace(')', '')
         try:
@@ -314,17 +442,17 @@ def _extract_ratings(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
             pass
 
 
-def _extract_variants(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_variants(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract product variants.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     variants = []
     
     # Find variant selectors
-    variant_containers = soup.select('.pdp-select-a-variant-module_container_3YtFX')
+    variant_containers = matches.all("variant_containers")
     if not variant_containers:
         return
         
@@ -358,26 +486,26 @@ def _extract_variants(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None
         product_data["variants"] = variants
 
 
-def _extract_stock_status(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_stock_status(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract stock availability status.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Check for out of stock indicator
-    out_of_stock = soup.select_one('.pdp-out-of-stock-module_container_1B85s')
+    out_of_stock = matches.first("out_of_stock")
     if out_of_stock:
         product_data["in_stock"] = False
         return
     
     # Check for "add to cart" button (indicates in stock)
-    add_to_cart = soup.select_one('.add-to-cart-button')
+    add_to_cart = matches.first("add_to_cart")
     if add_to_cart:
         product_data["in_stock"] = True
     
     # Try to extract stock level
-    stock_level_element = soup.select_one('.stock-availability-module_stock-level_28kjG')
+    stock_level_element = matches.first("stock_level")
     if stock_level_element:
         stock_text = stock_level_element.text.strip()
         
@@ -390,22 +518,22 @@ def _extract_stock_status(soup: BeautifulSoup, product_data: Dict[str, Any]) ->
                 pass
 
 
-def _extract_shipping_info(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_shipping_info(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract shipping information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     shipping_info = {}
     
     # Check for free delivery
-    free_delivery = soup.select_one('.free-delivery')
+    free_delivery = matches.first("free_delivery")
     if free_delivery:
         shipping_info["free_shipping"] = True
     
     # Extract delivery time
-    delivery_element = soup.select_one('.pdp-fulfillment-information-module_container_1jexO')
+    delivery_element = matches.first("delivery")
     if delivery_element:
         delivery_text = delivery_element.text.strip()
         shipping_info["delivery_time"] = delivery_text
@@ -414,19 +542,19 @@ def _extract_shipping_info(soup: BeautifulSoup, product_data: Dict[str, Any]) ->
         product_data["shipping_info"] = shipping_info
 
 
-def _extract_promotions(soup: BeautifulSoup, product_data: Dict[str, Any]) -> None:
+def _extract_promotions(matches: PlanMatches, product_data: Dict[str, Any]) -> None:
     """Extract promotion information.
     
     Args:
-        soup: BeautifulSoup object
+        matches: Elements located by PRODUCT_PLAN
         product_data: Product data dictionary to update
     """
     # Check for Daily Deal
-    daily_deal = soup.select_one('.pdp-deal-badge-module_daily-deal_1kUdX')
+    daily_deal = matches.first("daily_deal")
     if daily_deal:
         product_data["promotion"] = "Daily Deal"
     
     # Check for other promotions
-    promo_element = soup.select_one('.pdp-promotion-module_container_1psoO')
+    promo_element = matches.first("promotion")
     if promo_element and not product_data.get("promotion"):
         product_data["promotion"] = promo_element.text.strip()
\ No newline at end of file
@@ -7,24 +7,65 @@ from Takealot's search pages.
 
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from bs4 import BeautifulSoup
 
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.streaming import ElementStream
 
-def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Dict[str, Any]:
+
+# Class of a search result card
+PRODUCT_CARD_CLASS = "product-card"
+
+
+def extract_search_results(html_content: str, keyword: str, page: int = 1, limit: Optional[int] = None) -> Dict[str, Any]:
     """Extract search results from Takealot search page HTML.
     
+    With a limit, product cards are streamed and cards beyond the limit are
+    never parsed.
+    
     Args:
         html_content: HTML content of the search page
         keyword: Search keyword
         page: Page number
+        limit: Maximum number of results to extract
+        
+    Returns:
+        Search results dictionary
+    """
+    if limit is None:
+        return extract_search_results_from_soup(parse_html(html_content), keyword, page)
+    
+    stream = ElementStream(html_content, PRODUCT_CARD_CLASS)
+    return _build_search_data(stream.page, stream.iter_elements(limit), keyword, page)
+
+
+def extract_search_results_from_soup(soup: BeautifulSoup, keyword: str, page: int = 1) -> Dict[str, Any]:
+    """Extract search results from an already parsed Takealot search page.
+    
+    Args:
+        soup: Parsed search page
+        keyword: Search keyword
+        page: Page number
         
     Returns:
         Search results dictionary
     """
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    return _build_search_data(soup, soup.select(f'.{PRODUCT_CARD_CLASS}'), keyword, page)
+
+
+def _build_search_data(soup: BeautifulSoup, product_cards: Iterable[Any], keyword: str, page: int) -> Dict[str, Any]:
+    """Build search results from page-level markup and product cards.
     
+    Args:
+        soup: Parsed search page (product cards may be removed)
+        product_cards: Product card elements in page order
+        keyword: Search keyword
+        page: Page number
+        
+    Returns:
+        Search results dictionary
+    """
     # Create search results dictionary
     search_data = {
         "keyword": keyword,
@@ -37,7 +78,7 @@ def extract_search_results(html_content: str, keyword: str, page: int = 1) -> Di
     _extract_total_results(soup, search_data)
     
     # Extract search results
-    _extract_results(soup, search_data)
+    _extract_results(product_cards, search_data)
     
     # Extract result count for this page
     search_data["result_count"] = len(search_data["results"])
@@ -108,16 +149,13 @@ def _extract_total_results(soup: BeautifulSoup, search_data: Dict[str, Any]) ->
                 pass
 
 
-def _extract_results(soup: BeautifulSoup, search_data: Dict[str, Any]) -> None:
+def _extract_results(product_cards: Iterable[Any], search_data: Dict[str, Any]) -> None:
     """Extract search result items.
     
     Args:
-        soup: BeautifulSoup object
+        product_cards: Product card elements in page order
         search_data: Search data dictionary to update
     """
-    # Find product cards
-    product_cards = soup.select('.product-card')
-    
     for i, card in enumerate(product_cards):
         result = {"position": i + 1}
         
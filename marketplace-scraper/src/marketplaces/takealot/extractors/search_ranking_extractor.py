@@ -11,7 +11,9 @@ from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 
-from ....common.extractors.search_ranking_extractor import SearchRankingExtractor
+from ....common.extractors.html_parser import parse_html
+from ....common.extractors.search_ranking_extractor import SearchRankingExtractor, PRODUCT_ELEMENT_KEY
+from .search_extractor import extract_search_results_from_soup
 
 
 class TakealotSearchRankingExtractor(SearchRankingExtractor):
@@ -21,6 +23,8 @@ class TakealotSearchRankingExtractor(SearchRankingExtractor):
     with specific handling of Takealot's marketplace seller model and search result format.
     """
     
+    product_card_class = "product-card"
+    
     def __init__(self):
         """Initialize the Takealot search ranking extractor."""
         super().__init__(marketplace_name="takealot")
@@ -82,78 +86,118 @@ class TakealotSearchRankingExtractor(SearchRankingExtractor):
         
         results = []
         for card in product_cards:
-            product = {}
-            
-            # Extract product ID and URL
-            product_ref = card.get('data-ref', '')
-            if product_ref:
-                product["url"] = f"https://www.takealot.com{product_ref}"
-                
-                # Extract product ID from URL
-                plid_match = re.search(r'PLID(\d+)', product_ref)
-                if plid_match:
-                    product["product_id"] = plid_match.group(1)
-            
-            # Extract title
-            title_element = card.select_one('.product-title')
-            if title_element:
-                product["title"] = title_element.text.strip()
+            product = self._extract_ranked_product(card, keyword, page)
+            if product is not None:
+                results.append(product)
+        
+        return results
+    
+    def _extract_ranked_product(self, 
+                               card: BeautifulSoup, 
+                               keyword: str, 
+                               page: int) -> Optional[Dict[str, Any]]:
+        """Extract a ranked product from a Takealot search result card.
+        
+        Args:
+            card: Product card element
+            keyword: Search keyword
+            page: Page number
             
-            # Extract image
-            image_element = card.select_one('.product-image img')
-            if image_element and image_element.get('src'):
-                # Convert thumbnail URL to full-size URL
-                src = image_element['src']
-                src = re.sub(r'[_-]\d+x\d+', '', src)
-                product["image_url"] = src
+        Returns:
+            Product data dictionary, or None if the card is not a product
+        """
+        product = {}
+        
+        # Extract product ID and URL
+        product_ref = card.get('data-ref', '')
+        if product_ref:
+            product["url"] = f"https://www.takealot.com{product_ref}"
             
-            # Extract price
-            price_element = card.select_one('.currency-module_currency_29IIm .amount')
-            if price_element:
-                price_text = price_element.text.strip().replace('R', '').replace(',', '')
-                try:
-                    product["price"] = float(price_text)
-                    product["currency"] = "ZAR"
-                except ValueError:
-                    pass
+            # Extract product ID from URL
+            plid_match = re.search(r'PLID(\d+)', product_ref)
+            if plid_match:
+                product["product_id"] = plid_match.group(1)
+        
+        # Extract title
+        title_element = card.select_one('.product-title')
+        if title_element:
+            product["title"] = title_element.text.strip()
+        
+        # Extract image
+        image_element = card.select_one('.product-image img')
+        if image_element and image_element.get('src'):
+            # Convert thumbnail URL to full-size URL
+            src = image_element['src']
+            src = re.sub(r'[_-]\d+x\d+', '', src)
+            product["image_url"] = src
+        
+        # Extract price
+        price_element = card.select_one('.currency-module_currency_29IIm .amount')
+        if price_element:
+            price_text = price_element.text.strip().replace('R', '').replace(',', '')
+            try:
+                product["price"] = float(price_text)
+                product["currency"] = "ZAR"
+            except ValueError:
+                pass
+        
+        # Extract rating
+        rating_element = card.select_one('.star-rating-module_star-rating_2XDgZ')
+        if rating_element:
+            rating_text = rating_element.text.strip().split('/')[0]
+            try:
+                product["rating"] = float(rating_text)
+            except ValueError:
+                pass
             
-            # Extract rating
-            rating_element = card.select_one('.star-rating-module_star-rating_2XDgZ')
-            if rating_element:
-                rating_text = rating_element.text.strip().split('/')[0]
+            # Extract review count
+            review_count_element = card.select_one('.star-rating-module_star-rating_2XDgZ .review-count')
+            if review_count_element:
+                review_text = review_count_element.text.strip().replace('(', '').replace(')', '')
                 try:
-                    product["rating"] = float(rating_text)
+                    product["review_count"] = int(review_text)
                 except ValueError:
                     pass
-                
-                # Extract review count
-                review_count_element = card.select_one('.star-rating-module_star-rating_2XDgZ .review-count')
-                if review_count_element:
-                    review_text = review_count_element.text.strip().replace('(', '').replace(')', '')
-                    try:
-                        product["review_count"] = int(review_text)
-                    except ValueError:
-                        pass
-            
-            # Check if product is sponsored
-            sponsored_element = card.select_one('.sponsored-wrapper')
-            if sponsored_element:
-                product["sponsored"] = True
-            
-            # Extract badges
-            badge_element = card.select_one('.badges-module_badge_3o1o2')
-            if badge_element:
-                product["badge"] = badge_element.text.strip()
-            
-            # Extract brand
-            brand_element = card.select_one('.product-card-module_merchant_2NxG5')
-            if brand_element:
-                product["brand"] = brand_element.text.strip()
-            
-            # Add to results
-            results.append(product)
         
-        return results
+        # Check if product is sponsored
+        sponsored_element = card.select_one('.sponsored-wrapper')
+        if sponsored_element:
+            product["sponsored"] = True
+        
+        # Extract badges
+        badge_element = card.select_one('.badges-module_badge_3o1o2')
+        if badge_element:
+            product["badge"] = badge_element.text.strip()
+        
+        # Extract brand
+        brand_element = card.select_one('.product-card-module_merchant_2NxG5')
+        if brand_element:
+            product["brand"] = brand_element.text.strip()
+        
+        # Keep the card for seller and sponsored checks
+        product[PRODUCT_ELEMENT_KEY] = card
+        
+        return product
+    
+    def _extract_search_results(self, 
+                                html_content: str, 
+                                soup: Optional[BeautifulSoup], 
+                                keyword: str, 
+                                page: int) -> Optional[Dict[str, Any]]:
+        """Extract Takealot search results for `analyze_search_page`.
+        
+        Args:
+            html_content: HTML content of the search page
+            soup: Parsed page, or None when ranking came from structured data
+            keyword: Search keyword
+            page: Page number
+            
+        Returns:
+            Search results data
+        """
+        if soup is None:
+            soup = parse_html(html_content)
+        return extract_search_results_from_soup(soup, keyword, page)
     
     def _extract_seller_count(self, 
                             product: Dict[str, Any], 
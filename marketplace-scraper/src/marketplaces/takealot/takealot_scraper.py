@@ -23,6 +23,7 @@ from ...storage.repository import MarketplaceDataRepository
 from .extractors.product_extractor import extract_product_details
 from .extractors.search_extractor import extract_search_results, extract_search_suggestions
 from .extractors.category_extractor import extract_category_details
+from .extractors.deals_extractor import extract_deal_product_paths
 
 
 class TakealotScraper(MarketplaceScraper):
@@ -178,11 +179,12 @@ class TakealotScraper(MarketplaceScraper):
         # Assume it's a category name/path slug
         return f"{self.category_base_url}/{category}?page={page}"
             
-    async def extract_product_details(self, product_id_or_url: str) -> Dict[str, Any]:
+    async def extract_product_details(self, product_id_or_url: str, save: bool = True) -> Dict[str, Any]:
         """Extract detailed product information from Takealot.
         
         Args:
             product_id_or_url: Product PLID, URL, or path
+            save: Whether to save the product to the repository
             
         Returns:
             Product details dictionary
@@ -251,7 +253,7 @@ class TakealotScraper(MarketplaceScraper):
                 # Extract product data
                 if "content" in response:
                     # Use our specialized product extractor
-                    product_data = extract_product_details(response["content"], product_url)
+                    product_data = await self.run_extractor(extract_product_details, response["content"], product_url)
                     self.hybrid_performance["product_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for product {product_url}: {response}")
@@ -259,8 +261,9 @@ class TakealotScraper(MarketplaceScraper):
             
             # Save product data to repository
             if product_data:
-                await self.storage_client.save_product(product_data)
-                self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
+                if save:
+                    await self.storage_client.save_product(product_data)
+                    self.logger.info(f"Extracted and saved product {product_data.get('product_id')}")
                 
                 # Update performance metrics
                 total_extractions = self.hybrid_performance["product_extraction"]["template"] + self.hybrid_performance["product_extraction"]["raw"]
@@ -505,7 +508,11 @@ class TakealotScraper(MarketplaceScraper):
                 # Extract search data
                 if "content" in response:
                     # Use our specialized search extractor
-                    search_data = extract_search_results(response["content"], keyword, page)
+                    # Cards past the limit are not parsed; one extra result lets the
+                    # truncation below tell whether the page had more
+                    search_data = await self.run_extractor(
+                        extract_search_results, response["content"], keyword, page, limit + 1
+                    )
                     self.hybrid_performance["search_extraction"]["raw"] += 1
                 else:
                     self.logger.error(f"Invalid response for search '{keyword}': {response}")
@@ -623,6 +630,11 @@ class TakealotScraper(MarketplaceScraper):
         Raises:
             NetworkError: If suggestions couldn't be fetched
         """
+        # Answer from fetched suggestions when they cover this prefix
+        cached = self._cached_search_suggestions(keyword_prefix)
+        if cached is not None:
+            return cached
+            
         try:
             # Build suggestions URL
             suggest_url = f"{self.suggest_url}?search_term={quote(keyword_prefix)}"
@@ -635,11 +647,12 @@ class TakealotScraper(MarketplaceScraper):
             
             # Extract suggestions
             if "content" in response:
-                suggestion_data = extract_search_suggestions(response["content"], keyword_prefix)
+                suggestion_data = await self.run_extractor(extract_search_suggestions, response["content"], keyword_prefix)
                 
                 # Add metadata
                 suggestion_data["marketplace"] = self.marketplace_name
                 suggestion_data["timestamp"] = datetime.now().isoformat()
+                self._remember_search_suggestions(suggestion_data)
                 
                 # Save suggestions to repository
                 await self.storage_client.save_search_suggestions(suggestion_data)
@@ -694,7 +707,7 @@ class TakealotScraper(MarketplaceScraper):
             # Extract category data
             if "content" in response:
                 # Use our specialized category extractor
-                category_data = extract_category_details(response["content"], category_url)
+                category_data = await self.run_extractor(extract_category_details, response["content"], category_url)
                 
                 # Add metadata
                 category_data["marketplace"] = self.marketplace_name
@@ -778,15 +791,12 @@ class TakealotScraper(MarketplaceScraper):
                                     product_url = urljoin(self.base_url, product_url)
                                 
                                 # For each product, fetch complete details
-                                detailed_product = await self.extract_product_details(product_url)
+                                detailed_product = await self.extract_product_details(product_url, save=False)
                                 
                                 if detailed_product:
                                     # Mark as daily deal
                                     detailed_product["promotion"] = "Daily Deal"
                                     
-                                    # Save the updated product
-                                    await self.storage_client.save_product(detailed_product)
-                                    
                                     deal_products.append(detailed_product)
                             
                             template_success = True
@@ -814,29 +824,28 @@ class TakealotScraper(MarketplaceScraper):
                     self.hybrid_performance["category_extraction"]["raw"] += 1
                     
                     # Extract product cards
-                    product_card_pattern = r'<div[^>]*class="[^"]*product-card[^"]*"[^>]*data-ref="([^"]+)"'
-                    product_refs = re.findall(product_card_pattern, html_content)
+                    product_refs = await self.run_extractor(extract_deal_product_paths, html_content)
                     
                     # Process each deal product
                     for ref in product_refs:
-                        if "/PLID" in ref:
-                            product_url = f"{self.product_base_url}{ref}"
-                            
-                            # Extract the product details (this will also save it)
-                            product_data = await self.extract_product_details(product_url)
+                        product_url = f"{self.product_base_url}{ref}"
+                        
+                        # Extract the product details, saved below with the other deals
+                        product_data = await self.extract_product_details(product_url, save=False)
+                        
+                        if product_data:
+                            # Mark as daily deal
+                            product_data["promotion"] = "Daily Deal"
                             
-                            if product_data:
-                                # Mark as daily deal
-                                product_data["promotion"] = "Daily Deal"
-                                
-                                # Save the updated product
-                                await self.storage_client.save_product(product_data)
-                                
-                                deal_products.append(product_data)
+                            deal_products.append(product_data)
                 else:
                     self.logger.error(f"Invalid response for daily deals: {response}")
                     return []
             
+            # Save all deal products in a handful of batched writes
+            if deal_products:
+                await self.save_products_bulk(deal_products)
+            
             # Update performance metrics
             total_extractions = self.hybrid_performance["category_extraction"]["template"] + self.hybrid_performance["category_extraction"]["raw"]
             if total_extractions > 0:
@@ -1160,9 +1169,9 @@ class TakealotScraper(MarketplaceScraper):
                 # Remove the brand from the title to avoid redundancy
                 simplified_title = re.sub(rf'{re.escape(product_brand)}\s+', '', product_title, flags=re.IGNORECASE)
                 
-                # Extract key words from title (remove common filler words)
+                # Extract key words from title (remove stop words)
                 key_words = [word for word in simplified_title.split() 
-                            if len(word) > 3 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 3 and not self.keyword_classifier.is_stop_word(word)]
                 
                 # Take first 3-4 key words for more focused search
                 title_keywords = ' '.join(key_words[:min(4, len(key_words))])
@@ -1174,7 +1183,7 @@ class TakealotScraper(MarketplaceScraper):
             if not search_keywords:
                 # Extract key words from title
                 key_words = [word for word in product_title.split() 
-                            if len(word) > 3 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 3 and not self.keyword_classifier.is_stop_word(word)]
                 
                 # Take first 5-6 key words for more focused search
                 title_keywords = ' '.join(key_words[:min(6, len(key_words))])
@@ -1188,7 +1197,7 @@ class TakealotScraper(MarketplaceScraper):
                 
                 # Extract 2-3 key attributes from title
                 key_attrs = [word for word in product_title.split() 
-                            if len(word) > 4 and word.lower() not in ['with', 'plus', 'and', 'for', 'the']]
+                            if len(word) > 4 and not self.keyword_classifier.is_stop_word(word)]
                 
                 if key_attrs:
                     attr_keywords = ' '.join(key_attrs[:min(3, len(key_attrs))])
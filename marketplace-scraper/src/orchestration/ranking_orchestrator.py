@@ -16,6 +16,7 @@ from typing import Dict, List, Any, Optional, Union, Callable
 from ..common import MarketplaceScraper
 from ..common.alert_integration import AlertIntegration
 from ..common.credit_integration import KeywordResearchCreditManager
+from ..storage.cache import BoundedCache
 from .task_scheduler import TaskScheduler
 
 # Set up logging
@@ -50,8 +51,13 @@ class RankingOrchestrator:
         
         # Task tracking
         self.research_tasks = {}  # Map of operation_id to task_ids
-        self.keyword_cache = {}   # Simple in-memory cache
         self.cache_ttl = 7 * 24 * 60 * 60  # 7 days in seconds
+        self.keyword_cache = BoundedCache(
+            "orchestrator.keywords",
+            max_entries=5000,
+            max_bytes=64 * 1024 * 1024,
+            ttl=self.cache_ttl
+        )
         
     async def research_keywords(self, 
                               organization_id: str,
@@ -130,9 +136,9 @@ class RankingOrchestrator:
             cache_key = self._get_cache_key(keyword, marketplaces)
             cached = self.keyword_cache.get(cache_key)
             
-            if cached and time.time() - cached["timestamp"] < self.cache_ttl:
+            if cached:
                 logger.info(f"Using cached result for {keyword}")
-                cached_results.append(cached["result"])
+                cached_results.append(cached)
             else:
                 keywords_to_research.append(keyword)
         
@@ -263,10 +269,7 @@ class RankingOrchestrator:
         # Update cache if result is successful
         if success and task_type == "track_keyword_ranking":
             cache_key = self._get_cache_key(keyword, [marketplace])
-            self.keyword_cache[cache_key] = {
-                "timestamp": time.time(),
-                "result": result
-            }
+            self.keyword_cache.set(cache_key, result)
             
         # Check if this was the last task for the operation
         if operation_id and operation_id in self.research_tasks:
@@ -85,9 +85,12 @@ class OpportunityAlertManager:
         )
         
         # Check each keyword for alerts
+        # Get the recent history of every keyword in one batched read
+        histories = await self.storage_client.get_keyword_histories(keywords, start=cutoff_date)
+        
         alerts = []
         for keyword in keywords:
-            keyword_alerts = await self._check_keyword_alerts(keyword, cutoff_date)
+            keyword_alerts = await self._check_keyword_alerts(keyword, histories[keyword["keyword_id"]])
             alerts.extend(keyword_alerts)
             
         # Add cross-marketplace alerts
@@ -115,21 +118,36 @@ class OpportunityAlertManager:
         Returns:
             List of generated alerts
         """
-        self.logger.info(f"Checking alerts for {keyword} in {marketplace}")
+        return await self.check_specific_keywords(marketplace, [keyword])
+    
+    async def check_specific_keywords(self, 
+                                    marketplace: str,
+                                    keywords: List[str]) -> List[Dict[str, Any]]:
+        """Check for alerts for specific keywords, reading them in one batch.
+        
+        Args:
+            marketplace: Marketplace name
+            keywords: Keywords to check
+            
+        Returns:
+            List of generated alerts
+        """
+        self.logger.info(f"Checking alerts for {len(keywords)} keywords in {marketplace}")
         
         # Get keyword data
-        keyword_id = f"{marketplace}_{keyword}"
-        keyword_entry = await self.storage_client.get_keyword_ranking(keyword_id)
+        keyword_ids = [f"{marketplace}_{keyword}" for keyword in keywords]
+        keyword_entries = await self.storage_client.get_keyword_rankings_many(keyword_ids)
         
-        if not keyword_entry:
-            return []
-            
         # Check last 30 days
         cutoff_date = (datetime.now() - timedelta(days=30)).isoformat()
         
         # Check for alerts
-        alerts = await self._check_keyword_alerts(keyword_entry, cutoff_date)
-        
+        alerts = []
+        histories = await self.storage_client.get_keyword_histories(list(keyword_entries.values()), start=cutoff_date)
+        for keyword_id in keyword_ids:
+            if keyword_id in keyword_entries:
+                alerts.extend(await self._check_keyword_alerts(keyword_entries[keyword_id], histories[keyword_id]))
+                
         # Send alerts if endpoint configured
         if self.notification_endpoint and alerts:
             await self._send_alerts(alerts)
@@ -199,12 +217,12 @@ class OpportunityAlertManager:
     
     async def _check_keyword_alerts(self, 
                                   keyword_entry: Dict[str, Any],
-                                  cutoff_date: str) -> List[Dict[str, Any]]:
+                                  recent_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Check a specific keyword for alerts.
         
         Args:
             keyword_entry: Keyword data
-            cutoff_date: Cutoff date for history
+            recent_history: History entries of the keyword since the cutoff date
             
         Returns:
             List of generated alerts
@@ -216,13 +234,6 @@ class OpportunityAlertManager:
         marketplace = keyword_entry.get("marketplace", "")
         keyword_id = keyword_entry.get("keyword_id", "")
         
-        # Filter history to recent entries
-        history = keyword_entry.get("history", [])
-        recent_history = [
-            entry for entry in history
-            if entry.get("date", "9999-12-31") >= cutoff_date
-        ]
-        
         # Skip if less than 2 entries
         if len(recent_history) < 2:
             return []
@@ -589,4 +600,3 @@ class OpportunityAlertManager:
         except Exception as e:
             self.logger.error(f"Failed to send digest: {str(e)}")
             return False
-"""
\ No newline at end of file
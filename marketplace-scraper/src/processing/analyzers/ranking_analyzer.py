@@ -7,6 +7,7 @@ and trends across South African e-commerce platforms.
 """
 
 import asyncio
+import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
@@ -14,8 +15,146 @@ import statistics
 
 # Local imports
 from ...storage.repository import Repository
+from .trend_detection import TREND_METRICS, HistoryArrays, metric_changes, trend_scores, top_k
 
 
+class ReadMemo:
+    """Storage reads shared by the analyses making up one report.
+    
+    Each keyword entry, query and history range is read at most once per
+    memo, also when analyses running concurrently ask for it at the same
+    time: later callers await the read already in flight. Cutoff dates are
+    computed from the memo's creation time, so the analyses of one report
+    ask for the same ranges. A memo belongs to the event loop it is first
+    used in.
+    """
+    
+    def __init__(self, storage_client: Repository):
+        """Initialize an empty memo.
+        
+        Args:
+            storage_client: Repository client for data storage
+        """
+        self.storage_client = storage_client
+        self.now = datetime.now()
+        self.storage_calls = 0
+        # Read of each key, and the key of its result within the read for batched reads
+        self._reads: Dict[Tuple[Any, ...], Tuple[asyncio.Future, Optional[str]]] = {}
+        
+    def _start(self, key: Tuple[Any, ...], coroutine) -> asyncio.Future:
+        """Start a storage read and remember it under a key."""
+        self.storage_calls += 1
+        read = asyncio.ensure_future(coroutine)
+        self._reads[key] = (read, None)
+        return read
+        
+    def _share(self, keys: Dict[Tuple[Any, ...], str], read: asyncio.Future) -> None:
+        """Remember the results of a batched read under their own keys."""
+        for key, result_key in keys.items():
+            self._reads[key] = (read, result_key)
+            
+    async def _get(self, key: Tuple[Any, ...], default: Any = None) -> Any:
+        """Await the result remembered under a key."""
+        read, result_key = self._reads[key]
+        result = await read
+        return result if result_key is None else result.get(result_key, default)
+        
+    async def query(self, method: str, **kwargs) -> Any:
+        """Call a storage read method once per set of arguments.
+        
+        Args:
+            method: Name of the repository method
+            **kwargs: Keyword arguments of the call
+            
+        Returns:
+            Result of the call
+        """
+        key = (method, json.dumps(kwargs, sort_keys=True, default=str))
+        if key not in self._reads:
+            self._start(key, getattr(self.storage_client, method)(**kwargs))
+        return await self._get(key)
+        
+    async def keyword_rankings(self, **kwargs) -> List[Dict[str, Any]]:
+        """Query keyword ranking entries, remembering the entries found.
+        
+        Args:
+            **kwargs: Keyword arguments of get_keyword_rankings
+            
+        Returns:
+            Keyword entries
+        """
+        keyword_entries = await self.query("get_keyword_rankings", **kwargs)
+        found = {
+            keyword_entry["keyword_id"]: keyword_entry
+            for keyword_entry in keyword_entries
+            if "keyword_id" in keyword_entry and ("entry", keyword_entry["keyword_id"]) not in self._reads
+        }
+        if found:
+            read = asyncio.get_running_loop().create_future()
+            read.set_result(found)
+            self._share({("entry", keyword_id): keyword_id for keyword_id in found}, read)
+        return keyword_entries
+        
+    async def keyword_entries(self, keyword_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get keyword ranking entries, reading those not read yet in one batch.
+        
+        Args:
+            keyword_ids: Keyword IDs, "<marketplace>_<keyword>"
+            
+        Returns:
+            Keyword entries found, by keyword ID
+        """
+        keyword_ids = list(dict.fromkeys(keyword_ids))
+        missing = [keyword_id for keyword_id in keyword_ids if ("entry", keyword_id) not in self._reads]
+        if missing:
+            self._share(
+                {("entry", keyword_id): keyword_id for keyword_id in missing},
+                self._start(("entries", tuple(missing)), self.storage_client.get_keyword_rankings_many(missing))
+            )
+            
+        found = {}
+        for keyword_id in keyword_ids:
+            keyword_entry = await self._get(("entry", keyword_id))
+            if keyword_entry:
+                found[keyword_id] = keyword_entry
+        return found
+        
+    async def keyword_histories(self,
+                                keyword_entries: List[Dict[str, Any]],
+                                start: Any = None,
+                                end: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the history of keywords within a range, reading those not read yet in one batch.
+        
+        Args:
+            keyword_entries: Keyword ranking entries
+            start: Start of the range (optional)
+            end: End of the range (optional)
+            
+        Returns:
+            History entries in date order by keyword ID
+        """
+        def key(keyword_id: str) -> Tuple[Any, ...]:
+            return ("history", keyword_id, str(start), str(end))
+            
+        missing = list({
+            keyword_entry["keyword_id"]: keyword_entry
+            for keyword_entry in keyword_entries if key(keyword_entry["keyword_id"]) not in self._reads
+        }.values())
+        if missing:
+            self._share(
+                {key(keyword_entry["keyword_id"]): keyword_entry["keyword_id"] for keyword_entry in missing},
+                self._start(
+                    ("histories", tuple(entry["keyword_id"] for entry in missing), str(start), str(end)),
+                    self.storage_client.get_keyword_histories(missing, start=start, end=end)
+                )
+            )
+            
+        return {
+            keyword_entry["keyword_id"]: await self._get(key(keyword_entry["keyword_id"]), [])
+            for keyword_entry in keyword_entries
+        }
+        
+        
 class RankingAnalyzer:
     """Cross-marketplace ranking and opportunity analysis.
     
@@ -24,13 +163,15 @@ class RankingAnalyzer:
     insights.
     """
     
-    def __init__(self, storage_client: Repository):
+    def __init__(self, storage_client: Repository, max_concurrency: int = 8):
         """Initialize the ranking analyzer.
         
         Args:
             storage_client: Repository client for data storage
+            max_concurrency: Maximum number of analyses or reads one report runs at a time
         """
         self.storage_client = storage_client
+        self.max_concurrency = max_concurrency
         self.logger = logging.getLogger("ranking-analyzer")
         
         # Analysis thresholds
@@ -39,39 +180,63 @@ class RankingAnalyzer:
         self.low_competition_threshold = 3  # Avg sellers per product for low competition
         self.significant_change = 5  # Position change to consider significant
         
+    async def _gather(self, coroutines) -> List[Any]:
+        """Await coroutines concurrently, at most max_concurrency at a time.
+        
+        Args:
+            coroutines: Coroutines to await
+            
+        Returns:
+            Their results, in order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+                
+        return await asyncio.gather(*(bounded(coroutine) for coroutine in coroutines))
+        
     async def analyze_keyword_performance(self, 
                                          keyword: str,
                                          marketplaces: List[str],
-                                         days: int = 30) -> Dict[str, Any]:
+                                         days: int = 30,
+                                         memo: Optional[ReadMemo] = None) -> Dict[str, Any]:
         """Analyze keyword performance across marketplaces.
         
         Args:
             keyword: Keyword to analyze
             marketplaces: List of marketplaces to include
             days: Number of days of history to analyze
+            memo: Reads shared with other analyses of the same report (optional)
             
         Returns:
             Dictionary with analysis results
         """
         self.logger.info(f"Analyzing keyword '{keyword}' across {len(marketplaces)} marketplaces")
+        memo = memo or ReadMemo(self.storage_client)
         
         # Define cutoff date
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff_date = (memo.now - timedelta(days=days)).isoformat()
+        
+        # Get keyword data for each marketplace in one batched read
+        keyword_entries = await memo.keyword_entries(
+            [f"{marketplace}_{keyword}" for marketplace in marketplaces]
+        )
+        
+        # Get history within the requested timeframe, reading only the segments covering it
+        histories = await memo.keyword_histories(
+            list(keyword_entries.values()), start=cutoff_date
+        )
         
-        # Get keyword data for each marketplace
         keyword_data = {}
         for marketplace in marketplaces:
-            keyword_id = f"{marketplace}_{keyword}"
-            keyword_entry = await self.storage_client.get_keyword_ranking(keyword_id)
+            keyword_entry = keyword_entries.get(f"{marketplace}_{keyword}")
             
             if not keyword_entry:
                 continue
                 
-            # Filter history to requested timeframe
-            history = [
-                entry for entry in keyword_entry.get("history", [])
-                if entry.get("date", "9999-12-31") >= cutoff_date
-            ]
+            history = histories[keyword_entry["keyword_id"]]
             
             # Skip if no history
             if not history:
@@ -286,6 +451,9 @@ class RankingAnalyzer:
                                                  limit: int = 20) -> List[Dict[str, Any]]:
         """Find the best cross-marketplace opportunities.
         
+        The entries and history of all common keywords are read in one
+        batch, and the keywords analyzed concurrently from those reads.
+        
         Args:
             marketplace_set: List of marketplaces to include
             limit: Maximum number of opportunities to return
@@ -294,15 +462,27 @@ class RankingAnalyzer:
             List of cross-marketplace opportunities
         """
         self.logger.info(f"Finding cross-marketplace opportunities across {len(marketplace_set)} marketplaces")
+        memo = ReadMemo(self.storage_client)
         
         # Get common keywords across all marketplaces
-        common_keywords = await self._find_common_keywords(marketplace_set)
+        common_keywords = await self._find_common_keywords(marketplace_set, memo)
+        
+        # Read the history analyzed for every common keyword at once
+        keyword_entries = await memo.keyword_entries([
+            f"{marketplace}_{keyword}" for keyword in common_keywords for marketplace in marketplace_set
+        ])
+        await memo.keyword_histories(
+            list(keyword_entries.values()), start=(memo.now - timedelta(days=30)).isoformat()
+        )
         
         # Analyze each keyword
+        analyses = await self._gather(
+            self.analyze_keyword_performance(keyword, marketplace_set, memo=memo)
+            for keyword in common_keywords
+        )
+        
         opportunities = []
-        for keyword in common_keywords:
-            analysis = await self.analyze_keyword_performance(keyword, marketplace_set)
-            
+        for keyword, analysis in zip(common_keywords, analyses):
             # Skip keywords with no data
             if analysis.get("status") == "no_data" or analysis.get("marketplaces_analyzed", 0) == 0:
                 continue
@@ -336,9 +516,7 @@ class RankingAnalyzer:
         """
         self.logger.info(f"Analyzing product '{product_name}' across {len(marketplaces)} marketplaces")
         
-        # Search for product by name in each marketplace
-        product_data = {}
-        for marketplace in marketplaces:
+        async def find_product(marketplace: str) -> Optional[Dict[str, Any]]:
             # Search for products
             products = await self.storage_client.search_products(
                 marketplace=marketplace,
@@ -348,7 +526,7 @@ class RankingAnalyzer:
             
             # Skip if no products
             if not products:
-                continue
+                return None
                 
             # Find best match
             best_match = None
@@ -366,8 +544,15 @@ class RankingAnalyzer:
                 
                 best_match["opportunity_score"] = opportunity.get("opportunity_score", 0) if opportunity else 0
                 
-                # Add to data
-                product_data[marketplace] = best_match
+            return best_match
+            
+        # Search for product by name in all marketplaces concurrently
+        matches = await self._gather(find_product(marketplace) for marketplace in marketplaces)
+        product_data = {
+            marketplace: best_match
+            for marketplace, best_match in zip(marketplaces, matches)
+            if best_match
+        }
                 
         # Skip analysis if no data
         if not product_data:
@@ -477,21 +662,35 @@ class RankingAnalyzer:
     async def identify_trending_keywords(self, 
                                         marketplace: Optional[str] = None,
                                         days: int = 30,
-                                        limit: int = 20) -> List[Dict[str, Any]]:
+                                        limit: int = 20,
+                                        method: str = "delta",
+                                        max_keywords: int = 200,
+                                        memo: Optional[ReadMemo] = None) -> List[Dict[str, Any]]:
         """Identify trending keywords based on ranking changes.
         
+        The history of all analyzed keywords is scored at once, see
+        trend_detection.
+        
         Args:
             marketplace: Optional marketplace to filter by
             days: Number of days to analyze
             limit: Maximum number of trending keywords to return
+            method: How changes are measured, "delta" (newest minus oldest
+                entry), "least_squares" or "theil_sen" (fitted slopes)
+            max_keywords: Maximum number of tracked keywords to analyze
+            memo: Reads shared with other analyses of the same report (optional)
             
         Returns:
             List of trending keywords
+            
+        Raises:
+            ValueError: If the method is unknown
         """
         self.logger.info(f"Identifying trending keywords for the last {days} days")
+        memo = memo or ReadMemo(self.storage_client)
         
         # Define cutoff date
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff_date = (memo.now - timedelta(days=days)).isoformat()
         
         # Build filters
         filters = {
@@ -503,160 +702,147 @@ class RankingAnalyzer:
             filters["marketplace"] = marketplace
             
         # Get keywords from storage
-        keywords = await self.storage_client.get_keyword_rankings(
+        keywords = await memo.keyword_rankings(
             filters=filters,
-            limit=200  # Get more than we need to analyze
+            limit=max_keywords
         )
         
-        # Calculate trend scores
+        # Get history within the requested timeframe in one batched read
+        histories = await memo.keyword_histories(keywords, start=cutoff_date)
+        
+        # Lay out history as arrays and score all keywords at once; changes
+        # between the oldest and newest entry need no other entries
+        keyword_histories = [histories[keyword["keyword_id"]] for keyword in keywords]
+        if method == "delta":
+            keyword_histories = [history[:1] + history[1:][-1:] for history in keyword_histories]
+        arrays = HistoryArrays(keyword_histories, cutoff_date, days)
+        changes, percents = metric_changes(arrays, method)
+        scores = trend_scores(changes, percents)
+        
+        # Skip keywords with less than 2 data points
+        scores[arrays.counts < 2] = -1
+        ranked = [index for index in top_k(scores, limit) if scores[index] >= 0]
+        
+        _, newest = arrays.endpoints()
+        columns = {metric: column for column, metric in enumerate(TREND_METRICS)}
+        
+        def change(metric: str, index: int, percent: bool = True) -> Dict[str, Any]:
+            absolute = float(changes[index, columns[metric]])
+            entry = {"absolute": absolute}
+            if percent:
+                entry["percent"] = float(percents[index, columns[metric]])
+            entry["direction"] = "up" if absolute > 0 else "down" if absolute < 0 else "stable"
+            return entry
+            
+        # Create trending entries, highest trend score first
         trending_keywords = []
-        for keyword in keywords:
-            history = keyword.get("history", [])
-            
-            # Filter history to requested timeframe
-            history = [
-                entry for entry in history
-                if entry.get("date", "9999-12-31") >= cutoff_date
-            ]
-            
-            # Skip if less than 2 data points
-            if len(history) < 2:
-                continue
-                
-            # Get oldest and newest data points
-            oldest = history[0]
-            newest = history[-1]
-            
-            # Calculate metrics change
-            results_change = newest.get("total_results", 0) - oldest.get("total_results", 0)
-            results_change_pct = (results_change / oldest.get("total_results", 1)) * 100 if oldest.get("total_results", 0) > 0 else 0
-            
-            # Calculate competitive change
-            density_change = newest.get("competitive_density", 0) - oldest.get("competitive_density", 0)
-            density_change_pct = (density_change / oldest.get("competitive_density", 1)) * 100 if oldest.get("competitive_density", 0) > 0 else 0
-            
-            # Calculate opportunity change
-            opportunity_change = newest.get("opportunity_score", 0) - oldest.get("opportunity_score", 0)
-            
-            # Calculate price change
-            price_change = newest.get("average_price", 0) - oldest.get("average_price", 0)
-            price_change_pct = (price_change / oldest.get("average_price", 1)) * 100 if oldest.get("average_price", 0) > 0 else 0
-            
-            # Calculate trend score (weighted combination of changes)
-            trend_score = (
-                abs(results_change_pct) * 0.4 +   # 40% weight to search volume change
-                abs(opportunity_change) * 3 +      # 30% weight to opportunity score change
-                abs(density_change_pct) * 0.2 +    # 20% weight to competition change
-                abs(price_change_pct) * 0.1        # 10% weight to price change
-            )
-            
-            # Create trending entry
-            trending_entry = {
+        for index in ranked:
+            keyword = keywords[index]
+            trending_keywords.append({
                 "keyword": keyword.get("keyword", ""),
                 "marketplace": keyword.get("marketplace", ""),
-                "trend_score": trend_score,
+                "trend_score": float(scores[index]),
                 "keyword_id": keyword.get("keyword_id", ""),
-                "latest_opportunity_score": newest.get("opportunity_score", 0),
+                "latest_opportunity_score": float(newest[index, columns["opportunity_score"]]),
+                "trend_method": method,
                 "changes": {
-                    "results": {
-                        "absolute": results_change,
-                        "percent": results_change_pct,
-                        "direction": "up" if results_change > 0 else "down" if results_change < 0 else "stable"
-                    },
-                    "competition": {
-                        "absolute": density_change,
-                        "percent": density_change_pct,
-                        "direction": "up" if density_change > 0 else "down" if density_change < 0 else "stable"
-                    },
-                    "opportunity": {
-                        "absolute": opportunity_change,
-                        "direction": "up" if opportunity_change > 0 else "down" if opportunity_change < 0 else "stable"
-                    },
-                    "price": {
-                        "absolute": price_change,
-                        "percent": price_change_pct,
-                        "direction": "up" if price_change > 0 else "down" if price_change < 0 else "stable"
-                    }
+                    "results": change("total_results", index),
+                    "competition": change("competitive_density", index),
+                    "opportunity": change("opportunity_score", index, percent=False),
+                    "price": change("average_price", index)
                 }
-            }
-            
-            trending_keywords.append(trending_entry)
+            })
             
-        # Sort by trend score (highest first)
-        trending_keywords.sort(key=lambda x: x["trend_score"], reverse=True)
-        
-        return trending_keywords[:limit]
+        return trending_keywords
     
     async def generate_marketplace_opportunity_report(self, 
                                                     marketplace: str,
-                                                    days: int = 30) -> Dict[str, Any]:
+                                                    days: int = 30,
+                                                    memo: Optional[ReadMemo] = None) -> Dict[str, Any]:
         """Generate a comprehensive opportunity report for a marketplace.
         
+        The sections of the report are read concurrently.
+        
         Args:
             marketplace: Marketplace to analyze
             days: Number of days to analyze
+            memo: Reads shared with other reports (optional)
             
         Returns:
             Dictionary with report data
         """
         self.logger.info(f"Generating opportunity report for {marketplace}")
+        memo = memo or ReadMemo(self.storage_client)
         
         # Define cutoff date
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        # 1. Get top opportunity keywords
-        top_opportunities = await self.storage_client.get_opportunity_scores(
-            filters={
-                "marketplace": marketplace,
-                "entity_type": "keyword"
-            },
-            limit=20,
-            order_by="opportunity_score",
-            order_direction="desc"
-        )
-        
-        # 2. Get trending keywords
-        trending_keywords = await self.identify_trending_keywords(
-            marketplace=marketplace,
-            days=days,
-            limit=10
-        )
-        
-        # 3. Get high competition keywords
-        high_competition = await self.storage_client.get_keyword_rankings(
-            filters={
-                "marketplace": marketplace,
-                "tracking_enabled": True,
-                "competitive_density": {">=": self.competition_threshold}
-            },
-            limit=10,
-            order_by="competitive_density",
-            order_direction="desc"
-        )
-        
-        # 4. Get low competition keywords
-        low_competition = await self.storage_client.get_keyword_rankings(
-            filters={
-                "marketplace": marketplace,
-                "tracking_enabled": True,
-                "competitive_density": {"<=": self.low_competition_threshold},
-                "competitive_density": {">": 0}  # Ensure some competition
-            },
-            limit=10,
-            order_by="opportunity_score",
-            order_direction="desc"
-        )
-        
-        # 5. Calculate overall marketplace metrics
-        # Get recent keyword data
-        recent_keywords = await self.storage_client.get_keyword_rankings(
-            filters={
-                "marketplace": marketplace,
-                "tracking_enabled": True,
-                "last_updated": {">=": cutoff_date}
-            },
-            limit=100
-        )
+        cutoff_date = (memo.now - timedelta(days=days)).isoformat()
+        
+        (
+            top_opportunities,
+            trending_keywords,
+            high_competition,
+            low_competition,
+            recent_keywords,
+            category_opportunities
+        ) = await self._gather([
+            # 1. Get top opportunity keywords
+            memo.query(
+                "get_opportunity_scores",
+                filters={
+                    "marketplace": marketplace,
+                    "entity_type": "keyword"
+                },
+                limit=20,
+                order_by="opportunity_score",
+                order_direction="desc"
+            ),
+            
+            # 2. Get trending keywords
+            self.identify_trending_keywords(
+                marketplace=marketplace,
+                days=days,
+                limit=10,
+                memo=memo
+            ),
+            
+            # 3. Get high competition keywords
+            memo.keyword_rankings(
+                filters={
+                    "marketplace": marketplace,
+                    "tracking_enabled": True,
+                    "competitive_density": {">=": self.competition_threshold}
+                },
+                limit=10,
+                order_by="competitive_density",
+                order_direction="desc"
+            ),
+            
+            # 4. Get low competition keywords
+            memo.keyword_rankings(
+                filters={
+                    "marketplace": marketplace,
+                    "tracking_enabled": True,
+                    "competitive_density": {"<=": self.low_competition_threshold},
+                    "competitive_density": {">": 0}  # Ensure some competition
+                },
+                limit=10,
+                order_by="opportunity_score",
+                order_direction="desc"
+            ),
+            
+            # 5. Get recent keyword data for the overall marketplace metrics
+            memo.keyword_rankings(
+                filters={
+                    "marketplace": marketplace,
+                    "tracking_enabled": True,
+                    "last_updated": {">=": cutoff_date}
+                },
+                limit=100
+            ),
+            
+            # 6. Generate category opportunities
+            self._analyze_category_opportunities(marketplace, days, memo)
+        ])
         
         # Calculate average metrics
         if recent_keywords:
@@ -667,9 +853,6 @@ class RankingAnalyzer:
         else:
             avg_opportunity = avg_competition = median_competition = total_tracked = 0
             
-        # 6. Generate category opportunities
-        category_opportunities = await self._analyze_category_opportunities(marketplace, days)
-        
         # Compile report
         return {
             "marketplace": marketplace,
@@ -690,29 +873,36 @@ class RankingAnalyzer:
             "category_opportunities": category_opportunities
         }
         
-    async def _find_common_keywords(self, marketplaces: List[str]) -> List[str]:
+    async def _find_common_keywords(self, marketplaces: List[str], memo: Optional[ReadMemo] = None) -> List[str]:
         """Find keywords tracked across all specified marketplaces.
         
         Args:
             marketplaces: List of marketplaces
+            memo: Reads shared with other analyses of the same report (optional)
             
         Returns:
             List of keywords tracked across all marketplaces
         """
-        # Get keywords for each marketplace
-        marketplace_keywords = {}
-        for marketplace in marketplaces:
-            keywords = await self.storage_client.get_keyword_rankings(
+        memo = memo or ReadMemo(self.storage_client)
+        
+        # Get keywords for each marketplace concurrently
+        marketplace_entries = await self._gather(
+            memo.keyword_rankings(
                 filters={
                     "marketplace": marketplace,
                     "tracking_enabled": True
                 },
                 limit=1000
             )
-            
-            # Extract keyword text
-            marketplace_keywords[marketplace] = {k.get("keyword") for k in keywords}
-            
+            for marketplace in marketplaces
+        )
+        
+        # Extract keyword text
+        marketplace_keywords = {
+            marketplace: {k.get("keyword") for k in keywords}
+            for marketplace, keywords in zip(marketplaces, marketplace_entries)
+        }
+        
         # Find intersection of all sets
         if not marketplace_keywords:
             return []
@@ -729,18 +919,22 @@ class RankingAnalyzer:
     
     async def _analyze_category_opportunities(self, 
                                             marketplace: str,
-                                            days: int) -> List[Dict[str, Any]]:
+                                            days: int,
+                                            memo: Optional[ReadMemo] = None) -> List[Dict[str, Any]]:
         """Analyze category-level opportunities in a marketplace.
         
         Args:
             marketplace: Marketplace to analyze
             days: Number of days to analyze
+            memo: Reads shared with other analyses of the same report (optional)
             
         Returns:
             List of category opportunity objects
         """
+        memo = memo or ReadMemo(self.storage_client)
+        
         # Get all keywords with categories
-        keywords = await self.storage_client.get_keyword_rankings(
+        keywords = await memo.keyword_rankings(
             filters={
                 "marketplace": marketplace,
                 "tracking_enabled": True
@@ -806,4 +1000,3 @@ class RankingAnalyzer:
         )
         
         return sorted_categories[:10]  # Return top 10 categories
-"""
\ No newline at end of file
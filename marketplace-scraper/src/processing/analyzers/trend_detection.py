@@ -0,0 +1,267 @@
+"""
+Vectorized keyword trend detection.
+
+Lays the history of many keywords out as one NumPy array (keyword x day x
+metric, NaN where a keyword has no value that day) and measures the change
+of every metric over the analyzed period for all keywords at once. The
+change is measured in one of three ways:
+
+- "delta": newest minus oldest entry, as the per-keyword analysis did
+- "least_squares": slope of the least squares line through the daily
+  values, times the days between the oldest and newest entry
+- "theil_sen": the same with the median of the slopes between all pairs of
+  days, which a single outlying refresh cannot skew
+
+Percent changes are relative to the oldest entry for "delta", and to the
+fitted value on the day of the oldest entry for the slope estimators.
+"""
+
+import warnings
+from itertools import chain, repeat
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from ...storage.keyword_history import entry_time
+
+
+# History metrics laid out, in array order
+TREND_METRICS = ("total_results", "competitive_density", "opportunity_score", "average_price")
+
+# Ways of measuring the change of a metric
+TREND_METHODS = ("delta", "least_squares", "theil_sen")
+
+# Weight of each metric's change in the trend score, and whether the
+# percent (True) or absolute (False) change is weighted
+TREND_WEIGHTS = {
+    "total_results": (0.4, True),         # 40% weight to search volume change
+    "opportunity_score": (3.0, False),    # 30% weight to opportunity score change
+    "competitive_density": (0.2, True),   # 20% weight to competition change
+    "average_price": (0.1, True),         # 10% weight to price change
+}
+
+# Keywords whose pairwise slopes are computed at once by theil_sen_slopes
+THEIL_SEN_CHUNK = 512
+
+
+def _entry_times(entries: List[Dict[str, Any]]) -> np.ndarray:
+    """Dates of history entries as naive UTC datetimes, NaT where not a date."""
+    dates = list(map(dict.get, entries, repeat("date")))
+    try:
+        with warnings.catch_warnings():
+            # Timezone-aware strings are converted below instead
+            warnings.simplefilter("error")
+            return np.array(dates, dtype="datetime64[us]")
+    except (ValueError, TypeError, Warning):
+        return np.array([entry_time(date) for date in dates], dtype="datetime64[us]")
+
+
+def _metric_values(entries: List[Dict[str, Any]], metric: str) -> np.ndarray:
+    """Values of a metric in history entries, NaN where missing.
+
+    The values are read with dict.get mapped over the entries, much faster
+    than a comprehension; entries holding None are converted on a slower path.
+    """
+    try:
+        return np.fromiter(map(dict.get, entries, repeat(metric), repeat(np.nan)), dtype=float, count=len(entries))
+    except TypeError:
+        return np.array(list(map(dict.get, entries, repeat(metric))), dtype=float)
+
+
+class HistoryArrays:
+    """History of a batch of keywords as a keyword x day x metric array."""
+
+    def __init__(self, histories: List[List[Dict[str, Any]]], start: Any, days: int):
+        """Lay out history as arrays.
+
+        Entries are placed by the day they fall on, counted from the start;
+        of several entries on one day, the last one is kept in the daily
+        values. The oldest and newest entries are kept as they are. Entries
+        before the start or more than the given days after it are left out.
+
+        Args:
+            histories: History entries of each keyword, in date order
+            start: Start of the analyzed period
+            days: Days in the analyzed period
+        """
+        self.days = days + 1
+        entries = list(chain.from_iterable(histories))
+        rows = np.repeat(np.arange(len(histories)), [len(history) for history in histories])
+
+        times = _entry_times(entries)
+        with np.errstate(invalid="ignore"):
+            day_numbers = (times - np.datetime64(entry_time(start), "us")) // np.timedelta64(1, "D")
+        kept = np.flatnonzero(~np.isnat(times) & (day_numbers >= 0) & (day_numbers < self.days))
+        rows, columns = rows[kept], day_numbers[kept]
+
+        values = np.empty((len(entries), len(TREND_METRICS)))
+        for column, metric in enumerate(TREND_METRICS):
+            values[:, column] = _metric_values(entries, metric)
+        values = values[kept]
+
+        # Repeated indices keep the last value assigned, the latest entry of the day
+        self.values = np.full((len(histories), self.days, len(TREND_METRICS)), np.nan)
+        self.values[rows, columns] = values
+
+        # Oldest and newest entry of each keyword, from the entries kept in date order
+        keywords = np.arange(len(histories))
+        self.counts = np.bincount(rows, minlength=len(histories))
+        found = self.counts > 0
+        oldest = np.searchsorted(rows, keywords, side="left")[found]
+        newest = np.searchsorted(rows, keywords, side="right")[found] - 1
+
+        self.first = np.zeros(len(histories), dtype=int)
+        self.last = np.zeros(len(histories), dtype=int)
+        self.first[found], self.last[found] = columns[oldest], columns[newest]
+        self.oldest = np.full((len(histories), len(TREND_METRICS)), np.nan)
+        self.newest = np.full((len(histories), len(TREND_METRICS)), np.nan)
+        self.oldest[found], self.newest[found] = values[oldest], values[newest]
+
+    def __len__(self) -> int:
+        """Number of keywords in the batch."""
+        return len(self.values)
+
+    def endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Metric values of the oldest and newest entry of each keyword, 0 where missing."""
+        return np.nan_to_num(self.oldest, nan=0.0), np.nan_to_num(self.newest, nan=0.0)
+
+
+def least_squares_slopes(arrays: HistoryArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Least squares slope and intercept of each keyword's metrics over days.
+
+    Args:
+        arrays: History arrays
+
+    Returns:
+        Slopes per day and values at day 0, keyword x metric, 0 for metrics
+        with fewer than two days of values
+    """
+    mask = ~np.isnan(arrays.values)
+    x = np.broadcast_to(np.arange(arrays.days, dtype=float)[None, :, None], arrays.values.shape)
+    counts = mask.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / counts
+        y_mean = np.nansum(arrays.values, axis=1) / counts
+        dx = np.where(mask, x - x_mean[:, None, :], 0)
+        dy = np.where(mask, arrays.values - y_mean[:, None, :], 0)
+        variance = (dx * dx).sum(axis=1)
+        slopes = np.where(variance > 0, (dx * dy).sum(axis=1) / variance, 0.0)
+
+    intercepts = np.nan_to_num(y_mean - slopes * x_mean, nan=0.0)
+    return np.nan_to_num(slopes, nan=0.0), intercepts
+
+
+def _nan_median(values: np.ndarray) -> np.ndarray:
+    """Median over axis 1 of the non-NaN values, NaN where there are none.
+
+    Sorting moves NaN to the end, so the median is read at the middle of
+    the values present; much faster than np.nanmedian on many short rows.
+    """
+    ordered = np.sort(values, axis=1)
+    counts = np.count_nonzero(~np.isnan(values), axis=1)
+    low = np.take_along_axis(ordered, np.maximum(counts - 1, 0)[:, None] // 2, axis=1)[:, 0]
+    high = np.take_along_axis(ordered, counts[:, None] // 2, axis=1)[:, 0]
+    return np.where(counts > 0, (low + high) / 2, np.nan)
+
+
+def theil_sen_slopes(arrays: HistoryArrays) -> Tuple[np.ndarray, np.ndarray]:
+    """Theil-Sen slope and intercept of each keyword's metrics over days.
+
+    The slope is the median of the slopes between all pairs of days with
+    values, the intercept the median of the values less the slope times
+    their day.
+
+    Args:
+        arrays: History arrays
+
+    Returns:
+        Slopes per day and values at day 0, keyword x metric, 0 for metrics
+        with fewer than two days of values
+    """
+    first, second = np.triu_indices(arrays.days, k=1)
+    if not len(first):
+        return np.zeros((len(arrays), len(TREND_METRICS))), np.zeros((len(arrays), len(TREND_METRICS)))
+    spans = (second - first).astype(float)[None, :, None]
+    x = np.arange(arrays.days, dtype=float)[None, :, None]
+
+    slopes = np.zeros((len(arrays), len(TREND_METRICS)))
+    intercepts = np.zeros((len(arrays), len(TREND_METRICS)))
+    for chunk in range(0, len(arrays), THEIL_SEN_CHUNK):
+        values = arrays.values[chunk:chunk + THEIL_SEN_CHUNK]
+        chunk_slopes = _nan_median((values[:, second] - values[:, first]) / spans)
+        chunk_intercepts = _nan_median(values - chunk_slopes[:, None, :] * x)
+
+        # Metrics with fewer than two days of values have no slope
+        fitted = ~np.isnan(chunk_slopes)
+        slopes[chunk:chunk + THEIL_SEN_CHUNK] = np.where(fitted, chunk_slopes, 0.0)
+        intercepts[chunk:chunk + THEIL_SEN_CHUNK] = np.where(fitted, chunk_intercepts, 0.0)
+    return slopes, intercepts
+
+
+def metric_changes(arrays: HistoryArrays, method: str = "delta") -> Tuple[np.ndarray, np.ndarray]:
+    """Change of each keyword's metrics over its history.
+
+    Args:
+        arrays: History arrays
+        method: One of TREND_METHODS
+
+    Returns:
+        Absolute and percent changes, keyword x metric; percent changes are
+        0 where the base value is not positive
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method == "delta":
+        base, newest = arrays.endpoints()
+        changes = newest - base
+    elif method in ("least_squares", "theil_sen"):
+        slopes, intercepts = (least_squares_slopes if method == "least_squares" else theil_sen_slopes)(arrays)
+        first = arrays.first[:, None].astype(float)
+        changes = slopes * (arrays.last - arrays.first)[:, None]
+        base = intercepts + slopes * first
+    else:
+        raise ValueError(f"Unknown trend method '{method}', expected one of {', '.join(TREND_METHODS)}")
+
+    percents = np.divide(changes * 100, base, out=np.zeros_like(changes), where=base > 0)
+    return changes, percents
+
+
+def trend_scores(changes: np.ndarray, percents: np.ndarray) -> np.ndarray:
+    """Trend score of each keyword, a weighted sum of the size of its metric changes.
+
+    Args:
+        changes: Absolute changes, keyword x metric
+        percents: Percent changes, keyword x metric
+
+    Returns:
+        Trend scores
+    """
+    scores = np.zeros(len(changes))
+    for column, metric in enumerate(TREND_METRICS):
+        weight, percent = TREND_WEIGHTS[metric]
+        scores += np.abs((percents if percent else changes)[:, column]) * weight
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, highest first and ties in index order.
+
+    Args:
+        scores: Scores
+        k: Number of indices
+
+    Returns:
+        Indices of up to k scores
+    """
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=int)
+    if k < len(scores):
+        # Keep the lowest indices among scores tied with the k-th highest
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        candidates = np.concatenate([above, np.flatnonzero(scores == threshold)[:k - len(above)]])
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
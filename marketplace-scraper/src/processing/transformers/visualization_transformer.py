@@ -70,14 +70,8 @@ class VisualizationTransformer:
         # Define cutoff date
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        # Filter history to requested timeframe
-        history = [
-            entry for entry in keyword_entry.get("history", [])
-            if entry.get("date", "9999-12-31") >= cutoff_date
-        ]
-        
-        # Sort by date
-        history.sort(key=lambda x: x.get("date", ""))
+        # Get history within the requested timeframe, in date order
+        history = (await self.storage_client.get_keyword_histories([keyword_entry], start=cutoff_date))[keyword_id]
         
         # Extract series data
         series_data = {}
@@ -244,11 +238,14 @@ class VisualizationTransformer:
         Returns:
             Dictionary with radar chart data
         """
-        # Get keyword data for each marketplace
+        # Get keyword data for each marketplace in one batched read
+        keyword_entries = await self.storage_client.get_keyword_rankings_many(
+            [f"{marketplace}_{keyword}" for marketplace in marketplaces]
+        )
+        
         marketplace_data = {}
         for marketplace in marketplaces:
-            keyword_id = f"{marketplace}_{keyword}"
-            keyword_entry = await self.storage_client.get_keyword_ranking(keyword_id)
+            keyword_entry = keyword_entries.get(f"{marketplace}_{keyword}")
             
             if keyword_entry:
                 marketplace_data[marketplace] = keyword_entry
@@ -376,16 +373,13 @@ class VisualizationTransformer:
             limit=limit * 5  # Get more to analyze trends
         )
         
+        # Get history within the requested timeframe in one batched read
+        histories = await self.storage_client.get_keyword_histories(keywords, start=cutoff_date)
+        
         # Calculate trend metrics
         trending_data = []
         for keyword in keywords:
-            history = keyword.get("history", [])
-            
-            # Filter history to requested timeframe
-            history = [
-                entry for entry in history
-                if entry.get("date", "9999-12-31") >= cutoff_date
-            ]
+            history = histories[keyword["keyword_id"]]
             
             # Skip if less than 2 data points
             if len(history) < 2:
@@ -685,4 +679,3 @@ class VisualizationTransformer:
         
         # Default
         return data.get(metric, 0)
-"""
\ No newline at end of file
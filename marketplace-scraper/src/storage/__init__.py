@@ -5,6 +5,11 @@ This package provides storage-related components for the marketplace scraper.
 """
 
 from .repository import MarketplaceDataRepository
+from .sqlite_repository import SQLiteRepository
+from .fingerprint_index import FingerprintIndex
+from .write_behind import WriteBehindRepository
+from .cache import BoundedCache, get_cache_stats
+from .counters import ShardedCounters
 from .schemas import (
     PRODUCT_SCHEMA,
     PRICE_SCHEMA,
@@ -20,6 +25,12 @@ from .schemas import (
 
 __all__ = [
     'MarketplaceDataRepository',
+    'SQLiteRepository',
+    'FingerprintIndex',
+    'WriteBehindRepository',
+    'BoundedCache',
+    'get_cache_stats',
+    'ShardedCounters',
     'PRODUCT_SCHEMA',
     'PRICE_SCHEMA',
     'SEARCH_SCHEMA',
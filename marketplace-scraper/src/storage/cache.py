@@ -0,0 +1,345 @@
+"""
+Bounded in-memory caches.
+
+Long-running workers cache products, categories, keyword results and price
+histories in memory. The caches here keep that memory bounded: each cache
+has a maximum number of entries and bytes, evicts entries by LRU or
+TinyLFU, expires entries after a TTL and counts hits, misses, evictions
+and expirations.
+
+With the "tinylfu" policy, new entries first go into a small LRU window.
+When the window is full, its oldest entry is only admitted to the main
+cache if it is used more often than the entry it would evict, as estimated
+by a count-min sketch of recent accesses. A scan of many entries used once,
+such as a category crawl, then no longer flushes the entries used most.
+
+Caches are meant to be used from the event loop and are not thread-safe.
+"""
+
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Hashable, Tuple
+
+
+# Eviction policies
+CACHE_POLICIES = ("lru", "tinylfu")
+
+# Share of the entries of a TinyLFU cache kept in its admission window
+WINDOW_SHARE = 0.01
+
+# Odd multipliers spreading a key hash over the rows of the frequency sketch
+_SKETCH_SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+_HASH_MASK = (1 << 64) - 1
+
+# Byte translation halving every sketch counter
+_HALVE = bytes(count >> 1 for count in range(256))
+
+_caches: "weakref.WeakValueDictionary[str, BoundedCache]" = weakref.WeakValueDictionary()
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory used by a value and everything it contains.
+    
+    Args:
+        value: Value built from dicts, lists, tuples, sets and scalars
+        
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+            
+    return size
+
+
+class FrequencySketch:
+    """Count-min sketch of how often keys were used recently.
+    
+    Counters saturate at 15 and are halved once the number of recorded uses
+    reaches the sample size, so old popularity fades.
+    """
+    
+    def __init__(self, capacity: int):
+        """Initialize the sketch.
+        
+        Args:
+            capacity: Number of entries of the cache using the sketch
+        """
+        width = 16
+        while width < capacity * 4:
+            width *= 2
+            
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in _SKETCH_SEEDS]
+        self.sample_size = max(10 * capacity, 100)
+        self.additions = 0
+        
+    def _indexes(self, key: Hashable) -> List[int]:
+        key_hash = hash(key) & _HASH_MASK
+        return [(((key_hash * seed) & _HASH_MASK) >> 32) & self.mask for seed in _SKETCH_SEEDS]
+        
+    def increment(self, key: Hashable) -> None:
+        """Record a use of a key."""
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+                
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._age()
+            
+    def frequency(self, key: Hashable) -> int:
+        """Estimate how often a key was used recently."""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+        
+    def _age(self) -> None:
+        """Halve all counters."""
+        for row in self.rows:
+            row[:] = row.translate(_HALVE)
+        self.additions //= 2
+
+
+class BoundedCache:
+    """Cache bounded by entries and bytes, with TTL expiry and metrics."""
+    
+    def __init__(self,
+                 name: str,
+                 max_entries: int = 10000,
+                 max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None,
+                 policy: str = "lru",
+                 sweep_interval: float = 60.0,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        """Initialize the cache.
+        
+        Args:
+            name: Name of the cache in metrics
+            max_entries: Maximum number of entries
+            max_bytes: Maximum estimated size of all values (optional)
+            ttl: Default time-to-live of entries in seconds (optional)
+            policy: Eviction policy, "lru" or "tinylfu"
+            sweep_interval: Minimum seconds between sweeps of expired entries
+            sizeof: Function estimating the size of a value in bytes
+        """
+        if policy not in CACHE_POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}', expected one of {CACHE_POLICIES}")
+            
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.policy = policy
+        self.sweep_interval = sweep_interval
+        self.sizeof = sizeof
+        
+        # Entries as key -> (value, expiry time or None, size), least recently used first
+        self._window: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._main: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        
+        if policy == "tinylfu":
+            self.window_entries = max(1, int(self.max_entries * WINDOW_SHARE))
+            self._sketch: Optional[FrequencySketch] = FrequencySketch(self.max_entries)
+        else:
+            # Plain LRU keeps everything in the window
+            self.window_entries = self.max_entries
+            self._sketch = None
+            
+        self.bytes = 0
+        self._last_sweep = time.time()
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "rejections": 0
+        }
+        
+        _caches[name] = self
+        
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+        
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._window.get(key) or self._main.get(key)
+        return entry is not None and not self._expired(entry, time.time())
+        
+    def _expired(self, entry: Tuple[Any, Optional[float], int], now: float) -> bool:
+        return entry[1] is not None and entry[1] <= now
+        
+    def _segment(self, key: Hashable) -> Optional["OrderedDict[Hashable, Tuple[Any, Optional[float], int]]"]:
+        if key in self._window:
+            return self._window
+        if key in self._main:
+            return self._main
+        return None
+        
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, expiring it if its TTL has passed.
+        
+        Args:
+            key: Cache key
+            default: Value to return on a miss
+            
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        if self._sketch is not None:
+            self._sketch.increment(key)
+            
+        segment = self._segment(key)
+        if segment is None:
+            self.metrics["misses"] += 1
+            return default
+            
+        entry = segment[key]
+        if self._expired(entry, time.time()):
+            self._remove(segment, key)
+            self.metrics["expirations"] += 1
+            self.metrics["misses"] += 1
+            return default
+            
+        segment.move_to_end(key)
+        self.metrics["hits"] += 1
+        return entry[0]
+        
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting other entries if the cache is full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds, defaulting to the cache TTL
+        """
+        now = time.time()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.expire()
+            
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        size = self.sizeof(value)
+        
+        if self._sketch is not None:
+            self._sketch.increment(key)
+            
+        segment = self._segment(key)
+        if segment is not None:
+            self._remove(segment, key)
+        else:
+            segment = self._window
+            
+        # Values larger than the whole cache are not cached
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.metrics["rejections"] += 1
+            return
+            
+        segment[key] = (value, expires_at, size)
+        self.bytes += size
+        
+        if len(self._window) > self.window_entries:
+            self._admit_from_window()
+            
+        while self.max_bytes is not None and self.bytes > self.max_bytes:
+            self._evict(self._main if self._main else self._window)
+            
+    def _admit_from_window(self) -> None:
+        """Move the oldest window entry to the main cache if it earns its place."""
+        candidate_key, candidate = self._window.popitem(last=False)
+        self.bytes -= candidate[2]
+        
+        main_entries = self.max_entries - self.window_entries
+        if len(self._main) >= main_entries:
+            # Plain LRU has no main cache, so the window entry is evicted
+            if (self._sketch is None or not self._main
+                    or self._sketch.frequency(candidate_key) <= self._sketch.frequency(next(iter(self._main)))):
+                self.metrics["evictions"] += 1
+                return
+            self._evict(self._main)
+            
+        self._main[candidate_key] = candidate
+        self.bytes += candidate[2]
+        
+    def _evict(self, segment: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]") -> None:
+        """Evict the least recently used entry of a segment."""
+        _, entry = segment.popitem(last=False)
+        self.bytes -= entry[2]
+        self.metrics["evictions"] += 1
+        
+    def _remove(self, segment: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]", key: Hashable) -> None:
+        entry = segment.pop(key)
+        self.bytes -= entry[2]
+        
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry.
+        
+        Args:
+            key: Cache key
+            default: Value to return if the key is not cached
+            
+        Returns:
+            Removed value, or default
+        """
+        segment = self._segment(key)
+        if segment is None:
+            return default
+            
+        value = segment[key][0]
+        self._remove(segment, key)
+        return value
+        
+    def expire(self) -> int:
+        """Remove all expired entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        self._last_sweep = now
+        removed = 0
+        
+        for segment in (self._window, self._main):
+            for key in [key for key, entry in segment.items() if self._expired(entry, now)]:
+                self._remove(segment, key)
+                removed += 1
+                
+        self.metrics["expirations"] += removed
+        return removed
+        
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._window.clear()
+        self._main.clear()
+        self.bytes = 0
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache metrics.
+        
+        Returns:
+            Hits, misses, evictions, expirations and rejections, with the
+            current number of entries and bytes and the hit rate
+        """
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.metrics["hits"] / lookups * 100 if lookups else 0.0
+        }
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get the metrics of every live cache.
+    
+    Returns:
+        Metrics by cache name, of the most recently created cache of each name
+    """
+    return {name: cache.get_stats() for name, cache in list(_caches.items())}
@@ -0,0 +1,125 @@
+"""
+Sharded document counters for the marketplace data repository.
+
+Counting the products, categories or keywords of a marketplace with a query
+touches every matching document. The repository instead keeps a counter per
+marketplace and entity type, changed in the same batch as the write creating
+or deleting a document, so statistics take a single read of the counters.
+
+Each counter is split over several shard documents and every change goes to
+a random shard, so frequent creates do not contend on one document. Reading
+a counter sums its shards. A counter only counts once it was initialised,
+usually from an aggregation query; until then its total is unknown.
+"""
+
+import random
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+
+# Shard documents per counter
+COUNTER_SHARDS = 10
+
+# Entity types counted per marketplace
+COUNTED_ENTITIES = ("products", "categories", "keywords")
+
+# A write as (operation, document reference, data), as committed by the repository
+Write = Tuple[str, Any, Optional[Dict[str, Any]]]
+
+
+class ShardedCounters:
+    """Builds the writes and reads of sharded counters in a collection."""
+    
+    def __init__(self,
+                 collection,
+                 increment: Callable[[int], Any],
+                 num_shards: int = COUNTER_SHARDS):
+        """Initialize the counters.
+        
+        Args:
+            collection: Collection holding the shard documents
+            increment: Factory of the server-side increment of a field
+            num_shards: Number of shard documents per counter
+        """
+        self.collection = collection
+        self.increment = increment
+        self.num_shards = max(1, num_shards)
+        
+    def shard_ids(self, marketplace: str, entity: str) -> List[str]:
+        """Get the document IDs of the shards of a counter.
+        
+        Args:
+            marketplace: Marketplace name
+            entity: Counted entity type
+            
+        Returns:
+            Shard document IDs
+        """
+        return [f"{marketplace}_{entity}_{shard}" for shard in range(self.num_shards)]
+        
+    def change_write(self, marketplace: str, entity: str, amount: int) -> Write:
+        """Build the write changing a counter by an amount.
+        
+        Args:
+            marketplace: Marketplace name
+            entity: Counted entity type
+            amount: Number of documents created, negative for deletions
+            
+        Returns:
+            Merging write of a random shard
+        """
+        shard_id = random.choice(self.shard_ids(marketplace, entity))
+        return ("merge", self.collection.document(shard_id), {
+            "marketplace": marketplace,
+            "entity": entity,
+            "count": self.increment(amount)
+        })
+        
+    def change_writes(self, changes: Dict[Tuple[str, str], int]) -> List[Write]:
+        """Build the writes applying counter changes, one per counter.
+        
+        Args:
+            changes: Amounts by (marketplace, entity type)
+            
+        Returns:
+            Writes of the counters that changed
+        """
+        return [
+            self.change_write(marketplace, entity, amount)
+            for (marketplace, entity), amount in changes.items()
+            if amount
+        ]
+        
+    def reset_writes(self, marketplace: str, entity: str, count: int) -> List[Write]:
+        """Build the writes setting a counter, marking it initialised.
+        
+        Args:
+            marketplace: Marketplace name
+            entity: Counted entity type
+            count: Number of documents counted
+            
+        Returns:
+            Writes of every shard of the counter
+        """
+        writes = []
+        for shard, shard_id in enumerate(self.shard_ids(marketplace, entity)):
+            data = {"marketplace": marketplace, "entity": entity, "count": count if shard == 0 else 0}
+            if shard == 0:
+                data["initialized"] = True
+            writes.append(("set", self.collection.document(shard_id), data))
+        return writes
+        
+    def total(self, marketplace: str, entity: str, shards: Dict[str, Dict[str, Any]]) -> Optional[int]:
+        """Sum the shards of a counter.
+        
+        Args:
+            marketplace: Marketplace name
+            entity: Counted entity type
+            shards: Data of the shard documents that exist by document ID
+            
+        Returns:
+            Counter total, or None if the counter was never initialised
+        """
+        counter_shards = [shards[shard_id] for shard_id in self.shard_ids(marketplace, entity) if shard_id in shards]
+        if not any(shard.get("initialized") for shard in counter_shards):
+            return None
+        return sum(shard.get("count", 0) for shard in counter_shards)
@@ -0,0 +1,176 @@
+"""
+Local content fingerprints of stored products.
+
+The repository keeps a compact fingerprint of every product it has written:
+a hash of the product content, a short hash per field and the stored update
+count. With it, a daily refresh of an unchanged product needs neither a read
+nor a write, and a changed product is updated with just the changed fields
+without reading the stored document first.
+
+The index assumes the repository is the only writer of the products it
+fingerprints. It is kept in memory and can be persisted to disk, so that it
+is warm when the scraper restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Bookkeeping fields and fields that change on every scrape
+VOLATILE_FIELDS = frozenset({"first_seen", "last_updated", "update_count", "timestamp", "extracted_at"})
+
+# Content hash and per-field hashes of a product
+Fingerprint = Tuple[str, Dict[str, str]]
+
+
+def _hash_value(value: Any, digest_size: int) -> str:
+    """Hash a JSON-compatible value independently of key order."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=digest_size).hexdigest()
+
+
+class FingerprintIndex:
+    """Index of product fingerprints by document ID."""
+    
+    def __init__(self,
+                 persist_path: Optional[str] = None,
+                 save_interval: int = 300):
+        """Initialize the fingerprint index.
+        
+        Args:
+            persist_path: Path to persist the index to (optional)
+            save_interval: Minimum seconds between saves by save_if_due
+        """
+        self.persist_path = persist_path
+        self.save_interval = save_interval
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.last_saved = time.time()
+        
+        self.logger = logging.getLogger("marketplace-fingerprints")
+        
+        # Warm-load persisted fingerprints if available
+        if self.persist_path and os.path.exists(self.persist_path):
+            self.load()
+            
+    def __len__(self) -> int:
+        return len(self.entries)
+        
+    def fingerprint(self, data: Dict[str, Any]) -> Fingerprint:
+        """Fingerprint product data, leaving out volatile fields.
+        
+        Args:
+            data: Product data
+            
+        Returns:
+            Content hash and per-field hashes
+        """
+        field_hashes = {
+            key: _hash_value(value, 4)
+            for key, value in data.items()
+            if key not in VOLATILE_FIELDS
+        }
+        return _hash_value(field_hashes, 8), field_hashes
+        
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get the recorded fingerprint of a document.
+        
+        Args:
+            doc_id: Document ID
+            
+        Returns:
+            Entry with "hash", "fields" and "update_count", or None if unknown
+        """
+        return self.entries.get(doc_id)
+        
+    def changed_fields(self, doc_id: str, fingerprint: Fingerprint) -> Optional[List[str]]:
+        """Find the fields that differ from the recorded fingerprint.
+        
+        As with diffing against the stored document, only fields present in
+        the new data are compared.
+        
+        Args:
+            doc_id: Document ID
+            fingerprint: Fingerprint of the new data
+            
+        Returns:
+            Names of the changed fields, or None if the document is unknown
+        """
+        entry = self.entries.get(doc_id)
+        if entry is None:
+            return None
+            
+        content_hash, field_hashes = fingerprint
+        if content_hash == entry["hash"]:
+            return []
+            
+        recorded = entry["fields"]
+        return [key for key, field_hash in field_hashes.items() if recorded.get(key) != field_hash]
+        
+    def record(self, doc_id: str, fingerprint: Fingerprint, update_count: int) -> None:
+        """Record the fingerprint of a written document.
+        
+        Args:
+            doc_id: Document ID
+            fingerprint: Fingerprint of the written data
+            update_count: Update count of the stored document
+        """
+        content_hash, field_hashes = fingerprint
+        entry = self.entries.get(doc_id)
+        
+        # Fields missing from the written data keep their recorded hashes
+        fields = dict(entry["fields"]) if entry else {}
+        fields.update(field_hashes)
+        
+        self.entries[doc_id] = {"hash": content_hash, "fields": fields, "update_count": update_count}
+        self.dirty = True
+        
+    def discard(self, doc_id: str) -> None:
+        """Forget a document, e.g. after a failed write."""
+        if self.entries.pop(doc_id, None) is not None:
+            self.dirty = True
+            
+    def load(self) -> None:
+        """Load the index from persistent storage."""
+        try:
+            with open(self.persist_path, 'r') as f:
+                data = json.load(f)
+                
+            self.entries = data.get("entries", {})
+            self.dirty = False
+            self.logger.info(f"Loaded {len(self.entries)} product fingerprints")
+            
+        except Exception as e:
+            self.logger.error(f"Error loading product fingerprints: {str(e)}")
+            
+    def save(self) -> None:
+        """Save the index to persistent storage."""
+        if not self.persist_path:
+            return
+            
+        try:
+            # Ensure directory exists
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+                
+            # Write to a temporary file first so a crash never leaves a partial index
+            temp_path = f"{self.persist_path}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"version": 1, "entries": self.entries}, f, separators=(",", ":"))
+            os.replace(temp_path, self.persist_path)
+            
+            self.dirty = False
+            self.last_saved = time.time()
+            
+        except Exception as e:
+            self.logger.error(f"Error saving product fingerprints: {str(e)}")
+            
+    def save_if_due(self) -> None:
+        """Save the index if it changed and the save interval has passed."""
+        if self.dirty and time.time() - self.last_saved >= self.save_interval:
+            self.save()
@@ -0,0 +1,160 @@
+"""
+Segmented keyword ranking history.
+
+Keyword ranking entries used to embed their whole history as one list, so
+every read of an entry pulled its full retention period and every
+retention pass rewrote every entry. History entries are instead kept in
+weekly segment documents, one per keyword and week, and the ranking entry
+only lists the labels of its segments. A read of the last days touches the
+segments covering them, and retention deletes the segments that ended
+before the cutoff without rewriting the rest.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# Format of segment labels, the date of the Monday starting the segment's week
+SEGMENT_FORMAT = "%Y%m%d"
+
+
+def entry_time(value: Any) -> Optional[datetime]:
+    """Convert the date of a history entry to a naive datetime.
+    
+    Args:
+        value: Datetime, date or ISO format string
+        
+    Returns:
+        Naive datetime, in UTC for timezone-aware values, or None if the
+        value is not a date
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    elif isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def segment_label(value: Any) -> Optional[str]:
+    """Get the label of the segment holding a date.
+    
+    Args:
+        value: Datetime, date or ISO format string
+        
+    Returns:
+        Segment label, e.g. "20261012", or None if the value is not a date
+    """
+    moment = entry_time(value)
+    if moment is None:
+        return None
+    start = moment.date() - timedelta(days=moment.weekday())
+    return start.strftime(SEGMENT_FORMAT)
+
+
+def labels_in_range(labels: List[str], start: Any = None, end: Any = None) -> List[str]:
+    """Select the segments overlapping a time range.
+    
+    Args:
+        labels: Segment labels
+        start: Start of the range (optional)
+        end: End of the range (optional)
+        
+    Returns:
+        Labels of the segments overlapping the range, in time order
+    """
+    first = segment_label(start) if start is not None else None
+    last = segment_label(end) if end is not None else None
+    return sorted(
+        label for label in set(labels)
+        if (first is None or label >= first) and (last is None or label <= last)
+    )
+
+
+def labels_before(labels: List[str], cutoff: Any) -> List[str]:
+    """Select the segments that ended before a cutoff.
+    
+    Args:
+        labels: Segment labels
+        cutoff: Date entries before which are no longer retained
+        
+    Returns:
+        Labels of segments all of whose entries are older than the cutoff
+    """
+    first_kept = segment_label(cutoff)
+    return sorted(label for label in set(labels) if label < first_kept)
+
+
+def group_entries(entries: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Group history entries by the segment holding their date.
+    
+    Args:
+        entries: History entries with a "date"
+        
+    Returns:
+        Entries by segment label, and the entries without a valid date
+    """
+    segments: Dict[str, List[Dict[str, Any]]] = {}
+    undated = []
+    for entry in entries:
+        label = segment_label(entry.get("date"))
+        if label is None:
+            undated.append(entry)
+        else:
+            segments.setdefault(label, []).append(entry)
+    return segments, undated
+
+
+def new_segment(keyword_id: str, label: str) -> Dict[str, Any]:
+    """Create an empty segment.
+    
+    Args:
+        keyword_id: Keyword ID, "<marketplace>_<keyword>"
+        label: Segment label
+        
+    Returns:
+        Segment document data
+    """
+    return {"keyword_id": keyword_id, "segment": label, "entries": []}
+
+
+def add_entries(segment: Dict[str, Any], entries: List[Dict[str, Any]]) -> None:
+    """Add history entries to a segment, keeping its entries in date order.
+    
+    Args:
+        segment: Segment document data, changed in place
+        entries: History entries
+    """
+    segment["entries"] = sorted(
+        segment["entries"] + list(entries), key=lambda entry: entry_time(entry.get("date"))
+    )
+
+
+def entries_in_range(entries: List[Dict[str, Any]], start: Any = None, end: Any = None) -> List[Dict[str, Any]]:
+    """Select the history entries within a time range.
+    
+    Args:
+        entries: History entries with a "date"
+        start: Start of the range (optional)
+        end: End of the range (optional)
+        
+    Returns:
+        Entries dated within the range, in date order
+    """
+    start = entry_time(start) if start is not None else None
+    end = entry_time(end) if end is not None else None
+    selected = []
+    for entry in entries:
+        moment = entry_time(entry.get("date"))
+        if moment is None:
+            continue
+        if (start is None or moment >= start) and (end is None or moment <= end):
+            selected.append((moment, entry))
+    selected.sort(key=lambda item: item[0])
+    return [entry for _, entry in selected]
@@ -0,0 +1,218 @@
+"""
+Time-bucketed price series.
+
+Storing every price observation as its own document makes a 90-day history
+cost 90 reads per product. A price series instead keeps the observations of
+a product for one day or month in a single bucket document, as parallel
+arrays of timestamps, prices, list prices and stock states, so a history is
+read from a few bucket documents.
+
+Observations that repeat the previous point of their bucket are not
+recorded. The first observation of each bucket is always recorded, so a
+bucket can be read without the buckets before it. As a steady price is
+only recorded once, a read of a time range starts with the last point
+before the range, carried forward to its start.
+"""
+
+import copy
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional
+
+
+# Bucket sizes, by the format of their labels
+BUCKET_FORMATS = {
+    "daily": "%Y%m%d",
+    "monthly": "%Y%m"
+}
+
+# Parallel arrays of a bucket, by the price data field they record
+SERIES_ARRAYS = {
+    "price": "prices",
+    "list_price": "list_prices",
+    "in_stock": "in_stock"
+}
+
+
+def bucket_label(timestamp: float, granularity: str) -> str:
+    """Get the label of the bucket holding a timestamp.
+    
+    Args:
+        timestamp: Unix timestamp in seconds
+        granularity: Bucket size, "daily" or "monthly"
+        
+    Returns:
+        Bucket label, e.g. "20261018" or "202610"
+    """
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime(BUCKET_FORMATS[granularity])
+
+
+def bucket_labels(start: float, end: float, granularity: str) -> List[str]:
+    """Get the labels of the buckets covering a time range.
+    
+    Args:
+        start: Start of the range as a Unix timestamp
+        end: End of the range as a Unix timestamp
+        granularity: Bucket size, "daily" or "monthly"
+        
+    Returns:
+        Bucket labels in time order
+    """
+    labels = []
+    day = datetime.fromtimestamp(start, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    end_day = datetime.fromtimestamp(end, timezone.utc)
+    
+    while day <= end_day:
+        label = day.strftime(BUCKET_FORMATS[granularity])
+        if not labels or labels[-1] != label:
+            labels.append(label)
+        day += timedelta(days=1)
+        
+    return labels
+
+
+def previous_bucket_label(label: str, granularity: str) -> str:
+    """Get the label of the bucket before a bucket.
+    
+    Args:
+        label: Bucket label
+        granularity: Bucket size, "daily" or "monthly"
+        
+    Returns:
+        Label of the preceding bucket, e.g. "202609" for "202610"
+    """
+    first_day = datetime.strptime(label, BUCKET_FORMATS[granularity])
+    return (first_day - timedelta(days=1)).strftime(BUCKET_FORMATS[granularity])
+
+
+def to_timestamp(value: Any) -> Optional[float]:
+    """Convert a stored timestamp to a Unix timestamp.
+    
+    Args:
+        value: Unix timestamp, datetime or ISO format string
+        
+    Returns:
+        Unix timestamp, or None if the value is not a timestamp
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def new_bucket(marketplace: str, product_id: str, label: str, currency: str) -> Dict[str, Any]:
+    """Create an empty bucket.
+    
+    Args:
+        marketplace: Marketplace name
+        product_id: Product ID
+        label: Bucket label
+        currency: Currency of the prices
+        
+    Returns:
+        Bucket document data
+    """
+    bucket = {
+        "marketplace": marketplace,
+        "product_id": product_id,
+        "bucket": label,
+        "currency": currency,
+        "timestamps": []
+    }
+    for array in SERIES_ARRAYS.values():
+        bucket[array] = []
+    return bucket
+
+
+def copy_bucket(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a bucket so appending to it leaves the original unchanged."""
+    return copy.deepcopy(bucket)
+
+
+def append_point(bucket: Dict[str, Any], timestamp: float, price_data: Dict[str, Any]) -> bool:
+    """Record a price observation in a bucket if it changed anything.
+    
+    Observations older than the last point are inserted in time order.
+    
+    Args:
+        bucket: Bucket document data, changed in place
+        timestamp: Unix timestamp of the observation
+        price_data: Price data with "price" and optionally "list_price" and "in_stock"
+        
+    Returns:
+        True if the observation was recorded
+    """
+    values = {
+        "price": price_data["price"],
+        "list_price": price_data.get("list_price"),
+        "in_stock": price_data.get("in_stock", True)
+    }
+    
+    position = bisect_right(bucket["timestamps"], timestamp)
+    if position > 0 and all(
+        bucket[array][position - 1] == values[field] for field, array in SERIES_ARRAYS.items()
+    ):
+        return False
+        
+    bucket["timestamps"].insert(position, timestamp)
+    for field, array in SERIES_ARRAYS.items():
+        bucket[array].insert(position, values[field])
+    return True
+
+
+def _bucket_point(bucket: Dict[str, Any], index: int, timestamp: float) -> Dict[str, Any]:
+    """Shape a point of a bucket like a price point document."""
+    point = {
+        "product_id": bucket["product_id"],
+        "marketplace": bucket["marketplace"],
+        "price": bucket["prices"][index],
+        "currency": bucket.get("currency", "ZAR"),
+        "in_stock": bucket["in_stock"][index],
+        "timestamp": datetime.fromtimestamp(timestamp, timezone.utc)
+    }
+    if bucket["list_prices"][index] is not None:
+        point["list_price"] = bucket["list_prices"][index]
+    return point
+
+
+def bucket_points(bucket: Dict[str, Any], start: float, end: float) -> List[Dict[str, Any]]:
+    """Read the price points of a bucket within a time range.
+    
+    Args:
+        bucket: Bucket document data
+        start: Start of the range as a Unix timestamp
+        end: End of the range as a Unix timestamp
+        
+    Returns:
+        Price points in time order, shaped like price point documents
+    """
+    return [
+        _bucket_point(bucket, index, timestamp)
+        for index, timestamp in enumerate(bucket["timestamps"])
+        if start <= timestamp <= end
+    ]
+
+
+def point_before(bucket: Dict[str, Any], start: float) -> Optional[Dict[str, Any]]:
+    """Read the last price point of a bucket before a time, carried forward to it.
+    
+    Args:
+        bucket: Bucket document data
+        start: Start of a range as a Unix timestamp
+        
+    Returns:
+        The point in effect at the start, timestamped at the start, or None
+        if the bucket has no point before it
+    """
+    position = bisect_left(bucket["timestamps"], start)
+    if position == 0:
+        return None
+    return _bucket_point(bucket, position - 1, start)
@@ -10,8 +10,27 @@ import asyncio
 import json
 import logging
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Set, Tuple
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Any, AsyncIterator, Optional, Union, Set, Tuple
+
+from .fingerprint_index import FingerprintIndex, Fingerprint
+from .cache import BoundedCache
+from .counters import ShardedCounters, COUNTED_ENTITIES
+from .price_series import (
+    BUCKET_FORMATS,
+    bucket_label,
+    bucket_labels,
+    bucket_points,
+    point_before,
+    previous_bucket_label,
+    append_point,
+    copy_bucket,
+    new_bucket,
+    to_timestamp
+)
+from .search_snapshots import ranking_rows, diff_rows, apply_delta, needs_keyframe
+from .keyword_history import group_entries, labels_in_range, labels_before, entries_in_range
 
 try:
     from google.cloud import firestore
@@ -19,10 +38,21 @@ try:
 except ImportError:
     # Mock classes for development without Firebase
     class firestore:
-        @staticmethod
-        def SERVER_TIMESTAMP():
-            return datetime.now().isoformat()
-            
+        # Sentinel replaced by the server's time on write
+        SERVER_TIMESTAMP = "SERVER_TIMESTAMP"
+        
+        class Increment:
+            def __init__(self, value):
+                self.value = value
+                
+        class ArrayUnion:
+            def __init__(self, values):
+                self.values = values
+                
+        class ArrayRemove:
+            def __init__(self, values):
+                self.values = values
+                
         class AsyncClient:
             def __init__(self, *args, **kwargs):
                 pass
@@ -30,6 +60,9 @@ except ImportError:
             def collection(self, name):
                 return Collection(name)
                 
+            def batch(self):
+                return WriteBatch()
+                
     class FieldFilter:
         def __init__(self, field, op, value):
             self.field = field
@@ -48,8 +81,8 @@ except ImportError:
         def __init__(self, name):
             self.name = name
             
-        def document(self, doc_id):
-            return Document(doc_id)
+        def document(self, doc_id=None):
+            return Document(doc_id or uuid.uuid4().hex)
             
         def add(self, data):
             return ("mock_doc_id", None)
@@ -67,6 +100,25 @@ except ImportError:
         async def update(self, data):
             return True
             
+        async def delete(self):
+            return True
+            
+    class WriteBatch:
+        def __init__(self):
+            self.operations = []
+            
+        def set(self, doc_ref, data, merge=False):
+            self.operations.append(("merge" if merge else "set", doc_ref, data))
+            
+        def update(self, doc_ref, data):
+            self.operations.append(("update", doc_ref, data))
+            
+        def delete(self, doc_ref):
+            self.operations.append(("delete", doc_ref, None))
+            
+        async def commit(self):
+            return []
+            
     class MockDocSnapshot:
         @property
         def exists(self):
@@ -74,7 +126,48 @@ except ImportError:
             
         def to_dict(self):
             return {}
+
+
+# Firestore limit on the number of writes in one batched commit
+MAX_BATCH_WRITES = 500
+
+# Batched reads or commits in flight at once during bulk writes
+DEFAULT_BULK_CONCURRENCY = 4
+
+# Layouts of the price history: a document per price point, or bucketed price series
+PRICE_LAYOUTS = ("documents", "series")
+
+# Comparison operators of keyword ranking filters
+FILTER_OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not-in", "array_contains")
+
+# Keyword ranking fields holding lists, where an equality filter matches any element
+KEYWORD_ARRAY_FIELDS = ("categories", "tags")
+
+
+def filter_conditions(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Any]]:
+    """Expand keyword ranking filters into (field, operator, value) conditions.
+    
+    Args:
+        filters: Values by field, matched for equality, or dictionaries of
+            values by comparison operator, e.g. {"priority": {">=": 5}}
             
+    Returns:
+        Conditions, with equality on list fields expanded to "array_contains"
+        
+    Raises:
+        ValueError: If a filter uses an unknown operator
+    """
+    conditions = []
+    for field, condition in (filters or {}).items():
+        comparisons = condition.items() if isinstance(condition, dict) else [("==", condition)]
+        for operator, value in comparisons:
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter operator '{operator}' for {field}")
+            if operator == "==" and field in KEYWORD_ARRAY_FIELDS:
+                operator = "array_contains"
+            conditions.append((field, operator, value))
+    return conditions
+
 
 class MarketplaceDataRepository:
     """Repository for marketplace data with Firestore implementation.
@@ -93,7 +186,12 @@ class MarketplaceDataRepository:
                  firestore_client = None,
                  project_id: Optional[str] = None,
                  cache_enabled: bool = True,
-                 cache_ttl: int = 3600):  # 1 hour default TTL
+                 cache_ttl: int = 3600,  # 1 hour default TTL
+                 fingerprint_path: Optional[str] = None,
+                 cache_max_entries: int = 10000,
+                 cache_max_bytes: int = 32 * 1024 * 1024,
+                 price_layout: str = "documents",
+                 price_bucket: str = "monthly"):
         """Initialize the marketplace data repository.
         
         Args:
@@ -101,30 +199,69 @@ class MarketplaceDataRepository:
             project_id: Google Cloud project ID
             cache_enabled: Whether to enable in-memory caching
             cache_ttl: Cache time-to-live in seconds
+            fingerprint_path: Path to persist product fingerprints to (optional)
+            cache_max_entries: Maximum number of cached entries per entity type
+            cache_max_bytes: Maximum estimated bytes cached per entity type
+            price_layout: Price history layout, "documents" (a document per
+                price point) or "series" (bucketed price series)
+            price_bucket: Size of price series buckets, "daily" or "monthly"
         """
+        if price_layout not in PRICE_LAYOUTS:
+            raise ValueError(f"Unknown price layout '{price_layout}', expected one of {PRICE_LAYOUTS}")
+        if price_bucket not in BUCKET_FORMATS:
+            raise ValueError(f"Unknown price bucket '{price_bucket}', expected one of {tuple(BUCKET_FORMATS)}")
+            
         self.db = firestore_client or firestore.AsyncClient(project=project_id)
         self.products_collection = self.db.collection("marketplace_products")
         self.prices_collection = self.db.collection("product_prices")
         self.keywords_collection = self.db.collection("search_keywords")
         self.categories_collection = self.db.collection("marketplace_categories")
         self.suggestions_collection = self.db.collection("search_suggestions")
+        self.counters_collection = self.db.collection("marketplace_counters")
+        self.price_series_collection = self.db.collection("price_series")
+        self.snapshots_collection = self.db.collection("search_snapshots")
+        self.rankings_collection = self.db.collection("keyword_rankings")
+        self.history_collection = self.db.collection("keyword_history")
+        
+        # Document counts per marketplace, changed with the writes creating and deleting documents
+        self.counters = ShardedCounters(self.counters_collection, firestore.Increment)
+        self.counted_collections = {
+            "products": self.products_collection,
+            "categories": self.categories_collection,
+            "keywords": self.keywords_collection
+        }
         
         # Caching setup
         self.cache_enabled = cache_enabled
         self.cache_ttl = cache_ttl
         self.cache = {
-            "products": {},
-            "prices": {},
-            "keywords": {},
-            "categories": {},
-            "suggestions": {}
+            entity_type: BoundedCache(
+                f"repository.{entity_type}",
+                max_entries=cache_max_entries,
+                max_bytes=cache_max_bytes,
+                ttl=cache_ttl,
+                # Products are touched once by crawls but read repeatedly by refreshes
+                policy="tinylfu" if entity_type == "products" else "lru"
+            )
+            for entity_type in ["products", "prices", "keywords", "categories", "suggestions", "rankings"]
         }
-        self.cache_timestamps = {
-            "products": {},
-            "prices": {},
-            "keywords": {},
-            "categories": {},
-            "suggestions": {}
+        
+        # Price series buckets, kept so appending a point needs no read
+        self.price_layout = price_layout
+        self.price_bucket = price_bucket
+        self.series_buckets = BoundedCache(
+            "repository.price_series",
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes
+        )
+        
+        # Product fingerprints to skip reads and writes of unchanged products
+        self.fingerprints = FingerprintIndex(fingerprint_path)
+        self.write_stats = {
+            "reads": 0,
+            "reads_avoided": 0,
+            "writes": 0,
+            "writes_avoided": 0
         }
         
         # Setup logging
@@ -179,18 +316,7 @@ class MarketplaceDataRepository:
         if not self.cache_enabled:
             return None
             
-        if cache_key not in self.cache[entity_type]:
-            return None
-            
-        # Check if cache entry has expired
-        timestamp = self.cache_timestamps[entity_type].get(cache_key, 0)
-        if time.time() - timestamp > self.cache_ttl:
-            # Remove expired entry
-            self.cache[entity_type].pop(cache_key, None)
-            self.cache_timestamps[entity_type].pop(cache_key, None)
-            return None
-            
-        return self.cache[entity_type][cache_key]
+        return self.cache[entity_type].get(cache_key)
         
     def _set_in_cache(self, cache_key: str, entity_type: str, data: Dict[str, Any]) -> None:
         """Store data in cache.
@@ -203,8 +329,133 @@ class MarketplaceDataRepository:
         if not self.cache_enabled:
             return
             
-        self.cache[entity_type][cache_key] = data
-        self.cache_timestamps[entity_type][cache_key] = time.time()
+        self.cache[entity_type].set(cache_key, data)
+        
+    def _build_product_write(self,
+                             product_data: Dict[str, Any],
+                             existing_data: Optional[Dict[str, Any]],
+                             timestamp: Any) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Work out the write that brings a stored product up to date.
+        
+        Args:
+            product_data: Product data to save
+            existing_data: Stored product data, or None for a new product
+            timestamp: Timestamp to record for the write
+            
+        Returns:
+            ("update", changed fields) for an existing product, ("set", product
+            data) for a new one, or (None, {}) if nothing changed
+        """
+        if existing_data is None:
+            product_data.update({
+                "first_seen": timestamp,
+                "last_updated": timestamp,
+                "update_count": 1
+            })
+            return "set", product_data
+            
+        # Only update fields that have changed
+        update_data = {}
+        for key, value in product_data.items():
+            if key not in existing_data or existing_data[key] != value:
+                update_data[key] = value
+                
+        if not update_data:
+            return None, {}
+            
+        # Add metadata
+        update_data.update({
+            "last_updated": timestamp,
+            "update_count": (existing_data.get("update_count", 0) + 1)
+        })
+        return "update", update_data
+        
+    def _build_price_point(self, product_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the price point recorded along with a product.
+        
+        Args:
+            product_data: Product data
+            
+        Returns:
+            Price data, or None if the product has no price
+        """
+        if not all(k in product_data for k in ["price", "marketplace", "product_id"]):
+            return None
+            
+        price_data = {
+            "product_id": product_data["product_id"],
+            "marketplace": product_data["marketplace"],
+            "price": product_data["price"],
+            "currency": product_data.get("currency", "ZAR"),
+            "in_stock": product_data.get("in_stock", True),
+        }
+        
+        if "list_price" in product_data:
+            price_data["list_price"] = product_data["list_price"]
+            
+        if "discount_percentage" in product_data:
+            price_data["discount_percentage"] = product_data["discount_percentage"]
+            
+        return price_data
+        
+    def _plan_fingerprinted_write(self,
+                                  doc_id: str,
+                                  product_data: Dict[str, Any],
+                                  fingerprint: Fingerprint,
+                                  timestamp: Any) -> Optional[Tuple[Optional[str], Dict[str, Any], int]]:
+        """Work out the write of a known product from its fingerprint.
+        
+        Args:
+            doc_id: Document ID of the product
+            product_data: Product data to save
+            fingerprint: Fingerprint of the product data
+            timestamp: Timestamp to record for the write
+            
+        Returns:
+            Operation, write data and stored update count after the write, as
+            for _build_product_write, or None if the product has no fingerprint
+        """
+        changed_fields = self.fingerprints.changed_fields(doc_id, fingerprint)
+        if changed_fields is None:
+            return None
+            
+        self.write_stats["reads_avoided"] += 1
+        update_count = self.fingerprints.get(doc_id)["update_count"]
+        
+        if not changed_fields:
+            return None, {}, update_count
+            
+        update_data = {key: product_data[key] for key in changed_fields}
+        update_data.update({
+            "last_updated": timestamp,
+            "update_count": update_count + 1
+        })
+        return "update", update_data, update_count + 1
+        
+    def _stored_update_count(self,
+                             operation: Optional[str],
+                             write_data: Dict[str, Any],
+                             existing_data: Optional[Dict[str, Any]]) -> int:
+        """Get the update count of a stored product after a write."""
+        if operation:
+            return write_data["update_count"]
+        return existing_data.get("update_count", 0) if existing_data else 0
+        
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Get counts of product reads and writes, and of those avoided.
+        
+        Returns:
+            Read and write counts, including reads and writes skipped thanks to
+            product fingerprints, and the number of fingerprinted products
+        """
+        return {
+            **self.write_stats,
+            "fingerprinted_products": len(self.fingerprints)
+        }
+        
+    def save_fingerprints(self) -> None:
+        """Persist product fingerprints, e.g. on shutdown."""
+        self.fingerprints.save()
         
     async def save_product(self, product_data: Dict[str, Any]) -> str:
         """Save product data with efficient document structure.
@@ -224,70 +475,55 @@ class MarketplaceDataRepository:
         if "marketplace" not in product_data:
             raise ValueError("marketplace is required")
             
+        # Generate document ID
+        doc_id = self._get_document_id(
+            product_data["marketplace"], 
+            product_data["product_id"]
+        )
+        
         try:
-            # Generate document ID
-            doc_id = self._get_document_id(
-                product_data["marketplace"], 
-                product_data["product_id"]
-            )
-            
             product_ref = self.products_collection.document(doc_id)
             
-            # Check if product exists to determine if this is an update
-            doc_snapshot = await product_ref.get()
+            timestamp = firestore.SERVER_TIMESTAMP
+            fingerprint = self.fingerprints.fingerprint(product_data)
             
-            timestamp = firestore.SERVER_TIMESTAMP()
+            # Work out the write from the fingerprint, reading the product only if it is unknown
+            planned_write = self._plan_fingerprinted_write(doc_id, product_data, fingerprint, timestamp)
             
-            if doc_snapshot.exists:
-                # Update existing product with change tracking
-                existing_data = doc_snapshot.to_dict()
+            if planned_write is not None:
+                operation, write_data, update_count = planned_write
+            else:
+                # Check if product exists to determine if this is an update
+                doc_snapshot = await product_ref.get()
+                self.write_stats["reads"] += 1
+                existing_data = doc_snapshot.to_dict() if doc_snapshot.exists else None
                 
-                # Create update data
-                update_data = {}
+                # Update existing products with change tracking, create new ones
+                operation, write_data = self._build_product_write(product_data, existing_data, timestamp)
+                update_count = self._stored_update_count(operation, write_data, existing_data)
                 
-                # Only update fields that have changed
-                for key, value in product_data.items():
-                    if key not in existing_data or existing_data[key] != value:
-                        update_data[key] = value
-                        
-                if update_data:
-                    # Add metadata
-                    update_data.update({
-                        "last_updated": timestamp,
-                        "update_count": (existing_data.get("update_count", 0) + 1)
-                    })
-                    
-                    await product_ref.update(update_data)
-                    self.logger.info(f"Updated product {doc_id} with {len(update_data)} changed fields")
-                else:
-                    self.logger.info(f"No changes detected for product {doc_id}")
-            else:
-                # Create new product
-                product_data.update({
-                    "first_seen": timestamp,
-                    "last_updated": timestamp,
-                    "update_count": 1
-                })
-                
-                await product_ref.set(product_data)
+            if operation == "update":
+                await product_ref.update(write_data)
+                self.write_stats["writes"] += 1
+                self.logger.info(f"Updated product {doc_id} with {len(write_data)} changed fields")
+            elif operation == "set":
+                # Count the new product in the same commit
+                await self._commit_writes([
+                    ("set", product_ref, write_data),
+                    self.counters.change_write(product_data["marketplace"], "products", 1)
+                ])
+                self.write_stats["writes"] += 1
                 self.logger.info(f"Created new product {doc_id}")
+            else:
+                self.write_stats["writes_avoided"] += 1
+                self.logger.info(f"No changes detected for product {doc_id}")
                 
+            self.fingerprints.record(doc_id, fingerprint, update_count)
+            self.fingerprints.save_if_due()
+            
             # Save price data if available
-            if all(k in product_data for k in ["price", "marketplace", "product_id"]):
-                price_data = {
-                    "product_id": product_data["product_id"],
-                    "marketplace": product_data["marketplace"],
-                    "price": product_data["price"],
-                    "currency": product_data.get("currency", "ZAR"),
-                    "in_stock": product_data.get("in_stock", True),
-                }
-                
-                if "list_price" in product_data:
-                    price_data["list_price"] = product_data["list_price"]
-                    
-                if "discount_percentage" in product_data:
-                    price_data["discount_percentage"] = product_data["discount_percentage"]
-                    
+            price_data = self._build_price_point(product_data)
+            if price_data:
                 await self.save_price_point(price_data)
                 
             # Update cache
@@ -296,6 +532,8 @@ class MarketplaceDataRepository:
             return doc_id
             
         except Exception as e:
+            # The stored product may no longer match its fingerprint
+            self.fingerprints.discard(doc_id)
             self.logger.error(f"Failed to save product: {str(e)}")
             raise
             
@@ -317,8 +555,11 @@ class MarketplaceDataRepository:
                 raise ValueError(f"{field} is required")
                 
         try:
+            if self.price_layout == "series":
+                return await self._save_series_point(price_data)
+                
             # Add timestamp
-            price_data["timestamp"] = firestore.SERVER_TIMESTAMP()
+            price_data["timestamp"] = firestore.SERVER_TIMESTAMP
             
             # Save to Firestore
             doc_ref, _ = await self.prices_collection.add(price_data)
@@ -330,9 +571,451 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to save price point: {str(e)}")
             raise
             
+    async def _save_series_point(self, price_data: Dict[str, Any]) -> str:
+        """Append a price point to its price series bucket.
+        
+        Args:
+            price_data: Price data to save
+            
+        Returns:
+            Document ID of the bucket holding the price point
+        """
+        bucket_ids, changed_buckets, read_errors = await self._plan_series_appends(
+            [price_data], asyncio.Semaphore(1)
+        )
+        if read_errors:
+            raise RuntimeError(f"Failed to read price series: {next(iter(read_errors.values()))}")
+            
+        bucket_id = bucket_ids[0]
+        if bucket_id in changed_buckets:
+            await self._commit_writes([
+                ("set", self.price_series_collection.document(bucket_id), changed_buckets[bucket_id])
+            ])
+            self.series_buckets.set(bucket_id, changed_buckets[bucket_id])
+            self.logger.info(f"Recorded price point in {bucket_id}")
+        else:
+            self.logger.debug(f"Price unchanged in {bucket_id}, nothing recorded")
+            
+        return bucket_id
+        
+    async def _plan_series_appends(self,
+                                   price_points: List[Dict[str, Any]],
+                                   semaphore: asyncio.Semaphore) -> Tuple[List[str],
+                                                                          Dict[str, Dict[str, Any]],
+                                                                          Dict[str, str]]:
+        """Append price points to copies of their price series buckets.
+        
+        Buckets are taken from the bucket cache, and the others read in
+        chunks. Points are timestamped now unless they carry a "timestamp".
+        The cache is left unchanged until the changed buckets are written.
+        
+        Args:
+            price_points: Price data to append
+            semaphore: Limits the reads in flight
+            
+        Returns:
+            Bucket ID of each price point, the buckets that changed by ID,
+            and error messages by ID for buckets that could not be read
+        """
+        now = time.time()
+        placements = []
+        for price_data in price_points:
+            timestamp = to_timestamp(price_data.get("timestamp")) or now
+            label = bucket_label(timestamp, self.price_bucket)
+            doc_id = self._get_document_id(price_data["marketplace"], price_data["product_id"])
+            placements.append((f"{doc_id}_{label}", label, timestamp))
+            
+        buckets: Dict[str, Dict[str, Any]] = {}
+        for bucket_id, _, _ in placements:
+            cached = self.series_buckets.get(bucket_id)
+            if cached is not None:
+                buckets[bucket_id] = copy_bucket(cached)
+                
+        unknown_ids = list(dict.fromkeys(
+            bucket_id for bucket_id, _, _ in placements if bucket_id not in buckets
+        ))
+        stored, read_errors = await self._get_documents_bulk(self.price_series_collection, unknown_ids, semaphore)
+        for bucket_id, bucket in stored.items():
+            self.series_buckets.set(bucket_id, bucket)
+            buckets[bucket_id] = copy_bucket(bucket)
+            
+        changed = set()
+        for price_data, (bucket_id, label, timestamp) in zip(price_points, placements):
+            if bucket_id in read_errors:
+                continue
+                
+            if bucket_id not in buckets:
+                buckets[bucket_id] = new_bucket(
+                    price_data["marketplace"], price_data["product_id"], label, price_data.get("currency", "ZAR")
+                )
+            if append_point(buckets[bucket_id], timestamp, price_data):
+                changed.add(bucket_id)
+                
+        return (
+            [bucket_id for bucket_id, _, _ in placements],
+            {bucket_id: buckets[bucket_id] for bucket_id in changed},
+            read_errors
+        )
+        
+    async def save_products_bulk(self,
+                                 products: List[Dict[str, Any]],
+                                 max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Save many products and their price points using batched writes.
+        
+        Stored versions of products without a fingerprint are read in chunks,
+        then product writes and price points are committed in batches of at
+        most MAX_BATCH_WRITES operations, so hundreds of products take a
+        handful of round-trips. Change tracking is the same as in save_product. A product listed more
+        than once is written once, with later entries merged over earlier
+        ones, but every entry records its own price point.
+        
+        Args:
+            products: Product data to save
+            max_concurrency: Maximum number of batched reads or commits in flight
+            
+        Returns:
+            One result per product, in order, with the "doc_id" of the saved
+            product and an "error" message if it was not saved (None otherwise)
+        """
+        results = [{"doc_id": None, "error": None} for _ in products]
+        
+        # Validate products and group entries by document
+        merged_products: Dict[str, Dict[str, Any]] = {}
+        product_indexes: Dict[str, List[int]] = {}
+        
+        for index, product_data in enumerate(products):
+            missing = next((field for field in ["product_id", "marketplace"] if field not in product_data), None)
+            if missing:
+                results[index]["error"] = f"{missing} is required"
+                continue
+                
+            doc_id = self._get_document_id(product_data["marketplace"], product_data["product_id"])
+            results[index]["doc_id"] = doc_id
+            
+            if doc_id in merged_products:
+                merged_products[doc_id].update(product_data)
+            else:
+                merged_products[doc_id] = dict(product_data)
+            product_indexes.setdefault(doc_id, []).append(index)
+            
+        if not merged_products:
+            return results
+            
+        timestamp = firestore.SERVER_TIMESTAMP
+        
+        # Plan the writes of fingerprinted products without reading them
+        fingerprints = {}
+        planned_writes = {}
+        for doc_id, product_data in merged_products.items():
+            fingerprints[doc_id] = self.fingerprints.fingerprint(product_data)
+            planned_write = self._plan_fingerprinted_write(doc_id, product_data, fingerprints[doc_id], timestamp)
+            if planned_write is not None:
+                planned_writes[doc_id] = planned_write
+                
+        semaphore = asyncio.Semaphore(max_concurrency)
+        unknown_ids = [doc_id for doc_id in merged_products if doc_id not in planned_writes]
+        existing_products, read_errors = await self._get_documents_bulk(
+            self.products_collection, unknown_ids, semaphore
+        )
+        self.write_stats["reads"] += len(unknown_ids)
+        
+        # Price points of every product, appended to price series buckets up front
+        price_points = {
+            index: price_data
+            for doc_id in merged_products if doc_id not in read_errors
+            for index in product_indexes[doc_id]
+            for price_data in [self._build_price_point(products[index])] if price_data
+        }
+        if self.price_layout == "series":
+            point_buckets, changed_buckets, series_errors = await self._plan_series_appends(
+                list(price_points.values()), semaphore
+            )
+            point_buckets = dict(zip(price_points, point_buckets))
+            for bucket_id, error in series_errors.items():
+                doc_id = bucket_id.rsplit("_", 1)[0]
+                read_errors.setdefault(doc_id, error)
+                
+        # Keep the writes of each product together so they commit in the same batch
+        write_groups = []
+        group_buckets: Dict[str, List[str]] = {}
+        for doc_id, product_data in merged_products.items():
+            if doc_id in read_errors:
+                for index in product_indexes[doc_id]:
+                    results[index]["error"] = read_errors[doc_id]
+                continue
+                
+            if doc_id not in planned_writes:
+                existing_data = existing_products.get(doc_id)
+                operation, write_data = self._build_product_write(product_data, existing_data, timestamp)
+                planned_writes[doc_id] = (
+                    operation, write_data, self._stored_update_count(operation, write_data, existing_data)
+                )
+                
+            writes = []
+            counter_changes = {}
+            operation, write_data, _ = planned_writes[doc_id]
+            if operation:
+                writes.append((operation, self.products_collection.document(doc_id), write_data))
+            if operation == "set":
+                counter_changes[(product_data["marketplace"], "products")] = 1
+                
+            if self.price_layout == "series":
+                # One write per changed bucket, however many points it gained
+                group_buckets[doc_id] = [
+                    bucket_id for bucket_id in dict.fromkeys(
+                        point_buckets[index] for index in product_indexes[doc_id] if index in price_points
+                    )
+                    if bucket_id in changed_buckets
+                ]
+                for bucket_id in group_buckets[doc_id]:
+                    writes.append(("set", self.price_series_collection.document(bucket_id), changed_buckets[bucket_id]))
+            else:
+                for index in product_indexes[doc_id]:
+                    if index in price_points:
+                        price_data = price_points[index]
+                        price_data["timestamp"] = timestamp
+                        writes.append(("set", self.prices_collection.document(), price_data))
+                        
+            write_groups.append((product_indexes[doc_id], writes, counter_changes))
+            
+        commit_errors = await self._commit_write_groups(write_groups, semaphore)
+        
+        for doc_id, product_data in merged_products.items():
+            indexes = product_indexes[doc_id]
+            if doc_id in read_errors:
+                continue
+                
+            if indexes[0] in commit_errors:
+                self.fingerprints.discard(doc_id)
+                for index in indexes:
+                    results[index]["error"] = commit_errors[index]
+            else:
+                operation, _, update_count = planned_writes[doc_id]
+                self.write_stats["writes" if operation else "writes_avoided"] += 1
+                self.fingerprints.record(doc_id, fingerprints[doc_id], update_count)
+                
+                # Update cache
+                self._set_in_cache(doc_id, "products", product_data)
+                for bucket_id in group_buckets.get(doc_id, []):
+                    self.series_buckets.set(bucket_id, changed_buckets[bucket_id])
+                    
+        self.fingerprints.save_if_due()
+        
+        for result in results:
+            if result["error"]:
+                result["doc_id"] = None
+                
+        failed = sum(1 for result in results if result["error"])
+        self.logger.info(f"Saved {len(products) - failed} of {len(products)} products in bulk")
+        
+        return results
+        
+    async def save_price_points_bulk(self,
+                                     price_points: List[Dict[str, Any]],
+                                     max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Save many price points using batched writes.
+        
+        With the series layout, the points of a bucket are appended with one
+        write of the bucket.
+        
+        Args:
+            price_points: Price data to save
+            max_concurrency: Maximum number of batched reads or commits in flight
+            
+        Returns:
+            One result per price point, in order, with the "doc_id" of the saved
+            price point (of its bucket with the series layout) and an "error"
+            message if it was not saved (None otherwise)
+        """
+        results = [{"doc_id": None, "error": None} for _ in price_points]
+        timestamp = firestore.SERVER_TIMESTAMP
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        valid_indexes = []
+        for index, price_data in enumerate(price_points):
+            missing = next((field for field in ["product_id", "marketplace", "price"] if field not in price_data), None)
+            if missing:
+                results[index]["error"] = f"{missing} is required"
+            else:
+                valid_indexes.append(index)
+                
+        write_groups = []
+        changed_buckets: Dict[str, Dict[str, Any]] = {}
+        bucket_indexes: Dict[str, List[int]] = {}
+        if self.price_layout == "series":
+            point_buckets, changed_buckets, read_errors = await self._plan_series_appends(
+                [price_points[index] for index in valid_indexes], semaphore
+            )
+            for index, bucket_id in zip(valid_indexes, point_buckets):
+                if bucket_id in read_errors:
+                    results[index]["error"] = read_errors[bucket_id]
+                else:
+                    results[index]["doc_id"] = bucket_id
+                    bucket_indexes.setdefault(bucket_id, []).append(index)
+                    
+            for bucket_id, bucket in changed_buckets.items():
+                write_groups.append((
+                    bucket_indexes[bucket_id], [("set", self.price_series_collection.document(bucket_id), bucket)], {}
+                ))
+        else:
+            for index in valid_indexes:
+                price_data = price_points[index]
+                price_data["timestamp"] = timestamp
+                price_ref = self.prices_collection.document()
+                results[index]["doc_id"] = price_ref.id
+                write_groups.append(([index], [("set", price_ref, price_data)], {}))
+                
+        commit_errors = await self._commit_write_groups(write_groups, semaphore)
+        
+        for index, error in commit_errors.items():
+            results[index] = {"doc_id": None, "error": error}
+            
+        for bucket_id, bucket in changed_buckets.items():
+            if bucket_indexes[bucket_id][0] not in commit_errors:
+                self.series_buckets.set(bucket_id, bucket)
+                
+        self.logger.info(f"Saved {len(price_points) - sum(1 for r in results if r['error'])} "
+                         f"of {len(price_points)} price points in bulk")
+                         
+        return results
+        
+    async def _get_documents_bulk(self,
+                                  collection,
+                                  doc_ids: List[str],
+                                  semaphore: asyncio.Semaphore,
+                                  chunk_size: int = MAX_BATCH_WRITES) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Read many documents of a collection in chunks.
+        
+        Uses the client's multi-document get when available and falls back to
+        concurrent single reads otherwise.
+        
+        Args:
+            collection: Collection holding the documents
+            doc_ids: IDs of the documents to read
+            semaphore: Limits the reads in flight
+            chunk_size: Documents read per multi-document get
+            
+        Returns:
+            Data of the documents that exist by document ID, and error messages
+            by document ID for documents that could not be read
+        """
+        documents: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        
+        async def read_chunk(chunk_ids: List[str]) -> None:
+            try:
+                async with semaphore:
+                    refs = [collection.document(doc_id) for doc_id in chunk_ids]
+                    async for snapshot in self.db.get_all(refs):
+                        if snapshot.exists:
+                            documents[snapshot.id] = snapshot.to_dict()
+            except Exception as e:
+                self.logger.error(f"Failed to read {len(chunk_ids)} documents: {str(e)}")
+                errors.update((doc_id, str(e)) for doc_id in chunk_ids)
+                
+        async def read_one(doc_id: str) -> None:
+            try:
+                async with semaphore:
+                    snapshot = await collection.document(doc_id).get()
+                if snapshot.exists:
+                    documents[doc_id] = snapshot.to_dict()
+            except Exception as e:
+                self.logger.error(f"Failed to read document {doc_id}: {str(e)}")
+                errors[doc_id] = str(e)
+                
+        if hasattr(self.db, "get_all"):
+            await asyncio.gather(*(
+                read_chunk(doc_ids[start:start + chunk_size])
+                for start in range(0, len(doc_ids), chunk_size)
+            ))
+        else:
+            await asyncio.gather(*(read_one(doc_id) for doc_id in doc_ids))
+            
+        return documents, errors
+        
+    async def _commit_write_groups(self,
+                                   write_groups: List[Tuple[List[int],
+                                                            List[Tuple[str, Any, Dict[str, Any]]],
+                                                            Dict[Tuple[str, str], int]]],
+                                   semaphore: asyncio.Semaphore) -> Dict[int, str]:
+        """Commit groups of writes in batches of at most MAX_BATCH_WRITES.
+        
+        The writes of a group always go into the same batch, so they are
+        applied or rejected together. Counter changes of the groups in a batch
+        are summed into one write per counter, committed with the batch.
+        
+        Args:
+            write_groups: (item indexes, writes, counter changes) tuples, each
+                write being an (operation, document reference, data) tuple as
+                for _commit_writes, and the counter changes amounts by
+                (marketplace, entity type)
+            semaphore: Limits the commits in flight
+            
+        Returns:
+            Error messages by item index for items whose batch failed
+        """
+        batches = []
+        batch_indexes: List[int] = []
+        batch_writes: List[Tuple[str, Any, Dict[str, Any]]] = []
+        batch_changes: Dict[Tuple[str, str], int] = {}
+        
+        for indexes, writes, counter_changes in write_groups:
+            new_counters = sum(1 for key in counter_changes if key not in batch_changes)
+            if batch_writes and len(batch_writes) + len(batch_changes) + len(writes) + new_counters > MAX_BATCH_WRITES:
+                batches.append((batch_indexes, batch_writes, batch_changes))
+                batch_indexes, batch_writes, batch_changes = [], [], {}
+            batch_indexes.extend(indexes)
+            batch_writes.extend(writes)
+            for key, amount in counter_changes.items():
+                batch_changes[key] = batch_changes.get(key, 0) + amount
+                
+        if batch_writes:
+            batches.append((batch_indexes, batch_writes, batch_changes))
+            
+        errors: Dict[int, str] = {}
+        
+        async def commit(indexes: List[int],
+                         writes: List[Tuple[str, Any, Dict[str, Any]]],
+                         counter_changes: Dict[Tuple[str, str], int]) -> None:
+            try:
+                async with semaphore:
+                    await self._commit_writes(writes + self.counters.change_writes(counter_changes))
+            except Exception as e:
+                self.logger.error(f"Failed to commit batch of {len(writes)} writes: {str(e)}")
+                errors.update((index, str(e)) for index in indexes)
+                
+        await asyncio.gather(*(commit(*batch) for batch in batches))
+        
+        return errors
+        
+    async def _commit_writes(self, writes: List[Tuple[str, Any, Optional[Dict[str, Any]]]]) -> None:
+        """Commit writes atomically in one batch.
+        
+        Args:
+            writes: (operation, document reference, data) tuples, with "set",
+                "merge" (set merging into the stored document), "update" or
+                "delete" as the operation and None as the data of deletes
+        """
+        batch = self.db.batch()
+        for operation, doc_ref, data in writes:
+            if operation == "update":
+                batch.update(doc_ref, data)
+            elif operation == "merge":
+                batch.set(doc_ref, data, merge=True)
+            elif operation == "delete":
+                batch.delete(doc_ref)
+            else:
+                batch.set(doc_ref, data)
+                
+        await batch.commit()
+        
     async def save_search_results(self, search_data: Dict[str, Any]) -> str:
         """Save search results with position tracking.
         
+        Every save appends a snapshot to the keyword's history, stored as a
+        delta to the previous snapshot or as a full keyframe, and updates the
+        keyword document to point at it.
+        
         Args:
             search_data: Search results data
             
@@ -357,37 +1040,59 @@ class MarketplaceDataRepository:
             
             search_ref = self.keywords_collection.document(doc_id)
             
-            # Limit results to prevent large documents
-            results = search_data["results"][:100] if len(search_data["results"]) > 100 else search_data["results"]
+            # Limit results to prevent large documents, numbering their positions
+            processed_results = ranking_rows(search_data["results"])
             
-            # Process results to include position
-            processed_results = []
-            for idx, result in enumerate(results):
-                processed_result = {
-                    "position": idx + 1,
-                }
-                
-                # Copy relevant fields
-                for field in ["product_id", "title", "price", "url", "image_url"]:
-                    if field in result:
-                        processed_result[field] = result[field]
-                        
-                processed_results.append(processed_result)
-                
-            # Create final data
+            # The latest snapshot is cached; otherwise it is rebuilt, and keywords without one are new
+            previous = self._get_from_cache(doc_id, "keywords")
+            if previous is None:
+                search_snapshot = await search_ref.get()
+                if search_snapshot.exists:
+                    previous = await self._latest_search_snapshot(doc_id, search_snapshot.to_dict())
+            is_new = previous is None
+            
+            sequence = (previous or {}).get("snapshot_sequence", 0) + 1
+            keyframe_sequence = (previous or {}).get("keyframe_sequence")
+            delta = diff_rows(previous.get("results", []), processed_results) if previous else None
+            
+            snapshot_data = {
+                "keyword": search_data["keyword"],
+                "marketplace": search_data["marketplace"],
+                "result_count": len(processed_results),
+                "timestamp": firestore.SERVER_TIMESTAMP,
+                "sequence": sequence
+            }
+            if needs_keyframe(sequence, keyframe_sequence, delta, len(processed_results)):
+                keyframe_sequence = sequence
+                snapshot_data["results"] = processed_results
+            else:
+                snapshot_data["delta"] = delta
+            snapshot_data["keyframe_sequence"] = keyframe_sequence
+            
+            # The keyword document only points at its latest snapshot
             final_data = {
                 "keyword": search_data["keyword"],
                 "marketplace": search_data["marketplace"],
-                "result_count": len(results),
-                "timestamp": firestore.SERVER_TIMESTAMP(),
-                "results": processed_results
+                "result_count": len(processed_results),
+                "timestamp": firestore.SERVER_TIMESTAMP,
+                "snapshot_sequence": sequence,
+                "keyframe_sequence": keyframe_sequence
             }
             
-            await search_ref.set(final_data)
-            self.logger.info(f"Saved search results for '{search_data['keyword']}' with {len(results)} results")
+            writes = [
+                ("set", self.snapshots_collection.document(self._snapshot_id(doc_id, sequence)), snapshot_data),
+                ("set", search_ref, final_data)
+            ]
+            if is_new:
+                writes.append(self.counters.change_write(search_data["marketplace"], "keywords", 1))
+            await self._commit_writes(writes)
+            self.logger.info(
+                f"Saved search results for '{search_data['keyword']}' with {len(processed_results)} results "
+                f"as {'keyframe' if 'results' in snapshot_data else 'delta'} {sequence}"
+            )
             
             # Update cache
-            self._set_in_cache(doc_id, "keywords", final_data)
+            self._set_in_cache(doc_id, "keywords", dict(final_data, results=processed_results))
             
             return doc_id
             
@@ -395,6 +1100,86 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to save search results: {str(e)}")
             raise
             
+    def _snapshot_id(self, search_doc_id: str, sequence: int) -> str:
+        """Get the document ID of a search results snapshot.
+        
+        Args:
+            search_doc_id: Document ID of the keyword's search results
+            sequence: Sequence number of the snapshot
+            
+        Returns:
+            Snapshot document ID, sorting in sequence order
+        """
+        return f"{search_doc_id}_{sequence:08d}"
+        
+    async def _read_snapshots(self,
+                              search_doc_id: str,
+                              sequences: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Read search results snapshots by sequence number.
+        
+        Args:
+            search_doc_id: Document ID of the keyword's search results
+            sequences: Sequence numbers of the snapshots
+            
+        Returns:
+            Data of the snapshots that exist by sequence number
+            
+        Raises:
+            Exception: If a snapshot could not be read
+        """
+        snapshot_ids = {self._snapshot_id(search_doc_id, sequence): sequence for sequence in sequences}
+        documents, errors = await self._get_documents_bulk(
+            self.snapshots_collection, list(snapshot_ids), asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY)
+        )
+        if errors:
+            raise RuntimeError(f"Failed to read {len(errors)} search snapshots: {next(iter(errors.values()))}")
+            
+        return {snapshot_ids[snapshot_id]: data for snapshot_id, data in documents.items()}
+        
+    def _replay_snapshots(self, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Reconstruct the rows of consecutive snapshots, starting at a keyframe.
+        
+        Args:
+            snapshots: Snapshot data in sequence order, the first a keyframe
+            
+        Returns:
+            Snapshots with their reconstructed "results", in sequence order
+        """
+        rows: List[Dict[str, Any]] = []
+        replayed = []
+        for snapshot in snapshots:
+            if "results" in snapshot:
+                rows = snapshot["results"]
+            else:
+                rows = apply_delta(rows, snapshot.get("delta", {}))
+                
+            replayed_snapshot = {field: value for field, value in snapshot.items() if field != "delta"}
+            replayed_snapshot["results"] = rows
+            replayed.append(replayed_snapshot)
+            
+        return replayed
+        
+    async def _latest_search_snapshot(self, search_doc_id: str, search_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild the latest search results of a keyword from its snapshots.
+        
+        Args:
+            search_doc_id: Document ID of the keyword's search results
+            search_data: Keyword document data
+            
+        Returns:
+            Keyword document data with the latest "results"
+        """
+        # Keyword documents written before snapshots hold their results themselves
+        if "snapshot_sequence" not in search_data:
+            return search_data
+            
+        sequence = search_data["snapshot_sequence"]
+        keyframe_sequence = search_data.get("keyframe_sequence") or sequence
+        snapshots = await self._read_snapshots(search_doc_id, list(range(keyframe_sequence, sequence + 1)))
+        
+        replayed = self._replay_snapshots([snapshots[number] for number in sorted(snapshots)])
+        return dict(search_data, results=replayed[-1]["results"] if replayed else [])
+        
     async def save_category(self, category_data: Dict[str, Any]) -> str:
         """Save category data.
         
@@ -423,7 +1208,7 @@ class MarketplaceDataRepository:
             category_ref = self.categories_collection.document(doc_id)
             
             # Add timestamp
-            category_data["last_updated"] = firestore.SERVER_TIMESTAMP()
+            category_data["last_updated"] = firestore.SERVER_TIMESTAMP
             
             # Check if category exists
             doc_snapshot = await category_ref.get()
@@ -433,8 +1218,11 @@ class MarketplaceDataRepository:
                 self.logger.info(f"Updated category {doc_id}")
             else:
                 # Add first seen timestamp for new categories
-                category_data["first_seen"] = firestore.SERVER_TIMESTAMP()
-                await category_ref.set(category_data)
+                category_data["first_seen"] = firestore.SERVER_TIMESTAMP
+                await self._commit_writes([
+                    ("set", category_ref, category_data),
+                    self.counters.change_write(category_data["marketplace"], "categories", 1)
+                ])
                 self.logger.info(f"Created new category {doc_id}")
                 
             # Update cache
@@ -478,7 +1266,7 @@ class MarketplaceDataRepository:
                 "prefix": suggestion_data["prefix"],
                 "marketplace": suggestion_data["marketplace"],
                 "suggestions": suggestion_data["suggestions"],
-                "timestamp": firestore.SERVER_TIMESTAMP(),
+                "timestamp": firestore.SERVER_TIMESTAMP,
                 "count": len(suggestion_data["suggestions"])
             }
             
@@ -540,6 +1328,12 @@ class MarketplaceDataRepository:
                               days: int = 30) -> List[Dict[str, Any]]:
         """Get price history for a product.
         
+        With the series layout, the history is read from the buckets covering
+        the period, cached buckets first. Products without any bucket in the
+        period, e.g. not yet migrated, are read from price point documents.
+        As series only record changes, the price in effect at the start of
+        the period is carried forward as its first point.
+        
         Args:
             marketplace: Marketplace name
             product_id: Product ID
@@ -553,25 +1347,31 @@ class MarketplaceDataRepository:
         """
         try:
             # Calculate time limit
-            time_limit = datetime.now().timestamp() - (days * 86400)
-            
-            # Create query
-            query = (
-                self.prices_collection
-                .where(filter=FieldFilter("marketplace", "==", marketplace))
-                .where(filter=FieldFilter("product_id", "==", product_id))
-                .where(filter=FieldFilter("timestamp", ">=", time_limit))
-                .order_by("timestamp")
-            )
-            
-            # Execute query
-            docs = query.stream()
+            now = time.time()
+            time_limit = now - (days * 86400)
             
-            price_history = []
-            async for doc in docs:
-                price_point = doc.to_dict()
-                price_history.append(price_point)
+            price_history = None
+            if self.price_layout == "series":
+                price_history = await self._get_series_history(marketplace, product_id, time_limit, now)
+                
+            if price_history is None:
+                # Create query
+                query = (
+                    self.prices_collection
+                    .where(filter=FieldFilter("marketplace", "==", marketplace))
+                    .where(filter=FieldFilter("product_id", "==", product_id))
+                    .where(filter=FieldFilter("timestamp", ">=", datetime.fromtimestamp(time_limit, timezone.utc)))
+                    .order_by("timestamp")
+                )
                 
+                # Execute query
+                docs = query.stream()
+                
+                price_history = []
+                async for doc in docs:
+                    price_point = doc.to_dict()
+                    price_history.append(price_point)
+                    
             self.logger.info(f"Retrieved {len(price_history)} price points for {marketplace}_{product_id}")
             
             return price_history
@@ -580,41 +1380,233 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to get price history: {str(e)}")
             raise
             
-    async def get_search_history(self, 
-                               marketplace: str, 
-                               keyword: str, 
-                               limit: int = 10) -> List[Dict[str, Any]]:
-        """Get search history for a keyword.
+    async def _get_series_history(self,
+                                  marketplace: str,
+                                  product_id: str,
+                                  start: float,
+                                  end: float) -> Optional[List[Dict[str, Any]]]:
+        """Read the price points of a product from its price series buckets.
         
         Args:
             marketplace: Marketplace name
-            keyword: Search keyword
-            limit: Maximum number of historical searches to retrieve
+            product_id: Product ID
+            start: Start of the period as a Unix timestamp
+            end: End of the period as a Unix timestamp
             
         Returns:
-            List of search result snapshots
+            Price points in time order, the first one timestamped at the start
+            if carried forward, or None if no bucket covers the period
+            
+        Raises:
+            RuntimeError: If buckets could not be read
+        """
+        doc_id = self._get_document_id(marketplace, product_id)
+        labels = bucket_labels(start, end, self.price_bucket)
+        bucket_ids = [f"{doc_id}_{label}" for label in labels]
+        
+        buckets = await self._read_series_buckets(bucket_ids)
+        if not buckets:
+            return None
+            
+        price_history = []
+        for bucket_id in bucket_ids:
+            if bucket_id in buckets:
+                price_history.extend(bucket_points(buckets[bucket_id], start, end))
+                
+        if price_history and price_history[0]["timestamp"].timestamp() <= start:
+            return price_history
+            
+        # Carry forward the last point before the period, from the first bucket
+        # or, if the product was seen in it only after the start, the one before
+        first_bucket = buckets.get(bucket_ids[0])
+        if first_bucket is None:
+            return price_history
+            
+        carried = point_before(first_bucket, start)
+        if carried is None:
+            previous_id = f"{doc_id}_{previous_bucket_label(labels[0], self.price_bucket)}"
+            previous = (await self._read_series_buckets([previous_id])).get(previous_id)
+            if previous is not None:
+                carried = point_before(previous, start)
+                
+        if carried is not None:
+            price_history.insert(0, carried)
+        return price_history
+        
+    async def _read_series_buckets(self, bucket_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read price series buckets, cached buckets first.
+        
+        Args:
+            bucket_ids: Bucket document IDs
+            
+        Returns:
+            The stored buckets by ID
+            
+        Raises:
+            RuntimeError: If buckets could not be read
+        """
+        buckets = {}
+        for bucket_id in bucket_ids:
+            cached = self.series_buckets.get(bucket_id)
+            if cached is not None:
+                buckets[bucket_id] = cached
+                
+        stored, errors = await self._get_documents_bulk(
+            self.price_series_collection,
+            [bucket_id for bucket_id in bucket_ids if bucket_id not in buckets],
+            asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY)
+        )
+        if errors:
+            raise RuntimeError(f"Failed to read price series: {next(iter(errors.values()))}")
+            
+        for bucket_id, bucket in stored.items():
+            self.series_buckets.set(bucket_id, bucket)
+            buckets[bucket_id] = bucket
+        return buckets
+        
+    async def migrate_price_history(self,
+                                    marketplace: str,
+                                    delete_migrated: bool = False,
+                                    max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Dict[str, int]:
+        """Fold the price point documents of a marketplace into price series.
+        
+        Streams the price points product by product, appends them to the
+        buckets of their period and writes each changed bucket once. Points
+        already in a bucket are not recorded twice, so an interrupted
+        migration can simply be run again.
+        
+        Args:
+            marketplace: Marketplace name
+            delete_migrated: Whether to delete price point documents once
+                their bucket is written
+            max_concurrency: Maximum number of batched reads or commits in flight
+            
+        Returns:
+            Counts of points read, recorded and skipped (without a usable
+            timestamp), and of buckets written and documents deleted
+        """
+        stats = {"points_read": 0, "points_recorded": 0, "points_skipped": 0, "buckets_written": 0, "documents_deleted": 0}
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def migrate_product(points: List[Tuple[str, Dict[str, Any]]]) -> None:
+            usable = [(doc_id, data) for doc_id, data in points if to_timestamp(data.get("timestamp")) is not None]
+            stats["points_skipped"] += len(points) - len(usable)
+            usable.sort(key=lambda point: to_timestamp(point[1]["timestamp"]))
+            
+            _, changed_buckets, read_errors = await self._plan_series_appends(
+                [data for _, data in usable], semaphore
+            )
+            if read_errors:
+                raise RuntimeError(f"Failed to read price series: {next(iter(read_errors.values()))}")
+                
+            # Points the buckets held before, as read while planning
+            previous_points = 0
+            for bucket_id in changed_buckets:
+                previous = self.series_buckets.get(bucket_id)
+                previous_points += len(previous["timestamps"]) if previous else 0
+                
+            bucket_ids = list(changed_buckets)
+            write_errors = await self._commit_write_groups([
+                ([index], [("set", self.price_series_collection.document(bucket_id), changed_buckets[bucket_id])], {})
+                for index, bucket_id in enumerate(bucket_ids)
+            ], semaphore)
+            if write_errors:
+                raise RuntimeError(f"Failed to write price series: {next(iter(write_errors.values()))}")
+                
+            for bucket_id in bucket_ids:
+                self.series_buckets.set(bucket_id, changed_buckets[bucket_id])
+            stats["points_recorded"] += sum(len(bucket["timestamps"]) for bucket in changed_buckets.values()) - previous_points
+            stats["buckets_written"] += len(bucket_ids)
+            
+            if delete_migrated:
+                delete_errors = await self._commit_write_groups([
+                    ([index], [("delete", self.prices_collection.document(doc_id), None)], {})
+                    for index, (doc_id, _) in enumerate(usable)
+                ], semaphore)
+                if delete_errors:
+                    raise RuntimeError(f"Failed to delete migrated price points: {next(iter(delete_errors.values()))}")
+                stats["documents_deleted"] += len(usable)
+                
+        query = (
+            self.prices_collection
+            .where(filter=FieldFilter("marketplace", "==", marketplace))
+            .order_by("product_id")
+        )
+        
+        product_id = None
+        points: List[Tuple[str, Dict[str, Any]]] = []
+        async for doc in query.stream():
+            data = doc.to_dict()
+            stats["points_read"] += 1
+            if data.get("product_id") != product_id and points:
+                await migrate_product(points)
+                points = []
+            product_id = data.get("product_id")
+            points.append((doc.id, data))
+            
+        if points:
+            await migrate_product(points)
+            
+        self.logger.info(f"Migrated {marketplace} price history to price series: {stats}")
+        
+        return stats
+        
+    async def get_search_history(self, 
+                               marketplace: str, 
+                               keyword: str, 
+                               limit: int = 10) -> List[Dict[str, Any]]:
+        """Get search history for a keyword.
+        
+        Reads the latest snapshots and any snapshots back to the keyframe
+        before them, which are fetched together by ID.
+        
+        Args:
+            marketplace: Marketplace name
+            keyword: Search keyword
+            limit: Maximum number of historical searches to retrieve
+            
+        Returns:
+            List of search result snapshots, newest first
             
         Raises:
             Exception: If retrieval fails
         """
         try:
+            doc_id = self._get_document_id(marketplace, keyword, "search")
+            
             # Create query
             query = (
-                self.keywords_collection
+                self.snapshots_collection
                 .where(filter=FieldFilter("marketplace", "==", marketplace))
                 .where(filter=FieldFilter("keyword", "==", keyword))
-                .order_by("timestamp", direction="DESCENDING")
+                .order_by("sequence", direction="DESCENDING")
                 .limit(limit)
             )
             
             # Execute query
-            docs = query.stream()
-            
-            search_history = []
-            async for doc in docs:
-                search_data = doc.to_dict()
-                search_history.append(search_data)
+            snapshots = {}
+            async for doc in query.stream():
+                snapshot_data = doc.to_dict()
+                snapshots[snapshot_data["sequence"]] = snapshot_data
                 
+            if not snapshots:
+                # Keywords saved before snapshots only have their latest results
+                search_snapshot = await self.keywords_collection.document(doc_id).get()
+                return [search_snapshot.to_dict()] if search_snapshot.exists else []
+                
+            # Deltas are replayed from the keyframe before the oldest snapshot
+            oldest = snapshots[min(snapshots)]
+            keyframe_sequence = oldest.get("keyframe_sequence") or oldest["sequence"]
+            missing = [sequence for sequence in range(keyframe_sequence, oldest["sequence"])]
+            if missing:
+                snapshots.update(await self._read_snapshots(doc_id, missing))
+                
+            replayed = self._replay_snapshots([snapshots[sequence] for sequence in sorted(snapshots)])
+            search_history = [
+                snapshot for snapshot in reversed(replayed)
+                if snapshot["sequence"] >= oldest["sequence"]
+            ]
+            
             self.logger.info(f"Retrieved {len(search_history)} search snapshots for '{keyword}'")
             
             return search_history
@@ -623,6 +1615,109 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to get search history: {str(e)}")
             raise
             
+    async def _get_many(self,
+                        entity_type: str,
+                        collection,
+                        doc_ids: Dict[str, str],
+                        max_concurrency: int,
+                        chunk_size: int) -> Dict[str, Dict[str, Any]]:
+        """Get many documents, from the cache first and the rest in batched reads.
+        
+        Args:
+            entity_type: Entity type, also the name of its cache
+            collection: Collection holding the documents
+            doc_ids: Document IDs by the key to return each document under
+            max_concurrency: Maximum number of batched reads in flight
+            chunk_size: Documents read per batched read
+            
+        Returns:
+            Data of the documents that exist, by key
+            
+        Raises:
+            RuntimeError: If a document could not be read
+        """
+        found = {}
+        missing = {}
+        for key, doc_id in doc_ids.items():
+            cached_data = self._get_from_cache(doc_id, entity_type)
+            if cached_data:
+                found[key] = cached_data
+            else:
+                missing[key] = doc_id
+                
+        if missing:
+            documents, errors = await self._get_documents_bulk(
+                collection, list(dict.fromkeys(missing.values())), asyncio.Semaphore(max_concurrency), chunk_size
+            )
+            if errors:
+                raise RuntimeError(f"Failed to read {len(errors)} {entity_type}: {next(iter(errors.values()))}")
+                
+            for key, doc_id in missing.items():
+                if doc_id in documents:
+                    found[key] = documents[doc_id]
+                    self._set_in_cache(doc_id, entity_type, documents[doc_id])
+                    
+        self.logger.debug(f"Got {len(found)} of {len(doc_ids)} {entity_type}, {len(doc_ids) - len(missing)} from cache")
+        
+        return found
+        
+    async def get_products_many(self,
+                                marketplace: str,
+                                product_ids: List[str],
+                                max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get many products of a marketplace in batched reads.
+        
+        Cached products are served first; the rest take one multi-document
+        get per chunk of chunk_size products.
+        
+        Args:
+            marketplace: Marketplace name
+            product_ids: Product IDs
+            max_concurrency: Maximum number of batched reads in flight
+            chunk_size: Products read per batched read
+            
+        Returns:
+            Data of the products found, by product ID
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        return await self._get_many(
+            "products",
+            self.products_collection,
+            {product_id: self._get_document_id(marketplace, product_id) for product_id in product_ids},
+            max_concurrency,
+            chunk_size
+        )
+        
+    async def get_categories_many(self,
+                                  marketplace: str,
+                                  category_ids: List[str],
+                                  max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                  chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get many categories of a marketplace in batched reads.
+        
+        Args:
+            marketplace: Marketplace name
+            category_ids: Category IDs
+            max_concurrency: Maximum number of batched reads in flight
+            chunk_size: Categories read per batched read
+            
+        Returns:
+            Data of the categories found, by category ID
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        return await self._get_many(
+            "categories",
+            self.categories_collection,
+            {category_id: self._get_document_id(marketplace, category_id, "category") for category_id in category_ids},
+            max_concurrency,
+            chunk_size
+        )
+        
     async def get_category(self, marketplace: str, category_id: str) -> Optional[Dict[str, Any]]:
         """Get a category by ID.
         
@@ -663,48 +1758,558 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to get category: {str(e)}")
             raise
             
-    async def get_marketplace_stats(self, marketplace: str) -> Dict[str, Any]:
-        """Get statistics for a marketplace.
+    async def delete_product(self, marketplace: str, product_id: str) -> bool:
+        """Delete a product and count it out of its marketplace.
         
         Args:
             marketplace: Marketplace name
+            product_id: Product ID
             
         Returns:
-            Marketplace statistics
+            True if the product existed and was deleted
+            
+        Raises:
+            Exception: If deletion fails
+        """
+        doc_id = self._get_document_id(marketplace, product_id)
+        self.fingerprints.discard(doc_id)
+        return await self._delete_counted(marketplace, "products", doc_id)
+        
+    async def delete_category(self, marketplace: str, category_id: str) -> bool:
+        """Delete a category and count it out of its marketplace.
+        
+        Args:
+            marketplace: Marketplace name
+            category_id: Category ID
+            
+        Returns:
+            True if the category existed and was deleted
+            
+        Raises:
+            Exception: If deletion fails
+        """
+        doc_id = self._get_document_id(marketplace, category_id, "category")
+        return await self._delete_counted(marketplace, "categories", doc_id)
+        
+    async def delete_search_results(self, marketplace: str, keyword: str) -> bool:
+        """Delete the search results of a keyword and count it out of its marketplace.
+        
+        The keyword's snapshots are deleted too, so a keyword saved again
+        starts a new history.
+        
+        Args:
+            marketplace: Marketplace name
+            keyword: Search keyword
+            
+        Returns:
+            True if the keyword existed and was deleted
+            
+        Raises:
+            Exception: If deletion fails
+        """
+        doc_id = self._get_document_id(marketplace, keyword, "search")
+        deleted = await self._delete_counted(marketplace, "keywords", doc_id)
+        
+        query = (
+            self.snapshots_collection
+            .where(filter=FieldFilter("marketplace", "==", marketplace))
+            .where(filter=FieldFilter("keyword", "==", keyword))
+        )
+        snapshot_ids = [doc.id async for doc in query.stream()]
+        delete_errors = await self._commit_write_groups([
+            ([index], [("delete", self.snapshots_collection.document(snapshot_id), None)], {})
+            for index, snapshot_id in enumerate(snapshot_ids)
+        ], asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY))
+        if delete_errors:
+            raise RuntimeError(f"Failed to delete search snapshots: {next(iter(delete_errors.values()))}")
+            
+        return deleted
+        
+    async def _delete_counted(self, marketplace: str, entity_type: str, doc_id: str) -> bool:
+        """Delete a counted document, decrementing its counter in the same commit.
+        
+        Args:
+            marketplace: Marketplace name
+            entity_type: Counted entity type, also the name of its cache
+            doc_id: Document ID
+            
+        Returns:
+            True if the document existed and was deleted
+        """
+        doc_ref = self.counted_collections[entity_type].document(doc_id)
+        self.cache[entity_type].pop(doc_id)
+        
+        try:
+            # Only documents that exist are counted out
+            if not (await doc_ref.get()).exists:
+                return False
+                
+            await self._commit_writes([
+                ("delete", doc_ref, None),
+                self.counters.change_write(marketplace, entity_type, -1)
+            ])
+            self.logger.info(f"Deleted {entity_type} document {doc_id}")
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to delete {entity_type} document {doc_id}: {str(e)}")
+            raise
+            
+    async def create_keyword_ranking(self, keyword_entry: Dict[str, Any]) -> str:
+        """Create or replace the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_entry: Keyword entry with a "keyword_id"
+            
+        Returns:
+            Keyword ID
+            
+        Raises:
+            Exception: If save fails
+        """
+        if "keyword_id" not in keyword_entry:
+            raise ValueError("keyword_id is required")
+            
+        try:
+            keyword_id = keyword_entry["keyword_id"]
+            doc_id = self._sanitize_id(keyword_id)
+            await self.rankings_collection.document(doc_id).set(keyword_entry)
+            self.logger.info(f"Created keyword ranking {keyword_id}")
+            
+            # Update cache
+            self._set_in_cache(doc_id, "rankings", keyword_entry)
+            
+            return keyword_id
+            
+        except Exception as e:
+            self.logger.error(f"Failed to create keyword ranking: {str(e)}")
+            raise
+            
+    async def get_keyword_ranking(self, keyword_id: str) -> Optional[Dict[str, Any]]:
+        """Get the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            
+        Returns:
+            Keyword entry or None if not found
             
         Raises:
             Exception: If retrieval fails
         """
         try:
-            # Get product count
-            products_query = (
-                self.products_collection
-                .where(filter=FieldFilter("marketplace", "==", marketplace))
-                .limit(1)
-            )
-            products_count = await self._count_query_results(products_query)
+            doc_id = self._sanitize_id(keyword_id)
             
-            # Get category count
-            categories_query = (
-                self.categories_collection
-                .where(filter=FieldFilter("marketplace", "==", marketplace))
-                .limit(1)
-            )
-            categories_count = await self._count_query_results(categories_query)
+            # Check cache first
+            cached_data = self._get_from_cache(doc_id, "rankings")
+            if cached_data:
+                return cached_data
+                
+            doc_snapshot = await self.rankings_collection.document(doc_id).get()
+            if not doc_snapshot.exists:
+                return None
+                
+            keyword_entry = doc_snapshot.to_dict()
+            self._set_in_cache(doc_id, "rankings", keyword_entry)
             
-            # Get search keyword count
-            keywords_query = (
-                self.keywords_collection
-                .where(filter=FieldFilter("marketplace", "==", marketplace))
-                .limit(1)
+            return keyword_entry
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get keyword ranking: {str(e)}")
+            raise
+            
+    async def update_keyword_ranking(self, keyword_id: str, update_data: Dict[str, Any]) -> None:
+        """Update fields of the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            update_data: Fields to update
+            
+        Raises:
+            Exception: If the keyword does not exist or the update fails
+        """
+        doc_id = self._sanitize_id(keyword_id)
+        
+        # The cached entry no longer matches the stored one
+        self.cache["rankings"].pop(doc_id)
+        
+        try:
+            await self.rankings_collection.document(doc_id).update(update_data)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to update keyword ranking: {str(e)}")
+            raise
+            
+    async def get_keyword_rankings_many(self,
+                                        keyword_ids: List[str],
+                                        max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                        chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get the ranking entries of many tracked keywords in batched reads.
+        
+        Args:
+            keyword_ids: Keyword IDs, "<marketplace>_<keyword>"
+            max_concurrency: Maximum number of batched reads in flight
+            chunk_size: Entries read per batched read
+            
+        Returns:
+            Keyword entries found, by keyword ID
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        return await self._get_many(
+            "rankings",
+            self.rankings_collection,
+            {keyword_id: self._sanitize_id(keyword_id) for keyword_id in keyword_ids},
+            max_concurrency,
+            chunk_size
+        )
+        
+    async def get_keyword_rankings(self,
+                                   filters: Optional[Dict[str, Any]] = None,
+                                   limit: int = 100,
+                                   order_by: Optional[str] = None,
+                                   order_direction: str = "asc") -> List[Dict[str, Any]]:
+        """Query the ranking entries of tracked keywords.
+        
+        Args:
+            filters: Filters as for filter_conditions
+            limit: Maximum number of entries to retrieve
+            order_by: Field to order entries by (optional)
+            order_direction: "asc" or "desc"
+            
+        Returns:
+            Keyword entries
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        try:
+            query = self.rankings_collection
+            for field, operator, value in filter_conditions(filters):
+                query = query.where(filter=FieldFilter(field, operator, value))
+                
+            if order_by:
+                query = query.order_by(
+                    order_by, direction="DESCENDING" if order_direction.lower() == "desc" else "ASCENDING"
+                )
+            query = query.limit(limit)
+            
+            return [doc.to_dict() async for doc in query.stream()]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get keyword rankings: {str(e)}")
+            raise
+            
+    async def scan_keyword_rankings(self,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    page_size: int = 100,
+                                    start_after: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream the ranking entries of tracked keywords in pages.
+        
+        Pages are ordered by keyword ID and each page continues from the last
+        keyword ID of the previous one, so every entry is read once however
+        far the scan goes, and only one page is held in memory.
+        
+        Args:
+            filters: Filters as for filter_conditions
+            page_size: Entries read per page
+            start_after: Keyword ID to continue a scan after (optional)
+            
+        Yields:
+            Pages of keyword entries
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        query = self.rankings_collection
+        for field, operator, value in filter_conditions(filters):
+            query = query.where(filter=FieldFilter(field, operator, value))
+        query = query.order_by("keyword_id").limit(page_size)
+        
+        while True:
+            try:
+                page_query = query.start_after({"keyword_id": start_after}) if start_after is not None else query
+                page = [doc.to_dict() async for doc in page_query.stream()]
+                
+            except Exception as e:
+                self.logger.error(f"Failed to scan keyword rankings: {str(e)}")
+                raise
+                
+            if not page:
+                return
+                
+            yield page
+            
+            if len(page) < page_size:
+                return
+            start_after = page[-1]["keyword_id"]
+            
+    async def update_keyword_rankings_bulk(self,
+                                           updates: Dict[str, Dict[str, Any]],
+                                           max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Dict[str, str]:
+        """Update fields of many keyword ranking entries using batched writes.
+        
+        Args:
+            updates: Fields to update by keyword ID
+            max_concurrency: Maximum number of batched commits in flight
+            
+        Returns:
+            Error messages by keyword ID for entries whose batch failed
+        """
+        keyword_ids = list(updates)
+        write_groups = []
+        for index, keyword_id in enumerate(keyword_ids):
+            doc_id = self._sanitize_id(keyword_id)
+            
+            # The cached entry no longer matches the stored one
+            self.cache["rankings"].pop(doc_id)
+            
+            write_groups.append(
+                ([index], [("update", self.rankings_collection.document(doc_id), updates[keyword_id])], {})
             )
-            keywords_count = await self._count_query_results(keywords_query)
             
+        errors = await self._commit_write_groups(write_groups, asyncio.Semaphore(max_concurrency))
+        
+        return {keyword_ids[index]: error for index, error in errors.items()}
+        
+    def _history_segment_id(self, keyword_id: str, label: str) -> str:
+        """Get the document ID of a keyword history segment."""
+        return f"{self._sanitize_id(keyword_id)}_{label}"
+        
+    async def append_keyword_history(self,
+                                     keyword_id: str,
+                                     entries: List[Dict[str, Any]],
+                                     update_data: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Append entries to the history of a tracked keyword.
+        
+        Entries are added to the weekly segments holding their dates and the
+        segments are listed on the keyword's ranking entry, in one batched
+        commit without reads.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            entries: History entries with a "date"
+            update_data: Fields of the ranking entry to update with the append (optional)
+            
+        Returns:
+            Labels of the segments written
+            
+        Raises:
+            ValueError: If an entry has no valid date
+            Exception: If the keyword does not exist or the write fails
+        """
+        segments, undated = group_entries(entries)
+        if undated:
+            raise ValueError("History entries need a valid date")
+            
+        doc_id = self._sanitize_id(keyword_id)
+        
+        # The cached entry no longer matches the stored one
+        self.cache["rankings"].pop(doc_id)
+        
+        try:
+            writes = [
+                ("merge",
+                 self.history_collection.document(self._history_segment_id(keyword_id, label)),
+                 {"keyword_id": keyword_id, "segment": label, "entries": firestore.ArrayUnion(segment_entries)})
+                for label, segment_entries in segments.items()
+            ]
+            ranking_update = dict(update_data or {})
+            if segments:
+                ranking_update["history_segments"] = firestore.ArrayUnion(sorted(segments))
+            if ranking_update:
+                writes.append(("update", self.rankings_collection.document(doc_id), ranking_update))
+            if writes:
+                await self._commit_writes(writes)
+                
+            return sorted(segments)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to append keyword history: {str(e)}")
+            raise
+            
+    async def get_keyword_histories(self,
+                                    keyword_entries: List[Dict[str, Any]],
+                                    start: Any = None,
+                                    end: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the history of many keywords within a time range.
+        
+        Only the segments of each keyword overlapping the range are read, all
+        in one batched read. History still embedded in an entry is included.
+        
+        Args:
+            keyword_entries: Keyword ranking entries
+            start: Start of the range, datetime or ISO format string (optional)
+            end: End of the range, datetime or ISO format string (optional)
+            
+        Returns:
+            History entries in date order by keyword ID
+            
+        Raises:
+            RuntimeError: If segments could not be read
+        """
+        segment_ids = {
+            keyword_entry["keyword_id"]: [
+                self._history_segment_id(keyword_entry["keyword_id"], label)
+                for label in labels_in_range(keyword_entry.get("history_segments", []), start, end)
+            ]
+            for keyword_entry in keyword_entries
+        }
+        
+        stored, errors = await self._get_documents_bulk(
+            self.history_collection,
+            [segment_id for ids in segment_ids.values() for segment_id in ids],
+            asyncio.Semaphore(DEFAULT_BULK_CONCURRENCY)
+        )
+        if errors:
+            raise RuntimeError(f"Failed to read keyword history: {next(iter(errors.values()))}")
+            
+        histories = {}
+        for keyword_entry in keyword_entries:
+            keyword_id = keyword_entry["keyword_id"]
+            entries = list(keyword_entry.get("history", []))
+            for segment_id in segment_ids[keyword_id]:
+                entries.extend(stored.get(segment_id, {}).get("entries", []))
+            histories[keyword_id] = entries_in_range(entries, start, end)
+            
+        return histories
+        
+    async def get_keyword_history(self,
+                                  keyword_id: str,
+                                  start: Any = None,
+                                  end: Any = None) -> List[Dict[str, Any]]:
+        """Get the history of a tracked keyword within a time range.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            start: Start of the range, datetime or ISO format string (optional)
+            end: End of the range, datetime or ISO format string (optional)
+            
+        Returns:
+            History entries in date order, empty if the keyword does not exist
+        """
+        keyword_entry = await self.get_keyword_ranking(keyword_id)
+        if keyword_entry is None:
+            return []
+            
+        return (await self.get_keyword_histories([keyword_entry], start, end))[keyword_id]
+        
+    def _history_retention_writes(self,
+                                  keyword_entry: Dict[str, Any],
+                                  cutoff: Any) -> List[Tuple[str, Any, Optional[Dict[str, Any]]]]:
+        """Plan the writes dropping a keyword's history before a cutoff.
+        
+        Segments that ended before the cutoff are deleted. History still
+        embedded in the entry is moved to segments, keeping only entries
+        within retention.
+        
+        Returns:
+            Writes as for _commit_writes, empty if nothing is dropped
+        """
+        keyword_id = keyword_entry["keyword_id"]
+        dropped = labels_before(keyword_entry.get("history_segments", []), cutoff)
+        embedded, undated = group_entries(keyword_entry.get("history", []))
+        
+        writes = [
+            ("delete", self.history_collection.document(self._history_segment_id(keyword_id, label)), None)
+            for label in dropped
+        ]
+        ranking_update = {}
+        if dropped:
+            ranking_update["history_segments"] = firestore.ArrayRemove(dropped)
+            
+        if embedded:
+            segments, _ = group_entries(entries_in_range(keyword_entry["history"], start=cutoff))
+            for label, segment_entries in segments.items():
+                writes.append((
+                    "merge",
+                    self.history_collection.document(self._history_segment_id(keyword_id, label)),
+                    {"keyword_id": keyword_id, "segment": label, "entries": firestore.ArrayUnion(segment_entries)}
+                ))
+                
+            # Entries without a valid date were always retained
+            ranking_update["history"] = undated
+            
+            # Both array changes cannot go in one update; moved segments are added in a second one
+            if segments:
+                writes.append((
+                    "update",
+                    self.rankings_collection.document(self._sanitize_id(keyword_id)),
+                    {"history_segments": firestore.ArrayUnion(sorted(segments))}
+                ))
+                
+        if ranking_update:
+            writes.append(("update", self.rankings_collection.document(self._sanitize_id(keyword_id)), ranking_update))
+            
+        return writes
+        
+    async def drop_keyword_history_bulk(self,
+                                        keyword_entries: List[Dict[str, Any]],
+                                        cutoff: Any,
+                                        max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Tuple[List[str], Dict[str, str]]:
+        """Drop the history of many keywords before a cutoff using batched writes.
+        
+        Whole segments are deleted, so retention never rewrites the history
+        it keeps, apart from moving history still embedded in entries to
+        segments.
+        
+        Args:
+            keyword_entries: Keyword ranking entries, as read by a scan
+            cutoff: Date history before which is dropped
+            max_concurrency: Maximum number of batched commits in flight
+            
+        Returns:
+            IDs of the keywords whose history was dropped, and error messages
+            by keyword ID for keywords whose batch failed
+        """
+        keyword_ids = []
+        write_groups = []
+        for keyword_entry in keyword_entries:
+            writes = self._history_retention_writes(keyword_entry, cutoff)
+            if not writes:
+                continue
+                
+            # The cached entry no longer matches the stored one
+            self.cache["rankings"].pop(self._sanitize_id(keyword_entry["keyword_id"]))
+            
+            write_groups.append(([len(keyword_ids)], writes, {}))
+            keyword_ids.append(keyword_entry["keyword_id"])
+            
+        errors = await self._commit_write_groups(write_groups, asyncio.Semaphore(max_concurrency))
+        
+        failed = {keyword_ids[index]: error for index, error in errors.items()}
+        return [keyword_id for keyword_id in keyword_ids if keyword_id not in failed], failed
+        
+    async def get_marketplace_stats(self, marketplace: str) -> Dict[str, Any]:
+        """Get statistics for a marketplace.
+        
+        Document counts come from the marketplace counters in one read. A
+        counter that was never initialised is first set from an aggregation
+        count, see rebuild_counters.
+        
+        Args:
+            marketplace: Marketplace name
+            
+        Returns:
+            Marketplace statistics
+            
+        Raises:
+            Exception: If retrieval fails
+        """
+        try:
+            counts = await self._read_counters(marketplace)
+            
+            uninitialized = [entity for entity, count in counts.items() if count is None]
+            if uninitialized:
+                counts.update(await self.rebuild_counters(marketplace, uninitialized))
+                
             return {
                 "marketplace": marketplace,
-                "product_count": products_count,
-                "category_count": categories_count,
-                "keyword_count": keywords_count,
+                "product_count": counts["products"],
+                "category_count": counts["categories"],
+                "keyword_count": counts["keywords"],
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -712,17 +2317,92 @@ class MarketplaceDataRepository:
             self.logger.error(f"Failed to get marketplace stats: {str(e)}")
             raise
             
+    async def rebuild_counters(self,
+                               marketplace: str,
+                               entity_types: Optional[List[str]] = None) -> Dict[str, int]:
+        """Set marketplace counters from aggregation counts of their documents.
+        
+        Initialises counters of documents stored before counting, and
+        reconciles counters after documents were written around the
+        repository. Documents created or deleted while the counts run may be
+        missed, so this is best run while the marketplace is not being scraped.
+        
+        Args:
+            marketplace: Marketplace name
+            entity_types: Counted entity types to rebuild (defaults to all)
+            
+        Returns:
+            Document counts by entity type
+            
+        Raises:
+            Exception: If counting or writing fails
+        """
+        entity_types = list(entity_types or COUNTED_ENTITIES)
+        
+        aggregated = await asyncio.gather(*(
+            self._count_query_results(
+                self.counted_collections[entity_type].where(filter=FieldFilter("marketplace", "==", marketplace))
+            )
+            for entity_type in entity_types
+        ))
+        counts = dict(zip(entity_types, aggregated))
+        
+        writes = []
+        for entity_type, count in counts.items():
+            writes.extend(self.counters.reset_writes(marketplace, entity_type, count))
+        await self._commit_writes(writes)
+        
+        self.logger.info(f"Rebuilt {marketplace} counters: {counts}")
+        
+        return counts
+        
+    async def _read_counters(self, marketplace: str) -> Dict[str, Optional[int]]:
+        """Read the document counters of a marketplace.
+        
+        Args:
+            marketplace: Marketplace name
+            
+        Returns:
+            Counts by entity type, None for counters never initialised
+            
+        Raises:
+            RuntimeError: If the counters could not be read
+        """
+        shard_ids = [
+            shard_id
+            for entity_type in COUNTED_ENTITIES
+            for shard_id in self.counters.shard_ids(marketplace, entity_type)
+        ]
+        shards, errors = await self._get_documents_bulk(self.counters_collection, shard_ids, asyncio.Semaphore(1))
+        if errors:
+            raise RuntimeError(f"Failed to read counters: {next(iter(errors.values()))}")
+            
+        return {
+            entity_type: self.counters.total(marketplace, entity_type, shards)
+            for entity_type in COUNTED_ENTITIES
+        }
+        
     async def _count_query_results(self, query) -> int:
         """Helper method to count query results.
         
+        Uses a server-side aggregation, which returns just the count, and
+        streams the matching documents only with clients lacking aggregations.
+        
         Args:
             query: Firestore query
             
         Returns:
             Count of documents matching query
         """
-        # This is a workaround since Firestore doesn't have a direct count API
+        if hasattr(query, "count"):
+            results = await query.count(alias="count").get()
+            return int(results[0][0].value)
+            
         count = 0
         async for _ in query.stream():
             count += 1
-        return count
\ No newline at end of file
+        return count
+
+
+# Storage client interface used by the keyword manager and analyzers
+Repository = MarketplaceDataRepository
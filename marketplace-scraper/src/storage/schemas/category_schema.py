@@ -134,7 +134,7 @@ CATEGORY_SCHEMA = {
             "description": "Timestamp when category was last updated"
         }
     },
-    "additionalProperties": true
+    "additionalProperties": True
 }
 
 
@@ -101,7 +101,7 @@ PRODUCT_SCHEMA = {
         },
         "attributes": {
             "type": "object",
-            "additionalProperties": true,
+            "additionalProperties": True,
             "description": "Product attributes as key-value pairs"
         },
         "variants": {
@@ -120,7 +120,7 @@ PRODUCT_SCHEMA = {
                     },
                     "attributes": {
                         "type": "object",
-                        "additionalProperties": true
+                        "additionalProperties": True
                     },
                     "in_stock": {
                         "type": "boolean"
@@ -198,7 +198,7 @@ PRODUCT_SCHEMA = {
             "description": "Number of times product data has been updated"
         }
     },
-    "additionalProperties": true
+    "additionalProperties": True
 }
 
 
@@ -250,7 +250,7 @@ PRICE_SCHEMA = {
             "description": "Promotion information"
         }
     },
-    "additionalProperties": false
+    "additionalProperties": False
 }
 
 
@@ -114,7 +114,7 @@ SEARCH_SCHEMA = {
             "description": "Available facets with counts"
         }
     },
-    "additionalProperties": true
+    "additionalProperties": True
 }
 
 # Search suggestions schema definition
@@ -151,7 +151,7 @@ SUGGESTION_SCHEMA = {
             "description": "Timestamp when suggestions were collected"
         }
     },
-    "additionalProperties": false
+    "additionalProperties": False
 }
 
 
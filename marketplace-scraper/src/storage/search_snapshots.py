@@ -0,0 +1,155 @@
+"""
+Delta-encoded search ranking snapshots.
+
+Every refresh of a keyword's search results is kept as a snapshot. Most
+refreshes move a few products and change a few prices, so storing every
+snapshot in full rewrites up to 100 rows that did not change. A snapshot is
+instead stored as the difference to the snapshot before it: products that
+entered the results, products that left them and the changed fields of the
+products that stayed, including their new positions.
+
+Every few snapshots, and whenever a delta would not be much smaller than
+the full rows, a keyframe stores the results in full. Reconstructing a
+snapshot starts at the keyframe before it, so a read touches at most one
+keyframe interval of snapshots.
+"""
+
+from typing import Dict, List, Any, Optional
+
+
+# Result fields kept per ranked product
+RESULT_FIELDS = ["product_id", "title", "price", "url", "image_url"]
+
+# Ranked products kept per snapshot
+MAX_RESULTS = 100
+
+# Snapshots between keyframes
+KEYFRAME_INTERVAL = 10
+
+# A delta changing more than this share of the rows is stored as a keyframe
+MAX_DELTA_SHARE = 0.5
+
+
+def ranking_rows(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build the stored rows of search results, numbering their positions.
+    
+    Args:
+        results: Search results in ranking order
+        
+    Returns:
+        Rows with a position and the kept result fields
+    """
+    rows = []
+    for index, result in enumerate(results[:MAX_RESULTS]):
+        row = {"position": index + 1}
+        for field in RESULT_FIELDS:
+            if field in result:
+                row[field] = result[field]
+        rows.append(row)
+    return rows
+
+
+def _keyed_rows(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Index rows by a key identifying the product across snapshots.
+    
+    Products listed more than once get a key per listing.
+    """
+    keyed = {}
+    for row in rows:
+        base = str(row.get("product_id") or row.get("url") or row.get("title") or f"#{row['position']}")
+        key = base
+        occurrence = 1
+        while key in keyed:
+            occurrence += 1
+            key = f"{base}#{occurrence}"
+        keyed[key] = row
+    return keyed
+
+
+def diff_rows(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Encode the change between two snapshots' rows.
+    
+    Args:
+        previous: Rows of the previous snapshot
+        current: Rows of the new snapshot
+        
+    Returns:
+        Delta with the rows that "entered", the keys that "exited" and the
+        changed fields of the rows that were "updated"
+    """
+    previous_rows = _keyed_rows(previous)
+    current_rows = _keyed_rows(current)
+    delta = {"entered": [], "exited": [], "updated": []}
+    
+    for key, row in current_rows.items():
+        old_row = previous_rows.get(key)
+        if old_row is None:
+            delta["entered"].append(dict(row, key=key))
+            continue
+            
+        update = {field: value for field, value in row.items() if old_row.get(field) != value}
+        removed = [field for field in old_row if field not in row]
+        if removed:
+            update["removed"] = removed
+        if update:
+            update["key"] = key
+            delta["updated"].append(update)
+            
+    delta["exited"] = [key for key in previous_rows if key not in current_rows]
+    return delta
+
+
+def delta_size(delta: Dict[str, Any]) -> int:
+    """Count the rows a delta changes."""
+    return len(delta["entered"]) + len(delta["exited"]) + len(delta["updated"])
+
+
+def apply_delta(rows: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Reconstruct a snapshot's rows from the previous rows and its delta.
+    
+    Args:
+        rows: Rows of the previous snapshot
+        delta: Delta of the snapshot
+        
+    Returns:
+        Rows of the snapshot in position order
+    """
+    keyed = {key: dict(row) for key, row in _keyed_rows(rows).items()}
+    
+    for key in delta.get("exited", []):
+        keyed.pop(key, None)
+        
+    for update in delta.get("updated", []):
+        row = keyed.get(update["key"])
+        if row is None:
+            continue
+        for field in update.get("removed", []):
+            row.pop(field, None)
+        row.update({field: value for field, value in update.items() if field not in ("key", "removed")})
+        
+    for entered in delta.get("entered", []):
+        keyed[entered["key"]] = {field: value for field, value in entered.items() if field != "key"}
+        
+    return sorted(keyed.values(), key=lambda row: row["position"])
+
+
+def needs_keyframe(sequence: int,
+                   keyframe_sequence: Optional[int],
+                   delta: Optional[Dict[str, Any]],
+                   row_count: int) -> bool:
+    """Decide whether a snapshot is stored in full.
+    
+    Args:
+        sequence: Sequence number of the snapshot
+        keyframe_sequence: Sequence number of the last keyframe, None if there is none
+        delta: Delta to the previous snapshot, None if there is no previous snapshot
+        row_count: Number of rows of the snapshot
+        
+    Returns:
+        True if the snapshot should be a keyframe
+    """
+    if delta is None or keyframe_sequence is None:
+        return True
+    if sequence - keyframe_sequence >= KEYFRAME_INTERVAL:
+        return True
+    return delta_size(delta) > max(1, row_count) * MAX_DELTA_SHARE
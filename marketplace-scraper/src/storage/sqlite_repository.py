@@ -0,0 +1,1257 @@
+"""
+SQLite repository for marketplace data.
+
+This module provides a repository implementation on an embedded SQLite
+database, with the same interface and document IDs as the Firestore
+repository. It serves as a fast local tier for single-node deployments and
+as a backend for offline performance tests.
+
+The database runs in WAL mode, so readers do not block the writer. Every
+operation runs on one worker thread owning the connection, keeping the
+event loop free, and bulk saves commit one transaction per batch.
+Documents are stored as JSON, with the fields that queries filter and order
+by indexed, either as columns or as indexed JSON expressions.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple
+
+from .counters import COUNTED_ENTITIES
+from .repository import MAX_BATCH_WRITES, DEFAULT_BULK_CONCURRENCY, filter_conditions
+from .search_snapshots import ranking_rows
+from .keyword_history import (
+    group_entries,
+    labels_in_range,
+    labels_before,
+    entries_in_range,
+    new_segment,
+    add_entries
+)
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS products (
+        doc_id TEXT PRIMARY KEY,
+        marketplace TEXT NOT NULL,
+        product_id TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS products_marketplace ON products (marketplace)",
+    """CREATE TABLE IF NOT EXISTS price_points (
+        id INTEGER PRIMARY KEY,
+        marketplace TEXT NOT NULL,
+        product_id TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS price_points_product ON price_points (marketplace, product_id, timestamp)",
+    """CREATE TABLE IF NOT EXISTS search_keywords (
+        doc_id TEXT PRIMARY KEY,
+        marketplace TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS search_keywords_marketplace ON search_keywords (marketplace)",
+    """CREATE TABLE IF NOT EXISTS search_snapshots (
+        marketplace TEXT NOT NULL,
+        keyword TEXT NOT NULL,
+        sequence INTEGER NOT NULL,
+        timestamp REAL NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (marketplace, keyword, sequence)
+    )""",
+    """CREATE TABLE IF NOT EXISTS categories (
+        doc_id TEXT PRIMARY KEY,
+        marketplace TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS categories_marketplace ON categories (marketplace)",
+    """CREATE TABLE IF NOT EXISTS search_suggestions (
+        doc_id TEXT PRIMARY KEY,
+        marketplace TEXT NOT NULL,
+        data TEXT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS keyword_rankings (
+        keyword_id TEXT PRIMARY KEY,
+        marketplace TEXT,
+        data TEXT NOT NULL
+    )""",
+    # Keyword queries filter on tracking and order by priority or last update
+    """CREATE INDEX IF NOT EXISTS keyword_rankings_priority ON keyword_rankings (
+        marketplace, json_extract(data, '$.tracking_enabled'), json_extract(data, '$.priority')
+    )""",
+    """CREATE INDEX IF NOT EXISTS keyword_rankings_updated ON keyword_rankings (
+        json_extract(data, '$.tracking_enabled'), json_extract(data, '$.last_updated')
+    )""",
+    """CREATE TABLE IF NOT EXISTS keyword_history (
+        keyword_id TEXT NOT NULL,
+        segment TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (keyword_id, segment)
+    )""",
+]
+
+# Tables of the documents counted per marketplace, by entity type
+COUNTED_TABLES = {
+    "products": "products",
+    "categories": "categories",
+    "keywords": "search_keywords"
+}
+
+# Keyword ranking fields stored as columns
+RANKING_COLUMNS = ("keyword_id", "marketplace")
+
+# SQL comparisons of filter operators other than array membership
+SQL_OPERATORS = {"==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _encode(value: Any) -> Any:
+    """Encode values JSON lacks, keeping datetimes distinguishable from strings."""
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(value: Dict[str, Any]) -> Any:
+    """Decode values encoded by _encode."""
+    if len(value) == 1 and "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, default=_encode)
+
+
+def _loads(text: str) -> Dict[str, Any]:
+    return json.loads(text, object_hook=_decode)
+
+
+def _sql_value(value: Any) -> Any:
+    """Convert a filter value to the value stored in JSON documents."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class SQLiteRepository:
+    """Repository for marketplace data with SQLite implementation.
+    
+    Implements the interface of MarketplaceDataRepository, including the
+    keyword ranking queries of the keyword manager and analyzers.
+    """
+    
+    def __init__(self, path: str = "marketplace.db"):
+        """Initialize the SQLite repository.
+        
+        Args:
+            path: Path of the database file, or ":memory:" for a private
+                in-memory database
+        """
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-repository")
+        self.connection = self.executor.submit(self._connect).result()
+        
+        self.write_stats = {
+            "reads": 0,
+            "reads_avoided": 0,
+            "writes": 0,
+            "writes_avoided": 0
+        }
+        
+        # Setup logging
+        self.logger = logging.getLogger("sqlite-repository")
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+        
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create its tables and indexes."""
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps committed transactions durable across crashes of the process with NORMAL sync
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        return connection
+        
+    async def _run(self, func, *args) -> Any:
+        """Run a database operation on the connection's worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        
+    def _transaction(self, func, *args) -> Any:
+        """Run a database operation in a transaction, rolling it back on failure."""
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(*args)
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+        return result
+        
+    def close(self) -> None:
+        """Close the database and its worker thread."""
+        self.executor.submit(self.connection.close).result()
+        self.executor.shutdown()
+        
+    def _sanitize_id(self, id_string: str) -> str:
+        """Sanitize an ID as the Firestore repository does, keeping document IDs portable.
+        
+        Args:
+            id_string: Raw ID string
+            
+        Returns:
+            Sanitized ID string
+        """
+        sanitized = ''.join(c for c in id_string if c.isalnum() or c in ['-', '_'])
+        return sanitized[:1500]
+        
+    def _get_document_id(self, marketplace: str, entity_id: str, entity_type: str = "product") -> str:
+        """Generate a consistent document ID for an entity.
+        
+        Args:
+            marketplace: Marketplace name
+            entity_id: Entity ID
+            entity_type: Entity type
+            
+        Returns:
+            Document ID
+        """
+        return f"{marketplace}_{self._sanitize_id(entity_id)}"
+        
+    def get_write_stats(self) -> Dict[str, Any]:
+        """Get counts of product reads and writes, and of those avoided.
+        
+        Returns:
+            Read and write counts; products are not fingerprinted
+        """
+        return {
+            **self.write_stats,
+            "fingerprinted_products": 0
+        }
+        
+    def save_fingerprints(self) -> None:
+        """Nothing to persist; products are compared with their stored rows."""
+        
+    def _build_price_point(self, product_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the price point recorded along with a product.
+        
+        Args:
+            product_data: Product data
+            
+        Returns:
+            Price data, or None if the product has no price
+        """
+        if not all(k in product_data for k in ["price", "marketplace", "product_id"]):
+            return None
+            
+        price_data = {
+            "product_id": product_data["product_id"],
+            "marketplace": product_data["marketplace"],
+            "price": product_data["price"],
+            "currency": product_data.get("currency", "ZAR"),
+            "in_stock": product_data.get("in_stock", True),
+        }
+        
+        for field in ["list_price", "discount_percentage"]:
+            if field in product_data:
+                price_data[field] = product_data[field]
+                
+        return price_data
+        
+    def _write_products(self, products: List[Tuple[str, Dict[str, Any]]], now: float) -> List[Optional[str]]:
+        """Write products and their price points, with change tracking.
+        
+        Runs inside a transaction. Products are read in one query, then
+        changed products are written and price points inserted.
+        
+        Args:
+            products: (document ID, product data) pairs, one per document
+            now: Unix timestamp of the write
+            
+        Returns:
+            Operation per product: "set", "update" or None if unchanged
+        """
+        placeholders = ",".join("?" * len(products))
+        existing = {
+            row["doc_id"]: _loads(row["data"])
+            for row in self.connection.execute(
+                f"SELECT doc_id, data FROM products WHERE doc_id IN ({placeholders})",
+                [doc_id for doc_id, _ in products]
+            )
+        }
+        self.write_stats["reads"] += len(products)
+        
+        timestamp = datetime.fromtimestamp(now, timezone.utc)
+        operations = []
+        rows = []
+        for doc_id, product_data in products:
+            stored = existing.get(doc_id)
+            if stored is None:
+                data = dict(product_data, first_seen=timestamp, last_updated=timestamp, update_count=1)
+                operations.append("set")
+            elif any(key not in stored or stored[key] != value for key, value in product_data.items()):
+                data = dict(stored, **product_data)
+                data.update(last_updated=timestamp, update_count=stored.get("update_count", 0) + 1)
+                operations.append("update")
+            else:
+                operations.append(None)
+                continue
+            rows.append((doc_id, product_data["marketplace"], product_data["product_id"], _dumps(data)))
+            
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO products (doc_id, marketplace, product_id, data) VALUES (?, ?, ?, ?)",
+            rows
+        )
+        self.write_stats["writes"] += len(rows)
+        self.write_stats["writes_avoided"] += len(products) - len(rows)
+        
+        return operations
+        
+    def _insert_price_points(self, price_points: List[Dict[str, Any]], now: float) -> List[int]:
+        """Insert price points, inside a transaction.
+        
+        Args:
+            price_points: Price data to save
+            now: Unix timestamp of the points
+            
+        Returns:
+            Row IDs of the price points
+        """
+        row_ids = []
+        for price_data in price_points:
+            cursor = self.connection.execute(
+                "INSERT INTO price_points (marketplace, product_id, timestamp, data) VALUES (?, ?, ?, ?)",
+                (price_data["marketplace"], price_data["product_id"], now, _dumps(price_data))
+            )
+            row_ids.append(cursor.lastrowid)
+        return row_ids
+        
+    async def save_product(self, product_data: Dict[str, Any]) -> str:
+        """Save product data, recording its price point.
+        
+        Args:
+            product_data: Product data to save
+            
+        Returns:
+            Document ID of the saved product
+            
+        Raises:
+            Exception: If save fails
+        """
+        results = await self.save_products_bulk([product_data])
+        if results[0]["error"]:
+            raise ValueError(results[0]["error"])
+        return results[0]["doc_id"]
+        
+    async def save_products_bulk(self,
+                                 products: List[Dict[str, Any]],
+                                 max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Save many products and their price points in batched transactions.
+        
+        Products are written in transactions of at most MAX_BATCH_WRITES
+        products, with the same change tracking as the Firestore repository.
+        A product listed more than once is written once, with later entries
+        merged over earlier ones, but every entry records its own price point.
+        
+        Args:
+            products: Product data to save
+            max_concurrency: Unused, writes to SQLite are serialised
+            
+        Returns:
+            One result per product, in order, with the "doc_id" of the saved
+            product and an "error" message if it was not saved (None otherwise)
+        """
+        results = [{"doc_id": None, "error": None} for _ in products]
+        
+        merged_products: Dict[str, Dict[str, Any]] = {}
+        product_indexes: Dict[str, List[int]] = {}
+        for index, product_data in enumerate(products):
+            missing = next((field for field in ["product_id", "marketplace"] if field not in product_data), None)
+            if missing:
+                results[index]["error"] = f"{missing} is required"
+                continue
+                
+            doc_id = self._get_document_id(product_data["marketplace"], product_data["product_id"])
+            merged_products.setdefault(doc_id, {}).update(product_data)
+            product_indexes.setdefault(doc_id, []).append(index)
+            
+        doc_ids = list(merged_products)
+        now = time.time()
+        
+        def write_batch(batch_ids: List[str]) -> None:
+            self._write_products([(doc_id, merged_products[doc_id]) for doc_id in batch_ids], now)
+            price_points = [
+                price_data
+                for doc_id in batch_ids
+                for index in product_indexes[doc_id]
+                for price_data in [self._build_price_point(products[index])] if price_data
+            ]
+            self._insert_price_points(price_points, now)
+            
+        for start in range(0, len(doc_ids), MAX_BATCH_WRITES):
+            batch_ids = doc_ids[start:start + MAX_BATCH_WRITES]
+            try:
+                await self._run(self._transaction, write_batch, batch_ids)
+                error = None
+            except Exception as e:
+                self.logger.error(f"Failed to save {len(batch_ids)} products: {str(e)}")
+                error = str(e)
+                
+            for doc_id in batch_ids:
+                for index in product_indexes[doc_id]:
+                    results[index] = {"doc_id": None if error else doc_id, "error": error}
+                    
+        failed = sum(1 for result in results if result["error"])
+        self.logger.info(f"Saved {len(products) - failed} of {len(products)} products in bulk")
+        
+        return results
+        
+    async def save_price_point(self, price_data: Dict[str, Any]) -> str:
+        """Save a price point in the price history.
+        
+        Args:
+            price_data: Price data to save
+            
+        Returns:
+            ID of the saved price point
+            
+        Raises:
+            Exception: If save fails
+        """
+        results = await self.save_price_points_bulk([price_data])
+        if results[0]["error"]:
+            raise ValueError(results[0]["error"])
+        return results[0]["doc_id"]
+        
+    async def save_price_points_bulk(self,
+                                     price_points: List[Dict[str, Any]],
+                                     max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> List[Dict[str, Any]]:
+        """Save many price points in batched transactions.
+        
+        Args:
+            price_points: Price data to save
+            max_concurrency: Unused, writes to SQLite are serialised
+            
+        Returns:
+            One result per price point, in order, with the "doc_id" of the saved
+            price point and an "error" message if it was not saved (None otherwise)
+        """
+        results = [{"doc_id": None, "error": None} for _ in price_points]
+        
+        valid_indexes = []
+        for index, price_data in enumerate(price_points):
+            missing = next((field for field in ["product_id", "marketplace", "price"] if field not in price_data), None)
+            if missing:
+                results[index]["error"] = f"{missing} is required"
+            else:
+                valid_indexes.append(index)
+                
+        now = time.time()
+        for start in range(0, len(valid_indexes), MAX_BATCH_WRITES):
+            batch_indexes = valid_indexes[start:start + MAX_BATCH_WRITES]
+            try:
+                row_ids = await self._run(
+                    self._transaction, self._insert_price_points, [price_points[i] for i in batch_indexes], now
+                )
+                for index, row_id in zip(batch_indexes, row_ids):
+                    results[index]["doc_id"] = str(row_id)
+            except Exception as e:
+                self.logger.error(f"Failed to save {len(batch_indexes)} price points: {str(e)}")
+                for index in batch_indexes:
+                    results[index]["error"] = str(e)
+                    
+        self.logger.info(f"Saved {len(price_points) - sum(1 for r in results if r['error'])} "
+                         f"of {len(price_points)} price points in bulk")
+                         
+        return results
+        
+    async def save_search_results(self, search_data: Dict[str, Any]) -> str:
+        """Save search results with position tracking, appending a snapshot.
+        
+        Snapshots are stored in full; local storage makes the deltas of the
+        Firestore repository unnecessary.
+        
+        Args:
+            search_data: Search results data
+            
+        Returns:
+            Document ID of the saved search results
+            
+        Raises:
+            Exception: If save fails
+        """
+        required_fields = ["keyword", "marketplace", "results"]
+        for field in required_fields:
+            if field not in search_data:
+                raise ValueError(f"{field} is required")
+                
+        marketplace = search_data["marketplace"]
+        keyword = search_data["keyword"]
+        doc_id = self._get_document_id(marketplace, keyword, "search")
+        processed_results = ranking_rows(search_data["results"])
+        now = time.time()
+        
+        def write() -> int:
+            sequence = self.connection.execute(
+                "SELECT COALESCE(MAX(sequence), 0) + 1 FROM search_snapshots WHERE marketplace = ? AND keyword = ?",
+                (marketplace, keyword)
+            ).fetchone()[0]
+            final_data = {
+                "keyword": keyword,
+                "marketplace": marketplace,
+                "result_count": len(processed_results),
+                "timestamp": datetime.fromtimestamp(now, timezone.utc),
+                "snapshot_sequence": sequence
+            }
+            self.connection.execute(
+                "INSERT OR REPLACE INTO search_keywords (doc_id, marketplace, keyword, data) VALUES (?, ?, ?, ?)",
+                (doc_id, marketplace, keyword, _dumps(final_data))
+            )
+            self.connection.execute(
+                "INSERT INTO search_snapshots (marketplace, keyword, sequence, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+                (marketplace, keyword, sequence, now, _dumps({"results": processed_results}))
+            )
+            return sequence
+            
+        try:
+            sequence = await self._run(self._transaction, write)
+            self.logger.info(f"Saved search results for '{keyword}' with {len(processed_results)} results "
+                             f"as snapshot {sequence}")
+            return doc_id
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save search results: {str(e)}")
+            raise
+            
+    async def save_category(self, category_data: Dict[str, Any]) -> str:
+        """Save category data.
+        
+        Args:
+            category_data: Category data
+            
+        Returns:
+            Document ID of the saved category
+            
+        Raises:
+            Exception: If save fails
+        """
+        required_fields = ["category_id", "marketplace", "name"]
+        for field in required_fields:
+            if field not in category_data:
+                raise ValueError(f"{field} is required")
+                
+        doc_id = self._get_document_id(category_data["marketplace"], category_data["category_id"], "category")
+        timestamp = datetime.now(timezone.utc)
+        
+        def write() -> None:
+            row = self.connection.execute("SELECT data FROM categories WHERE doc_id = ?", (doc_id,)).fetchone()
+            data = _loads(row["data"]) if row else {"first_seen": timestamp}
+            data.update(category_data, last_updated=timestamp)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO categories (doc_id, marketplace, data) VALUES (?, ?, ?)",
+                (doc_id, category_data["marketplace"], _dumps(data))
+            )
+            
+        try:
+            await self._run(self._transaction, write)
+            self.logger.info(f"Saved category {doc_id}")
+            return doc_id
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save category: {str(e)}")
+            raise
+            
+    async def save_search_suggestions(self, suggestion_data: Dict[str, Any]) -> str:
+        """Save search suggestions.
+        
+        Args:
+            suggestion_data: Suggestion data
+            
+        Returns:
+            Document ID of the saved suggestions
+            
+        Raises:
+            Exception: If save fails
+        """
+        required_fields = ["prefix", "marketplace", "suggestions"]
+        for field in required_fields:
+            if field not in suggestion_data:
+                raise ValueError(f"{field} is required")
+                
+        doc_id = self._get_document_id(suggestion_data["marketplace"], suggestion_data["prefix"], "suggestion")
+        final_data = {
+            "prefix": suggestion_data["prefix"],
+            "marketplace": suggestion_data["marketplace"],
+            "suggestions": suggestion_data["suggestions"],
+            "timestamp": datetime.now(timezone.utc),
+            "count": len(suggestion_data["suggestions"])
+        }
+        
+        try:
+            await self._run(
+                self.connection.execute,
+                "INSERT OR REPLACE INTO search_suggestions (doc_id, marketplace, data) VALUES (?, ?, ?)",
+                (doc_id, final_data["marketplace"], _dumps(final_data))
+            )
+            self.logger.info(f"Saved {final_data['count']} search suggestions for '{final_data['prefix']}'")
+            return doc_id
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save search suggestions: {str(e)}")
+            raise
+            
+    def _get_document(self, table: str, key_column: str, key: str) -> Optional[Dict[str, Any]]:
+        """Read one document by its key."""
+        row = self.connection.execute(f"SELECT data FROM {table} WHERE {key_column} = ?", (key,)).fetchone()
+        return _loads(row["data"]) if row else None
+        
+    async def get_product(self, marketplace: str, product_id: str) -> Optional[Dict[str, Any]]:
+        """Get a product by ID.
+        
+        Args:
+            marketplace: Marketplace name
+            product_id: Product ID
+            
+        Returns:
+            Product data or None if not found
+        """
+        doc_id = self._get_document_id(marketplace, product_id)
+        return await self._run(self._get_document, "products", "doc_id", doc_id)
+        
+    def _get_documents(self, table: str, key_column: str, keys: List[str], chunk_size: int) -> Dict[str, Dict[str, Any]]:
+        """Read many documents by key, one query per chunk of keys."""
+        documents = {}
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            rows = self.connection.execute(
+                f"SELECT {key_column} AS key, data FROM {table} WHERE {key_column} IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            documents.update((row["key"], _loads(row["data"])) for row in rows)
+        return documents
+        
+    async def _get_many(self,
+                        table: str,
+                        key_column: str,
+                        keys: Dict[str, str],
+                        chunk_size: int) -> Dict[str, Dict[str, Any]]:
+        """Get many documents, returning each under its key in keys."""
+        documents = await self._run(self._get_documents, table, key_column, list(dict.fromkeys(keys.values())), chunk_size)
+        return {key: documents[doc_id] for key, doc_id in keys.items() if doc_id in documents}
+        
+    async def get_products_many(self,
+                                marketplace: str,
+                                product_ids: List[str],
+                                max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get many products of a marketplace, one query per chunk.
+        
+        Args:
+            marketplace: Marketplace name
+            product_ids: Product IDs
+            max_concurrency: Unused, reads from SQLite are serialised
+            chunk_size: Products read per query
+            
+        Returns:
+            Data of the products found, by product ID
+        """
+        return await self._get_many(
+            "products", "doc_id",
+            {product_id: self._get_document_id(marketplace, product_id) for product_id in product_ids},
+            chunk_size
+        )
+        
+    async def get_categories_many(self,
+                                  marketplace: str,
+                                  category_ids: List[str],
+                                  max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                  chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get many categories of a marketplace, one query per chunk.
+        
+        Args:
+            marketplace: Marketplace name
+            category_ids: Category IDs
+            max_concurrency: Unused, reads from SQLite are serialised
+            chunk_size: Categories read per query
+            
+        Returns:
+            Data of the categories found, by category ID
+        """
+        return await self._get_many(
+            "categories", "doc_id",
+            {category_id: self._get_document_id(marketplace, category_id, "category") for category_id in category_ids},
+            chunk_size
+        )
+        
+    async def get_category(self, marketplace: str, category_id: str) -> Optional[Dict[str, Any]]:
+        """Get a category by ID.
+        
+        Args:
+            marketplace: Marketplace name
+            category_id: Category ID
+            
+        Returns:
+            Category data or None if not found
+        """
+        doc_id = self._get_document_id(marketplace, category_id, "category")
+        return await self._run(self._get_document, "categories", "doc_id", doc_id)
+        
+    async def get_price_history(self,
+                              marketplace: str,
+                              product_id: str,
+                              days: int = 30) -> List[Dict[str, Any]]:
+        """Get price history for a product.
+        
+        Args:
+            marketplace: Marketplace name
+            product_id: Product ID
+            days: Number of days of history to retrieve
+            
+        Returns:
+            List of price points in time order
+        """
+        def read() -> List[Dict[str, Any]]:
+            rows = self.connection.execute(
+                "SELECT timestamp, data FROM price_points"
+                " WHERE marketplace = ? AND product_id = ? AND timestamp >= ? ORDER BY timestamp",
+                (marketplace, product_id, time.time() - days * 24 * 60 * 60)
+            )
+            return [
+                dict(_loads(row["data"]), timestamp=datetime.fromtimestamp(row["timestamp"], timezone.utc))
+                for row in rows
+            ]
+            
+        price_history = await self._run(read)
+        self.logger.info(f"Retrieved {len(price_history)} price points for {marketplace}_{product_id}")
+        return price_history
+        
+    async def get_search_history(self,
+                               marketplace: str,
+                               keyword: str,
+                               limit: int = 10) -> List[Dict[str, Any]]:
+        """Get search history for a keyword.
+        
+        Args:
+            marketplace: Marketplace name
+            keyword: Search keyword
+            limit: Maximum number of historical searches to retrieve
+            
+        Returns:
+            List of search result snapshots, newest first
+        """
+        def read() -> List[Dict[str, Any]]:
+            rows = self.connection.execute(
+                "SELECT sequence, timestamp, data FROM search_snapshots"
+                " WHERE marketplace = ? AND keyword = ? ORDER BY sequence DESC LIMIT ?",
+                (marketplace, keyword, limit)
+            )
+            search_history = []
+            for row in rows:
+                results = _loads(row["data"])["results"]
+                search_history.append({
+                    "keyword": keyword,
+                    "marketplace": marketplace,
+                    "result_count": len(results),
+                    "timestamp": datetime.fromtimestamp(row["timestamp"], timezone.utc),
+                    "sequence": row["sequence"],
+                    "results": results
+                })
+            return search_history
+            
+        search_history = await self._run(read)
+        self.logger.info(f"Retrieved {len(search_history)} search snapshots for '{keyword}'")
+        return search_history
+        
+    async def _delete(self, statements: List[Tuple[str, Tuple[Any, ...]]]) -> bool:
+        """Run delete statements in one transaction.
+        
+        Returns:
+            True if the first statement deleted a row
+        """
+        def delete() -> bool:
+            deleted = self.connection.execute(*statements[0]).rowcount > 0
+            for statement in statements[1:]:
+                self.connection.execute(*statement)
+            return deleted
+            
+        return await self._run(self._transaction, delete)
+        
+    async def delete_product(self, marketplace: str, product_id: str) -> bool:
+        """Delete a product.
+        
+        Args:
+            marketplace: Marketplace name
+            product_id: Product ID
+            
+        Returns:
+            True if the product existed and was deleted
+        """
+        doc_id = self._get_document_id(marketplace, product_id)
+        return await self._delete([("DELETE FROM products WHERE doc_id = ?", (doc_id,))])
+        
+    async def delete_category(self, marketplace: str, category_id: str) -> bool:
+        """Delete a category.
+        
+        Args:
+            marketplace: Marketplace name
+            category_id: Category ID
+            
+        Returns:
+            True if the category existed and was deleted
+        """
+        doc_id = self._get_document_id(marketplace, category_id, "category")
+        return await self._delete([("DELETE FROM categories WHERE doc_id = ?", (doc_id,))])
+        
+    async def delete_search_results(self, marketplace: str, keyword: str) -> bool:
+        """Delete the search results of a keyword and its snapshots.
+        
+        Args:
+            marketplace: Marketplace name
+            keyword: Search keyword
+            
+        Returns:
+            True if the keyword existed and was deleted
+        """
+        doc_id = self._get_document_id(marketplace, keyword, "search")
+        return await self._delete([
+            ("DELETE FROM search_keywords WHERE doc_id = ?", (doc_id,)),
+            ("DELETE FROM search_snapshots WHERE marketplace = ? AND keyword = ?", (marketplace, keyword))
+        ])
+        
+    async def create_keyword_ranking(self, keyword_entry: Dict[str, Any]) -> str:
+        """Create or replace the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_entry: Keyword entry with a "keyword_id"
+            
+        Returns:
+            Keyword ID
+        """
+        if "keyword_id" not in keyword_entry:
+            raise ValueError("keyword_id is required")
+            
+        await self._run(
+            self.connection.execute,
+            "INSERT OR REPLACE INTO keyword_rankings (keyword_id, marketplace, data) VALUES (?, ?, ?)",
+            (keyword_entry["keyword_id"], keyword_entry.get("marketplace"), _dumps(keyword_entry))
+        )
+        self.logger.info(f"Created keyword ranking {keyword_entry['keyword_id']}")
+        return keyword_entry["keyword_id"]
+        
+    async def get_keyword_ranking(self, keyword_id: str) -> Optional[Dict[str, Any]]:
+        """Get the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            
+        Returns:
+            Keyword entry or None if not found
+        """
+        return await self._run(self._get_document, "keyword_rankings", "keyword_id", keyword_id)
+        
+    async def update_keyword_ranking(self, keyword_id: str, update_data: Dict[str, Any]) -> None:
+        """Update fields of the ranking entry of a tracked keyword.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            update_data: Fields to update
+            
+        Raises:
+            ValueError: If the keyword does not exist
+        """
+        def update() -> None:
+            data = self._get_document("keyword_rankings", "keyword_id", keyword_id)
+            if data is None:
+                raise ValueError(f"Keyword ranking {keyword_id} not found")
+            data.update(update_data)
+            self.connection.execute(
+                "UPDATE keyword_rankings SET marketplace = ?, data = ? WHERE keyword_id = ?",
+                (data.get("marketplace"), _dumps(data), keyword_id)
+            )
+            
+        await self._run(self._transaction, update)
+        
+    async def get_keyword_rankings_many(self,
+                                        keyword_ids: List[str],
+                                        max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                                        chunk_size: int = MAX_BATCH_WRITES) -> Dict[str, Dict[str, Any]]:
+        """Get the ranking entries of many tracked keywords, one query per chunk.
+        
+        Args:
+            keyword_ids: Keyword IDs, "<marketplace>_<keyword>"
+            max_concurrency: Unused, reads from SQLite are serialised
+            chunk_size: Entries read per query
+            
+        Returns:
+            Keyword entries found, by keyword ID
+        """
+        return await self._get_many(
+            "keyword_rankings", "keyword_id", {keyword_id: keyword_id for keyword_id in keyword_ids}, chunk_size
+        )
+        
+    def _field_expression(self, field: str) -> str:
+        """Get the SQL expression of a keyword ranking field.
+        
+        Raises:
+            ValueError: If the field name is not a plain identifier
+        """
+        if not FIELD_NAME.match(field):
+            raise ValueError(f"Invalid field name '{field}'")
+        if field in RANKING_COLUMNS:
+            return field
+        return f"json_extract(data, '$.{field}')"
+        
+    def _ranking_query(self,
+                       filters: Optional[Dict[str, Any]],
+                       limit: int,
+                       order_by: Optional[str],
+                       order_direction: str) -> Tuple[str, List[Any]]:
+        """Translate a keyword ranking query to SQL.
+        
+        Args:
+            filters: Filters as for filter_conditions
+            limit: Maximum number of entries
+            order_by: Field to order entries by (optional)
+            order_direction: "asc" or "desc"
+            
+        Returns:
+            SQL statement and its parameters
+        """
+        clauses = []
+        parameters: List[Any] = []
+        for field, operator, value in filter_conditions(filters):
+            expression = self._field_expression(field)
+            if operator == "array_contains":
+                clauses.append(f"EXISTS (SELECT 1 FROM json_each(data, '$.{field}') WHERE value = ?)")
+                parameters.append(_sql_value(value))
+            elif operator in ("in", "not-in"):
+                values = [_sql_value(item) for item in value]
+                negation = "NOT " if operator == "not-in" else ""
+                clauses.append(f"{expression} {negation}IN ({','.join('?' * len(values))})")
+                parameters.extend(values)
+            else:
+                # Like Firestore, comparisons never match missing fields
+                clauses.append(f"{expression} IS NOT NULL AND {expression} {SQL_OPERATORS[operator]} ?")
+                parameters.append(_sql_value(value))
+                
+        statement = "SELECT data FROM keyword_rankings"
+        if clauses:
+            statement += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            expression = self._field_expression(order_by)
+            direction = "DESC" if order_direction.lower() == "desc" else "ASC"
+            statement += f" AND {expression} IS NOT NULL" if clauses else f" WHERE {expression} IS NOT NULL"
+            statement += f" ORDER BY {expression} {direction}"
+        statement += " LIMIT ?"
+        parameters.append(limit)
+        
+        return statement, parameters
+        
+    async def get_keyword_rankings(self,
+                                   filters: Optional[Dict[str, Any]] = None,
+                                   limit: int = 100,
+                                   order_by: Optional[str] = None,
+                                   order_direction: str = "asc") -> List[Dict[str, Any]]:
+        """Query the ranking entries of tracked keywords.
+        
+        Args:
+            filters: Filters as for filter_conditions
+            limit: Maximum number of entries to retrieve
+            order_by: Field to order entries by (optional)
+            order_direction: "asc" or "desc"
+            
+        Returns:
+            Keyword entries
+        """
+        statement, parameters = self._ranking_query(filters, limit, order_by, order_direction)
+        
+        def read() -> List[Dict[str, Any]]:
+            return [_loads(row["data"]) for row in self.connection.execute(statement, parameters)]
+            
+        return await self._run(read)
+        
+    async def scan_keyword_rankings(self,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    page_size: int = 100,
+                                    start_after: Optional[str] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream the ranking entries of tracked keywords in pages ordered by keyword ID.
+        
+        Args:
+            filters: Filters as for filter_conditions
+            page_size: Entries read per page
+            start_after: Keyword ID to continue a scan after (optional)
+            
+        Yields:
+            Pages of keyword entries
+        """
+        while True:
+            page_filters = dict(filters or {})
+            if start_after is not None:
+                page_filters["keyword_id"] = {">": start_after}
+            page = await self.get_keyword_rankings(page_filters, page_size, "keyword_id")
+            if not page:
+                return
+                
+            yield page
+            
+            if len(page) < page_size:
+                return
+            start_after = page[-1]["keyword_id"]
+            
+    async def update_keyword_rankings_bulk(self,
+                                           updates: Dict[str, Dict[str, Any]],
+                                           max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Dict[str, str]:
+        """Update fields of many keyword ranking entries in batched transactions.
+        
+        Args:
+            updates: Fields to update by keyword ID
+            max_concurrency: Unused, writes to SQLite are serialised
+            
+        Returns:
+            Error messages by keyword ID for entries not found or whose batch failed
+        """
+        keyword_ids = list(updates)
+        errors: Dict[str, str] = {}
+        
+        def update_batch(batch_ids: List[str]) -> None:
+            stored = self._get_documents("keyword_rankings", "keyword_id", batch_ids, MAX_BATCH_WRITES)
+            rows = []
+            for keyword_id in batch_ids:
+                data = stored.get(keyword_id)
+                if data is None:
+                    errors[keyword_id] = f"Keyword ranking {keyword_id} not found"
+                    continue
+                data.update(updates[keyword_id])
+                rows.append((data.get("marketplace"), _dumps(data), keyword_id))
+            self.connection.executemany(
+                "UPDATE keyword_rankings SET marketplace = ?, data = ? WHERE keyword_id = ?", rows
+            )
+            
+        for start in range(0, len(keyword_ids), MAX_BATCH_WRITES):
+            batch_ids = keyword_ids[start:start + MAX_BATCH_WRITES]
+            try:
+                await self._run(self._transaction, update_batch, batch_ids)
+            except Exception as e:
+                self.logger.error(f"Failed to update {len(batch_ids)} keyword rankings: {str(e)}")
+                errors.update((keyword_id, str(e)) for keyword_id in batch_ids)
+                
+        return errors
+        
+    def _add_history(self, keyword_id: str, segments: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Add entries to a keyword's history segments."""
+        for label, entries in segments.items():
+            segment = self._get_segment(keyword_id, label) or new_segment(keyword_id, label)
+            add_entries(segment, [entry for entry in entries if entry not in segment["entries"]])
+            self.connection.execute(
+                "INSERT OR REPLACE INTO keyword_history (keyword_id, segment, data) VALUES (?, ?, ?)",
+                (keyword_id, label, _dumps(segment))
+            )
+            
+    def _get_segment(self, keyword_id: str, label: str) -> Optional[Dict[str, Any]]:
+        """Read one history segment."""
+        row = self.connection.execute(
+            "SELECT data FROM keyword_history WHERE keyword_id = ? AND segment = ?", (keyword_id, label)
+        ).fetchone()
+        return _loads(row["data"]) if row else None
+        
+    async def append_keyword_history(self,
+                                     keyword_id: str,
+                                     entries: List[Dict[str, Any]],
+                                     update_data: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Append entries to the history of a tracked keyword in one transaction.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            entries: History entries with a "date"
+            update_data: Fields of the ranking entry to update with the append (optional)
+            
+        Returns:
+            Labels of the segments written
+            
+        Raises:
+            ValueError: If an entry has no valid date or the keyword does not exist
+        """
+        segments, undated = group_entries(entries)
+        if undated:
+            raise ValueError("History entries need a valid date")
+            
+        def append() -> None:
+            data = self._get_document("keyword_rankings", "keyword_id", keyword_id)
+            if data is None:
+                raise ValueError(f"Keyword ranking {keyword_id} not found")
+            self._add_history(keyword_id, segments)
+            data.update(update_data or {})
+            data["history_segments"] = sorted(set(data.get("history_segments", [])) | set(segments))
+            self.connection.execute(
+                "UPDATE keyword_rankings SET marketplace = ?, data = ? WHERE keyword_id = ?",
+                (data.get("marketplace"), _dumps(data), keyword_id)
+            )
+            
+        await self._run(self._transaction, append)
+        return sorted(segments)
+        
+    async def get_keyword_histories(self,
+                                    keyword_entries: List[Dict[str, Any]],
+                                    start: Any = None,
+                                    end: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the history of many keywords within a time range, reading only overlapping segments.
+        
+        Args:
+            keyword_entries: Keyword ranking entries
+            start: Start of the range, datetime or ISO format string (optional)
+            end: End of the range, datetime or ISO format string (optional)
+            
+        Returns:
+            History entries in date order by keyword ID
+        """
+        keys = [
+            (keyword_entry["keyword_id"], label)
+            for keyword_entry in keyword_entries
+            for label in labels_in_range(keyword_entry.get("history_segments", []), start, end)
+        ]
+        
+        def read() -> Dict[Tuple[str, str], Dict[str, Any]]:
+            segments = {}
+            for chunk_start in range(0, len(keys), MAX_BATCH_WRITES):
+                chunk = keys[chunk_start:chunk_start + MAX_BATCH_WRITES]
+                rows = self.connection.execute(
+                    "SELECT keyword_id, segment, data FROM keyword_history "
+                    f"WHERE (keyword_id, segment) IN (VALUES {','.join('(?, ?)' for _ in chunk)})",
+                    [value for key in chunk for value in key]
+                )
+                segments.update(((row["keyword_id"], row["segment"]), _loads(row["data"])) for row in rows)
+            return segments
+            
+        segments = await self._run(read)
+        
+        histories = {}
+        for keyword_entry in keyword_entries:
+            keyword_id = keyword_entry["keyword_id"]
+            entries = list(keyword_entry.get("history", []))
+            for label in labels_in_range(keyword_entry.get("history_segments", []), start, end):
+                entries.extend(segments.get((keyword_id, label), {}).get("entries", []))
+            histories[keyword_id] = entries_in_range(entries, start, end)
+            
+        return histories
+        
+    async def get_keyword_history(self,
+                                  keyword_id: str,
+                                  start: Any = None,
+                                  end: Any = None) -> List[Dict[str, Any]]:
+        """Get the history of a tracked keyword within a time range.
+        
+        Args:
+            keyword_id: Keyword ID, "<marketplace>_<keyword>"
+            start: Start of the range, datetime or ISO format string (optional)
+            end: End of the range, datetime or ISO format string (optional)
+            
+        Returns:
+            History entries in date order, empty if the keyword does not exist
+        """
+        keyword_entry = await self.get_keyword_ranking(keyword_id)
+        if keyword_entry is None:
+            return []
+            
+        return (await self.get_keyword_histories([keyword_entry], start, end))[keyword_id]
+        
+    async def drop_keyword_history_bulk(self,
+                                        keyword_entries: List[Dict[str, Any]],
+                                        cutoff: Any,
+                                        max_concurrency: int = DEFAULT_BULK_CONCURRENCY) -> Tuple[List[str], Dict[str, str]]:
+        """Drop the history of many keywords before a cutoff in batched transactions.
+        
+        Args:
+            keyword_entries: Keyword ranking entries, as read by a scan
+            cutoff: Date history before which is dropped
+            max_concurrency: Unused, writes to SQLite are serialised
+            
+        Returns:
+            IDs of the keywords whose history was dropped, and error messages
+            by keyword ID for keywords whose batch failed
+        """
+        keyword_ids = [keyword_entry["keyword_id"] for keyword_entry in keyword_entries]
+        dropped_ids: List[str] = []
+        errors: Dict[str, str] = {}
+        
+        def drop_batch(batch_ids: List[str]) -> List[str]:
+            stored = self._get_documents("keyword_rankings", "keyword_id", batch_ids, MAX_BATCH_WRITES)
+            changed = []
+            for keyword_id in batch_ids:
+                data = stored.get(keyword_id)
+                if data is None:
+                    continue
+                dropped = labels_before(data.get("history_segments", []), cutoff)
+                embedded, undated = group_entries(data.get("history", []))
+                if not dropped and not embedded:
+                    continue
+                    
+                self.connection.executemany(
+                    "DELETE FROM keyword_history WHERE keyword_id = ? AND segment = ?",
+                    [(keyword_id, label) for label in dropped]
+                )
+                segments = set(data.get("history_segments", [])) - set(dropped)
+                if embedded:
+                    # Embedded history is moved to segments, keeping entries within retention
+                    moved, _ = group_entries(entries_in_range(data["history"], start=cutoff))
+                    self._add_history(keyword_id, moved)
+                    segments |= set(moved)
+                    data["history"] = undated
+                data["history_segments"] = sorted(segments)
+                self.connection.execute(
+                    "UPDATE keyword_rankings SET data = ? WHERE keyword_id = ?", (_dumps(data), keyword_id)
+                )
+                changed.append(keyword_id)
+            return changed
+            
+        for start in range(0, len(keyword_ids), MAX_BATCH_WRITES):
+            batch_ids = keyword_ids[start:start + MAX_BATCH_WRITES]
+            try:
+                dropped_ids.extend(await self._run(self._transaction, drop_batch, batch_ids))
+            except Exception as e:
+                self.logger.error(f"Failed to drop history of {len(batch_ids)} keywords: {str(e)}")
+                errors.update((keyword_id, str(e)) for keyword_id in batch_ids)
+                
+        return dropped_ids, errors
+        
+    async def get_marketplace_stats(self, marketplace: str) -> Dict[str, Any]:
+        """Get statistics for a marketplace, counting on the marketplace indexes.
+        
+        Args:
+            marketplace: Marketplace name
+            
+        Returns:
+            Marketplace statistics
+        """
+        def count() -> Dict[str, int]:
+            return {
+                entity_type: self.connection.execute(
+                    f"SELECT COUNT(*) FROM {COUNTED_TABLES[entity_type]} WHERE marketplace = ?", (marketplace,)
+                ).fetchone()[0]
+                for entity_type in COUNTED_ENTITIES
+            }
+            
+        counts = await self._run(count)
+        return {
+            "marketplace": marketplace,
+            "product_count": counts["products"],
+            "category_count": counts["categories"],
+            "keyword_count": counts["keywords"],
+            "timestamp": datetime.now().isoformat()
+        }
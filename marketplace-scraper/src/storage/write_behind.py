@@ -0,0 +1,460 @@
+"""
+Write-behind buffering for the marketplace data repository.
+
+Scrapers save every product, price point, search result and category as soon
+as it is extracted. With write-behind buffering these saves only queue the
+data in memory and return; a background task flushes the queue to the
+repository in batches, so storage latency stays off the fetch and extract
+path of the scrapers.
+
+Saves to the same document are coalesced while queued, and the queue is
+bounded: when it is full, saves wait until a flush has made room.
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from .repository import MarketplaceDataRepository
+
+
+# Save methods that replace the whole document, and the fields they require
+_REPLACED_ENTITIES = {
+    "search": ("save_search_results", ["keyword", "marketplace", "results"], "keyword"),
+    "suggestion": ("save_search_suggestions", ["prefix", "marketplace", "suggestions"], "prefix"),
+}
+
+
+class WriteBehindRepository:
+    """Repository wrapper buffering saves and flushing them in the background.
+    
+    Saves of products, price points, search results, suggestions and
+    categories are queued and return at once. Everything else, including all
+    reads, is passed through to the wrapped repository; reads of a product
+    still in the queue see its queued changes.
+    """
+    
+    def __init__(self,
+                 repository: MarketplaceDataRepository,
+                 max_pending: int = 5000,
+                 flush_size: int = 500,
+                 flush_interval: float = 5.0,
+                 max_concurrency: int = 4,
+                 max_attempts: int = 3):
+        """Initialize the write-behind buffer.
+        
+        Args:
+            repository: Repository to write to
+            max_pending: Maximum number of queued and in-flight saves before
+                saves wait for a flush
+            flush_size: Number of queued saves that triggers a flush
+            flush_interval: Maximum seconds between flushes
+            max_concurrency: Maximum number of concurrent writes in a flush
+            max_attempts: Attempts to write a document before dropping it
+        """
+        self.repository = repository
+        self.max_pending = max_pending
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        
+        # Queued saves by (entity type, document ID), in arrival order
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._pending_prices: List[Dict[str, Any]] = []
+        self._attempts: Dict[Tuple[str, str], int] = {}
+        
+        # Queued and in-flight saves, bounded by max_pending
+        self._pending_count = 0
+        
+        self._space: Optional[asyncio.Condition] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+        
+        self.stats = {
+            "queued": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "backpressure_waits": 0
+        }
+        
+        self.logger = logging.getLogger("marketplace-write-behind")
+        
+    def __getattr__(self, name: str) -> Any:
+        # Pass everything not buffered through to the repository
+        if name == "repository":
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+        
+    def _start(self) -> None:
+        """Create the synchronisation primitives and start the flusher."""
+        if self._flusher is None or self._flusher.done():
+            if self._space is None:
+                self._space = asyncio.Condition()
+                self._flush_requested = asyncio.Event()
+                self._flush_lock = asyncio.Lock()
+            self._flusher = asyncio.create_task(self._flush_periodically())
+            
+    async def _reserve(self, count: int = 1) -> None:
+        """Wait until the buffer has room for more saves."""
+        if self._closed:
+            raise RuntimeError("Write-behind buffer is closed")
+            
+        self._start()
+        
+        if self._pending_count + count > self.max_pending:
+            self.stats["backpressure_waits"] += 1
+            self._flush_requested.set()
+            async with self._space:
+                # Admit oversized requests into an empty buffer rather than waiting forever
+                await self._space.wait_for(
+                    lambda: self._pending_count + count <= self.max_pending or self._pending_count == 0
+                )
+                
+        self._pending_count += count
+        self.stats["queued"] += count
+        
+        if len(self._pending) + len(self._pending_prices) >= self.flush_size:
+            self._flush_requested.set()
+            
+    async def _release(self, count: int) -> None:
+        """Free room in the buffer after writes completed."""
+        self._pending_count -= count
+        async with self._space:
+            self._space.notify_all()
+            
+    async def _queue(self, key: Tuple[str, str], data: Dict[str, Any], merge: bool) -> None:
+        """Queue a document save, coalescing it with a queued save of the same document."""
+        # Copy the data, as callers may keep changing it after saving
+        data = dict(data)
+        
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+            if key[0] == "product":
+                self._pending[key].append(data)
+                return
+                
+            if merge:
+                self._pending[key].update(data)
+            else:
+                self._pending[key] = data
+                
+            # The save takes no room of its own
+            await self._release(1)
+        else:
+            self._pending[key] = [data] if key[0] == "product" else data
+            
+    async def save_product(self, product_data: Dict[str, Any]) -> str:
+        """Queue a product and its price point.
+        
+        Args:
+            product_data: Product data to save
+            
+        Returns:
+            Document ID the product will be saved under
+            
+        Raises:
+            ValueError: If product_id or marketplace is missing
+        """
+        for field in ["product_id", "marketplace"]:
+            if field not in product_data:
+                raise ValueError(f"{field} is required")
+                
+        doc_id = self.repository._get_document_id(product_data["marketplace"], product_data["product_id"])
+        
+        await self._reserve()
+        await self._queue(("product", doc_id), product_data, merge=True)
+        return doc_id
+        
+    async def save_products_bulk(self, products: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """Queue many products.
+        
+        Args:
+            products: Product data to save
+            
+        Returns:
+            One result per product, as for MarketplaceDataRepository.save_products_bulk
+        """
+        results = []
+        for product_data in products:
+            try:
+                results.append({"doc_id": await self.save_product(product_data), "error": None})
+            except ValueError as e:
+                results.append({"doc_id": None, "error": str(e)})
+        return results
+        
+    async def save_price_point(self, price_data: Dict[str, Any]) -> Optional[str]:
+        """Queue a price point.
+        
+        Args:
+            price_data: Price data to save
+            
+        Returns:
+            None, as price point IDs are assigned when the buffer is flushed
+            
+        Raises:
+            ValueError: If product_id, marketplace or price is missing
+        """
+        for field in ["product_id", "marketplace", "price"]:
+            if field not in price_data:
+                raise ValueError(f"{field} is required")
+                
+        await self._reserve()
+        self._pending_prices.append(dict(price_data))
+        return None
+        
+    async def save_price_points_bulk(self, price_points: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """Queue many price points.
+        
+        Args:
+            price_points: Price data to save
+            
+        Returns:
+            One result per price point, as for MarketplaceDataRepository.save_price_points_bulk
+        """
+        results = []
+        for price_data in price_points:
+            try:
+                await self.save_price_point(price_data)
+                results.append({"doc_id": None, "error": None})
+            except ValueError as e:
+                results.append({"doc_id": None, "error": str(e)})
+        return results
+        
+    async def _save_replaced(self, entity_type: str, data: Dict[str, Any]) -> str:
+        """Queue a save that replaces the whole document."""
+        _, required_fields, id_field = _REPLACED_ENTITIES[entity_type]
+        for field in required_fields:
+            if field not in data:
+                raise ValueError(f"{field} is required")
+                
+        doc_id = self.repository._get_document_id(data["marketplace"], data[id_field], entity_type)
+        
+        await self._reserve()
+        await self._queue((entity_type, doc_id), data, merge=False)
+        return doc_id
+        
+    async def save_search_results(self, search_data: Dict[str, Any]) -> str:
+        """Queue search results, replacing queued results for the same keyword."""
+        return await self._save_replaced("search", search_data)
+        
+    async def save_search_suggestions(self, suggestion_data: Dict[str, Any]) -> str:
+        """Queue search suggestions, replacing queued suggestions for the same prefix."""
+        return await self._save_replaced("suggestion", suggestion_data)
+        
+    async def save_category(self, category_data: Dict[str, Any]) -> str:
+        """Queue category data, merging it into queued data for the same category."""
+        for field in ["category_id", "marketplace", "name"]:
+            if field not in category_data:
+                raise ValueError(f"{field} is required")
+                
+        doc_id = self.repository._get_document_id(
+            category_data["marketplace"], category_data["category_id"], "category"
+        )
+        
+        await self._reserve()
+        await self._queue(("category", doc_id), category_data, merge=True)
+        return doc_id
+        
+    async def get_product(self, marketplace: str, product_id: str) -> Optional[Dict[str, Any]]:
+        """Get a product, including changes still in the buffer."""
+        stored = await self.repository.get_product(marketplace, product_id)
+        
+        queued = self._pending.get(("product", self.repository._get_document_id(marketplace, product_id)))
+        if not queued:
+            return stored
+            
+        product = dict(stored or {})
+        for product_data in queued:
+            product.update(product_data)
+        return product
+        
+    async def get_products_many(self,
+                                marketplace: str,
+                                product_ids: List[str],
+                                **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Get many products, including changes still in the buffer."""
+        products = await self.repository.get_products_many(marketplace, product_ids, **kwargs)
+        
+        for product_id in product_ids:
+            queued = self._pending.get(("product", self.repository._get_document_id(marketplace, product_id)))
+            if queued:
+                product = dict(products.get(product_id) or {})
+                for product_data in queued:
+                    product.update(product_data)
+                products[product_id] = product
+                
+        return products
+        
+    async def _flush_periodically(self) -> None:
+        """Flush the buffer every flush_interval seconds or when requested."""
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+                
+            self._flush_requested.clear()
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                self.logger.error(f"Error flushing buffered writes: {str(e)}")
+                
+    async def flush(self) -> int:
+        """Write all queued saves to the repository.
+        
+        Products and price points are written with batched writes; other
+        documents are saved concurrently. Saves that fail are queued again
+        until they have been attempted max_attempts times.
+        
+        Returns:
+            Number of queued saves written
+        """
+        if self._flush_lock is None:
+            self._start()
+            
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            prices, self._pending_prices = self._pending_prices, []
+            
+            if not pending and not prices:
+                return 0
+                
+            queued_count = len(prices) + sum(
+                len(data) if key[0] == "product" else 1 for key, data in pending.items()
+            )
+            
+            try:
+                failed = await self._write(pending, prices)
+            except Exception as e:
+                # Nothing is known to be written, so the whole flush is retried
+                self.logger.error(f"Failed to write {queued_count} buffered writes: {str(e)}")
+                failed = dict(pending)
+                if prices:
+                    failed[("price", None)] = prices
+            finally:
+                await self._release(queued_count)
+                
+            self._requeue(failed)
+            
+            written = queued_count - sum(
+                len(data) if isinstance(data, list) else 1 for data in failed.values()
+            )
+            self.stats["written"] += written
+            self.stats["flushes"] += 1
+            self.logger.info(f"Flushed {written} of {queued_count} buffered writes")
+            return written
+            
+    async def _write(self,
+                     pending: Dict[Tuple[str, str], Any],
+                     prices: List[Dict[str, Any]]) -> Dict[Tuple[str, Any], Any]:
+        """Write queued saves, returning those that failed by key."""
+        failed: Dict[Tuple[str, Any], Any] = {}
+        
+        # Products, with all queued entries of a product saved together
+        product_keys = [key for key in pending if key[0] == "product"]
+        products = []
+        product_entries = []
+        for key in product_keys:
+            for product_data in pending[key]:
+                products.append(product_data)
+                product_entries.append(key)
+                
+        if products:
+            results = await self.repository.save_products_bulk(products, max_concurrency=self.max_concurrency)
+            for key, result in zip(product_entries, results):
+                if result["error"]:
+                    failed.setdefault(key, pending[key])
+                    
+        if prices:
+            results = await self.repository.save_price_points_bulk(prices, max_concurrency=self.max_concurrency)
+            failed_prices = [price for price, result in zip(prices, results) if result["error"]]
+            if failed_prices:
+                failed[("price", None)] = failed_prices
+                
+        # Other documents are saved one by one, a few at a time
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def save(key: Tuple[str, str], data: Dict[str, Any]) -> None:
+            entity_type = key[0]
+            method = "save_category" if entity_type == "category" else _REPLACED_ENTITIES[entity_type][0]
+            try:
+                async with semaphore:
+                    await getattr(self.repository, method)(dict(data))
+            except Exception as e:
+                self.logger.error(f"Failed to write buffered {entity_type} {key[1]}: {str(e)}")
+                failed[key] = data
+                
+        await asyncio.gather(*(save(key, data) for key, data in pending.items() if key[0] != "product"))
+        
+        return failed
+        
+    def _requeue(self, failed: Dict[Tuple[str, Any], Any]) -> None:
+        """Queue failed saves again, dropping those out of attempts."""
+        for key, data in failed.items():
+            count = len(data) if isinstance(data, list) else 1
+            self.stats["failed"] += count
+            
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(key, None)
+                self.stats["dropped"] += count
+                self.logger.error(f"Dropping buffered {key[0]} write {key[1]} after {attempts} attempts")
+                continue
+                
+            self._attempts[key] = attempts
+            
+            if key[0] == "price":
+                self._pending_prices[:0] = data
+            elif key[0] == "product":
+                # Keep entries queued meanwhile after the failed ones
+                self._pending[key] = data + self._pending.get(key, [])
+            elif key in self._pending:
+                # Newer category data is merged over the failed save, newer
+                # search results and suggestions replace it, so the failed
+                # save takes no room of its own
+                if key[0] == "category":
+                    self._pending[key] = {**data, **self._pending[key]}
+                continue
+            else:
+                self._pending[key] = data
+                
+            self._pending_count += count
+            
+        for key in list(self._attempts):
+            if key not in failed:
+                self._attempts.pop(key)
+                
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Get statistics of the write-behind buffer.
+        
+        Returns:
+            Counts of queued, coalesced, written, failed and dropped saves,
+            flushes and waits for room, and the saves currently pending
+        """
+        return {
+            **self.stats,
+            "pending": self._pending_count
+        }
+        
+    async def close(self) -> None:
+        """Flush all queued saves and stop the background flusher."""
+        self._closed = True
+        
+        if self._flusher is not None:
+            self._flush_requested.set()
+            try:
+                await self._flusher
+            except Exception as e:
+                self.logger.error(f"Error stopping write-behind flusher: {str(e)}")
+            self._flusher = None
+            
+        # Retry failed saves until written or dropped
+        while self._pending or self._pending_prices:
+            await self.flush()
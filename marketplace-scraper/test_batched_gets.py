@@ -0,0 +1,149 @@
+"""
+Unit tests for batched multi-document gets.
+
+Checks that products, categories and keyword rankings requested together
+are served from the cache first and read in one multi-document get per
+chunk, and that the analysis code fetching keywords per marketplace or
+per related keyword reads them in one batch.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.sqlite_repository import SQLiteRepository
+from src.storage.write_behind import WriteBehindRepository
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer
+from src.common.keyword_manager import KeywordManager
+from test_repository_bulk_writes import FakeClient, _product
+
+
+def _ranking(marketplace, keyword, **fields):
+    return dict({
+        "keyword_id": f"{marketplace}_{keyword}",
+        "marketplace": marketplace,
+        "keyword": keyword,
+        "tracking_enabled": True,
+        "history": []
+    }, **fields)
+
+
+class FirestoreBatchedGetTest(unittest.TestCase):
+    """Tests for batched gets of the Firestore repository"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+
+    def test_products_read_in_chunks(self):
+        for i in range(250):
+            self.client.data["marketplace_products"][f"takealot_PLID{i}"] = _product(i)
+        product_ids = [f"PLID{i}" for i in range(260)]
+
+        products = asyncio.run(self.repository.get_products_many("takealot", product_ids, chunk_size=100))
+
+        self.assertEqual(len(products), 250)
+        self.assertEqual(products["PLID7"]["title"], "Product 7")
+        self.assertEqual(self.client.round_trips, 3)
+
+        # Found products are cached; only the missing ones are read again
+        products = asyncio.run(self.repository.get_products_many("takealot", product_ids, chunk_size=100))
+        self.assertEqual(len(products), 250)
+        self.assertEqual(self.client.round_trips, 4)
+
+    def test_categories_and_rankings(self):
+        self.client.data["marketplace_categories"]["takealot_home"] = {"name": "Home"}
+        asyncio.run(self.repository.create_keyword_ranking(_ranking("takealot", "kettle", priority=5)))
+        self.client.data["keyword_rankings"]["loot_kettle"] = _ranking("loot", "kettle", priority=3)
+        round_trips = self.client.round_trips
+
+        categories = asyncio.run(self.repository.get_categories_many("takealot", ["home", "garden"]))
+        rankings = asyncio.run(self.repository.get_keyword_rankings_many(
+            ["takealot_kettle", "loot_kettle", "makro_kettle"]
+        ))
+
+        self.assertEqual(categories, {"home": {"name": "Home"}})
+        self.assertEqual({keyword_id: entry["priority"] for keyword_id, entry in rankings.items()},
+                         {"takealot_kettle": 5, "loot_kettle": 3})
+        # The created ranking came from the cache
+        self.assertEqual(self.client.round_trips, round_trips + 2)
+
+        # Updates drop the cached entry so the next read sees them
+        asyncio.run(self.repository.update_keyword_ranking("takealot_kettle", {"priority": 9}))
+        rankings = asyncio.run(self.repository.get_keyword_rankings_many(["takealot_kettle"]))
+        self.assertEqual(rankings["takealot_kettle"]["priority"], 9)
+
+    def test_read_errors_raise(self):
+        async def get_all(refs):
+            raise RuntimeError("read failed")
+            yield
+
+        self.client.get_all = get_all
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.repository.get_products_many("takealot", ["PLID0"]))
+
+    def test_analysis_reads_keywords_in_one_batch(self):
+        marketplaces = ["takealot", "loot", "makro", "bob_shop"]
+        for marketplace in marketplaces[:3]:
+            self.client.data["keyword_rankings"][f"{marketplace}_kettle"] = _ranking(marketplace, "kettle")
+
+        asyncio.run(RankingAnalyzer(self.repository).analyze_keyword_performance("kettle", marketplaces))
+        self.assertEqual(self.client.round_trips, 1)
+
+        self.client.data["keyword_rankings"]["takealot_toaster"] = _ranking(
+            "takealot", "toaster", related_keywords=["kettle", "blender", "airfryer"]
+        )
+        self.client.data["keyword_rankings"]["takealot_airfryer"] = _ranking("takealot", "airfryer")
+        self.client.round_trips = 0
+
+        related = asyncio.run(KeywordManager(self.repository).get_related_keywords("takealot", "toaster"))
+
+        self.assertEqual([entry["keyword"] for entry in related], ["kettle", "airfryer"])
+        # The kettle entry is cached from the analysis
+        self.assertEqual(self.client.round_trips, 2)
+
+    def test_write_behind_includes_buffered_products(self):
+        self.client.data["marketplace_products"]["takealot_PLID0"] = _product(0)
+
+        async def run():
+            buffer = WriteBehindRepository(self.repository, flush_interval=60)
+            await buffer.save_product(_product(0, price=50.0))
+            await buffer.save_product(_product(1))
+            products = await buffer.get_products_many("takealot", ["PLID0", "PLID1", "PLID2"])
+            await buffer.close()
+            return products
+
+        products = asyncio.run(run())
+
+        self.assertEqual({product_id: product["price"] for product_id, product in products.items()},
+                         {"PLID0": 50.0, "PLID1": 100.0})
+
+
+class SQLiteBatchedGetTest(unittest.TestCase):
+    """Tests for batched gets of the SQLite repository"""
+
+    def test_batched_gets(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = SQLiteRepository(os.path.join(directory, "marketplace.db"))
+            repository.logger.disabled = True
+
+            asyncio.run(repository.save_products_bulk([_product(i) for i in range(30)]))
+            asyncio.run(repository.save_category({"category_id": "home", "marketplace": "takealot", "name": "Home"}))
+            asyncio.run(repository.create_keyword_ranking(_ranking("takealot", "kettle")))
+
+            products = asyncio.run(repository.get_products_many("takealot", ["PLID1", "PLID29", "PLID99"], chunk_size=2))
+            categories = asyncio.run(repository.get_categories_many("takealot", ["home", "garden"]))
+            rankings = asyncio.run(repository.get_keyword_rankings_many(["takealot_kettle", "loot_kettle"]))
+            repository.close()
+
+        self.assertEqual(sorted(products), ["PLID1", "PLID29"])
+        self.assertEqual(list(categories), ["home"])
+        self.assertEqual(list(rankings), ["takealot_kettle"])
+
+
+if __name__ == "__main__":
+    unittest.main()
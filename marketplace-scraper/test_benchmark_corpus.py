@@ -0,0 +1,77 @@
+"""
+Unit tests for the extractor benchmark corpus.
+
+Checks that the recorded fixtures match the manifest, that every extractor
+case still produces its expected output, and that field-level comparison
+reports the fields that changed.
+"""
+
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+import corpus
+
+
+class CorpusManifestTest(unittest.TestCase):
+    """Tests for the fixture manifest"""
+
+    def test_fixtures_match_manifest(self):
+        manifest = corpus.load_manifest()
+        self.assertEqual(corpus.verify_manifest(manifest), [])
+
+    def test_every_case_has_expected_output(self):
+        for name in corpus.CASES:
+            with self.subTest(case=name):
+                self.assertIsNotNone(corpus.load_expected(name))
+
+
+class CorpusOutputTest(unittest.TestCase):
+    """Tests for extractor outputs over the corpus"""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_outputs_match_expected(self):
+        manifest = corpus.load_manifest()
+
+        for name, (fixture_id, _) in corpus.CASES.items():
+            with self.subTest(case=name):
+                html_content = corpus.load_fixture(manifest["fixtures"][fixture_id])
+                output = corpus.normalize(corpus.run_case(name, html_content, manifest))
+                self.assertEqual(corpus.diff_fields(corpus.load_expected(name), output), [])
+
+    def test_outputs_are_not_empty(self):
+        for name in corpus.CASES:
+            with self.subTest(case=name):
+                self.assertTrue(corpus.load_expected(name))
+
+
+class FieldDiffTest(unittest.TestCase):
+    """Tests for field-level output comparison"""
+
+    def test_reports_changed_missing_and_added_fields(self):
+        expected = {"title": "Kettle", "price": {"current": 649.0}, "images": ["a.jpg", "b.jpg"]}
+        actual = {"title": "Kettle", "price": {"current": 599.0, "was": 649.0}, "images": ["a.jpg"]}
+
+        self.assertEqual(corpus.diff_fields(expected, actual), [
+            ("images.1", "b.jpg", None),
+            ("price.current", 649.0, 599.0),
+            ("price.was", None, 649.0),
+        ])
+
+    def test_volatile_fields_are_ignored(self):
+        first = corpus.normalize({"name": "Kettles", "timestamp": "2026-01-01T00:00:00"})
+        second = corpus.normalize({"name": "Kettles", "timestamp": "2026-06-01T00:00:00"})
+
+        self.assertEqual(corpus.diff_fields(first, second), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Unit tests for the bounded in-memory caches.
+
+Checks entry and byte limits, TTL expiry on reads and in periodic sweeps,
+the metrics, and that the TinyLFU policy keeps frequently used entries
+through a scan of entries used once.
+"""
+
+import unittest
+from unittest import mock
+
+from src.storage.cache import BoundedCache, estimate_size, get_cache_stats
+from src.storage.repository import MarketplaceDataRepository
+from test_repository_bulk_writes import FakeClient
+
+
+class BoundedCacheTest(unittest.TestCase):
+    """Tests for cache eviction, expiry and metrics"""
+
+    def test_lru_eviction(self):
+        cache = BoundedCache("test.lru", max_entries=3)
+        for key in "abc":
+            cache.set(key, key.upper())
+
+        cache.get("a")
+        cache.set("d", "D")
+
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn("b", cache)
+        self.assertEqual([cache.get(key) for key in "acd"], ["A", "C", "D"])
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_byte_limit(self):
+        value = {"title": "x" * 100}
+        size = estimate_size(value)
+        cache = BoundedCache("test.bytes", max_entries=100, max_bytes=size * 3)
+
+        for key in range(5):
+            cache.set(key, dict(value))
+        cache.set("huge", {"title": "x" * (size * 4)})
+
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.bytes, size * 3)
+        self.assertEqual(cache.get_stats()["rejections"], 1)
+
+        # Replacing an entry re-counts its size
+        cache.set(4, {})
+        self.assertEqual(cache.bytes, size * 2 + estimate_size({}))
+
+    def test_ttl(self):
+        with mock.patch("src.storage.cache.time.time", return_value=1000.0) as clock:
+            cache = BoundedCache("test.ttl", ttl=10, sweep_interval=30)
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=100)
+
+            clock.return_value = 1011.0
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(cache.get("b"), 2)
+
+            cache.set("c", 3)
+            clock.return_value = 1035.0
+            cache.set("d", 4)
+
+            # The sweep on set removed "c" before it was read again
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.get_stats()["expirations"], 2)
+
+    def test_metrics(self):
+        cache = BoundedCache("test.metrics")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        stats = get_cache_stats()["test.metrics"]
+
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 50.0)
+
+    def test_tinylfu_resists_scans(self):
+        hot_keys = [f"hot{i}" for i in range(50)]
+        caches = {policy: BoundedCache(f"test.{policy}", max_entries=100, policy=policy)
+                  for policy in ("lru", "tinylfu")}
+
+        for cache in caches.values():
+            for _ in range(5):
+                for key in hot_keys:
+                    if cache.get(key) is None:
+                        cache.set(key, key)
+            for i in range(1000):
+                cache.set(f"scan{i}", i)
+
+        hot_hits = {policy: sum(key in cache for key in hot_keys) for policy, cache in caches.items()}
+
+        self.assertEqual(hot_hits["lru"], 0)
+        # The frequency sketch is approximate, so an occasional hot entry may be lost
+        self.assertGreaterEqual(hot_hits["tinylfu"], 45)
+        self.assertLessEqual(len(caches["tinylfu"]), 100)
+
+    def test_repository_cache_is_bounded(self):
+        repository = MarketplaceDataRepository(firestore_client=FakeClient(), cache_max_entries=10)
+
+        for i in range(50):
+            repository._set_in_cache(f"takealot_PLID{i}", "categories", {"name": str(i)})
+
+        self.assertEqual(len(repository.cache["categories"]), 10)
+        self.assertEqual(repository._get_from_cache("takealot_PLID49", "categories"), {"name": "49"})
+        self.assertIsNone(repository._get_from_cache("takealot_PLID0", "categories"))
+
+
+if __name__ == "__main__":
+    unittest.main()
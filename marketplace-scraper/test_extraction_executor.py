@@ -0,0 +1,159 @@
+"""
+Unit tests for the process-pool extraction executor.
+
+Checks that extraction in worker processes returns the same data as inline
+extraction, that fast path statistics recorded in workers reach the parent,
+and that the event loop keeps running while workers parse.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+from src.common.extraction_executor import ExtractionExecutor
+from src.common.extractors.structured_data import get_structured_data_stats, reset_structured_data_stats
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.makro.extractors import search_extractor as makro_search
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+TAKEALOT_URL = "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234"
+
+
+def _load_fixture(marketplace: str, page_type: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, f'{page_type}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _crash_once(html_content: str, marker_path: str) -> str:
+    """Kill the worker process the first time it is called."""
+    if not os.path.exists(marker_path):
+        open(marker_path, "w").close()
+        os._exit(1)
+    return html_content.upper()
+
+
+def _strip_timestamps(data):
+    """Drop extraction timestamps so results can be compared."""
+    if isinstance(data, dict):
+        return {key: _strip_timestamps(value) for key, value in data.items()
+                if key not in ("timestamp", "extracted_at")}
+    if isinstance(data, list):
+        return [_strip_timestamps(item) for item in data]
+    return data
+
+
+class ExtractionExecutorTest(unittest.TestCase):
+    """Tests for the extraction executor"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ExtractionExecutor(max_workers=2, parser_backend="html.parser")
+        cls.executor.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def setUp(self):
+        reset_structured_data_stats()
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_inline_executor_runs_on_calling_thread(self):
+        """Test that an executor without workers extracts inline"""
+        executor = ExtractionExecutor(max_workers=0)
+        executor.start()
+        self.assertFalse(executor.running)
+
+        html_content = _load_fixture("takealot", "product")
+        product = asyncio.run(executor.run(takealot_product.extract_product_details,
+                                           html_content.encode("utf-8"), TAKEALOT_URL))
+        self.assertEqual(product["title"], "Acme Audio Portable Bluetooth Speaker - Black")
+        self.assertEqual(executor.get_stats()["tasks_inline"], 1)
+
+    def test_pool_matches_inline_extraction(self):
+        """Test that workers return the same data as inline extraction"""
+        pages = [
+            (takealot_product.extract_product_details, _load_fixture("takealot", "product"), (TAKEALOT_URL,)),
+            (loot_search.extract_search_results, _load_fixture("loot", "search"), ("kettle", 1)),
+            (makro_search.extract_search_results, _load_fixture("makro", "search"), ("kettle", 1)),
+        ]
+
+        async def run_all():
+            return await asyncio.gather(*(self.executor.run(func, html_content, *args)
+                                          for func, html_content, args in pages))
+
+        pooled = asyncio.run(run_all())
+        for (func, html_content, args), result in zip(pages, pooled):
+            self.assertEqual(_strip_timestamps(result), _strip_timestamps(func(html_content, *args)))
+
+    def test_worker_stats_are_merged(self):
+        """Test that fast path counters recorded in workers reach the parent"""
+        html_content = _load_fixture("makro", "search")
+        asyncio.run(self.executor.run(makro_search.extract_search_results, html_content, "kettle"))
+
+        stats = get_structured_data_stats("makro")["search"]
+        self.assertEqual((stats["pages"], stats["structured_hits"]), (1, 1))
+
+    def test_event_loop_not_blocked(self):
+        """Test that the event loop keeps ticking while workers parse"""
+        html_content = _load_fixture("loot", "search")
+
+        async def measure():
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+
+            ticker_task = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            await asyncio.gather(*(self.executor.run(loot_search.extract_search_results, html_content, "kettle")
+                                   for _ in range(4)))
+            elapsed = time.perf_counter() - start
+            done.set()
+            await ticker_task
+            return ticks, elapsed
+
+        ticks, elapsed = asyncio.run(measure())
+        # At least a few ticks per 10ms of parsing means the loop was never stalled for long
+        self.assertGreater(ticks, elapsed * 100)
+
+    def test_broken_pool_is_replaced_once(self):
+        """Test that tasks on a broken pool share one replacement pool"""
+        executor = ExtractionExecutor(max_workers=2, parser_backend="html.parser", warm_modules=())
+        executor.start()
+        broken_pool = executor._pool
+
+        with tempfile.TemporaryDirectory() as directory:
+            marker_path = os.path.join(directory, "crashed")
+
+            async def run_all():
+                return await asyncio.gather(*(executor.run(_crash_once, f"page {i}", marker_path)
+                                              for i in range(4)))
+
+            try:
+                results = asyncio.run(run_all())
+            finally:
+                executor.shutdown()
+
+        self.assertEqual(results, [f"PAGE {i}" for i in range(4)])
+        self.assertEqual(executor.get_stats()["pool_restarts"], 1)
+        self.assertGreaterEqual(executor.get_stats()["tasks_failed"], 1)
+        # The broken pool was shut down rather than left behind
+        self.assertTrue(broken_pool._shutdown_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
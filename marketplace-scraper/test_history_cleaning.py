@@ -0,0 +1,168 @@
+"""
+Unit tests for streaming keyword scans and history cleaning.
+
+Checks that keyword rankings are scanned in cursor-paginated pages reading
+every entry once, and that history cleaning drops the expired history
+segments of each page in one batch and resumes after the last completed
+page when interrupted.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.keyword_history import segment_label
+from src.storage.sqlite_repository import SQLiteRepository
+from src.common.keyword_manager import KeywordManager
+from test_repository_bulk_writes import FakeClient
+
+
+OLD_DATE = (datetime.now() - timedelta(days=200)).isoformat()
+NEW_DATE = datetime.now().isoformat()
+
+
+def _keyword(index):
+    return {
+        "keyword_id": f"takealot_keyword {index:03d}",
+        "marketplace": "takealot",
+        "keyword": f"keyword {index:03d}",
+        "tracking_enabled": index % 3 != 0
+    }
+
+
+def _history(old_history=True):
+    history = [{"date": NEW_DATE, "position": 3}]
+    if old_history:
+        history.insert(0, {"date": OLD_DATE, "position": 5})
+    return history
+
+
+class FirestoreHistoryCleaningTest(unittest.TestCase):
+    """Tests for scans and history cleaning on the Firestore repository"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+        for index in range(250):
+            entry = _keyword(index)
+            doc_id = self.repository._sanitize_id(entry["keyword_id"])
+            self.client.data.setdefault("keyword_rankings", {})[doc_id] = entry
+            asyncio.run(self.repository.append_keyword_history(entry["keyword_id"], _history(index % 2 == 0)))
+        self.client.round_trips = 0
+        self.client.batch_sizes = []
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, "history_checkpoint.json")
+        self.manager = KeywordManager(self.repository, checkpoint_path=self.checkpoint_path)
+        self.manager.logger.disabled = True
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _scan(self, **kwargs):
+        async def run():
+            return [page async for page in self.repository.scan_keyword_rankings(**kwargs)]
+
+        return asyncio.run(run())
+
+    def test_scan_reads_every_entry_once(self):
+        pages = self._scan(page_size=100)
+
+        self.assertEqual([len(page) for page in pages], [100, 100, 50])
+        keyword_ids = [entry["keyword_id"] for page in pages for entry in page]
+        self.assertEqual(keyword_ids, [_keyword(index)["keyword_id"] for index in range(250)])
+        self.assertEqual((self.client.round_trips, self.client.streamed), (3, 250))
+
+        pages = self._scan(filters={"tracking_enabled": True}, page_size=100, start_after="takealot_keyword 199")
+        self.assertEqual(len(pages[0]), 33)
+
+    def _assert_history_dropped(self):
+        segments = [entry["history_segments"] for entry in self.client.data["keyword_rankings"].values()]
+        self.assertTrue(all(labels == [segment_label(NEW_DATE)] for labels in segments))
+        self.assertEqual(len(self.client.data["keyword_history"]), 250)
+
+    def test_clean_old_history(self):
+        cleaned = asyncio.run(self.manager.clean_old_history(page_size=100))
+
+        self.assertEqual(cleaned, 125)
+        self._assert_history_dropped()
+        # One batch per page, deleting the expired segment and updating the entry
+        self.assertEqual(self.client.batch_sizes, [100, 100, 50])
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_interrupted_run_resumes(self):
+        drop_bulk = self.repository.drop_keyword_history_bulk
+        calls = []
+
+        async def failing_drop(keyword_entries, cutoff, max_concurrency=4):
+            calls.append(len(keyword_entries))
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return await drop_bulk(keyword_entries, cutoff, max_concurrency)
+
+        self.repository.drop_keyword_history_bulk = failing_drop
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.manager.clean_old_history(page_size=100, max_concurrency=1))
+
+        with open(self.checkpoint_path) as f:
+            self.assertEqual(json.load(f), {"start_after": "takealot_keyword 099"})
+
+        # A new manager picks up the checkpoint and skips the cleaned page
+        self.repository.drop_keyword_history_bulk = drop_bulk
+        self.client.streamed = 0
+        manager = KeywordManager(self.repository, checkpoint_path=self.checkpoint_path)
+        manager.logger.disabled = True
+        cleaned = asyncio.run(manager.clean_old_history(page_size=100))
+
+        self.assertEqual(cleaned, 75)
+        self.assertEqual(self.client.streamed, 150)
+        self._assert_history_dropped()
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_failed_batches_are_not_counted(self):
+        self.client.fail_commits = 1
+
+        cleaned = asyncio.run(self.manager.clean_old_history(page_size=100, max_concurrency=1))
+
+        self.assertEqual(cleaned, 75)
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+
+
+class SQLiteHistoryCleaningTest(unittest.TestCase):
+    """Tests for scans and history cleaning on the SQLite repository"""
+
+    def test_clean_old_history(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = SQLiteRepository(os.path.join(directory, "marketplace.db"))
+            repository.logger.disabled = True
+            for index in range(30):
+                entry = _keyword(index)
+                asyncio.run(repository.create_keyword_ranking(entry))
+                asyncio.run(repository.append_keyword_history(entry["keyword_id"], _history(index < 20)))
+
+            async def scan():
+                return [page async for page in repository.scan_keyword_rankings(
+                    filters={"tracking_enabled": True}, page_size=8
+                )]
+
+            pages = asyncio.run(scan())
+            errors = asyncio.run(repository.update_keyword_rankings_bulk({"takealot_missing": {"priority": 1}}))
+
+            manager = KeywordManager(repository)
+            manager.logger.disabled = True
+            cleaned = asyncio.run(manager.clean_old_history(page_size=8))
+            history = asyncio.run(repository.get_keyword_history("takealot_keyword 005"))
+            repository.close()
+
+        self.assertEqual([len(page) for page in pages], [8, 8, 4])
+        self.assertEqual(list(errors), ["takealot_missing"])
+        self.assertEqual(cleaned, 20)
+        self.assertEqual(history, [{"date": NEW_DATE, "position": 3}])
+
+
+if __name__ == "__main__":
+    unittest.main()
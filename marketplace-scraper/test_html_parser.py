@@ -0,0 +1,174 @@
+"""
+Unit tests for the pluggable HTML parser backends.
+
+Checks that every available backend produces identical extractor output
+for the saved product and search page fixtures and the recorded output for
+every case of the benchmark corpus, and that the selectolax node wrapper
+follows BeautifulSoup semantics for the API extractors use.
+"""
+
+import json
+import logging
+import os
+import sys
+import unittest
+
+from src.common.extractors import html_parser
+from src.common.extractors.html_parser import (
+    parse_html, set_parser_backend, get_parser_backend,
+    available_parser_backends, is_html_node, FastNode
+)
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.takealot.extractors import search_extractor as takealot_search
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import product_extractor as loot_product
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+import corpus
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+SAMPLE_HTML = """
+<div id="root" class="list main">
+  <span class="price" data-value="10">R10</span>
+  <p class="note"><b>Only</b> text</p>
+  <p class="note">plain</p>
+  <input type="checkbox" checked>
+</div>
+"""
+
+
+def _load_fixture(marketplace: str, page_type: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, f'{page_type}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _extract_all() -> dict:
+    """Run every BeautifulSoup-based extractor over the fixtures."""
+    results = {
+        "takealot/product": takealot_product.extract_product_details(
+            _load_fixture("takealot", "product"),
+            "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234"
+        ),
+        "loot/product": loot_product.extract_product_details(
+            _load_fixture("loot", "product"),
+            "https://www.loot.co.za/product/the-long-road/lt-5001"
+        ),
+        "takealot/search": takealot_search.extract_search_results(
+            _load_fixture("takealot", "search"), "bluetooth speaker"
+        ),
+        "loot/search": loot_search.extract_search_results(
+            _load_fixture("loot", "search"), "history books"
+        ),
+        "takealot/ranking": TakealotSearchRankingExtractor().extract_search_ranking_data(
+            _load_fixture("takealot", "search"), "bluetooth speaker", 1
+        ),
+        "loot/ranking": LootSearchRankingExtractor().extract_search_ranking_data(
+            _load_fixture("loot", "search"), "history books", 1
+        ),
+    }
+
+    # Drop extraction timestamps, which differ between runs
+    for data in results.values():
+        data.pop("timestamp", None)
+        data.pop("extracted_at", None)
+
+    return json.loads(json.dumps(results, default=str))
+
+
+class HtmlParserBackendTest(unittest.TestCase):
+    """Tests for parser backend selection and equivalence"""
+
+    def setUp(self):
+        self.original_backend = get_parser_backend()
+
+    def tearDown(self):
+        set_parser_backend(self.original_backend)
+
+    def test_backends_produce_identical_fields(self):
+        """Test that all backends extract the same fields from fixtures"""
+        set_parser_backend("html.parser")
+        reference = _extract_all()
+        self.assertEqual(len(reference["takealot/search"]["results"]), 24)
+        self.assertEqual(len(reference["loot/ranking"]["top_ranked_products"]), 24)
+
+        for backend in available_parser_backends():
+            set_parser_backend(backend)
+            results = _extract_all()
+            for page, data in reference.items():
+                self.assertEqual(results[page], data, f"{backend}: {page}")
+
+    def test_backends_match_corpus(self):
+        """Test that all backends reproduce the recorded output of every corpus case"""
+        manifest = corpus.load_manifest()
+        logging.disable(logging.INFO)
+        try:
+            for backend in available_parser_backends():
+                set_parser_backend(backend)
+                for name, (fixture_id, _) in corpus.CASES.items():
+                    with self.subTest(backend=backend, case=name):
+                        html_content = corpus.load_fixture(manifest["fixtures"][fixture_id])
+                        output = corpus.normalize(corpus.run_case(name, html_content, manifest))
+                        self.assertEqual(corpus.diff_fields(corpus.load_expected(name), output), [])
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_unknown_backend_raises(self):
+        """Test that an unknown backend name is rejected"""
+        with self.assertRaises(ValueError):
+            set_parser_backend("html5lib")
+
+    def test_unavailable_backend_falls_back(self):
+        """Test fallback to html.parser when a backend is not installed"""
+        original = html_parser.LexborHTMLParser
+        html_parser.LexborHTMLParser = None
+        try:
+            self.assertEqual(set_parser_backend("selectolax"), "html.parser")
+        finally:
+            html_parser.LexborHTMLParser = original
+
+    @unittest.skipUnless(html_parser.LexborHTMLParser is not None, "selectolax not installed")
+    def test_fast_node_follows_soup_semantics(self):
+        """Test the FastNode element API against BeautifulSoup"""
+        soup = parse_html(SAMPLE_HTML, "html.parser")
+        fast = parse_html(SAMPLE_HTML, "selectolax")
+        self.assertIsInstance(fast, FastNode)
+        self.assertTrue(is_html_node(fast) and is_html_node(soup))
+
+        for root in (soup, fast):
+            self.assertEqual(root.select_one("#root")["class"], ["list", "main"])
+            self.assertEqual(root.select_one(".price").get("data-value"), "10")
+            self.assertEqual(root.select_one("input").get("checked"), "")
+            self.assertIsNone(root.select_one(".price").get("missing"))
+            self.assertIsNone(root.select_one(".missing"))
+
+        notes = [(n.text, n.string) for n in soup.select(".note")]
+        self.assertEqual([(n.text, n.string) for n in fast.select(".note")], notes)
+        self.assertEqual(
+            [n.text for n in fast.find_all("p", class_="note")],
+            [n.text for n in soup.find_all("p", class_="note")]
+        )
+        self.assertEqual(fast.select_one(".price"), fast.select(".price")[0])
+
+    @unittest.skipUnless(html_parser.LexborHTMLParser is not None, "selectolax not installed")
+    def test_fast_node_scoped_selects(self):
+        """Test that scoped selects skip the element itself and soupsieve-only selectors work"""
+        html = '<div class="card"><div class="card">inner</div><h3>Category</h3><div><a href="/x">X</a></div></div>'
+        for root in (parse_html(html, "html.parser"), parse_html(html, "selectolax")):
+            card = root.select_one(".card")
+            self.assertEqual(card.select_one(".card").text, "inner")
+            self.assertEqual([node.text for node in card.select(".card")], ["inner"])
+            self.assertIsNone(card.select_one(".card").select_one(".card"))
+
+            links = root.select('h3:-soup-contains("Category") + div a')
+            self.assertEqual([link.get("href") for link in links], ["/x"])
+            self.assertEqual(card.select_one('h3:-soup-contains("Category") + div a').text, "X")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Unit tests for keyword canonicalisation and near-duplicate collapsing.
+
+Checks that spelling variants share a canonical form, that MinHash
+signatures estimate the similarity of result sets, and that the keyword
+manager records variants and keywords with nearly the same results as
+aliases of one tracked keyword, reporting the refreshes saved.
+"""
+
+import asyncio
+import unittest
+
+from src.common.keyword_canonicalizer import canonical_keyword, minhash_signature, signature_similarity
+from src.common.keyword_manager import KeywordManager
+from src.storage.repository import MarketplaceDataRepository
+from test_repository_bulk_writes import FakeClient
+
+
+class CanonicalKeywordTest(unittest.TestCase):
+    """Tests for canonical forms and signatures"""
+
+    def test_variants_share_a_form(self):
+        groups = [
+            ["iphone 13 case", "iPhone13 case", "iphone 13 cases", "  IPHONE 13   CASE "],
+            ["kettle 1.7 litres", "Kettle 1700ml", "kettle 1.7L"],
+            ["55\" tv", "55 inch TV", "55 inches tv"],
+            ["1,000 piece puzzle", "1000 piece puzzles"],
+            ["crème brûlée dish", "creme brulee dishes"],
+            ["aa batteries", "AA battery"],
+        ]
+        for variants in groups:
+            self.assertEqual(len({canonical_keyword(variant) for variant in variants}), 1, variants)
+
+        self.assertEqual(canonical_keyword("Kettle 1.7 Litres"), "kettle 1700ml")
+        self.assertNotEqual(canonical_keyword("iphone 13 case"), canonical_keyword("iphone 12 case"))
+        self.assertNotEqual(canonical_keyword("glass"), canonical_keyword("glasses case"))
+        self.assertEqual(canonical_keyword("保温杯"), "保温杯")
+
+    def test_false_plurals_keep_their_form(self):
+        pairs = [
+            ("reading glasses", "reading glass"),
+            ("running shorts", "running short"),
+            ("camera lens", "camera len"),
+            ("tv series", "tv sery"),
+        ]
+        for keyword, stemmed in pairs:
+            self.assertEqual(canonical_keyword(keyword), keyword)
+            self.assertNotEqual(canonical_keyword(keyword), canonical_keyword(stemmed))
+
+        self.assertEqual(canonical_keyword("Camera Lens"), canonical_keyword("camera lens"))
+
+    def test_signature_similarity(self):
+        first = minhash_signature(f"PLID{i}" for i in range(100))
+        near = minhash_signature(f"PLID{i}" for i in range(5, 100))
+        other = minhash_signature(f"PLID{i}" for i in range(80, 180))
+
+        self.assertEqual(first, minhash_signature(f"PLID{i}" for i in reversed(range(100))))
+        self.assertGreater(signature_similarity(first, near), 0.8)
+        self.assertLess(signature_similarity(first, other), 0.3)
+        self.assertEqual(minhash_signature([]), [])
+
+
+class KeywordManagerDuplicateTest(unittest.TestCase):
+    """Tests for collapsing duplicates in the keyword manager"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+        self.manager = KeywordManager(self.repository)
+        self.manager.logger.disabled = True
+
+    def _tracked(self):
+        return sorted(key for key, entry in self.client.data["keyword_rankings"].items() if entry["tracking_enabled"])
+
+    def test_variants_become_aliases(self):
+        asyncio.run(self.manager.add_keyword("takealot", "iphone 13 case", priority=4))
+        entry = asyncio.run(self.manager.add_keyword("takealot", "iPhone13 Cases", priority=6))
+        asyncio.run(self.manager.add_keyword("loot", "iphone 13 cases"))
+
+        self.assertEqual(entry["keyword"], "iphone 13 case")
+        self.assertEqual(self._tracked(), ["loot_iphone13cases", "takealot_iphone13case"])
+        stored = self.client.data["keyword_rankings"]["takealot_iphone13case"]
+        self.assertEqual(stored["priority"], 6)
+        self.assertEqual([alias["keyword"] for alias in stored["aliases"]], ["iPhone13 Cases"])
+
+        # Aliases resolve after a restart
+        manager = KeywordManager(self.repository)
+        manager.logger.disabled = True
+        entry = asyncio.run(manager.add_keyword("takealot", "IPHONE 13 CASE"))
+        self.assertEqual(entry["keyword"], "iphone 13 case")
+        self.assertEqual(len(self.client.data["keyword_rankings"]["takealot_iphone13case"]["aliases"]), 2)
+
+        stats = manager.get_duplicate_stats()
+        self.assertEqual((stats["canonical_keywords"], stats["aliases"]), (1, 2))
+        # Priority 6 refreshes every 72 hours and priority 5 every 96 hours
+        self.assertEqual(stats["refresh_requests_saved_per_day"], round(24 / 72 + 24 / 96, 2))
+
+    def test_false_plurals_are_tracked(self):
+        for keyword in ("wine glass", "wine glasses", "short", "shorts", "lens", "len"):
+            asyncio.run(self.manager.add_keyword("takealot", keyword))
+
+        self.assertEqual(len(self._tracked()), 6)
+        self.assertEqual(self.manager.get_duplicate_stats()["aliases"], 0)
+
+    def test_similar_results_are_collapsed(self):
+        asyncio.run(self.manager.add_keyword("takealot", "phone cover", priority=7))
+        asyncio.run(self.manager.add_keyword("takealot", "phone case", priority=5))
+        asyncio.run(self.manager.add_keyword("takealot", "kettle", priority=5))
+
+        results = [f"PLID{i}" for i in range(40)]
+        self.assertIsNone(asyncio.run(self.manager.record_refresh("takealot", "phone case", result_ids=results)))
+        self.assertIsNone(asyncio.run(self.manager.record_refresh(
+            "takealot", "kettle", result_ids=[f"PLID{i}" for i in range(500, 540)]
+        )))
+        kept = asyncio.run(self.manager.record_refresh("takealot", "phone cover", result_ids=results[2:] + ["PLID99"]))
+
+        self.assertEqual(kept, "takealot_phone cover")
+        self.assertEqual(self._tracked(), ["takealot_kettle", "takealot_phonecover"])
+        aliases = self.client.data["keyword_rankings"]["takealot_phonecover"]["aliases"]
+        self.assertEqual([(alias["keyword"], alias["reason"]) for alias in aliases], [("phone case", "results")])
+
+        # The variant is now answered by the kept keyword, and left the refresh schedule
+        entry = asyncio.run(self.manager.add_keyword("takealot", "Phone Cases"))
+        self.assertEqual(entry["keyword"], "phone cover")
+        due = asyncio.run(self.manager.get_due_keywords())
+        self.assertNotIn("takealot_phone case", [entry["keyword_id"] for entry in due])
+
+    def test_loaded_duplicates_are_collapsed(self):
+        for keyword, priority in (("usb c cable", 3), ("USB-C cables", 8), ("hdmi cable", 5)):
+            key = f"takealot_{keyword}"
+            self.client.data["keyword_rankings"][self.repository._sanitize_id(key)] = {
+                "keyword_id": key, "marketplace": "takealot", "keyword": keyword,
+                "tracking_enabled": True, "priority": priority
+            }
+
+        collapsed = asyncio.run(self.manager.collapse_duplicate_keywords())
+
+        self.assertEqual(collapsed, 1)
+        self.assertEqual(self._tracked(), ["takealot_USB-Ccables", "takealot_hdmicable"])
+        aliases = self.client.data["keyword_rankings"]["takealot_USB-Ccables"]["aliases"]
+        self.assertEqual([alias["keyword"] for alias in aliases], ["usb c cable"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the keyword classifier.
+
+Checks that classifying with the compiled automaton finds the same terms as
+scanning each term list on its own, including overlapping terms and terms
+shared between labels, and that whole-word dictionaries ignore matches
+inside longer words.
+"""
+
+import random
+import unittest
+
+from src.common.keyword_classifier import (
+    KeywordClassifier,
+    SEASON_TERMS,
+    CATEGORY_TERMS,
+    default_dictionaries,
+    get_keyword_classifier
+)
+
+
+WORDS = ["garden", "hose", "beach", "towel", "school", "bag", "christmas", "lights", "new", "year", "cold",
+         "drink", "rainbow", "training", "shoes", "tv", "stand", "laptop", "paperback", "barbecue", "bbq",
+         "football", "snowboard", "holiday", "pool", "cover", "kettle"]
+
+
+class KeywordClassifierTest(unittest.TestCase):
+    """Tests for matching keywords against term dictionaries"""
+
+    def setUp(self):
+        self.classifier = KeywordClassifier()
+
+    def test_matches_per_term_scan(self):
+        rng = random.Random(34)
+
+        for _ in range(2000):
+            keyword = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+            if rng.random() < 0.3:
+                keyword = keyword.title()
+            classes = self.classifier.classify(keyword)
+
+            for group, dictionary in (("season", SEASON_TERMS), ("category", CATEGORY_TERMS)):
+                expected = {label for label, terms in dictionary.items()
+                            if any(term in keyword.lower() for term in terms)}
+                self.assertEqual(set(classes.get(group, [])), expected, keyword)
+
+    def test_overlapping_terms(self):
+        classifier = KeywordClassifier({"term": {"he": ["he"], "she": ["she"], "hers": ["hers"], "his": ["his"]}})
+
+        matches = [(start, end, term) for start, end, _, _, term in classifier.iter_matches("ushers")]
+
+        self.assertEqual(matches, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_term_in_several_labels(self):
+        classes = self.classifier.classify("Holiday Lights")
+
+        self.assertEqual(classes["season"], ["summer", "winter"])
+
+    def test_multi_word_term(self):
+        self.assertTrue(self.classifier.has_label("new year party", "season", "winter"))
+        self.assertFalse(self.classifier.has_label("new yearbook", "season", "spring"))
+
+    def test_whole_word_groups(self):
+        classifier = KeywordClassifier(default_dictionaries(brands=["Acme", "HP"]))
+
+        self.assertEqual(classifier.classify("acme hp laptop")["brand"], ["acme", "hp"])
+        self.assertNotIn("brand", classifier.classify("acmes chp"))
+        self.assertNotIn("stop_word", classifier.classify("theatre"))
+        self.assertEqual(classifier.classify("kettle with the stand")["stop_word"], ["stop_word"])
+
+    def test_is_stop_word(self):
+        self.assertTrue(self.classifier.is_stop_word("With"))
+        self.assertFalse(self.classifier.is_stop_word("without"))
+        self.assertFalse(self.classifier.is_stop_word("with,"))
+
+    def test_classify_batch(self):
+        keywords = ["Beach Towel", "beach towel", "school bag", "kettle", ""]
+
+        self.assertEqual(self.classifier.classify_batch(keywords),
+                         [self.classifier.classify(keyword) for keyword in keywords])
+
+    def test_shared_classifier(self):
+        self.assertIs(get_keyword_classifier(), get_keyword_classifier())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the due-time index of the keyword manager.
+
+Checks that due keywords and keyword batches are answered from the index
+loaded by initialize(), matching the refresh intervals of their
+priorities, without storage reads, and that adding, re-prioritising,
+refreshing and disabling keywords move them in the index.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from src.storage.repository import MarketplaceDataRepository
+from src.common.keyword_manager import KeywordManager
+from test_repository_bulk_writes import FakeClient
+
+
+NOW = datetime.now()
+
+
+def _keyword(index, marketplace="takealot"):
+    return {
+        "keyword_id": f"{marketplace}_keyword{index}",
+        "marketplace": marketplace,
+        "keyword": f"keyword{index}",
+        "tracking_enabled": index % 7 != 0,
+        "priority": index % 10 + 1,
+        "last_updated": (NOW - timedelta(hours=index * 7)).isoformat(),
+        "history": []
+    }
+
+
+class KeywordDueIndexTest(unittest.TestCase):
+    """Tests for due and batch queries of the keyword manager"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+        self.entries = [_keyword(i) for i in range(60)] + [_keyword(i, "loot") for i in range(20)]
+        for entry in self.entries:
+            self.client.data.setdefault("keyword_rankings", {})[entry["keyword_id"]] = dict(entry)
+        self.manager = KeywordManager(self.repository)
+        self.manager.logger.disabled = True
+        asyncio.run(self.manager.initialize())
+        self.client.round_trips = 0
+
+    def _expected_due(self, marketplace=None):
+        due = [
+            entry for entry in self.entries
+            if entry["tracking_enabled"] and marketplace in (None, entry["marketplace"])
+            and datetime.fromisoformat(entry["last_updated"])
+            < NOW - timedelta(hours=self.manager.refresh_intervals[entry["priority"]])
+        ]
+        due.sort(key=lambda entry: (-entry["priority"], entry["last_updated"], entry["keyword_id"]))
+        return [entry["keyword_id"] for entry in due]
+
+    def test_due_keywords(self):
+        due = asyncio.run(self.manager.get_due_keywords())
+        takealot_due = asyncio.run(self.manager.get_due_keywords("takealot"))
+
+        self.assertEqual([entry["keyword_id"] for entry in due], self._expected_due())
+        self.assertEqual([entry["keyword_id"] for entry in takealot_due], self._expected_due("takealot"))
+        self.assertEqual(self.client.round_trips, 0)
+
+        # Queries leave the index intact
+        self.assertEqual([entry["keyword_id"] for entry in asyncio.run(self.manager.get_due_keywords())],
+                         self._expected_due())
+
+    def test_index_follows_changes(self):
+        due_ids = self._expected_due("loot")
+        keyword = due_ids[0].split("_", 1)[1]
+
+        asyncio.run(self.manager.record_refresh("loot", keyword))
+        due = asyncio.run(self.manager.get_due_keywords("loot"))
+        self.assertEqual([entry["keyword_id"] for entry in due], due_ids[1:])
+        self.assertIsNotNone(self.client.data["keyword_rankings"][due_ids[0]]["last_updated"])
+
+        asyncio.run(self.manager.update_keyword_priority("loot", due_ids[1].split("_", 1)[1], 1))
+        asyncio.run(self.manager.disable_keyword_tracking("loot", due_ids[2].split("_", 1)[1]))
+        due = asyncio.run(self.manager.get_due_keywords("loot"))
+        self.assertEqual([entry["keyword_id"] for entry in due], due_ids[3:])
+
+        # New keywords are due once their refresh interval passes
+        asyncio.run(self.manager.add_keyword("loot", "kettle", priority=10))
+        self.assertNotIn("loot_kettle", [entry["keyword_id"] for entry in asyncio.run(self.manager.get_due_keywords())])
+        later = datetime.now().timestamp() + 13 * 3600
+        self.assertEqual(
+            [entry["keyword_id"] for entry in self.manager._earliest_due(10, "loot", due_before=later)][-1],
+            "loot_kettle"
+        )
+
+    def test_generate_keywords_batch(self):
+        batch = asyncio.run(self.manager.generate_keywords_batch("takealot", batch_size=20))
+
+        self.assertEqual(self.client.round_trips, 0)
+        keyword_ids = [entry["keyword_id"] for entry in batch]
+        self.assertEqual(len(keyword_ids), len(set(keyword_ids)))
+        self.assertTrue(all(keyword_id.startswith("takealot_") for keyword_id in keyword_ids))
+
+        # Each priority's allocation takes its least recently updated keywords
+        top = [entry for entry in self.entries
+               if entry["marketplace"] == "takealot" and entry["tracking_enabled"] and entry["priority"] == 10]
+        oldest = sorted(top, key=lambda entry: entry["last_updated"])[:5]
+        self.assertTrue({entry["keyword_id"] for entry in oldest} <= set(keyword_ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
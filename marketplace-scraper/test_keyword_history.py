@@ -0,0 +1,177 @@
+"""
+Unit tests for segmented keyword history.
+
+Checks that history entries are appended to weekly segments in one write,
+that range reads only touch the segments overlapping the range, and that
+retention drops whole segments and moves history still embedded in
+ranking entries to segments, on both repository backends.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.sqlite_repository import SQLiteRepository
+from src.storage.keyword_history import segment_label, labels_before, entries_in_range
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer
+from test_repository_bulk_writes import FakeClient
+
+
+START = datetime(2026, 6, 1, 9)  # A Monday
+
+
+def _entries(days, score=10):
+    return [
+        {"date": (START + timedelta(days=day)).isoformat(), "opportunity_score": score + day, "total_results": 100 + day}
+        for day in days
+    ]
+
+
+def _entry(keyword="kettle", marketplace="takealot", **fields):
+    return dict({
+        "keyword_id": f"{marketplace}_{keyword}",
+        "marketplace": marketplace,
+        "keyword": keyword,
+        "tracking_enabled": True
+    }, **fields)
+
+
+class KeywordHistorySegmentsTest(unittest.TestCase):
+    """Tests for the segment helpers"""
+
+    def test_segment_labels(self):
+        self.assertEqual(segment_label("2026-06-07T23:59:00"), "20260601")
+        self.assertEqual(segment_label("2026-06-08"), "20260608")
+        self.assertEqual(segment_label("2026-06-08T01:00:00+02:00"), "20260601")
+        self.assertIsNone(segment_label("yesterday"))
+        self.assertEqual(labels_before(["20260601", "20260608", "20260615"], "2026-06-10"), ["20260601"])
+
+        entries = _entries([3, 0, 9])
+        self.assertEqual([entry["total_results"] for entry in entries_in_range(entries, "2026-06-02")], [103, 109])
+
+
+class FirestoreKeywordHistoryTest(unittest.TestCase):
+    """Tests for segmented history on the Firestore repository"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+        asyncio.run(self.repository.create_keyword_ranking(_entry()))
+
+        # Count the segments read by multi-document gets
+        self.segments_read = []
+        get_all = self.client.get_all
+
+        def counting_get_all(refs):
+            refs = list(refs)
+            self.segments_read.extend(ref.id for ref in refs)
+            return get_all(refs)
+
+        self.client.get_all = counting_get_all
+
+    def test_append_and_range_reads(self):
+        self.client.round_trips = 0
+        labels = asyncio.run(self.repository.append_keyword_history("takealot_kettle", _entries(range(0, 28, 2))))
+        asyncio.run(self.repository.append_keyword_history("takealot_kettle", _entries([27]), {"update_count": 1}))
+
+        self.assertEqual(labels, ["20260601", "20260608", "20260615", "20260622"])
+        self.assertEqual(self.client.round_trips, 2)
+        stored = self.client.data["keyword_rankings"]["takealot_kettle"]
+        self.assertEqual((stored["history_segments"], stored["update_count"]), (labels, 1))
+        self.assertEqual(len(self.client.data["keyword_history"]["takealot_kettle_20260622"]["entries"]), 4)
+
+        history = asyncio.run(self.repository.get_keyword_history(
+            "takealot_kettle", start=START + timedelta(days=20)
+        ))
+
+        self.assertEqual([entry["total_results"] for entry in history], [120, 122, 124, 126, 127])
+        self.assertEqual(self.segments_read, ["takealot_kettle_20260615", "takealot_kettle_20260622"])
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.repository.append_keyword_history("takealot_kettle", [{"position": 1}]))
+
+    def test_retention_drops_segments(self):
+        asyncio.run(self.repository.append_keyword_history("takealot_kettle", _entries(range(21))))
+        entry = self.client.data["keyword_rankings"]["takealot_kettle"]
+        self.client.batch_sizes = []
+
+        dropped, errors = asyncio.run(self.repository.drop_keyword_history_bulk(
+            [entry], (START + timedelta(days=10)).isoformat()
+        ))
+
+        self.assertEqual((dropped, errors), (["takealot_kettle"], {}))
+        self.assertEqual(sorted(self.client.data["keyword_history"]), ["takealot_kettle_20260608", "takealot_kettle_20260615"])
+        self.assertEqual(self.client.data["keyword_rankings"]["takealot_kettle"]["history_segments"],
+                         ["20260608", "20260615"])
+        # A delete and an update, without rewriting the kept segments
+        self.assertEqual(self.client.batch_sizes, [2])
+
+        # Nothing left to drop
+        entry = self.client.data["keyword_rankings"]["takealot_kettle"]
+        self.assertEqual(asyncio.run(self.repository.drop_keyword_history_bulk([entry], START.isoformat())), ([], {}))
+
+    def test_embedded_history_is_moved_to_segments(self):
+        undated = {"position": 4}
+        self.client.data["keyword_rankings"]["takealot_toaster"] = _entry(
+            "toaster", history=_entries(range(0, 14, 3)) + [undated]
+        )
+        entry = self.client.data["keyword_rankings"]["takealot_toaster"]
+
+        # Embedded history is read until it is moved
+        history = asyncio.run(self.repository.get_keyword_histories([entry], start=START + timedelta(days=5)))
+        self.assertEqual(len(history["takealot_toaster"]), 3)
+
+        asyncio.run(self.repository.drop_keyword_history_bulk([entry], START + timedelta(days=1)))
+
+        stored = self.client.data["keyword_rankings"]["takealot_toaster"]
+        self.assertEqual((stored["history"], stored["history_segments"]), ([undated], ["20260601", "20260608"]))
+        history = asyncio.run(self.repository.get_keyword_history("takealot_toaster"))
+        self.assertEqual([entry["total_results"] for entry in history], [103, 106, 109, 112])
+
+    def test_analyzer_reads_segments(self):
+        now = datetime.now()
+        asyncio.run(self.repository.append_keyword_history("takealot_kettle", [
+            {"date": (now - timedelta(days=days)).isoformat(), "total_results": 200 - days, "opportunity_score": 50}
+            for days in (60, 20, 10, 1)
+        ]))
+
+        analysis = asyncio.run(RankingAnalyzer(self.repository).analyze_keyword_performance(
+            "kettle", ["takealot"], days=30
+        ))
+
+        self.assertEqual(analysis["marketplaces_analyzed"], 1)
+        self.assertNotIn(f"takealot_kettle_{segment_label(now - timedelta(days=60))}", self.segments_read)
+
+
+class SQLiteKeywordHistoryTest(unittest.TestCase):
+    """Tests for segmented history on the SQLite repository"""
+
+    def test_segments(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repository = SQLiteRepository(os.path.join(directory, "marketplace.db"))
+            repository.logger.disabled = True
+            asyncio.run(repository.create_keyword_ranking(_entry()))
+            asyncio.run(repository.create_keyword_ranking(_entry("toaster", history=_entries([0, 10]))))
+
+            asyncio.run(repository.append_keyword_history("takealot_kettle", _entries(range(21)), {"update_count": 2}))
+            asyncio.run(repository.append_keyword_history("takealot_kettle", _entries([20])))
+            recent = asyncio.run(repository.get_keyword_history("takealot_kettle", start=START + timedelta(days=18)))
+
+            entries = asyncio.run(repository.get_keyword_rankings(limit=10))
+            dropped, errors = asyncio.run(repository.drop_keyword_history_bulk(entries, START + timedelta(days=8)))
+            kettle = asyncio.run(repository.get_keyword_ranking("takealot_kettle"))
+            toaster = asyncio.run(repository.get_keyword_history("takealot_toaster"))
+            repository.close()
+
+        self.assertEqual([entry["total_results"] for entry in recent], [118, 119, 120])
+        self.assertEqual((sorted(dropped), errors), (["takealot_kettle", "takealot_toaster"], {}))
+        self.assertEqual((kettle["history_segments"], kettle["update_count"]), (["20260608", "20260615"], 2))
+        self.assertEqual([entry["total_results"] for entry in toaster], [110])
+
+
+if __name__ == "__main__":
+    unittest.main()
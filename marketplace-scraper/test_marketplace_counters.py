@@ -0,0 +1,105 @@
+"""
+Unit tests for the marketplace document counters.
+
+Runs the repository against the in-memory client of the bulk write tests,
+checking that creates and deletes keep the sharded counters in step with
+the stored documents, and that marketplace statistics count every document
+with a single read once the counters are initialised.
+"""
+
+import asyncio
+import unittest
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.counters import ShardedCounters, COUNTER_SHARDS
+from test_repository_bulk_writes import FakeClient, _product
+
+
+class MarketplaceCounterTest(unittest.TestCase):
+    """Tests for counting marketplace documents"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+
+    def _stats(self, marketplace="takealot"):
+        return asyncio.run(self.repository.get_marketplace_stats(marketplace))
+
+    def _counts(self, stats):
+        return stats["product_count"], stats["category_count"], stats["keyword_count"]
+
+    def test_counts_documents_stored_before_counting(self):
+        # Stats used to stream a query limited to one document, reporting at most 1
+        for i in range(25):
+            self.client.data["marketplace_products"][f"takealot_PLID{i}"] = {"marketplace": "takealot"}
+        self.client.data["marketplace_products"]["loot_PLID0"] = {"marketplace": "loot"}
+
+        self.assertEqual(self._counts(self._stats()), (25, 0, 0))
+        self.assertEqual(self.client.streamed, 0)
+        self.assertEqual(self.client.aggregations, 3)
+
+        round_trips = self.client.round_trips
+        self.assertEqual(self._counts(self._stats()), (25, 0, 0))
+
+        # Initialised counters are read in one round-trip without counting again
+        self.assertEqual(self.client.round_trips, round_trips + 1)
+        self.assertEqual(self.client.aggregations, 3)
+
+    def test_creates_and_deletes(self):
+        self._stats()
+
+        asyncio.run(self.repository.save_products_bulk([_product(i) for i in range(30)]))
+        asyncio.run(self.repository.save_product(_product(30)))
+        # Updates do not count again
+        asyncio.run(self.repository.save_products_bulk([_product(i, price=50.0) for i in range(31)]))
+        asyncio.run(self.repository.save_category({"category_id": "home", "marketplace": "takealot", "name": "Home"}))
+        asyncio.run(self.repository.save_category({"category_id": "home", "marketplace": "takealot", "name": "Home"}))
+        for keyword in ("kettle", "toaster", "kettle"):
+            asyncio.run(self.repository.save_search_results(
+                {"keyword": keyword, "marketplace": "takealot", "results": []}
+            ))
+
+        self.assertEqual(self._counts(self._stats()), (31, 1, 2))
+
+        self.assertTrue(asyncio.run(self.repository.delete_product("takealot", "PLID0")))
+        self.assertFalse(asyncio.run(self.repository.delete_product("takealot", "PLID0")))
+        self.assertTrue(asyncio.run(self.repository.delete_search_results("takealot", "kettle")))
+        self.assertTrue(asyncio.run(self.repository.delete_category("takealot", "home")))
+
+        self.assertEqual(self._counts(self._stats()), (30, 0, 1))
+        self.assertEqual(self.client.aggregations, 3)
+
+    def test_failed_commit_does_not_count(self):
+        self._stats()
+        self.client.fail_commits = 1
+
+        asyncio.run(self.repository.save_products_bulk([_product(0)]))
+
+        self.assertEqual(self._stats()["product_count"], 0)
+
+    def test_rebuild_reconciles(self):
+        self._stats()
+        asyncio.run(self.repository.save_products_bulk([_product(i) for i in range(5)]))
+        # Documents removed around the repository leave the counter stale
+        del self.client.data["marketplace_products"]["takealot_PLID0"]
+
+        self.assertEqual(asyncio.run(self.repository.rebuild_counters("takealot", ["products"])), {"products": 4})
+        self.assertEqual(self._stats()["product_count"], 4)
+
+    def test_changes_spread_over_shards(self):
+        counters = ShardedCounters(self.client.collection("marketplace_counters"), lambda amount: amount)
+        shards = {counters.change_write("takealot", "products", 1)[1].id for _ in range(200)}
+
+        self.assertGreater(len(shards), 1)
+        self.assertLessEqual(shards, set(counters.shard_ids("takealot", "products")))
+        self.assertEqual(len(counters.shard_ids("takealot", "products")), COUNTER_SHARDS)
+
+        data = {shard_id: {"count": 2} for shard_id in counters.shard_ids("takealot", "products")}
+        self.assertIsNone(counters.total("takealot", "products", data))
+        data["takealot_products_0"]["initialized"] = True
+        self.assertEqual(counters.total("takealot", "products", data), 2 * COUNTER_SHARDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
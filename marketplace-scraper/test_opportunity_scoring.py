@@ -0,0 +1,142 @@
+"""
+Unit tests for batch opportunity scoring.
+
+Checks that scoring many keywords at once with vectorized factor scores
+gives the same results as scoring each keyword on its own, for every
+marketplace's adjustments and with and without historical data.
+"""
+
+import logging
+import random
+import unittest
+
+from src.common.extractors.opportunity_scoring import RankingArrays, price_gap_counts
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+from src.marketplaces.bob_shop.extractors.search_ranking_extractor import BobShopSearchRankingExtractor
+from src.marketplaces.amazon.extractors.search_ranking_extractor import AmazonSearchRankingExtractor
+
+
+KEYWORDS = ["kettle", "garden hose", "beach towel", "school bag", "christmas lights", "usb cable", "air fryer"]
+BADGES = [None, "Daily Deal", "Best Seller", "Makro Exclusive", "Bestseller"]
+
+
+def _random_product(rng: random.Random, position: int) -> dict:
+    product = {"position": position, "title": f"Product {position}"}
+    if rng.random() < 0.9:
+        product["price"] = rng.choice([0, round(rng.uniform(50, 5000), 2), 199.0, 199.0])
+    if rng.random() < 0.7:
+        product["rating"] = rng.choice([0, round(rng.uniform(1, 5), 1)])
+    if rng.random() < 0.6:
+        product["review_count"] = rng.choice([0, rng.randint(1, 30), rng.randint(50, 4000)])
+    if rng.random() < 0.3:
+        product["sponsored"] = True
+    badge = rng.choice(BADGES)
+    if badge:
+        product["badge"] = badge
+        product["flag"] = badge
+    if rng.random() < 0.3:
+        product["on_sale"] = True
+        product["original_price"] = product.get("price", 0) * rng.uniform(1.0, 1.8)
+    product["in_stock"] = rng.random() > 0.2
+    if rng.random() < 0.2:
+        product["brand"] = rng.choice(["Takealot", "Acme Audio"])
+    product["seller_count"] = rng.randint(1, 8)
+    return product
+
+
+def _random_ranking_data(rng: random.Random, marketplace: str, index: int) -> dict:
+    products = [_random_product(rng, position) for position in range(1, rng.choice([0, 1, 2, 3, 12, 24]) + 1)]
+    data = {
+        "keyword": f"{rng.choice(KEYWORDS)} {index}",
+        "marketplace": marketplace,
+        "current_results": rng.choice([0, 3, 20, 49, 50, 120, 640, 1000, 4800, 9000]),
+        "top_ranked_products": products,
+        "seller_density": rng.choice([0, 0.8, 1.5, 3.0, 6.0]),
+    }
+    if rng.random() < 0.9:
+        data["competitive_index"] = round(rng.uniform(0, 10), 2)
+    return data
+
+
+def _random_history(rng: random.Random) -> list:
+    return [
+        {
+            "date": f"2026-0{rng.randint(1, 9)}-{rng.randint(10, 28)}",
+            "total_results": rng.choice([0, 10, 100, 1000, 5000]),
+            "competitive_density": rng.choice([0, 1.0, 2.5, 5.0]),
+        }
+        for _ in range(rng.choice([0, 1, 2, 5]))
+    ]
+
+
+class BatchOpportunityScoringTest(unittest.TestCase):
+    """Tests for vectorized batch opportunity scoring"""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.extractors = [
+            TakealotSearchRankingExtractor(),
+            LootSearchRankingExtractor(),
+            MakroSearchRankingExtractor(),
+            BobShopSearchRankingExtractor(),
+            AmazonSearchRankingExtractor(),
+        ]
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def assertSameOpportunity(self, expected, actual):
+        self.assertAlmostEqual(expected["opportunity_score"], actual["opportunity_score"], places=9)
+        self.assertAlmostEqual(expected["confidence"], actual["confidence"], places=9)
+        for name, score in expected["score_breakdown"].items():
+            self.assertAlmostEqual(score, actual["score_breakdown"][name], places=9, msg=name)
+        for want, got in zip(expected["factor_scores"], actual["factor_scores"]):
+            self.assertEqual(want["factor_name"], got["factor_name"])
+            if isinstance(want["raw_value"], float):
+                self.assertAlmostEqual(want["raw_value"], got["raw_value"], places=9)
+            else:
+                self.assertEqual(want["raw_value"], got["raw_value"])
+        self.assertEqual(expected["recommendations"], actual["recommendations"])
+        self.assertEqual(
+            {key: value for key, value in expected.items()
+             if key not in ("opportunity_score", "confidence", "score_breakdown", "factor_scores")},
+            {key: value for key, value in actual.items()
+             if key not in ("opportunity_score", "confidence", "score_breakdown", "factor_scores")}
+        )
+
+    def test_batch_matches_per_keyword_scoring(self):
+        rng = random.Random(33)
+
+        for extractor in self.extractors:
+            batch = [_random_ranking_data(rng, extractor.marketplace_name, i) for i in range(150)]
+            histories = [_random_history(rng) for _ in batch]
+
+            for history_batch in (None, histories):
+                with self.subTest(marketplace=extractor.marketplace_name, history=history_batch is not None):
+                    results = extractor.calculate_opportunity_scores(batch, history_batch)
+
+                    self.assertEqual(len(results), len(batch))
+                    for row, (data, result) in enumerate(zip(batch, results)):
+                        history = history_batch[row] if history_batch else None
+                        self.assertSameOpportunity(extractor.calculate_opportunity_score(data, history), result)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.extractors[0].calculate_opportunity_scores([]), [])
+
+    def test_price_gaps_match_per_keyword(self):
+        extractor = self.extractors[0]
+        price_lists = [[], [100.0], [100.0, 900.0], [100.0, 110.0, 120.0, 900.0], [5.0, 5.0, 5.0],
+                       [300.0, 100.0, 200.0, 1000.0, 1100.0]]
+        arrays = RankingArrays([
+            {"keyword": "kettle", "top_ranked_products": [{"price": price} for price in prices]}
+            for prices in price_lists
+        ])
+
+        self.assertEqual(list(price_gap_counts(arrays)),
+                         [len(extractor._find_price_gaps(prices)) for prices in price_lists])
+
+
+if __name__ == "__main__":
+    unittest.main()
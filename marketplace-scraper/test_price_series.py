@@ -0,0 +1,209 @@
+"""
+Unit tests for time-bucketed price series.
+
+Checks that price points are appended to daily or monthly buckets only when
+they change something, that histories are read from a few bucket documents,
+and that price point documents are migrated into series.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.price_series import append_point, bucket_labels, new_bucket
+from test_repository_bulk_writes import FakeClient, _product
+
+
+# 2026-10-18 12:00 UTC
+NOW = datetime(2026, 10, 18, 12, tzinfo=timezone.utc).timestamp()
+DAY = 86400
+
+
+class PriceSeriesTest(unittest.TestCase):
+    """Tests for storing price history as bucketed series"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = self._repository()
+        self.clock = mock.patch("src.storage.repository.time.time", return_value=NOW)
+        self.time = self.clock.start()
+
+    def tearDown(self):
+        self.clock.stop()
+
+    def _repository(self, **kwargs):
+        repository = MarketplaceDataRepository(firestore_client=self.client, price_layout="series", **kwargs)
+        repository.logger.disabled = True
+        return repository
+
+    def _series(self):
+        return self.client.data["price_series"]
+
+    def _history(self, repository=None, days=30):
+        return asyncio.run((repository or self.repository).get_price_history("takealot", "PLID0", days))
+
+    def test_bucket_helpers(self):
+        self.assertEqual(bucket_labels(NOW - 20 * DAY, NOW, "monthly"), ["202609", "202610"])
+        self.assertEqual(len(bucket_labels(NOW - 20 * DAY, NOW, "daily")), 21)
+
+        bucket = new_bucket("takealot", "PLID0", "202610", "ZAR")
+        self.assertTrue(append_point(bucket, 100, {"price": 10.0}))
+        self.assertFalse(append_point(bucket, 200, {"price": 10.0}))
+        self.assertTrue(append_point(bucket, 300, {"price": 10.0, "in_stock": False}))
+        # Late points are inserted in time order
+        self.assertTrue(append_point(bucket, 150, {"price": 12.0}))
+
+        self.assertEqual(bucket["timestamps"], [100, 150, 300])
+        self.assertEqual(bucket["prices"], [10.0, 12.0, 10.0])
+        self.assertEqual(bucket["in_stock"], [True, True, False])
+
+    def test_change_only_recording(self):
+        for hour, price in enumerate([100.0, 100.0, 100.0, 90.0, 90.0, 100.0]):
+            self.time.return_value = NOW + hour * 3600
+            asyncio.run(self.repository.save_price_point({"product_id": "PLID0", "marketplace": "takealot",
+                                                          "price": price}))
+
+        self.assertEqual(list(self._series()), ["takealot_PLID0_202610"])
+        self.assertEqual(self._series()["takealot_PLID0_202610"]["prices"], [100.0, 90.0, 100.0])
+        self.assertEqual(self.client.data["product_prices"], {})
+        # Only the first save read the bucket, and unchanged points were not written
+        self.assertEqual(self.client.round_trips, 1 + 3)
+
+    def test_history_reads_few_buckets(self):
+        for day in range(60):
+            self.time.return_value = NOW - day * DAY
+            asyncio.run(self.repository.save_price_point({"product_id": "PLID0", "marketplace": "takealot",
+                                                          "price": 100.0 + day % 2}))
+
+        # A fresh repository has no cached buckets
+        reader = self._repository()
+        self.time.return_value = NOW
+        round_trips = self.client.round_trips
+        history = self._history(reader)
+
+        self.assertEqual(self.client.round_trips, round_trips + 1)
+        self.assertEqual(len(history), 31)
+        self.assertEqual([point["timestamp"] for point in history],
+                         sorted(point["timestamp"] for point in history))
+        self.assertEqual(history[-1]["price"], 100.0)
+
+        # Cached buckets are served without reads
+        self._history(reader)
+        self.assertEqual(self.client.round_trips, round_trips + 1)
+
+    def test_steady_price_history(self):
+        for day in range(17, -1, -1):
+            self.time.return_value = NOW - day * DAY
+            asyncio.run(self.repository.save_price_point({"product_id": "PLID0", "marketplace": "takealot",
+                                                          "price": 99.0}))
+
+        self.time.return_value = NOW
+        week = self._history(self._repository(), days=7)
+        month = self._history(self._repository(), days=30)
+
+        # The single recorded point, before the period, is carried to its start
+        self.assertEqual([(point["price"], point["timestamp"].timestamp()) for point in week], [(99.0, NOW - 7 * DAY)])
+        self.assertEqual([point["price"] for point in month], [99.0])
+
+    def test_carry_from_previous_bucket(self):
+        repository = self._repository(price_bucket="daily")
+        for timestamp, price in ((NOW - 8 * DAY, 80.0), (NOW - 7 * DAY + 3 * 3600, 90.0)):
+            self.time.return_value = timestamp
+            asyncio.run(repository.save_price_point({"product_id": "PLID0", "marketplace": "takealot",
+                                                     "price": price}))
+
+        self.time.return_value = NOW
+        round_trips = self.client.round_trips
+        history = self._history(self._repository(price_bucket="daily"), days=7)
+
+        # Seen in the first bucket only after the start, the price is carried from the bucket before
+        self.assertEqual([point["price"] for point in history], [80.0, 90.0])
+        self.assertEqual(history[0]["timestamp"].timestamp(), NOW - 7 * DAY)
+        self.assertEqual(self.client.round_trips, round_trips + 2)
+
+    def test_daily_buckets(self):
+        repository = self._repository(price_bucket="daily")
+        for day in range(3):
+            self.time.return_value = NOW + day * DAY
+            asyncio.run(repository.save_price_point({"product_id": "PLID0", "marketplace": "takealot",
+                                                     "price": 100.0}))
+
+        # The first point of every bucket is kept so buckets read on their own
+        self.assertEqual(sorted(self._series()), ["takealot_PLID0_20261018", "takealot_PLID0_20261019",
+                                                  "takealot_PLID0_20261020"])
+
+    def test_bulk_saves_write_each_bucket_once(self):
+        products = [_product(i) for i in range(20)] + [_product(0, price=80.0)]
+
+        asyncio.run(self.repository.save_products_bulk(products))
+
+        self.assertEqual(len(self._series()), 20)
+        self.assertEqual(self._series()["takealot_PLID0_202610"]["prices"], [100.0, 80.0])
+        self.assertEqual(sum(self.client.batch_sizes), 20 + 20 + 1)
+
+        # Unchanged products and prices write nothing
+        self.client.batch_sizes.clear()
+        asyncio.run(self.repository.save_products_bulk([_product(i) for i in range(1, 20)]))
+        self.assertEqual(self.client.batch_sizes, [])
+
+        results = asyncio.run(self.repository.save_price_points_bulk([
+            {"product_id": "PLID1", "marketplace": "takealot", "price": price} for price in (70.0, 60.0, 60.0)
+        ]))
+
+        self.assertEqual([result["doc_id"] for result in results], ["takealot_PLID1_202610"] * 3)
+        self.assertEqual(self.client.batch_sizes, [1])
+        self.assertEqual(self._series()["takealot_PLID1_202610"]["prices"], [100.0, 70.0, 60.0])
+
+    def test_failed_commit_leaves_cached_bucket(self):
+        asyncio.run(self.repository.save_products_bulk([_product(0)]))
+        self.client.fail_commits = 1
+        asyncio.run(self.repository.save_products_bulk([_product(0, price=50.0)]))
+        asyncio.run(self.repository.save_products_bulk([_product(0, price=50.0)]))
+
+        self.assertEqual(self._series()["takealot_PLID0_202610"]["prices"], [100.0, 50.0])
+
+    def test_migration(self):
+        legacy = self.client.data["product_prices"]
+        for day in range(40):
+            legacy[f"point{day}"] = {
+                "product_id": "PLID0",
+                "marketplace": "takealot",
+                "price": 100.0 if day < 30 else 90.0,
+                "currency": "ZAR",
+                "in_stock": True,
+                "timestamp": datetime.fromtimestamp(NOW - day * DAY, timezone.utc)
+            }
+        legacy["other"] = {"product_id": "PLID1", "marketplace": "takealot", "price": 5.0,
+                           "timestamp": datetime.fromtimestamp(NOW, timezone.utc)}
+        legacy["unusable"] = {"product_id": "PLID1", "marketplace": "takealot", "price": 5.0, "timestamp": None}
+
+        # Until migrated, history is read from the price point documents
+        before = self._history(days=35)
+
+        stats = asyncio.run(self.repository.migrate_price_history("takealot"))
+
+        self.assertEqual(stats, {"points_read": 42, "points_recorded": 4, "points_skipped": 1,
+                                 "buckets_written": 3, "documents_deleted": 0})
+        after = self._history(self._repository(), days=35)
+        # Only changes are recorded, the price at the start of the period is carried forward
+        self.assertEqual([point["price"] for point in after], [90.0, 100.0, 100.0])
+        self.assertEqual(after[0]["price"], before[0]["price"])
+        self.assertEqual(before[-1]["price"], after[-1]["price"])
+
+        # Migrating again records nothing new
+        stats = asyncio.run(self.repository.migrate_price_history("takealot", delete_migrated=True))
+
+        self.assertEqual((stats["points_recorded"], stats["documents_deleted"]), (0, 41))
+        self.assertEqual(list(legacy), ["unusable"])
+
+    def test_invalid_layout(self):
+        with self.assertRaises(ValueError):
+            MarketplaceDataRepository(firestore_client=self.client, price_layout="columns")
+        with self.assertRaises(ValueError):
+            MarketplaceDataRepository(firestore_client=self.client, price_bucket="weekly")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Unit tests for product fingerprints in the marketplace data repository.
+
+Checks that saves of known products skip the read of the stored document,
+that unchanged products are not written at all, that changed products are
+updated with just the changed fields, and that the index survives a restart.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.fingerprint_index import FingerprintIndex
+from test_repository_bulk_writes import FakeClient, _product
+
+
+class ProductFingerprintTest(unittest.TestCase):
+    """Tests for skipping product reads and writes with fingerprints"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = self._repository()
+
+    def _repository(self, fingerprint_path=None):
+        repository = MarketplaceDataRepository(firestore_client=self.client, fingerprint_path=fingerprint_path)
+        repository.logger.disabled = True
+        return repository
+
+    def _stored(self, doc_id="takealot_PLID0"):
+        return self.client.data["marketplace_products"][doc_id]
+
+    def test_unchanged_product_skips_read_and_write(self):
+        asyncio.run(self.repository.save_product(_product(0)))
+        round_trips = self.client.round_trips
+
+        product = _product(0)
+        product["extracted_at"] = "2026-10-18T09:00:00"
+        asyncio.run(self.repository.save_product(product))
+
+        # Only the price point is written
+        self.assertEqual(self.client.round_trips, round_trips + 1)
+        self.assertEqual(len(self.client.data["product_prices"]), 2)
+        self.assertEqual(self.repository.get_write_stats(), {
+            "reads": 1,
+            "reads_avoided": 1,
+            "writes": 1,
+            "writes_avoided": 1,
+            "fingerprinted_products": 1
+        })
+
+    def test_changed_product_writes_changed_fields(self):
+        asyncio.run(self.repository.save_product(_product(0)))
+        asyncio.run(self.repository.save_product(_product(0, price=80.0)))
+        asyncio.run(self.repository.save_product(_product(0, price=90.0)))
+
+        self.assertEqual([set(data) for data in self.client.updates], [{"price", "last_updated", "update_count"}] * 2)
+        self.assertEqual(self._stored()["price"], 90.0)
+        self.assertEqual(self._stored()["update_count"], 3)
+        self.assertEqual(self.repository.get_write_stats()["reads"], 1)
+
+    def test_matches_reading_saves(self):
+        # A repository without fingerprints diffs against the stored document every time
+        reading_client = FakeClient()
+        reading = MarketplaceDataRepository(firestore_client=reading_client)
+        reading.logger.disabled = True
+
+        for run in range(4):
+            for i in range(20):
+                product = _product(i, price=100.0 + (run * i) % 7)
+                if run % 2:
+                    product["title"] = f"Product {i} ({run})"
+                asyncio.run(self.repository.save_product(dict(product)))
+                reading.fingerprints.entries.clear()
+                asyncio.run(reading.save_product(dict(product)))
+
+        self.assertEqual(self.client.data["marketplace_products"], reading_client.data["marketplace_products"])
+        self.assertEqual(self.repository.get_write_stats()["reads"], 20)
+
+    def test_bulk_saves_use_fingerprints(self):
+        asyncio.run(self.repository.save_products_bulk([_product(i) for i in range(10)]))
+        round_trips = self.client.round_trips
+
+        results = asyncio.run(self.repository.save_products_bulk(
+            [_product(i, price=50.0 if i < 3 else 100.0) for i in range(10)]
+        ))
+
+        self.assertTrue(all(result["error"] is None for result in results))
+        # No read, one commit with three product updates and ten price points
+        self.assertEqual(self.client.round_trips, round_trips + 1)
+        self.assertEqual(self.client.batch_sizes[-1], 13)
+        self.assertEqual(self._stored("takealot_PLID2")["update_count"], 2)
+        self.assertEqual(self._stored("takealot_PLID3")["update_count"], 1)
+
+    def test_failed_write_discards_fingerprint(self):
+        asyncio.run(self.repository.save_products_bulk([_product(0)]))
+        self.client.fail_commits = 1
+
+        asyncio.run(self.repository.save_products_bulk([_product(0, price=10.0)]))
+
+        self.assertIsNone(self.repository.fingerprints.get("takealot_PLID0"))
+
+    def test_warm_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fingerprints.json")
+            repository = self._repository(path)
+            asyncio.run(repository.save_product(_product(0)))
+            repository.save_fingerprints()
+
+            restarted = self._repository(path)
+            asyncio.run(restarted.save_product(_product(0)))
+
+            self.assertEqual(restarted.get_write_stats()["reads_avoided"], 1)
+            self.assertEqual(restarted.get_write_stats()["writes_avoided"], 1)
+
+    def test_changed_fields(self):
+        index = FingerprintIndex()
+        index.record("doc", index.fingerprint({"a": 1, "b": [1, 2], "c": {"x": 1}}), 1)
+
+        self.assertIsNone(index.changed_fields("other", index.fingerprint({"a": 1})))
+        self.assertEqual(index.changed_fields("doc", index.fingerprint({"a": 1, "b": [1, 2], "c": {"x": 1}})), [])
+        self.assertEqual(index.changed_fields("doc", index.fingerprint({"a": 1})), [])
+        self.assertEqual(index.changed_fields("doc", index.fingerprint({"a": 2, "b": [2, 1], "d": None})),
+                         ["a", "b", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
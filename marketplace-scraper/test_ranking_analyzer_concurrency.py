@@ -0,0 +1,153 @@
+"""
+Unit tests for concurrent ranking analysis.
+
+Checks that the reads of one report are shared through its memo, also
+between analyses running at the same time, that the analyzer never runs
+more reads at once than allowed, and that the results match those of a
+sequential run.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer, ReadMemo
+
+
+MARKETPLACES = ["takealot", "loot", "makro"]
+
+
+class SlowRepository:
+    """Repository stand-in counting calls and the reads in flight at once."""
+
+    def __init__(self, keyword_count=6):
+        now = datetime.now()
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.keywords = {}
+        self.histories = {}
+        for m, marketplace in enumerate(MARKETPLACES):
+            for i in range(keyword_count):
+                keyword_id = f"{marketplace}_keyword {i}"
+                self.keywords[keyword_id] = {
+                    "keyword_id": keyword_id, "marketplace": marketplace, "keyword": f"keyword {i}",
+                    "tracking_enabled": True, "categories": [f"category {i % 2}"],
+                    "opportunity_score": 40 + i * 5 + m, "seller_density": 0.1 * (i + 1),
+                    "competitive_density": 0.15 * i, "average_price": 100 * (m + 1), "total_results": 50 * (i + 1),
+                    "last_updated": now.isoformat()
+                }
+                self.histories[keyword_id] = [
+                    {"date": (now - timedelta(days=day)).isoformat(), "opportunity_score": 60 - day + i,
+                     "total_results": 10 * day, "average_price": 100 + day}
+                    for day in (20, 10, 1)
+                ]
+
+    async def _call(self, name):
+        self.calls.append(name)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+    async def get_keyword_rankings(self, filters=None, limit=100, order_by=None, order_direction="desc"):
+        await self._call("get_keyword_rankings")
+        entries = [dict(entry) for entry in self.keywords.values() if entry["marketplace"] == filters["marketplace"]]
+        return entries[:limit]
+
+    async def get_keyword_rankings_many(self, keyword_ids, **kwargs):
+        await self._call("get_keyword_rankings_many")
+        return {keyword_id: dict(self.keywords[keyword_id]) for keyword_id in keyword_ids if keyword_id in self.keywords}
+
+    async def get_keyword_histories(self, keyword_entries, start=None, end=None):
+        await self._call("get_keyword_histories")
+        return {
+            entry["keyword_id"]: [h for h in self.histories[entry["keyword_id"]] if not start or h["date"] >= start]
+            for entry in keyword_entries
+        }
+
+    async def get_opportunity_scores(self, filters=None, limit=100, **kwargs):
+        await self._call("get_opportunity_scores")
+        return []
+
+    async def search_products(self, marketplace, query, limit=10):
+        await self._call("search_products")
+        return [{"product_id": f"{marketplace}1", "title": "Glass Kettle", "price": 300}]
+
+    async def get_opportunity_score(self, opportunity_id):
+        await self._call("get_opportunity_score")
+        return {"opportunity_score": 70}
+
+
+class ReadMemoTest(unittest.TestCase):
+    """Tests for sharing reads within a report"""
+
+    def test_reads_are_shared(self):
+        repository = SlowRepository()
+
+        async def read_twice():
+            memo = ReadMemo(repository)
+            ids = ["takealot_keyword 1", "loot_keyword 1", "takealot_missing"]
+            first, second = await asyncio.gather(memo.keyword_entries(ids), memo.keyword_entries(ids[:2]))
+            histories = await asyncio.gather(*(
+                memo.keyword_histories(list(first.values()), start="2000-01-01") for _ in range(3)
+            ))
+            rankings = await memo.keyword_rankings(filters={"marketplace": "makro"}, limit=10)
+            await memo.keyword_entries(["makro_keyword 2"])
+            return first, second, histories, rankings, memo
+
+        first, second, histories, rankings, memo = asyncio.run(read_twice())
+
+        self.assertEqual(sorted(first), ["loot_keyword 1", "takealot_keyword 1"])
+        self.assertEqual(first, second)
+        self.assertEqual(len(histories[0]["loot_keyword 1"]), 3)
+        self.assertEqual(len(rankings), 6)
+        # Entries found by a query are not read again
+        self.assertEqual(repository.calls, ["get_keyword_rankings_many", "get_keyword_histories", "get_keyword_rankings"])
+        self.assertEqual(memo.storage_calls, 3)
+
+
+class RankingAnalyzerConcurrencyTest(unittest.TestCase):
+    """Tests for bounded concurrent analysis"""
+
+    def test_cross_marketplace_matches_sequential(self):
+        sequential_repository = SlowRepository()
+        sequential = RankingAnalyzer(sequential_repository, max_concurrency=1)
+        expected = asyncio.run(sequential.find_cross_marketplace_opportunities(MARKETPLACES))
+
+        repository = SlowRepository()
+        opportunities = asyncio.run(RankingAnalyzer(repository, max_concurrency=2).find_cross_marketplace_opportunities(
+            MARKETPLACES
+        ))
+
+        for opportunity in opportunities + expected:
+            del opportunity["analysis"]["generated_at"]
+        self.assertEqual(opportunities, expected)
+        self.assertTrue(opportunities)
+        self.assertEqual(sequential_repository.max_in_flight, 1)
+        self.assertEqual(repository.max_in_flight, 2)
+        # One query per marketplace finding the entries, then one batched read of history
+        self.assertEqual(repository.calls, ["get_keyword_rankings"] * 3 + ["get_keyword_histories"])
+
+    def test_report_shares_reads(self):
+        repository = SlowRepository()
+        analyzer = RankingAnalyzer(repository)
+
+        report = asyncio.run(analyzer.generate_marketplace_opportunity_report("takealot"))
+
+        self.assertEqual(report["marketplace"], "takealot")
+        self.assertTrue(report["category_opportunities"])
+        self.assertLessEqual(repository.max_in_flight, analyzer.max_concurrency)
+        self.assertEqual(repository.calls.count("get_keyword_histories"), 1)
+
+    def test_product_comparison(self):
+        repository = SlowRepository()
+
+        analysis = asyncio.run(RankingAnalyzer(repository).analyze_product_across_marketplaces("kettle", MARKETPLACES))
+
+        self.assertEqual(analysis["marketplaces_analyzed"], 3)
+        self.assertEqual(repository.max_in_flight, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
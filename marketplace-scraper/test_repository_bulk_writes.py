@@ -0,0 +1,340 @@
+"""
+Unit tests for the bulk write API of the marketplace data repository.
+
+Runs the repository against an in-memory client that counts round-trips, to
+check that bulk saves store the same documents as saving products one by one
+while committing them in a few batches of bounded size.
+"""
+
+import asyncio
+import itertools
+import operator
+import unittest
+from types import SimpleNamespace
+
+from src.storage.repository import MarketplaceDataRepository, MAX_BATCH_WRITES, firestore
+from src.marketplaces.takealot.takealot_scraper import TakealotScraper
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+def _apply(documents, doc_id, data, merge=False):
+    """Apply a set to stored documents, resolving server-side increments and array changes."""
+    stored = dict(documents.get(doc_id) or {}) if merge else {}
+    for key, value in data.items():
+        if isinstance(value, firestore.Increment):
+            value = stored.get(key, 0) + value.value
+        elif isinstance(value, firestore.ArrayUnion):
+            value = list(stored.get(key, [])) + [item for item in value.values if item not in stored.get(key, [])]
+        elif isinstance(value, firestore.ArrayRemove):
+            value = [item for item in stored.get(key, []) if item not in value.values]
+        stored[key] = value
+    documents[doc_id] = stored
+
+
+class FakeAggregationResult:
+    def __init__(self, value):
+        self.value = value
+
+
+_OPERATORS = {"==": operator.eq, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+class FakeQuery:
+    """Query filtering documents by field comparisons."""
+
+    def __init__(self, client, collection, filters=(), limit=None, order=None, start_after=None):
+        self.client = client
+        self.collection = collection
+        self.filters = filters
+        self._limit = limit
+        self._order = order
+        self._start_after = start_after
+
+    def _copy(self, **changes):
+        fields = dict(filters=self.filters, limit=self._limit, order=self._order, start_after=self._start_after)
+        fields.update(changes)
+        return FakeQuery(self.client, self.collection, **fields)
+
+    def where(self, filter):
+        return self._copy(filters=self.filters + (filter,))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._copy(order=(field, direction))
+
+    def start_after(self, values):
+        return self._copy(start_after=values)
+
+    def _matches(self):
+        matches = [
+            (doc_id, data) for doc_id, data in self.client.data[self.collection].items()
+            if all(f.field_path in data and _OPERATORS[f.op_string](data[f.field_path], f.value)
+                   for f in self.filters)
+        ]
+        if self._order:
+            field, direction = self._order
+            matches.sort(key=lambda match: match[1][field], reverse=direction == "DESCENDING")
+            if self._start_after is not None:
+                cursor = self._start_after[field]
+                matches = [match for match in matches
+                           if (match[1][field] < cursor if direction == "DESCENDING" else match[1][field] > cursor)]
+        return matches[:self._limit] if self._limit is not None else matches
+
+    async def stream(self):
+        self.client.round_trips += 1
+        for doc_id, data in self._matches():
+            self.client.streamed += 1
+            yield FakeSnapshot(doc_id, data)
+
+    def count(self, alias=None):
+        query = self
+
+        class Aggregation:
+            async def get(self):
+                query.client.round_trips += 1
+                query.client.aggregations += 1
+                return [[FakeAggregationResult(len(query._matches()))]]
+
+        return Aggregation()
+
+
+class FakeDocument:
+    def __init__(self, client, collection, doc_id):
+        self.client = client
+        self.collection = collection
+        self.id = doc_id
+
+    async def get(self):
+        self.client.round_trips += 1
+        return FakeSnapshot(self.id, self.client.data[self.collection].get(self.id))
+
+    async def set(self, data):
+        self.client.round_trips += 1
+        self.client.data[self.collection][self.id] = dict(data)
+
+    async def update(self, data):
+        self.client.round_trips += 1
+        self.client.updates.append(dict(data))
+        self.client.data[self.collection][self.id].update(data)
+
+    async def delete(self):
+        self.client.round_trips += 1
+        self.client.data[self.collection].pop(self.id, None)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.name = name
+
+    def document(self, doc_id=None):
+        return FakeDocument(self.client, self.name, doc_id or f"auto_{next(self.client.ids)}")
+
+    async def add(self, data):
+        doc_ref = self.document()
+        await doc_ref.set(data)
+        return doc_ref, None
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, doc_ref, data, merge=False):
+        self.writes.append(("merge" if merge else "set", doc_ref, data))
+
+    def update(self, doc_ref, data):
+        self.writes.append(("update", doc_ref, data))
+
+    def delete(self, doc_ref):
+        self.writes.append(("delete", doc_ref, None))
+
+    async def commit(self):
+        self.client.round_trips += 1
+        self.client.batch_sizes.append(len(self.writes))
+        if self.client.fail_commits:
+            self.client.fail_commits -= 1
+            raise RuntimeError("commit failed")
+
+        for operation, doc_ref, data in self.writes:
+            documents = self.client.data[doc_ref.collection]
+            if operation == "update":
+                if doc_ref.id not in documents:
+                    raise RuntimeError(f"No document to update: {doc_ref.id}")
+                _apply(documents, doc_ref.id, data, merge=True)
+            elif operation == "delete":
+                documents.pop(doc_ref.id, None)
+            else:
+                _apply(documents, doc_ref.id, data, merge=operation == "merge")
+
+
+class FakeClient:
+    """In-memory client counting round-trips to the database."""
+
+    def __init__(self, multi_get=True):
+        self.data = {}
+        self.ids = itertools.count()
+        self.round_trips = 0
+        self.batch_sizes = []
+        self.updates = []
+        self.fail_commits = 0
+        self.streamed = 0
+        self.aggregations = 0
+        if multi_get:
+            self.get_all = self._get_all
+
+    def collection(self, name):
+        self.data.setdefault(name, {})
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    async def _get_all(self, refs):
+        self.round_trips += 1
+        for ref in refs:
+            yield FakeSnapshot(ref.id, self.data[ref.collection].get(ref.id))
+
+
+def _product(index, price=100.0):
+    return {
+        "product_id": f"PLID{index}",
+        "marketplace": "takealot",
+        "title": f"Product {index}",
+        "price": price,
+        "in_stock": True,
+    }
+
+
+def _without_timestamps(documents):
+    return {
+        doc_id: {key: value for key, value in data.items() if key not in ("first_seen", "last_updated", "timestamp")}
+        for doc_id, data in documents.items()
+    }
+
+
+class RepositoryBulkWriteTest(unittest.TestCase):
+    """Tests for batched product and price point writes"""
+
+    def _repository(self, client):
+        repository = MarketplaceDataRepository(firestore_client=client)
+        repository.logger.disabled = True
+        return repository
+
+    def test_matches_single_saves(self):
+        single_client, bulk_client = FakeClient(), FakeClient()
+        single, bulk = self._repository(single_client), self._repository(bulk_client)
+
+        for run in range(2):
+            products = [_product(i, price=100.0 + run * (i % 3)) for i in range(50)]
+            for product in products:
+                asyncio.run(single.save_product(dict(product)))
+            results = asyncio.run(bulk.save_products_bulk([dict(product) for product in products]))
+
+            self.assertTrue(all(result["error"] is None for result in results))
+            self.assertEqual([result["doc_id"] for result in results], [f"takealot_PLID{i}" for i in range(50)])
+
+        self.assertEqual(_without_timestamps(bulk_client.data["marketplace_products"]),
+                         _without_timestamps(single_client.data["marketplace_products"]))
+        self.assertEqual(sorted(_without_timestamps(bulk_client.data["product_prices"]).values(), key=repr),
+                         sorted(_without_timestamps(single_client.data["product_prices"]).values(), key=repr))
+
+    def test_round_trips_and_batch_size(self):
+        client = FakeClient()
+        repository = self._repository(client)
+
+        results = asyncio.run(repository.save_products_bulk([_product(i) for i in range(600)]))
+
+        self.assertEqual(len(results), 600)
+        self.assertEqual(len(client.data["marketplace_products"]), 600)
+        self.assertEqual(len(client.data["product_prices"]), 600)
+        self.assertTrue(all(size <= MAX_BATCH_WRITES for size in client.batch_sizes))
+        # Each batch also counts its new products in one counter write
+        self.assertEqual(sum(client.batch_sizes), 1203)
+        # Two chunked reads and three commits
+        self.assertEqual(client.round_trips, 5)
+
+    def test_single_reads_without_multi_get(self):
+        client = FakeClient(multi_get=False)
+        repository = self._repository(client)
+
+        results = asyncio.run(repository.save_products_bulk([_product(i) for i in range(10)]))
+
+        self.assertTrue(all(result["error"] is None for result in results))
+        self.assertEqual(len(client.data["marketplace_products"]), 10)
+
+    def test_per_item_errors(self):
+        client = FakeClient()
+        repository = self._repository(client)
+        products = [_product(0), {"product_id": "PLID1"}, _product(2)]
+
+        results = asyncio.run(repository.save_products_bulk(products))
+
+        self.assertEqual(results[1], {"doc_id": None, "error": "marketplace is required"})
+        self.assertIsNone(results[0]["error"])
+        self.assertIsNone(results[2]["error"])
+
+        client.fail_commits = 1
+        results = asyncio.run(repository.save_products_bulk([_product(3, price=5.0)]))
+
+        self.assertEqual(results, [{"doc_id": None, "error": "commit failed"}])
+        self.assertNotIn("takealot_PLID3", client.data["marketplace_products"])
+
+    def test_duplicate_products(self):
+        client = FakeClient()
+        repository = self._repository(client)
+
+        results = asyncio.run(repository.save_products_bulk([_product(0, price=10.0), _product(0, price=12.0)]))
+
+        self.assertEqual([result["doc_id"] for result in results], ["takealot_PLID0", "takealot_PLID0"])
+        self.assertEqual(client.data["marketplace_products"]["takealot_PLID0"]["price"], 12.0)
+        self.assertEqual(sorted(p["price"] for p in client.data["product_prices"].values()), [10.0, 12.0])
+
+    def test_save_price_points_bulk(self):
+        client = FakeClient()
+        repository = self._repository(client)
+        price_points = [{"product_id": f"PLID{i}", "marketplace": "loot", "price": float(i)} for i in range(700)]
+        price_points.append({"product_id": "PLID700", "marketplace": "loot"})
+
+        results = asyncio.run(repository.save_price_points_bulk(price_points, max_concurrency=2))
+
+        self.assertEqual(results[-1], {"doc_id": None, "error": "price is required"})
+        self.assertEqual(len(client.data["product_prices"]), 700)
+        self.assertEqual(client.batch_sizes, [500, 200])
+        self.assertEqual({result["doc_id"] for result in results[:-1]}, set(client.data["product_prices"]))
+
+    def test_scraper_reports_failed_saves(self):
+        client = FakeClient()
+        proxy_client = SimpleNamespace(GENERIC_TEMPLATES={"ecommerce": "ecommerce"})
+        scraper = TakealotScraper(proxy_client=proxy_client, storage_client=self._repository(client))
+        scraper.logger.disabled = True
+        client.fail_commits = 1
+
+        saved = asyncio.run(scraper.save_products_bulk([_product(0), {"product_id": "PLID1"}]))
+
+        self.assertEqual(saved, [])
+        self.assertEqual(scraper.get_statistics()["failed_saves"], 2)
+
+        saved = asyncio.run(scraper.save_products_bulk([_product(0)]))
+
+        self.assertEqual(saved, ["takealot_PLID0"])
+        self.assertEqual(scraper.failed_saves, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for combined search page analysis.
+
+Checks that analyzing a search page parses it once and returns the same
+search results and ranking data as the separate extractors, and that seller
+and sponsored checks only look at each product's own card.
+"""
+
+import logging
+import os
+import unittest
+from unittest import mock
+
+from src.common.extractors import search_ranking_extractor as ranking_base
+from src.marketplaces.takealot.extractors import search_extractor as takealot_search
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+from src.marketplaces.makro.extractors import search_extractor as makro_search
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+
+def _load_fixture(marketplace: str, page_type: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, f'{page_type}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _strip_timestamps(data):
+    """Drop extraction timestamps so results can be compared."""
+    if isinstance(data, dict):
+        return {key: _strip_timestamps(value) for key, value in data.items() if key != "timestamp"}
+    if isinstance(data, list):
+        return [_strip_timestamps(item) for item in data]
+    return data
+
+
+class SearchPageAnalysisTest(unittest.TestCase):
+    """Tests for combined search results and ranking extraction"""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_matches_separate_extractors(self):
+        """Test that one analysis equals the search and ranking extractors"""
+        cases = [
+            ("takealot", TakealotSearchRankingExtractor(), takealot_search),
+            ("loot", LootSearchRankingExtractor(), loot_search),
+            ("makro", MakroSearchRankingExtractor(), makro_search),
+        ]
+        for marketplace, extractor, search_module in cases:
+            html_content = _load_fixture(marketplace, "search")
+            analysis = extractor.analyze_search_page(html_content, "kettle")
+
+            self.assertEqual(_strip_timestamps(analysis["search_results"]),
+                             _strip_timestamps(search_module.extract_search_results(html_content, "kettle")),
+                             marketplace)
+            self.assertEqual(analysis["ranking"], extractor.extract_search_ranking_data(html_content, "kettle"),
+                             marketplace)
+            self.assertTrue(analysis["search_results"]["results"], marketplace)
+
+    def test_page_is_parsed_once(self):
+        """Test that search results and ranking share one parse tree"""
+        html_content = _load_fixture("loot", "search")
+        parse_calls = []
+
+        def counting_parse(content, *args, **kwargs):
+            parse_calls.append(content)
+            return real_parse(content, *args, **kwargs)
+
+        real_parse = ranking_base.parse_html
+        with mock.patch.object(ranking_base, "parse_html", counting_parse), \
+                mock.patch.object(loot_search, "parse_html", counting_parse):
+            LootSearchRankingExtractor().analyze_search_page(html_content, "kettle")
+
+        self.assertEqual(len(parse_calls), 1)
+
+    def test_sponsored_checks_use_product_card(self):
+        """Test that one featured card does not mark the whole page sponsored"""
+        extractor = LootSearchRankingExtractor()
+        html_content = _load_fixture("loot", "search")
+
+        # The fixture has one promoted card and one bestseller badge
+        ranking = extractor.analyze_search_page(html_content, "kettle")["ranking"]
+        sponsored = [product.get("sponsored", False) for product in ranking["top_ranked_products"]]
+        self.assertEqual(sum(sponsored), 2)
+        self.assertFalse(sponsored[0])
+
+        html_content = html_content.replace(
+            'class="product product-list-item"', 'class="product product-list-item featured-product"', 1
+        )
+        ranking = extractor.analyze_search_page(html_content, "kettle")["ranking"]
+        sponsored = [product.get("sponsored", False) for product in ranking["top_ranked_products"]]
+        self.assertEqual(sum(sponsored), 3)
+        self.assertTrue(sponsored[0])
+
+        for product in ranking["top_ranked_products"]:
+            self.assertNotIn(ranking_base.PRODUCT_ELEMENT_KEY, product)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for delta-encoded search ranking snapshots.
+
+Checks that deltas reconstruct the rankings they encode, that refreshes are
+stored as small deltas between periodic keyframes, and that search history
+is rebuilt from the latest snapshots and the keyframe before them.
+"""
+
+import asyncio
+import random
+import unittest
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.search_snapshots import (
+    KEYFRAME_INTERVAL,
+    ranking_rows,
+    diff_rows,
+    apply_delta,
+    delta_size
+)
+from test_repository_bulk_writes import FakeClient
+
+
+def _results(product_ids, price=100.0):
+    return [{"product_id": product_id, "title": f"Product {product_id}", "price": price} for product_id in product_ids]
+
+
+def _refreshes(count, seed=7):
+    """Result lists of successive refreshes, each moving a few products."""
+    rng = random.Random(seed)
+    product_ids = [f"PLID{i}" for i in range(50)]
+    next_id = 50
+    refreshes = []
+    for _ in range(count):
+        first, second = rng.sample(range(len(product_ids)), 2)
+        product_ids[first], product_ids[second] = product_ids[second], product_ids[first]
+        product_ids[rng.randrange(len(product_ids))] = f"PLID{next_id}"
+        next_id += 1
+        refreshes.append(_results(product_ids))
+    return refreshes
+
+
+class SearchSnapshotTest(unittest.TestCase):
+    """Tests for storing search results as snapshot deltas"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = self._repository()
+
+    def _repository(self):
+        repository = MarketplaceDataRepository(firestore_client=self.client)
+        repository.logger.disabled = True
+        return repository
+
+    def _save(self, results, repository=None, keyword="kettle"):
+        return asyncio.run((repository or self.repository).save_search_results(
+            {"keyword": keyword, "marketplace": "takealot", "results": results}
+        ))
+
+    def _history(self, limit=10, repository=None):
+        return asyncio.run((repository or self.repository).get_search_history("takealot", "kettle", limit))
+
+    def _snapshots(self):
+        return self.client.data["search_snapshots"]
+
+    def test_deltas_reconstruct_rankings(self):
+        rng = random.Random(3)
+        previous = ranking_rows(_results([f"PLID{i}" for i in range(20)]))
+        for _ in range(50):
+            results = [dict(row) for row in previous]
+            rng.shuffle(results)
+            results = results[:rng.randint(10, 20)] + _results([f"NEW{rng.randint(0, 30)}"])
+            for result in rng.sample(results, 3):
+                result["price"] = rng.choice([50.0, 75.0])
+                result.pop("title", None)
+            # Products can be listed more than once
+            results.append(dict(results[0]))
+
+            current = ranking_rows(results)
+            self.assertEqual(apply_delta(previous, diff_rows(previous, current)), current)
+            previous = current
+
+    def test_delta_encodes_changes_only(self):
+        previous = ranking_rows(_results(["A", "B", "C", "D"]))
+        current = ranking_rows(_results(["B", "A", "C", "E"]))
+
+        delta = diff_rows(previous, current)
+
+        self.assertEqual([entered["key"] for entered in delta["entered"]], ["E"])
+        self.assertEqual(delta["exited"], ["D"])
+        self.assertEqual(delta["updated"], [{"key": "B", "position": 1}, {"key": "A", "position": 2}])
+        self.assertEqual(delta_size(delta), 4)
+
+    def test_refreshes_stored_as_deltas_between_keyframes(self):
+        refreshes = _refreshes(KEYFRAME_INTERVAL + 2)
+        for results in refreshes:
+            self._save(results)
+
+        snapshots = [self._snapshots()[doc_id] for doc_id in sorted(self._snapshots())]
+        keyframes = [snapshot["sequence"] for snapshot in snapshots if "results" in snapshot]
+        self.assertEqual(keyframes, [1, KEYFRAME_INTERVAL + 1])
+        self.assertTrue(all(delta_size(snapshot["delta"]) <= 4 for snapshot in snapshots if "delta" in snapshot))
+
+        # The keyword document points at the latest snapshot without repeating its rows
+        head = self.client.data["search_keywords"]["takealot_kettle"]
+        self.assertEqual(head["snapshot_sequence"], KEYFRAME_INTERVAL + 2)
+        self.assertNotIn("results", head)
+
+    def test_history_rebuilt_from_keyframe(self):
+        refreshes = _refreshes(8)
+        for results in refreshes:
+            self._save(results)
+
+        round_trips = self.client.round_trips
+        history = self._history(limit=3)
+
+        self.assertEqual([snapshot["sequence"] for snapshot in history], [8, 7, 6])
+        self.assertEqual([snapshot["results"] for snapshot in history],
+                         [ranking_rows(results) for results in reversed(refreshes[-3:])])
+        self.assertNotIn("delta", history[0])
+        # One query for the latest snapshots and one read back to their keyframe
+        self.assertEqual(self.client.round_trips, round_trips + 2)
+
+    def test_large_changes_stored_as_keyframes(self):
+        self._save(_results(["A", "B", "C", "D"]))
+        self._save(_results(["A", "B", "C", "E"]))
+        self._save(_results(["W", "X", "Y", "Z"]))
+
+        self.assertEqual(["results" in self._snapshots()[f"takealot_kettle_{n:08d}"] for n in (1, 2, 3)],
+                         [True, False, True])
+
+    def test_fresh_repository_continues_history(self):
+        refreshes = _refreshes(4)
+        for results in refreshes[:3]:
+            self._save(results)
+
+        # Without a cache the latest rankings are rebuilt to encode the next delta
+        repository = self._repository()
+        self._save(refreshes[3], repository)
+
+        latest = self._snapshots()["takealot_kettle_00000004"]
+        self.assertIn("delta", latest)
+        self.assertEqual(self._history(limit=1)[0]["results"], ranking_rows(refreshes[3]))
+
+    def test_keywords_saved_before_snapshots(self):
+        legacy = {"keyword": "kettle", "marketplace": "takealot", "result_count": 1,
+                  "results": ranking_rows(_results(["A"]))}
+        self.client.data["search_keywords"]["takealot_kettle"] = legacy
+
+        self.assertEqual(self._history(), [legacy])
+
+        self._save(_results(["A", "B"]))
+        self.assertEqual([snapshot["sequence"] for snapshot in self._history()], [1])
+        self.assertIn("results", self._snapshots()["takealot_kettle_00000001"])
+
+    def test_delete_removes_history(self):
+        for results in _refreshes(3):
+            self._save(results)
+        self._save(_results(["A"]), keyword="toaster")
+
+        self.assertTrue(asyncio.run(self.repository.delete_search_results("takealot", "kettle")))
+
+        self.assertEqual(list(self._snapshots()), ["takealot_toaster_00000001"])
+        self._save(_results(["A"]))
+        self.assertEqual([snapshot["sequence"] for snapshot in self._history()], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the single-pass selector plan.
+
+Checks that a compiled SelectorPlan locates the same elements as one
+`select` per field, and that the plan-based product extractors still
+produce the expected fields for the saved HTML fixtures.
+"""
+
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+from src.common.extractors.selector_plan import SelectorPlan
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.loot.extractors import product_extractor as loot_product
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+SAMPLE_HTML = """
+<div class="list">
+  <a class="crumb" href="/">Home</a>
+  <a class="crumb" href="/brand/acme">Acme</a>
+  <div class="card"><span class="price">R10</span><button class="buy disabled">x</button></div>
+  <div class="card"><div class="inner"><span class="price">R20</span></div><button class="buy">y</button></div>
+  <span class="price">R30</span>
+  <p class="out-of-stock">gone</p><p class="unavailable">none</p>
+</div>
+"""
+
+
+def _load_fixture(marketplace: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, 'product.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+class SelectorPlanTest(unittest.TestCase):
+    """Tests for SelectorPlan"""
+
+    def assertSameMatches(self, plan, soup):
+        single = plan.match(soup).as_dict()
+        multi = plan.match_each(soup).as_dict()
+        for field in plan.fields:
+            self.assertEqual([id(e) for e in single[field]], [id(e) for e in multi[field]], field)
+
+    def test_selector_features_match_select(self):
+        """Test descendant, attribute, :not and list selectors"""
+        plan = SelectorPlan({
+            "card_prices": ".card .price",
+            "all_prices": ".price",
+            "nested": ".list .card .inner span",
+            "brand": 'a.crumb[href*="/brand/"]',
+            "enabled": ".buy:not(.disabled)",
+            "stock": ".out-of-stock, .unavailable",
+            "missing": ".does-not-exist",
+        })
+        soup = BeautifulSoup(SAMPLE_HTML, 'html.parser')
+        self.assertSameMatches(plan, soup)
+
+        matches = plan.match(soup)
+        self.assertEqual(len(matches.all("card_prices")), 2)
+        self.assertEqual(matches.first("brand").text, "Acme")
+        self.assertEqual(matches.first("enabled").text, "y")
+        self.assertIsNone(matches.first("missing"))
+
+    def test_unsupported_selector_raises(self):
+        """Test that unsupported syntax fails at compile time"""
+        with self.assertRaises(ValueError):
+            SelectorPlan({"child": ".a > .b"})
+
+    def test_product_plans_match_select_on_fixtures(self):
+        """Test marketplace plans against saved fixtures"""
+        for marketplace, module in [("takealot", takealot_product), ("loot", loot_product)]:
+            soup = BeautifulSoup(_load_fixture(marketplace), 'html.parser')
+            self.assertSameMatches(module.PRODUCT_PLAN, soup)
+
+    def test_takealot_product_fields(self):
+        """Test Takealot product extraction from fixture"""
+        product = takealot_product.extract_product_details(
+            _load_fixture("takealot"),
+            "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234"
+        )
+        self.assertEqual(product["product_id"], "90001234")
+        self.assertEqual(product["price"], 1299.0)
+        self.assertEqual(product["list_price"], 1899.0)
+        self.assertEqual(product["brand"], "Acme Audio")
+        self.assertEqual(product["categories"], ["Electronics", "Audio", "Portable Speakers"])
+        self.assertEqual(product["promotion"], "Daily Deal")
+        self.assertEqual(len(product["variants"]), 5)
+
+    def test_loot_product_fields(self):
+        """Test Loot product extraction from fixture"""
+        product = loot_product.extract_product_details(
+            _load_fixture("loot"),
+            "https://www.loot.co.za/product/the-long-road/lt-5001"
+        )
+        self.assertEqual(product["product_id"], "lt-5001")
+        self.assertEqual(product["price"], 289.0)
+        self.assertEqual(product["brand"], "Northwind Press")
+        self.assertEqual(product["rating"], 4.2)
+        self.assertTrue(product["in_stock"])
+        self.assertEqual(product["promotion"], "Save 20%")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+Unit tests for the SQLite repository.
+
+Runs the repository on a temporary database, checking products, prices,
+search history and categories against the Firestore repository's behaviour,
+and that keyword ranking filters, ordering and limits are translated to
+indexed SQL queries.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.storage.repository import MarketplaceDataRepository, filter_conditions
+from src.storage.sqlite_repository import SQLiteRepository
+from src.storage.write_behind import WriteBehindRepository
+from test_repository_bulk_writes import FakeClient, _product
+
+
+def _keyword(index, marketplace="takealot", **fields):
+    entry = {
+        "keyword_id": f"{marketplace}_keyword {index}",
+        "marketplace": marketplace,
+        "keyword": f"keyword {index}",
+        "tracking_enabled": True,
+        "priority": index % 10 + 1,
+        "last_updated": (datetime(2026, 10, 1) + timedelta(hours=index)).isoformat(),
+        "categories": ["kitchen"] if index % 2 else ["garden", "outdoor"],
+        "history": []
+    }
+    entry.update(fields)
+    return entry
+
+
+class SQLiteRepositoryTest(unittest.TestCase):
+    """Tests for the SQLite repository backend"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "marketplace.db")
+        self.repository = SQLiteRepository(self.path)
+        self.repository.logger.disabled = True
+
+    def tearDown(self):
+        self.repository.close()
+        self.directory.cleanup()
+
+    def _run(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_wal_mode(self):
+        mode = self.repository.executor.submit(
+            lambda: self.repository.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        ).result()
+        self.assertEqual(mode, "wal")
+
+    def test_products_and_prices(self):
+        products = [_product(i) for i in range(30)] + [_product(0, price=80.0), {"marketplace": "takealot"}]
+
+        results = self._run(self.repository.save_products_bulk(products))
+
+        self.assertEqual(results[0]["doc_id"], "takealot_PLID0")
+        self.assertEqual(results[-1], {"doc_id": None, "error": "product_id is required"})
+        product = self._run(self.repository.get_product("takealot", "PLID0"))
+        self.assertEqual((product["price"], product["update_count"]), (80.0, 1))
+        self.assertIsInstance(product["first_seen"], datetime)
+
+        # Unchanged products are not written again; changed ones count an update
+        self._run(self.repository.save_products_bulk([_product(1), _product(2, price=50.0)]))
+        self.assertEqual(self.repository.get_write_stats()["writes_avoided"], 1)
+        self.assertEqual(self._run(self.repository.get_product("takealot", "PLID2"))["update_count"], 2)
+
+        history = self._run(self.repository.get_price_history("takealot", "PLID0"))
+        self.assertEqual([point["price"] for point in history], [100.0, 80.0])
+        self.assertIsInstance(history[0]["timestamp"], datetime)
+
+        results = self._run(self.repository.save_price_points_bulk([
+            {"product_id": "PLID5", "marketplace": "takealot", "price": 10.0}, {"product_id": "PLID5"}
+        ]))
+        self.assertIsNotNone(results[0]["doc_id"])
+        self.assertEqual(results[1]["error"], "marketplace is required")
+
+        stats = self._run(self.repository.get_marketplace_stats("takealot"))
+        self.assertEqual((stats["product_count"], stats["category_count"], stats["keyword_count"]), (30, 0, 0))
+
+        self.assertTrue(self._run(self.repository.delete_product("takealot", "PLID0")))
+        self.assertFalse(self._run(self.repository.delete_product("takealot", "PLID0")))
+
+    def test_failed_batch_rolls_back(self):
+        products = [_product(0), dict(_product(1), price=object())]
+
+        results = self._run(self.repository.save_products_bulk(products))
+
+        self.assertTrue(all(result["error"] for result in results))
+        self.assertIsNone(self._run(self.repository.get_product("takealot", "PLID0")))
+        self.assertEqual(self._run(self.repository.get_price_history("takealot", "PLID0")), [])
+
+    def test_search_history_and_categories(self):
+        for count in (1, 2, 3):
+            self._run(self.repository.save_search_results(
+                {"keyword": "kettle", "marketplace": "takealot", "results": [{"product_id": "A"}] * count}
+            ))
+        self._run(self.repository.save_category({"category_id": "home", "marketplace": "takealot", "name": "Home"}))
+        self._run(self.repository.save_category({"category_id": "home", "marketplace": "takealot", "name": "Homeware"}))
+
+        history = self._run(self.repository.get_search_history("takealot", "kettle", limit=2))
+        self.assertEqual([snapshot["result_count"] for snapshot in history], [3, 2])
+        self.assertEqual(history[0]["results"][2], {"position": 3, "product_id": "A"})
+
+        category = self._run(self.repository.get_category("takealot", "home"))
+        self.assertEqual(category["name"], "Homeware")
+        self.assertIn("first_seen", category)
+
+        stats = self._run(self.repository.get_marketplace_stats("takealot"))
+        self.assertEqual((stats["category_count"], stats["keyword_count"]), (1, 1))
+
+        self.assertTrue(self._run(self.repository.delete_search_results("takealot", "kettle")))
+        self.assertEqual(self._run(self.repository.get_search_history("takealot", "kettle")), [])
+
+    def test_keyword_rankings(self):
+        for index in range(40):
+            self._run(self.repository.create_keyword_ranking(_keyword(index)))
+        self._run(self.repository.create_keyword_ranking(_keyword(0, marketplace="loot", tracking_enabled=False)))
+
+        self._run(self.repository.update_keyword_ranking("takealot_keyword 3", {"priority": 10, "trend": "rising"}))
+        entry = self._run(self.repository.get_keyword_ranking("takealot_keyword 3"))
+        self.assertEqual((entry["priority"], entry["trend"], entry["keyword"]), (10, "rising", "keyword 3"))
+        self.assertIsNone(self._run(self.repository.get_keyword_ranking("takealot_missing")))
+        with self.assertRaises(ValueError):
+            self._run(self.repository.update_keyword_ranking("takealot_missing", {"priority": 1}))
+
+        top = self._run(self.repository.get_keyword_rankings(
+            filters={"marketplace": "takealot", "tracking_enabled": True, "priority": {">=": 9}},
+            limit=3, order_by="priority", order_direction="desc"
+        ))
+        self.assertEqual([keyword["priority"] for keyword in top], [10, 10, 10])
+
+        due = self._run(self.repository.get_keyword_rankings(
+            filters={"tracking_enabled": True, "last_updated": {"<": datetime(2026, 10, 1, 5)}},
+            limit=100, order_by="last_updated"
+        ))
+        self.assertEqual([keyword["keyword"] for keyword in due], [f"keyword {i}" for i in range(5)])
+
+        kitchen = self._run(self.repository.get_keyword_rankings(filters={"categories": "kitchen"}, limit=100))
+        self.assertEqual(len(kitchen), 20)
+
+        inactive = self._run(self.repository.get_keyword_rankings(filters={"tracking_enabled": False}))
+        self.assertEqual([keyword["marketplace"] for keyword in inactive], ["loot"])
+
+        # Fields missing from an entry never match a comparison or order
+        self.assertEqual(self._run(self.repository.get_keyword_rankings(filters={"trend": {"!=": "falling"}})),
+                         [entry])
+        self.assertEqual(len(self._run(self.repository.get_keyword_rankings(order_by="trend"))), 1)
+
+        with self.assertRaises(ValueError):
+            self._run(self.repository.get_keyword_rankings(filters={"priority": {"~": 1}}))
+        with self.assertRaises(ValueError):
+            self._run(self.repository.get_keyword_rankings(order_by="priority); DROP TABLE products; --"))
+
+    def test_keyword_queries_use_indexes(self):
+        statement, parameters = self.repository._ranking_query(
+            {"marketplace": "takealot", "tracking_enabled": True, "priority": {">=": 5}}, 10, "priority", "desc"
+        )
+        plan = self.repository.executor.submit(
+            lambda: " ".join(row[3] for row in self.repository.connection.execute(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ))
+        ).result()
+
+        self.assertIn("USING INDEX keyword_rankings_priority", plan)
+
+    def test_write_behind(self):
+        async def run():
+            buffer = WriteBehindRepository(self.repository, flush_interval=60)
+            for price in (100.0, 90.0):
+                await buffer.save_product(_product(0, price=price))
+            await buffer.close()
+
+        self._run(run())
+
+        product = self._run(self.repository.get_product("takealot", "PLID0"))
+        self.assertEqual(product["price"], 90.0)
+
+    def test_reopened_database_keeps_data(self):
+        self._run(self.repository.save_product(_product(0)))
+        self.repository.close()
+
+        self.repository = SQLiteRepository(self.path)
+        self.repository.logger.disabled = True
+        self.assertEqual(self._run(self.repository.get_product("takealot", "PLID0"))["title"], "Product 0")
+
+
+class FirestoreKeywordRankingTest(unittest.TestCase):
+    """Tests for the keyword ranking methods of the Firestore repository"""
+
+    def test_keyword_rankings(self):
+        client = FakeClient()
+        repository = MarketplaceDataRepository(firestore_client=client)
+        repository.logger.disabled = True
+
+        for index in range(10):
+            asyncio.run(repository.create_keyword_ranking(_keyword(index)))
+        asyncio.run(repository.update_keyword_ranking("takealot_keyword 3", {"priority": 10}))
+
+        self.assertEqual(asyncio.run(repository.get_keyword_ranking("takealot_keyword 3"))["priority"], 10)
+        top = asyncio.run(repository.get_keyword_rankings(
+            filters={"tracking_enabled": True, "priority": {">=": 9}}, limit=2,
+            order_by="priority", order_direction="desc"
+        ))
+        self.assertEqual([keyword["keyword"] for keyword in top], ["keyword 3", "keyword 9"])
+
+    def test_filter_conditions(self):
+        self.assertEqual(
+            filter_conditions({"categories": "kitchen", "priority": {">=": 2, "<": 5}}),
+            [("categories", "array_contains", "kitchen"), ("priority", ">=", 2), ("priority", "<", 5)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for streaming search page extraction.
+
+Checks that product cards are located in the raw HTML like a full parse
+would find them, and that ranking and search extraction stop parsing cards
+once the depth or result limit is reached without changing their output.
+"""
+
+import logging
+import os
+import unittest
+from unittest import mock
+
+from src.common.extractors.html_parser import parse_html
+from src.common.extractors.streaming import ElementStream
+from src.marketplaces.takealot.extractors import search_extractor as takealot_search
+from src.marketplaces.takealot.extractors.search_ranking_extractor import TakealotSearchRankingExtractor
+from src.marketplaces.loot.extractors import search_extractor as loot_search
+from src.marketplaces.loot.extractors.search_ranking_extractor import LootSearchRankingExtractor
+from src.marketplaces.makro.extractors import search_extractor as makro_search
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+
+def _load_fixture(marketplace: str, page_type: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, f'{page_type}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _strip_timestamps(data):
+    """Drop extraction timestamps so results can be compared."""
+    if isinstance(data, dict):
+        return {key: _strip_timestamps(value) for key, value in data.items() if key != "timestamp"}
+    if isinstance(data, list):
+        return [_strip_timestamps(item) for item in data]
+    return data
+
+
+class ElementStreamTest(unittest.TestCase):
+    """Tests for locating repeated elements in raw HTML"""
+
+    def test_matches_full_parse(self):
+        """Test that streamed cards equal the cards of a full parse"""
+        cases = [
+            ("takealot", "product-card"),
+            ("loot", "product product-list-item"),
+            ("makro", "product-item"),
+        ]
+        for marketplace, class_name in cases:
+            html_content = _load_fixture(marketplace, "search")
+            full = parse_html(html_content).select("." + ".".join(class_name.split()))
+            streamed = list(ElementStream(html_content, class_name))
+
+            self.assertEqual(len(streamed), len(full), marketplace)
+            self.assertEqual([str(card) for card in streamed], [str(card) for card in full], marketplace)
+
+    def test_nested_elements_and_scripts(self):
+        """Test that nested matches and script contents are not reported"""
+        html_content = (
+            '<div><script>var card = "<div class=\\"card\\">";</script>'
+            '<div class="card x"><div class="card">inner</div><script>"<div class=card>"</script></div>'
+            '<p class=card>second</p><span title="card">no</span><div class="cards">no</div></div>'
+        )
+        stream = ElementStream(html_content, "card")
+
+        self.assertEqual([html_content[start:end] for start, end in stream.spans], [
+            '<div class="card x"><div class="card">inner</div><script>"<div class=card>"</script></div>',
+            '<p class=card>second</p>',
+        ])
+        self.assertNotIn("second", stream.page.get_text())
+        self.assertIn("no", stream.page.get_text())
+        # Emptied elements can still be counted on the page
+        self.assertEqual(len(stream.page.select(".card")), 2)
+
+
+class StreamingExtractionTest(unittest.TestCase):
+    """Tests for depth and limit bounded extraction"""
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_ranking_matches_full_extraction(self):
+        """Test that streaming ranking extraction equals the full extraction"""
+        for extractor in (TakealotSearchRankingExtractor(), LootSearchRankingExtractor()):
+            html_content = _load_fixture(extractor.marketplace_name.lower(), "search")
+            for max_depth in (1, 3):
+                for page in (1, 2):
+                    self.assertEqual(
+                        extractor.extract_search_ranking_data(html_content, "kettle", page, max_depth,
+                                                              streaming=True),
+                        extractor.extract_search_ranking_data(html_content, "kettle", page, max_depth),
+                        (extractor.marketplace_name, max_depth, page)
+                    )
+
+    def test_ranking_without_result_count(self):
+        """Test that both modes agree on pages without a result count"""
+        class CountElementOnly(TakealotSearchRankingExtractor):
+            def _extract_total_results(self, soup):
+                return 0
+
+        html_content = _load_fixture("takealot", "search").replace('class="search-count"', 'class="summary"')
+
+        # Takealot falls back to counting product cards, the subclass reports no count
+        for extractor, expected in ((TakealotSearchRankingExtractor(), 24), (CountElementOnly(), 0)):
+            # The count is read without parsing the whole page
+            with mock.patch("src.common.extractors.search_ranking_extractor.parse_html") as full_parse:
+                streamed = extractor.extract_search_ranking_data(html_content, "kettle", streaming=True)
+            full_parse.assert_not_called()
+
+            self.assertEqual(streamed, extractor.extract_search_ranking_data(html_content, "kettle"))
+            self.assertEqual(streamed["current_results"], expected)
+
+    def test_search_limit_matches_truncated_results(self):
+        """Test that limited search results are a prefix of the full results"""
+        for marketplace, search_module in (("takealot", takealot_search), ("loot", loot_search),
+                                           ("makro", makro_search)):
+            html_content = _load_fixture(marketplace, "search")
+            full = _strip_timestamps(search_module.extract_search_results(html_content, "kettle"))
+            limited = _strip_timestamps(search_module.extract_search_results(html_content, "kettle", limit=5))
+
+            self.assertEqual(limited.pop("results"), full.pop("results")[:5], marketplace)
+
+            # Page-level data is unaffected by the limit
+            limited.pop("result_count")
+            full.pop("result_count")
+            self.assertEqual(limited, full, marketplace)
+
+    def test_stops_parsing_at_limit(self):
+        """Test that cards past the limit are never parsed"""
+        html_content = _load_fixture("takealot", "search")
+        stream = ElementStream(html_content, "product-card")
+
+        cards = list(stream.iter_elements(limit=3))
+
+        self.assertEqual(len(cards), 3)
+        self.assertEqual(stream.parsed_count, 3)
+        self.assertGreater(len(stream), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
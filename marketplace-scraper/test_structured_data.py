@@ -0,0 +1,159 @@
+"""
+Unit tests for the embedded structured data fast path.
+
+Checks JSON-LD and hydration state decoding from raw HTML, that extractors
+prefer structured data and only fall back to the DOM for missing fields, and
+that fast path statistics are recorded per marketplace.
+"""
+
+import json
+import logging
+import os
+import unittest
+
+from src.common.extractors.structured_data import (
+    iter_json_ld, find_json_ld, find_hydration_state,
+    get_structured_data_stats, reset_structured_data_stats
+)
+from src.marketplaces.takealot.extractors import product_extractor as takealot_product
+from src.marketplaces.makro.extractors import search_extractor as makro_search
+from src.marketplaces.makro.extractors.search_ranking_extractor import MakroSearchRankingExtractor
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+TAKEALOT_URL = "https://www.takealot.com/acme-audio-portable-bluetooth-speaker/PLID90001234"
+
+TAKEALOT_JSON_LD = [
+    {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": "Acme Audio Portable Bluetooth Speaker - Black",
+        "image": ["https://media.example.net/covers_images/abc0/s-pdpxl.jpg"],
+        "brand": {"@type": "Brand", "name": "Acme Audio"},
+        "offers": {"@type": "Offer", "price": "1299", "priceCurrency": "ZAR",
+                   "availability": "https://schema.org/InStock"},
+        "aggregateRating": {"@type": "AggregateRating", "ratingValue": "4.6", "reviewCount": "213"}
+    },
+    {
+        "@context": "https://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {"@type": "ListItem", "position": 1, "name": "Home", "item": "https://www.takealot.com/"},
+            {"@type": "ListItem", "position": 2, "name": "Electronics",
+             "item": "https://www.takealot.com/electronics/Categories/15"},
+            {"@type": "ListItem", "position": 3, "name": "Audio",
+             "item": "https://www.takealot.com/audio/Categories/2021"}
+        ]
+    }
+]
+
+
+def _load_fixture(marketplace: str, page_type: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, marketplace, f'{page_type}.html'), encoding='utf-8') as f:
+        return f.read()
+
+
+def _with_json_ld(html_content: str, data) -> str:
+    script = f'<script type="application/ld+json">{json.dumps(data)}</script>'
+    return html_content.replace('</head>', script + '\n</head>', 1)
+
+
+class StructuredDataTest(unittest.TestCase):
+    """Tests for the structured data fast path"""
+
+    def setUp(self):
+        reset_structured_data_stats()
+        logging.disable(logging.INFO)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_json_ld_blocks_are_flattened(self):
+        """Test arrays, @graph containers and malformed blocks"""
+        html_content = (
+            '<script type="application/ld+json">{not json}</script>'
+            '<script>var x = "<script type=application/ld+json>";</script>'
+            '<script type="application/ld+json">[{"@type": "BreadcrumbList"}, '
+            '{"@graph": [{"@type": ["Product", "Thing"], "name": "Kettle"}]}]</script>'
+        )
+        self.assertEqual([item["@type"] for item in iter_json_ld(html_content)],
+                         ["BreadcrumbList", ["Product", "Thing"]])
+        self.assertEqual(find_json_ld(html_content.encode("utf-8"), "Product")["name"], "Kettle")
+        self.assertIsNone(find_json_ld(html_content, "Offer"))
+
+    def test_hydration_state_decodes_nested_json(self):
+        """Test assignment and JSON script tag hydration state"""
+        html_content = (
+            '<script>window.__INITIAL_STATE__ = {"search": {"name": "a }; b", "items": [{"id": 1}]}};'
+            'window.other = 1;</script>'
+            '<script id="__NEXT_DATA__" type="application/json">{"props": {"page": 2}}</script>'
+        )
+        self.assertEqual(find_hydration_state(html_content, "__INITIAL_STATE__"),
+                         {"search": {"name": "a }; b", "items": [{"id": 1}]}})
+        self.assertEqual(find_hydration_state(html_content, "__NEXT_DATA__"), {"props": {"page": 2}})
+        self.assertIsNone(find_hydration_state("<p>__INITIAL_STATE__ is documented here</p>"))
+
+    def test_takealot_product_prefers_json_ld(self):
+        """Test structured fields agree with the DOM and DOM fills the rest"""
+        html_content = _load_fixture("takealot", "product")
+        dom_only = takealot_product.extract_product_details(html_content, TAKEALOT_URL)
+        combined = takealot_product.extract_product_details(_with_json_ld(html_content, TAKEALOT_JSON_LD), TAKEALOT_URL)
+
+        for key in ("title", "price", "currency", "brand", "rating", "review_count", "in_stock"):
+            self.assertEqual(combined[key], dom_only[key], key)
+        self.assertEqual(combined["categories"], ["Electronics", "Audio"])
+        self.assertEqual(combined["images"], TAKEALOT_JSON_LD[0]["image"])
+
+        # Fields without structured equivalents still come from the DOM
+        for key in ("specifications", "variants", "promotion", "list_price"):
+            self.assertEqual(combined.get(key), dom_only.get(key), key)
+
+    def test_takealot_product_skips_dom_when_covered(self):
+        """Test that a page fully covered by JSON-LD is never parsed"""
+        html_content = _with_json_ld("<html><head></head><body><div id='app'></div></body></html>", TAKEALOT_JSON_LD)
+        product = takealot_product.extract_product_details(html_content, TAKEALOT_URL)
+        self.assertEqual(product["price"], 1299.0)
+
+        stats = get_structured_data_stats("takealot")["product"]
+        self.assertEqual(stats["structured_hits"], 1)
+        self.assertEqual(stats["dom_skipped"], 1)
+
+    def test_makro_ranking_structured_matches_dom(self):
+        """Test Makro ranking from hydration state against the DOM path"""
+        html_content = _load_fixture("makro", "search")
+        extractor = MakroSearchRankingExtractor()
+
+        structured = extractor.extract_search_ranking_data(html_content, "kettle")
+        dom = extractor.extract_search_ranking_data(html_content.replace("__INITIAL_STATE__", "__DISABLED__"), "kettle")
+
+        self.assertEqual(structured["current_results"], dom["current_results"])
+        self.assertEqual(len(structured["top_ranked_products"]), 24)
+        for fast, slow in zip(structured["top_ranked_products"], dom["top_ranked_products"]):
+            for key, value in slow.items():
+                self.assertEqual(fast.get(key), value, key)
+
+        stats = get_structured_data_stats("makro")["ranking"]
+        self.assertEqual((stats["pages"], stats["structured_hits"], stats["dom_skipped"]), (2, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
+    def test_makro_ranking_falls_back_for_sponsored_markup(self):
+        """Test that markup only the DOM understands disables the fast path"""
+        html_content = _load_fixture("makro", "search").replace(
+            '<li class="product-item">', '<li class="product-item"><span class="sponsored-label">Ad</span>', 1
+        )
+        ranking = MakroSearchRankingExtractor().extract_search_ranking_data(html_content, "kettle")
+        self.assertTrue(ranking["top_ranked_products"][0].get("sponsored"))
+        self.assertEqual(get_structured_data_stats("makro")["ranking"]["dom_skipped"], 0)
+
+    def test_makro_search_uses_hydration_state(self):
+        """Test Makro search results from hydration state"""
+        search_data = makro_search.extract_search_results(_load_fixture("makro", "search"), "kettle")
+        self.assertEqual(search_data["result_count"], 164)
+        self.assertEqual(search_data["total_pages"], 7)
+        self.assertEqual(len(search_data["results"]), 24)
+        self.assertEqual(get_structured_data_stats("makro")["search"]["hit_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
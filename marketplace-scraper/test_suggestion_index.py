@@ -0,0 +1,148 @@
+"""
+Unit tests for the search suggestion index.
+
+Checks that prefixes are answered from fetched suggestions, directly or
+derived from a shorter complete prefix of a marketplace with a known cap,
+only while they are fresh, that the index survives a save and load, and
+that scrapers and keyword discovery use it instead of repeating requests.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from src.common.proxy_client import SmartProxyClient
+from src.common.suggestion_index import SuggestionIndex
+from src.common.keyword_manager import KeywordManager
+from src.marketplaces.takealot.takealot_scraper import TakealotScraper
+from src.storage.repository import MarketplaceDataRepository
+from test_repository_bulk_writes import FakeClient
+
+
+KETTLES = ["Kettle", "Kettle Black", "Kettle Glass", "Kettlebell"]
+
+
+class SuggestionIndexTest(unittest.TestCase):
+    """Tests for lookups, completions and persistence"""
+
+    def setUp(self):
+        self.index = SuggestionIndex(max_suggestions={"takealot": 10, "loot": 5, "makro": 10})
+        self.index.record("takealot", "kett", KETTLES)
+
+    def test_lookups(self):
+        self.assertEqual(self.index.lookup("takealot", " KETT "), KETTLES)
+        self.assertEqual(self.index.lookup("takealot", "kettle g"), ["Kettle Glass"])
+        self.assertEqual(self.index.lookup("takealot", "kettled"), [])
+        self.assertIsNone(self.index.lookup("takealot", "ket"))
+        self.assertIsNone(self.index.lookup("loot", "kettle"))
+        self.assertEqual(self.index.stats, {"hits": 1, "derived": 2, "misses": 2})
+
+    def test_incomplete_responses_are_not_derived(self):
+        # A full response may be truncated, and matches inside words may be missing
+        self.index.record("loot", "tv", [f"TV {size}" for size in (32, 43, 50, 55, 65)])
+        self.index.record("takealot", "mug", ["Mug", "Coffee Mug"])
+
+        self.assertIsNone(self.index.lookup("loot", "tv 4"))
+        self.assertIsNone(self.index.lookup("takealot", "mugs"))
+        self.assertEqual(self.index.lookup("takealot", "mug"), ["Mug", "Coffee Mug"])
+
+    def test_unknown_cap_is_not_derived(self):
+        # Without a verified cap a short response may still be truncated
+        self.index.record("bob_shop", "kett", KETTLES)
+
+        self.assertEqual(self.index.lookup("bob_shop", "kett"), KETTLES)
+        self.assertIsNone(self.index.lookup("bob_shop", "kettleb"))
+
+    def test_response_fields(self):
+        products = [{"text": "Glass Kettle 1.7L", "type": "product"}]
+        self.index.record("makro", "kett", KETTLES, fields={
+            "prefix": "kett", "timestamp": "2026-10-18T12:00:00", "product_suggestions": products
+        })
+
+        # Fields of the response come with its own prefix only
+        self.assertEqual(self.index.lookup_response("makro", "kett"),
+                         {"suggestions": KETTLES, "product_suggestions": products})
+        self.assertEqual(self.index.lookup_response("makro", "kettleb"), {"suggestions": ["Kettlebell"]})
+
+    def test_expired_suggestions_are_fetched(self):
+        self.index.record("takealot", "toast", ["Toaster"], fetched_at=time.time() - 8 * 24 * 3600)
+
+        self.assertIsNone(self.index.lookup("takealot", "toast"))
+        self.assertIsNone(self.index.lookup("takealot", "toaste"))
+
+    def test_completions(self):
+        self.index.record("makro", "kett", [{"suggestion": "Kettle", "type": "query"}, {"suggestion": "Kettle Jug"}])
+
+        self.assertEqual(self.index.completions("takealot", "kettle", limit=3), ["Kettle", "Kettlebell", "Kettle Black"])
+        self.assertEqual(self.index.completions("makro", "kettle j"), ["Kettle Jug"])
+        self.assertEqual(self.index.lookup("makro", "kettle j"), [{"suggestion": "Kettle Jug"}])
+        self.assertEqual(self.index.completions("bob_shop", "kettle"), [])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "suggestions.json")
+            index = SuggestionIndex(persist_path=path, max_suggestions={"takealot": 10})
+            index.record("takealot", "kett", KETTLES, fields={"product_suggestions": []})
+            index.record("takealot", "toast", ["Toaster"], fetched_at=time.time() - 8 * 24 * 3600)
+            index.save()
+
+            with open(path) as f:
+                self.assertEqual(list(json.load(f)["marketplaces"]["takealot"]), ["kett"])
+            loaded = SuggestionIndex(persist_path=path, max_suggestions={"takealot": 10})
+
+        self.assertEqual(loaded.lookup("takealot", "kettleb"), ["Kettlebell"])
+        self.assertEqual(loaded.lookup_response("takealot", "kett")["product_suggestions"], [])
+        self.assertFalse(loaded.dirty)
+
+
+class ScraperSuggestionCacheTest(unittest.TestCase):
+    """Tests for scrapers and keyword discovery using the index"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+        self.index = SuggestionIndex(max_suggestions={"takealot": 10})
+        self.scraper = TakealotScraper(SmartProxyClient(), self.repository)
+        self.scraper.logger.disabled = True
+        self.scraper.suggestion_index = self.index
+
+        self.fetched = []
+
+        async def fetch_page(url, use_js=False, **kwargs):
+            self.fetched.append(url)
+            items = [{"name": name} for name in KETTLES]
+            return {"content": json.dumps({"sections": [{"name": "Suggestions", "items": items}]})}
+
+        self.scraper.fetch_page = fetch_page
+
+    def test_scraper_reuses_suggestions(self):
+        fetched = asyncio.run(self.scraper.extract_search_suggestions("kett"))
+        derived = asyncio.run(self.scraper.extract_search_suggestions("kettleb"))
+        repeated = asyncio.run(self.scraper.extract_search_suggestions("kett"))
+
+        self.assertEqual(fetched["suggestions"], KETTLES)
+        self.assertNotIn("cached", fetched)
+        # A repeated prefix is answered with every field of the fetched response
+        self.assertEqual(set(repeated) - {"cached"}, set(fetched))
+        self.assertEqual((derived["suggestions"], derived["cached"]), (["Kettlebell"], True))
+        self.assertEqual(len(self.fetched), 1)
+        self.assertEqual(len(self.client.data["search_suggestions"]), 1)
+
+    def test_discovery_adds_suggestions(self):
+        self.index.record("takealot", "kettle s", ["Kettle Stainless Steel"])
+        manager = KeywordManager(self.repository, suggestion_index=self.index)
+        manager.logger.disabled = True
+        asyncio.run(manager.add_keyword("takealot", "kettle", priority=8))
+
+        discovered = asyncio.run(manager.discover_related_keywords({"takealot": self.scraper}))
+
+        self.assertEqual(sorted(discovered), ["Kettle Black", "Kettle Glass", "Kettle Stainless Steel", "Kettlebell"])
+        self.assertEqual(len(self.fetched), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for vectorized trend detection.
+
+Checks the columnar history layout, that the trend methods measure changes
+as expected (Theil-Sen ignoring an outlying refresh that skews least
+squares), that top-k selection matches a full sort, and that the ranking
+analyzer reports trending keywords with the chosen method.
+"""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.processing.analyzers.ranking_analyzer import RankingAnalyzer
+from src.processing.analyzers.trend_detection import (
+    TREND_METRICS, HistoryArrays, metric_changes, top_k
+)
+
+
+START = datetime(2026, 6, 1)
+RESULTS = TREND_METRICS.index("total_results")
+OPPORTUNITY = TREND_METRICS.index("opportunity_score")
+
+
+def _history(values, metric="total_results", days=None):
+    return [
+        {"date": (START + timedelta(days=day, hours=12)).isoformat(), metric: value}
+        for day, value in zip(days or range(len(values)), values)
+    ]
+
+
+class HistoryArraysTest(unittest.TestCase):
+    """Tests for laying out history as arrays"""
+
+    def test_layout(self):
+        same_day = [
+            {"date": "2026-06-03T08:00:00", "total_results": 10},
+            {"date": "2026-06-03T20:00:00", "total_results": 30, "opportunity_score": 5},
+        ]
+        histories = [
+            _history([100, 110, 120], days=[0, 4, 9]),
+            same_day,
+            [{"date": "yesterday", "total_results": 1}, {"date": "2026-05-20", "total_results": 2}],
+            [{"date": "2026-06-02T23:30:00-02:00", "total_results": 7, "average_price": None}],
+        ]
+
+        arrays = HistoryArrays(histories, START, days=10)
+
+        self.assertEqual(arrays.values.shape, (4, 11, len(TREND_METRICS)))
+        self.assertEqual(arrays.counts.tolist(), [3, 2, 0, 1])
+        self.assertEqual(arrays.values[0, [0, 4, 9], RESULTS].tolist(), [100, 110, 120])
+        # The daily value is the day's last entry, the oldest entry is kept as it is
+        self.assertEqual(arrays.values[1, 2, RESULTS], 30)
+        oldest, newest = arrays.endpoints()
+        self.assertEqual((oldest[1, RESULTS], newest[1, RESULTS], oldest[1, OPPORTUNITY]), (10, 30, 0))
+        # Timezone-aware dates are placed by their UTC day
+        self.assertEqual(arrays.values[3, 2, RESULTS], 7)
+        # Missing and None values are NaN
+        self.assertTrue(np.isnan(arrays.values[3, 2, 1:]).all())
+        self.assertEqual((arrays.first[0], arrays.last[0]), (0, 9))
+
+
+class TrendMethodsTest(unittest.TestCase):
+    """Tests for measuring changes and selecting the top keywords"""
+
+    def setUp(self):
+        steady = [100 + 10 * day for day in range(11)]
+        spiked = list(steady)
+        spiked[8] = 1000
+        self.arrays = HistoryArrays([_history(steady), _history(spiked), _history([50])], START, days=10)
+
+    def test_methods(self):
+        delta, delta_percent = metric_changes(self.arrays, "delta")
+        least_squares, _ = metric_changes(self.arrays, "least_squares")
+        theil_sen, theil_sen_percent = metric_changes(self.arrays, "theil_sen")
+
+        self.assertEqual(delta[:, RESULTS].tolist(), [100, 100, 0])
+        self.assertEqual(delta_percent[0, RESULTS], 100)
+        np.testing.assert_allclose(least_squares[0, RESULTS], 100)
+        np.testing.assert_allclose(theil_sen[:, RESULTS], [100, 100, 0])
+        np.testing.assert_allclose(theil_sen_percent[:2, RESULTS], [100, 100])
+        # The spike pulls the least squares line, not the median slope
+        self.assertNotAlmostEqual(least_squares[1, RESULTS], 100)
+
+        with self.assertRaises(ValueError):
+            metric_changes(self.arrays, "median")
+
+    def test_top_k(self):
+        scores = np.array([3.0, 9.0, 1.0, 9.0, 5.0, 3.0, 3.0])
+
+        self.assertEqual(top_k(scores, 3).tolist(), [1, 3, 4])
+        self.assertEqual(top_k(scores, 5).tolist(), [1, 3, 4, 0, 5])
+        self.assertEqual(top_k(scores, 10).tolist(), [1, 3, 4, 0, 5, 6, 2])
+        self.assertEqual(top_k(scores, 0).tolist(), [])
+
+        random_scores = np.random.default_rng(1).integers(0, 50, 500).astype(float)
+        expected = sorted(range(500), key=lambda index: -random_scores[index])[:25]
+        self.assertEqual(top_k(random_scores, 25).tolist(), expected)
+
+
+class TrendingKeywordsTest(unittest.TestCase):
+    """Tests for identifying trending keywords with the ranking analyzer"""
+
+    class Repository:
+        def __init__(self, histories):
+            self.histories = histories
+
+        async def get_keyword_rankings(self, filters=None, limit=100, **kwargs):
+            return [
+                {"keyword_id": f"takealot_{keyword}", "keyword": keyword, "marketplace": "takealot"}
+                for keyword in self.histories
+            ][:limit]
+
+        async def get_keyword_histories(self, keyword_entries, start=None, end=None):
+            return {
+                entry["keyword_id"]: [h for h in self.histories[entry["keyword"]] if h["date"] >= start]
+                for entry in keyword_entries
+            }
+
+    def test_methods(self):
+        now = datetime.now()
+
+        def history(values):
+            return [
+                {"date": (now - timedelta(days=len(values) - day)).isoformat(), "total_results": value,
+                 "opportunity_score": 50, "average_price": 100}
+                for day, value in enumerate(values)
+            ]
+
+        analyzer = RankingAnalyzer(self.Repository({
+            "kettle": history([100, 100, 100, 100, 100, 100, 300]),
+            "toaster": history([100, 120, 140, 160, 180, 200, 220]),
+            "mug": history([100]),
+        }))
+
+        by_delta = asyncio.run(analyzer.identify_trending_keywords(days=10, method="delta"))
+        by_theil_sen = asyncio.run(analyzer.identify_trending_keywords(days=10, method="theil_sen"))
+
+        self.assertEqual([entry["keyword"] for entry in by_delta], ["kettle", "toaster"])
+        self.assertEqual(by_delta[0]["changes"]["results"], {"absolute": 200, "percent": 200, "direction": "up"})
+        self.assertEqual(by_delta[0]["trend_method"], "delta")
+        # A single jump in the last refresh is not a trend
+        self.assertEqual([entry["keyword"] for entry in by_theil_sen], ["toaster", "kettle"])
+        self.assertAlmostEqual(by_theil_sen[0]["changes"]["results"]["absolute"], 120)
+        self.assertEqual(by_theil_sen[1]["trend_score"], 0)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(analyzer.identify_trending_keywords(method="median"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+"""
+Unit tests for the write-behind repository buffer.
+
+Runs the buffer over a repository backed by the in-memory client of the bulk
+write tests, checking that saves return without touching storage, that
+queued saves to the same document are coalesced, that a full buffer makes
+saves wait and that failed writes are retried.
+"""
+
+import asyncio
+import unittest
+
+from src.storage.repository import MarketplaceDataRepository
+from src.storage.write_behind import WriteBehindRepository
+from test_repository_bulk_writes import FakeClient, FakeBatch, _product
+
+
+class SlowBatch(FakeBatch):
+    async def commit(self):
+        await asyncio.sleep(0.01)
+        await super().commit()
+
+
+class WriteBehindTest(unittest.TestCase):
+    """Tests for buffering repository saves"""
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.repository = MarketplaceDataRepository(firestore_client=self.client)
+        self.repository.logger.disabled = True
+
+    def _buffer(self, **kwargs):
+        buffer = WriteBehindRepository(self.repository, flush_interval=60, **kwargs)
+        buffer.logger.disabled = True
+        return buffer
+
+    def _products(self):
+        return self.client.data["marketplace_products"]
+
+    def test_saves_return_before_writing(self):
+        async def run():
+            buffer = self._buffer()
+            doc_id = await buffer.save_product(_product(0))
+            round_trips = self.client.round_trips
+            queued = await buffer.get_product("takealot", "PLID0")
+            await buffer.close()
+            return doc_id, round_trips, queued
+
+        doc_id, round_trips, queued = asyncio.run(run())
+
+        self.assertEqual(doc_id, "takealot_PLID0")
+        self.assertEqual(round_trips, 0)
+        self.assertEqual(queued["title"], "Product 0")
+        self.assertEqual(self._products()["takealot_PLID0"]["price"], 100.0)
+
+    def test_coalescing(self):
+        async def run():
+            buffer = self._buffer()
+            for price in (100.0, 90.0, 80.0):
+                await buffer.save_product(_product(0, price=price))
+            for count in (1, 2):
+                await buffer.save_search_results({"keyword": "kettle", "marketplace": "takealot",
+                                                  "results": [{"title": "Kettle"}] * count})
+                await buffer.save_category({"category_id": "home", "marketplace": "takealot",
+                                            "name": "Home", f"field_{count}": count})
+            await buffer.close()
+            return buffer.get_buffer_stats()
+
+        stats = asyncio.run(run())
+
+        # The new product, keyword and category are each committed with a counter write,
+        # and the keyword with its first snapshot
+        self.assertEqual(self.client.batch_sizes, [5, 3, 2])
+        self.assertEqual(self._products()["takealot_PLID0"]["price"], 80.0)
+        self.assertEqual(len(self.client.data["product_prices"]), 3)
+        self.assertEqual(self.client.data["search_keywords"]["takealot_kettle"]["result_count"], 2)
+        category = self.client.data["marketplace_categories"]["takealot_home"]
+        self.assertEqual((category["field_1"], category["field_2"]), (1, 2))
+        self.assertEqual(stats["coalesced"], 4)
+        self.assertEqual(stats["written"], 5)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_backpressure(self):
+        self.client.batch = lambda: SlowBatch(self.client)
+
+        async def run():
+            buffer = self._buffer(max_pending=10, flush_size=5)
+            peak = 0
+
+            async def scraper(worker):
+                nonlocal peak
+                for i in range(10):
+                    await buffer.save_product(_product(worker * 10 + i))
+                    peak = max(peak, buffer.get_buffer_stats()["pending"])
+
+            await asyncio.gather(*(scraper(worker) for worker in range(5)))
+            await buffer.close()
+            return peak, buffer.get_buffer_stats()
+
+        peak, stats = asyncio.run(run())
+
+        self.assertLessEqual(peak, 10)
+        self.assertGreater(stats["backpressure_waits"], 0)
+        self.assertEqual(stats["written"], 50)
+        self.assertEqual(len(self._products()), 50)
+
+    def test_failed_writes_are_retried(self):
+        self.client.fail_commits = 1
+
+        async def run():
+            buffer = self._buffer()
+            await buffer.save_product(_product(0))
+            await buffer.save_price_point({"product_id": "PLID1", "marketplace": "takealot", "price": 5.0})
+            await buffer.close()
+            return buffer.get_buffer_stats()
+
+        stats = asyncio.run(run())
+
+        self.assertIn("takealot_PLID0", self._products())
+        self.assertEqual(len(self.client.data["product_prices"]), 2)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["dropped"], 0)
+
+    def test_failed_save_replaced_meanwhile_releases_room(self):
+        self.client.fail_commits = 1
+        search = {"keyword": "kettle", "marketplace": "takealot", "results": [{"title": "Kettle"}]}
+
+        async def run():
+            buffer = self._buffer()
+            await buffer.save_search_results(search)
+            write = buffer._write
+
+            async def write_with_newer_save(pending, prices):
+                # A newer save of the keyword is queued while the failing flush runs
+                await buffer.save_search_results({**search, "results": []})
+                return await write(pending, prices)
+
+            buffer._write = write_with_newer_save
+            await buffer.flush()
+            buffer._write = write
+            await buffer.close()
+            return buffer.get_buffer_stats()
+
+        stats = asyncio.run(run())
+
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(self.client.data["search_keywords"]["takealot_kettle"]["result_count"], 0)
+
+    def test_flush_error_requeues_everything(self):
+        async def run():
+            buffer = self._buffer()
+            write = buffer._write
+
+            async def broken_write(pending, prices):
+                raise RuntimeError("storage unavailable")
+
+            buffer._write = broken_write
+            await buffer.save_product(_product(0))
+            await buffer.save_category({"category_id": "home", "marketplace": "takealot", "name": "Home"})
+            await buffer.flush()
+            pending = buffer.get_buffer_stats()["pending"]
+            buffer._write = write
+            await buffer.close()
+            return pending, buffer.get_buffer_stats()
+
+        pending, stats = asyncio.run(run())
+
+        self.assertEqual(pending, 2)
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(stats["pending"], 0)
+        self.assertIn("takealot_PLID0", self._products())
+        self.assertIn("takealot_home", self.client.data["marketplace_categories"])
+
+    def test_drops_after_max_attempts(self):
+        self.client.fail_commits = 10
+
+        async def run():
+            buffer = self._buffer(max_attempts=2)
+            await buffer.save_product(_product(0))
+            await buffer.close()
+            return buffer.get_buffer_stats()
+
+        stats = asyncio.run(run())
+
+        self.assertEqual(self.client.batch_sizes, [3, 3])
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_periodic_flush(self):
+        async def run():
+            buffer = WriteBehindRepository(self.repository, flush_interval=0.01)
+            await buffer.save_product(_product(0))
+            await asyncio.sleep(0.1)
+            written = buffer.get_buffer_stats()["written"]
+            await buffer.close()
+            return written
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+    def test_validation_and_passthrough(self):
+        async def run():
+            buffer = self._buffer()
+            with self.assertRaises(ValueError):
+                await buffer.save_product({"product_id": "PLID0"})
+            results = await buffer.save_products_bulk([_product(0), {"marketplace": "takealot"}])
+            await buffer.close()
+            with self.assertRaises(RuntimeError):
+                await buffer.save_product(_product(1))
+            return results
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results[1], {"doc_id": None, "error": "product_id is required"})
+        self.assertEqual(self._buffer().get_write_stats()["writes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()